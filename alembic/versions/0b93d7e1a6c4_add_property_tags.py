@@ -0,0 +1,58 @@
+"""Add normalized property_tags table
+
+Revision ID: 0b93d7e1a6c4
+Revises: f6a1c3d8e250
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0b93d7e1a6c4'
+down_revision = 'f6a1c3d8e250'
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH_SIZE = 1000
+
+
+def upgrade() -> None:
+    property_tags = op.create_table(
+        'property_tags',
+        sa.Column('property_id', sa.Integer(), nullable=False),
+        sa.Column('tag', sa.String(), nullable=False),
+        sa.ForeignKeyConstraint(['property_id'], ['properties.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('property_id', 'tag'),
+    )
+    op.create_index('ix_property_tags_tag_property_id', 'property_tags', ['tag', 'property_id'], unique=False)
+
+    # Backfill from the JSON tags column in keyset-ordered batches.
+    connection = op.get_bind()
+    properties = sa.table('properties', sa.column('id', sa.Integer), sa.column('tags', sa.JSON))
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            sa.select(properties.c.id, properties.c.tags)
+            .where(properties.c.id > last_id)
+            .order_by(properties.c.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        ).fetchall()
+        if not rows:
+            break
+        inserts = []
+        for property_id, tags in rows:
+            if isinstance(tags, str):
+                tags = json.loads(tags)
+            normalized = {tag.strip().lower() for tag in tags or [] if tag and tag.strip()}
+            inserts.extend({'property_id': property_id, 'tag': tag} for tag in sorted(normalized))
+        if inserts:
+            connection.execute(property_tags.insert(), inserts)
+        last_id = rows[-1][0]
+
+
+def downgrade() -> None:
+    op.drop_index('ix_property_tags_tag_property_id', table_name='property_tags')
+    op.drop_table('property_tags')
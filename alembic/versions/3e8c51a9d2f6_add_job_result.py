@@ -0,0 +1,23 @@
+"""Add job result
+
+Revision ID: 3e8c51a9d2f6
+Revises: 7d25e0b4c918
+Create Date: 2026-10-17 19:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '3e8c51a9d2f6'
+down_revision = '7d25e0b4c918'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('jobs', sa.Column('result', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('jobs', 'result')
@@ -0,0 +1,82 @@
+"""Add denormalized metric columns to deals
+
+Revision ID: 5b7d2c9e4f10
+Revises: 11546bb87e54
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '5b7d2c9e4f10'
+down_revision = '11546bb87e54'
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH_SIZE = 1000
+
+
+def upgrade() -> None:
+    op.add_column('deals', sa.Column('monthly_cash_flow', sa.Float(), nullable=True))
+    op.add_column('deals', sa.Column('noi_annual', sa.Float(), nullable=True))
+    op.add_column('deals', sa.Column('cash_on_cash_return', sa.Float(), nullable=True))
+    op.add_column('deals', sa.Column('overall_score', sa.Float(), nullable=True))
+    op.create_index('ix_deals_user_id_stage', 'deals', ['user_id', 'stage'], unique=False)
+
+    # Backfill from the stored analytics snapshots in keyset-ordered batches.
+    connection = op.get_bind()
+    deals = sa.table(
+        'deals',
+        sa.column('id', sa.Integer),
+        sa.column('snapshot_of_analytics_result', sa.JSON),
+        sa.column('monthly_cash_flow', sa.Float),
+        sa.column('noi_annual', sa.Float),
+        sa.column('cash_on_cash_return', sa.Float),
+        sa.column('overall_score', sa.Float),
+    )
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            sa.select(deals.c.id, deals.c.snapshot_of_analytics_result)
+            .where(deals.c.id > last_id)
+            .order_by(deals.c.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        ).fetchall()
+        if not rows:
+            break
+        updates = []
+        for deal_id, snapshot in rows:
+            if isinstance(snapshot, str):
+                snapshot = json.loads(snapshot)
+            cash_flow = (snapshot or {}).get('cash_flow') or {}
+            deal_analysis = (snapshot or {}).get('deal_analysis') or {}
+            updates.append({
+                'deal_id': deal_id,
+                'monthly_cash_flow': cash_flow.get('monthly_cash_flow'),
+                'noi_annual': cash_flow.get('noi_annual'),
+                'cash_on_cash_return': cash_flow.get('cash_on_cash_return'),
+                'overall_score': deal_analysis.get('overall_score'),
+            })
+        connection.execute(
+            deals.update()
+            .where(deals.c.id == sa.bindparam('deal_id'))
+            .values(
+                monthly_cash_flow=sa.bindparam('monthly_cash_flow'),
+                noi_annual=sa.bindparam('noi_annual'),
+                cash_on_cash_return=sa.bindparam('cash_on_cash_return'),
+                overall_score=sa.bindparam('overall_score'),
+            ),
+            updates,
+        )
+        last_id = rows[-1][0]
+
+
+def downgrade() -> None:
+    op.drop_index('ix_deals_user_id_stage', table_name='deals')
+    op.drop_column('deals', 'overall_score')
+    op.drop_column('deals', 'cash_on_cash_return')
+    op.drop_column('deals', 'noi_annual')
+    op.drop_column('deals', 'monthly_cash_flow')
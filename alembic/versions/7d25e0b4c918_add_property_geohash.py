@@ -0,0 +1,85 @@
+"""Add geohash column and covering indexes for radius search
+
+Revision ID: 7d25e0b4c918
+Revises: 0b93d7e1a6c4
+Create Date: 2026-10-17 17:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '7d25e0b4c918'
+down_revision = '0b93d7e1a6c4'
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH_SIZE = 1000
+GEOHASH_PRECISION = 9
+GEOHASH_ALPHABET = '0123456789bcdefghjkmnpqrstuvwxyz'
+
+
+def _geohash(latitude, longitude):
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, bit_count, even = [], 0, 0, True
+    while len(chars) < GEOHASH_PRECISION:
+        bounds, value = (lon_range, longitude) if even else (lat_range, latitude)
+        middle = (bounds[0] + bounds[1]) / 2
+        bits = (bits << 1) | (value >= middle)
+        bounds[0 if value >= middle else 1] = middle
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(GEOHASH_ALPHABET[bits])
+            bits, bit_count = 0, 0
+    return ''.join(chars)
+
+
+def upgrade() -> None:
+    op.add_column('properties', sa.Column('geohash', sa.String(length=12), nullable=True))
+    op.create_index(
+        'ix_properties_owner_user_id_geohash',
+        'properties',
+        ['owner_user_id', 'geohash', 'latitude', 'longitude'],
+        unique=False,
+    )
+    op.create_index('ix_properties_geohash', 'properties', ['geohash', 'latitude', 'longitude'], unique=False)
+
+    # Backfill in keyset-ordered batches.
+    connection = op.get_bind()
+    properties = sa.table(
+        'properties',
+        sa.column('id', sa.Integer),
+        sa.column('latitude', sa.Float),
+        sa.column('longitude', sa.Float),
+        sa.column('geohash', sa.String),
+    )
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            sa.select(properties.c.id, properties.c.latitude, properties.c.longitude)
+            .where(properties.c.id > last_id)
+            .order_by(properties.c.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        ).fetchall()
+        if not rows:
+            break
+        updates = [
+            {'property_id': property_id, 'geohash': _geohash(latitude, longitude)}
+            for property_id, latitude, longitude in rows
+            if latitude is not None and longitude is not None
+        ]
+        if updates:
+            connection.execute(
+                properties.update()
+                .where(properties.c.id == sa.bindparam('property_id'))
+                .values(geohash=sa.bindparam('geohash')),
+                updates,
+            )
+        last_id = rows[-1][0]
+
+
+def downgrade() -> None:
+    op.drop_index('ix_properties_geohash', table_name='properties')
+    op.drop_index('ix_properties_owner_user_id_geohash', table_name='properties')
+    op.drop_column('properties', 'geohash')
@@ -0,0 +1,95 @@
+"""Add normalized address key for duplicate detection
+
+Revision ID: a5d3f08c6e21
+Revises: 3e8c51a9d2f6
+Create Date: 2026-10-17 20:00:00.000000
+
+"""
+import re
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'a5d3f08c6e21'
+down_revision = '3e8c51a9d2f6'
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH_SIZE = 1000
+
+# Frozen copy of app.core.address.address_key as of this revision.
+ABBREVIATIONS = {
+    'avenue': 'ave', 'av': 'ave', 'boulevard': 'blvd', 'circle': 'cir', 'court': 'ct', 'drive': 'dr',
+    'expressway': 'expy', 'freeway': 'fwy', 'highway': 'hwy', 'lane': 'ln', 'parkway': 'pkwy', 'place': 'pl',
+    'road': 'rd', 'square': 'sq', 'street': 'st', 'terrace': 'ter', 'trail': 'trl', 'north': 'n', 'south': 's',
+    'east': 'e', 'west': 'w', 'northeast': 'ne', 'northwest': 'nw', 'southeast': 'se', 'southwest': 'sw',
+}
+UNIT_DESIGNATORS = frozenset({'#', 'apt', 'apartment', 'unit', 'suite', 'ste', 'rm', 'room'})
+SEPARATORS = re.compile(r'[^\w#]+|(#)')
+
+
+def _tokens(text):
+    return [token for token in SEPARATORS.split((text or '').lower()) if token]
+
+
+def _address_key(address_line1, address_line2, zip_code):
+    street, unit = [], []
+    tokens = _tokens(address_line1)
+    for position, token in enumerate(tokens):
+        if token in UNIT_DESIGNATORS:
+            unit.extend(tokens[position + 1:])
+            break
+        street.append(ABBREVIATIONS.get(token, token))
+    unit.extend(_tokens(address_line2))
+    unit = [token for token in unit if token not in UNIT_DESIGNATORS]
+    key = ' '.join(street)
+    if unit:
+        key += ' #' + ''.join(unit)
+    digits = re.sub(r'\D', '', zip_code or '')
+    return f"{key}|{digits[:5] if digits else (zip_code or '').strip().lower()}"
+
+
+def upgrade() -> None:
+    op.add_column('properties', sa.Column('address_key', sa.String(), nullable=True))
+    op.create_index(
+        'ix_properties_owner_user_id_address_key', 'properties', ['owner_user_id', 'address_key'], unique=False
+    )
+
+    # Backfill in keyset-ordered batches.
+    connection = op.get_bind()
+    properties = sa.table(
+        'properties',
+        sa.column('id', sa.Integer),
+        sa.column('address_line1', sa.String),
+        sa.column('address_line2', sa.String),
+        sa.column('zip_code', sa.String),
+        sa.column('address_key', sa.String),
+    )
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            sa.select(
+                properties.c.id, properties.c.address_line1, properties.c.address_line2, properties.c.zip_code
+            )
+            .where(properties.c.id > last_id)
+            .order_by(properties.c.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        ).fetchall()
+        if not rows:
+            break
+        connection.execute(
+            properties.update()
+            .where(properties.c.id == sa.bindparam('property_id'))
+            .values(address_key=sa.bindparam('key')),
+            [
+                {'property_id': property_id, 'key': _address_key(line1, line2, zip_code)}
+                for property_id, line1, line2, zip_code in rows
+            ],
+        )
+        last_id = rows[-1][0]
+
+
+def downgrade() -> None:
+    op.drop_index('ix_properties_owner_user_id_address_key', table_name='properties')
+    op.drop_column('properties', 'address_key')
@@ -0,0 +1,36 @@
+"""Add versioned assumption sets
+
+Revision ID: a8e3f61c2d47
+Revises: 5b7d2c9e4f10
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'a8e3f61c2d47'
+down_revision = '5b7d2c9e4f10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'assumption_sets',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.Column('values', sa.JSON(), nullable=False),
+        sa.Column('created_by_user_id', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['created_by_user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_assumption_sets_id'), 'assumption_sets', ['id'], unique=False)
+    op.create_index(op.f('ix_assumption_sets_version'), 'assumption_sets', ['version'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_assumption_sets_version'), table_name='assumption_sets')
+    op.drop_index(op.f('ix_assumption_sets_id'), table_name='assumption_sets')
+    op.drop_table('assumption_sets')
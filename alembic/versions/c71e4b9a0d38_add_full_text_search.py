@@ -0,0 +1,74 @@
+"""Add full-text search indexes for properties, leads and deals
+
+Revision ID: c71e4b9a0d38
+Revises: a5d3f08c6e21
+Create Date: 2026-10-17 21:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'c71e4b9a0d38'
+down_revision = 'a5d3f08c6e21'
+branch_labels = None
+depends_on = None
+
+# Frozen copy of app.core.search.SEARCH_ENTITIES as of this revision.
+SEARCH_COLUMNS = {
+    'properties': ('address_line1', 'address_line2', 'city', 'state', 'zip_code'),
+    'leads': ('first_name', 'last_name', 'email', 'phone', 'source', 'notes'),
+    'deals': ('notes',),
+}
+
+
+def _text(columns):
+    return " || ' ' || ".join(f"coalesce({column}, '')" for column in columns) or "''"
+
+
+def _sqlite_upgrade(table, columns):
+    fts = f'{table}_fts'
+    names = ', '.join(columns)
+    new = ', '.join(f'new.{column}' for column in columns)
+    old = ', '.join(f'old.{column}' for column in columns)
+    delete_old = f"INSERT INTO {fts}({fts}, rowid, {names}) VALUES ('delete', old.id, {old});"
+    insert_new = f'INSERT INTO {fts}(rowid, {names}) VALUES (new.id, {new});'
+    op.execute(
+        f"CREATE VIRTUAL TABLE {fts} USING fts5({names}, content='{table}', content_rowid='id', "
+        "tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+    )
+    op.execute(f'CREATE TRIGGER {fts}_insert AFTER INSERT ON {table} BEGIN {insert_new} END')
+    op.execute(f'CREATE TRIGGER {fts}_delete AFTER DELETE ON {table} BEGIN {delete_old} END')
+    op.execute(f'CREATE TRIGGER {fts}_update AFTER UPDATE OF {names} ON {table} BEGIN {delete_old} {insert_new} END')
+    # Index the existing rows.
+    op.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+def _postgres_upgrade(table, columns):
+    # The generated column is computed for existing rows as it is added.
+    op.execute(
+        f'ALTER TABLE {table} ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ('
+        f"setweight(to_tsvector('simple'::regconfig, {_text(columns[:1])}), 'A') || "
+        f"setweight(to_tsvector('simple'::regconfig, {_text(columns[1:])}), 'B')) STORED"
+    )
+    op.execute(f'CREATE INDEX ix_{table}_search_vector ON {table} USING GIN (search_vector)')
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    for table, columns in SEARCH_COLUMNS.items():
+        if dialect == 'sqlite':
+            _sqlite_upgrade(table, columns)
+        elif dialect == 'postgresql':
+            _postgres_upgrade(table, columns)
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    for table in SEARCH_COLUMNS:
+        if dialect == 'sqlite':
+            for trigger in ('insert', 'delete', 'update'):
+                op.execute(f'DROP TRIGGER IF EXISTS {table}_fts_{trigger}')
+            op.execute(f'DROP TABLE IF EXISTS {table}_fts')
+        elif dialect == 'postgresql':
+            op.execute(f'DROP INDEX IF EXISTS ix_{table}_search_vector')
+            op.execute(f'ALTER TABLE {table} DROP COLUMN IF EXISTS search_vector')
@@ -0,0 +1,23 @@
+"""Add job claim token
+
+Revision ID: d94b2f7a1c55
+Revises: c71e4b9a0d38
+Create Date: 2026-10-17 22:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'd94b2f7a1c55'
+down_revision = 'c71e4b9a0d38'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('jobs', sa.Column('claim_token', sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('jobs', 'claim_token')
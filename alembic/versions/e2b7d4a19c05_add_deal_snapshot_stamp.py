@@ -0,0 +1,26 @@
+"""Stamp deal analytics snapshots with engine version and assumptions hash
+
+Revision ID: e2b7d4a19c05
+Revises: c4f9a2e7b813
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'e2b7d4a19c05'
+down_revision = 'c4f9a2e7b813'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Existing snapshots stay unstamped and are recomputed the first time they are read.
+    op.add_column('deals', sa.Column('analytics_engine_version', sa.Integer(), nullable=True))
+    op.add_column('deals', sa.Column('analytics_assumptions_hash', sa.String(length=40), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('deals', 'analytics_assumptions_hash')
+    op.drop_column('deals', 'analytics_engine_version')
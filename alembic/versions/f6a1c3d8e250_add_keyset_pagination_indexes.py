@@ -0,0 +1,36 @@
+"""Add composite indexes for keyset pagination
+
+Revision ID: f6a1c3d8e250
+Revises: e2b7d4a19c05
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'f6a1c3d8e250'
+down_revision = 'e2b7d4a19c05'
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ('ix_deals_user_id_id', 'deals', ['user_id', 'id']),
+    ('ix_deals_user_id_created_at_id', 'deals', ['user_id', 'created_at', 'id']),
+    ('ix_deals_user_id_purchase_price_id', 'deals', ['user_id', 'purchase_price', 'id']),
+    ('ix_properties_owner_user_id_id', 'properties', ['owner_user_id', 'id']),
+    ('ix_properties_owner_user_id_created_at_id', 'properties', ['owner_user_id', 'created_at', 'id']),
+    ('ix_leads_owner_id_id', 'leads', ['owner_id', 'id']),
+    ('ix_leads_owner_id_created_at_id', 'leads', ['owner_id', 'created_at', 'id']),
+    ('ix_users_created_at_id', 'users', ['created_at', 'id']),
+    ('ix_audit_logs_created_at_id', 'audit_logs', ['created_at', 'id']),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,149 @@
+"""Opaque keyset (cursor) pagination for list endpoints.
+
+Lists are ordered by ``(sort key, id)`` and a page continues strictly after
+the last row of the previous one, so every page is one index range scan no
+matter how deep it is. The cursor for the next page is returned in the
+``X-Next-Cursor`` response header (absent on the last page) and passed back
+as ``?cursor=``; the legacy ``skip`` offset still works when no cursor is
+given.
+"""
+from __future__ import annotations
+
+import base64
+import binascii
+from bisect import bisect_left, bisect_right
+import json
+from datetime import datetime
+from typing import Any, List, Mapping, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, Response, status
+from sqlalchemy import func, tuple_
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+TOTAL_COUNT_HEADER = "X-Total-Count"
+
+
+def _bad_request(detail: str) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
+
+
+def resolve_sort(sort: str, columns: Mapping[str, Any]) -> Tuple[str, Any, bool]:
+    """Parse ``sort`` (``name`` or ``-name`` for descending) against the allowed columns."""
+
+    descending = sort.startswith("-")
+    name = sort.lstrip("-")
+    if name not in columns:
+        raise _bad_request(f"Cannot sort by '{name}'; choose one of {sorted(columns)}")
+    return name, columns[name], descending
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return getattr(value, "value", value)
+
+
+def encode_cursor(sort: str, values: Tuple[Any, ...]) -> str:
+    """Opaque token for the position just after ``values``."""
+
+    payload = json.dumps([sort, [_encode_value(value) for value in values]], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str, columns: Tuple[Any, ...]) -> Tuple[Any, ...]:
+    """Decode a cursor issued for ``sort``, converting values back to the columns' types."""
+
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_sort, values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if cursor_sort != sort or len(values) != len(columns):
+            raise ValueError
+        decoded = []
+        for column, value in zip(columns, values):
+            if value is not None and column.type.python_type is datetime:
+                value = datetime.fromisoformat(value)
+            decoded.append(value)
+        return tuple(decoded)
+    except (ValueError, TypeError, binascii.Error, UnicodeError, NotImplementedError):
+        raise _bad_request("Invalid or expired cursor")
+
+
+def paginate(
+    query,
+    *,
+    sort: str,
+    columns: Mapping[str, Any],
+    id_column: Any,
+    limit: int,
+    cursor: Optional[str] = None,
+    skip: int = 0,
+) -> Tuple[List[Any], Optional[str]]:
+    """Return one page of ``query`` ordered by ``(sort, id)`` and the next page's cursor."""
+
+    _, sort_column, descending = resolve_sort(sort, columns)
+    key_columns = (id_column,) if sort_column is id_column else (sort_column, id_column)
+    key = tuple_(*key_columns) if len(key_columns) > 1 else key_columns[0]
+    query = query.order_by(*[column.desc() if descending else column.asc() for column in key_columns])
+
+    if cursor:
+        position = decode_cursor(cursor, sort, key_columns)
+        bound = tuple_(*position) if len(position) > 1 else position[0]
+        rows = query.filter(key < bound if descending else key > bound).limit(limit + 1).all()
+    else:
+        rows = query.offset(skip).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        last = rows[limit - 1]
+        next_cursor = encode_cursor(sort, tuple(getattr(last, column.key) for column in key_columns))
+    return rows[:limit], next_cursor
+
+
+def paginate_positions(
+    positions: Sequence[Tuple[Any, int]],
+    *,
+    sort: str,
+    columns: Mapping[str, Any],
+    id_column: Any,
+    limit: int,
+    cursor: Optional[str] = None,
+    skip: int = 0,
+) -> Tuple[List[int], Optional[str]]:
+    """Like ``paginate``, for ``(sort value, id)`` pairs already computed in Python.
+
+    Used when the sort key is not a column (e.g. distance); cursors are
+    interchangeable with the ones ``paginate`` issues for the same sort.
+    """
+
+    _, sort_column, descending = resolve_sort(sort, columns)
+    key_columns = (id_column,) if sort_column is id_column else (sort_column, id_column)
+    if len(key_columns) == 1:
+        ordered = sorted((row_id,) for _, row_id in positions)
+    else:
+        ordered = sorted((value, row_id) for value, row_id in positions)
+
+    if cursor:
+        bound = decode_cursor(cursor, sort, key_columns)
+        start = len(ordered) - bisect_left(ordered, bound) if descending else bisect_right(ordered, bound)
+    else:
+        start = skip
+    if descending:
+        ordered.reverse()
+
+    page = ordered[start:start + limit + 1]
+    next_cursor = encode_cursor(sort, page[limit - 1]) if len(page) > limit else None
+    return [position[-1] for position in page[:limit]], next_cursor
+
+
+def set_next_cursor(response: Response, next_cursor: Optional[str]) -> None:
+    """Expose the next page's cursor to the client."""
+
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+
+
+def set_total_count(response: Response, query, id_column: Any) -> None:
+    """Expose how many rows match ``query``'s filters, counted in the database."""
+
+    total = query.order_by(None).with_entities(func.count(id_column)).scalar()
+    response.headers[TOTAL_COUNT_HEADER] = str(total or 0)
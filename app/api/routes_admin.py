@@ -1,22 +1,34 @@
 """Admin-only routes."""
 from __future__ import annotations
 
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, Query, HTTPException
+from fastapi import APIRouter, Depends, Query, HTTPException, Response, status
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 
+from app.api.pagination import paginate, set_next_cursor
+from app.core.assumptions import get_assumptions
+from app.core.cache import analytics_cache
+from app.core.config import settings
 from app.core.dependencies import require_admin
-from app.db.base import get_db
+from app.core.underwriting import (
+    RECOMPUTE_JOB_KIND,
+    claim_recompute_job,
+    create_recompute_job,
+    start_recompute_job,
+)
+from app.db.base import SessionLocal, get_db
 from app.models.user import User
 from app.models.deal import Deal
 from app.models.property import Property
 from app.models.lead import Lead
 from app.models.admin import AuditLog, FeatureFlag
 from app.models.billing import Subscription, SubscriptionStatus
+from app.models.job import Job, JobStatus
 
 from app.schemas.deal import DealResponse
+from app.schemas.job import JobResponse
 from app.schemas.property import PropertyResponse
 from app.schemas.user import UserResponse
 from app.schemas.admin import (
@@ -24,11 +36,14 @@ from app.schemas.admin import (
     FeatureFlagResponse, 
     FeatureFlagCreate, 
     FeatureFlagUpdate,
-    SystemStats
+    SystemStats,
+    AnalyticsCacheStats,
 )
 
 router = APIRouter(prefix="/api/v1/admin", tags=["admin"])
 
+AUDIT_LOG_SORTS = {"created_at": AuditLog.created_at}
+
 
 @router.get("/stats", response_model=SystemStats)
 def get_system_stats(
@@ -52,26 +67,53 @@ def get_system_stats(
         active_subscriptions=active_subscriptions
     )
 
+@router.get("/analytics-cache", response_model=AnalyticsCacheStats)
+def get_analytics_cache_stats(
+    admin_user = Depends(require_admin),
+) -> AnalyticsCacheStats:
+    """Get hit/miss/eviction counters for the analytics memoization cache."""
+    return AnalyticsCacheStats(**analytics_cache.stats())
+
+
+@router.delete("/analytics-cache", response_model=AnalyticsCacheStats)
+def clear_analytics_cache(
+    admin_user = Depends(require_admin),
+) -> AnalyticsCacheStats:
+    """Drop every cached analytics result (counters are kept)."""
+    analytics_cache.clear()
+    return AnalyticsCacheStats(**analytics_cache.stats())
+
 @router.get("/users", response_model=List[UserResponse])
 def list_all_users(
-    skip: int = Query(0, ge=0),
+    response: Response,
+    skip: int = Query(0, ge=0, deprecated=True),
     limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
     admin_user = Depends(require_admin),
 ) -> List[UserResponse]:
     """List all users (admin only)."""
-    users = db.query(User).offset(skip).limit(limit).all()
+    users, next_cursor = paginate(
+        db.query(User), sort="id", columns={"id": User.id}, id_column=User.id, limit=limit, cursor=cursor, skip=skip
+    )
+    set_next_cursor(response, next_cursor)
     return [UserResponse.model_validate(user) for user in users]
 
 @router.get("/audit-logs", response_model=List[AuditLogResponse])
 def list_audit_logs(
-    skip: int = Query(0, ge=0),
+    response: Response,
+    skip: int = Query(0, ge=0, deprecated=True),
     limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = None,
+    sort: str = Query("-created_at", description="created_at, newest first by default"),
     db: Session = Depends(get_db),
     admin_user = Depends(require_admin),
 ) -> List[AuditLogResponse]:
     """List audit logs (admin only)."""
-    logs = db.query(AuditLog).order_by(AuditLog.created_at.desc()).offset(skip).limit(limit).all()
+    logs, next_cursor = paginate(
+        db.query(AuditLog), sort=sort, columns=AUDIT_LOG_SORTS, id_column=AuditLog.id, limit=limit, cursor=cursor, skip=skip
+    )
+    set_next_cursor(response, next_cursor)
     return [AuditLogResponse.model_validate(log) for log in logs]
 
 @router.get("/feature-flags", response_model=List[FeatureFlagResponse])
@@ -125,23 +167,95 @@ def update_feature_flag(
 
 @router.get("/deals", response_model=List[DealResponse])
 def list_all_deals(
-    skip: int = Query(0, ge=0),
+    response: Response,
+    skip: int = Query(0, ge=0, deprecated=True),
     limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
     admin_user = Depends(require_admin),
 ) -> List[DealResponse]:
     """List all deals (admin only)."""
-    deals = db.query(Deal).offset(skip).limit(limit).all()
+    deals, next_cursor = paginate(
+        db.query(Deal), sort="id", columns={"id": Deal.id}, id_column=Deal.id, limit=limit, cursor=cursor, skip=skip
+    )
+    set_next_cursor(response, next_cursor)
     return [DealResponse.model_validate(deal) for deal in deals]
 
 
 @router.get("/properties", response_model=List[PropertyResponse])
 def list_all_properties(
-    skip: int = Query(0, ge=0),
+    response: Response,
+    skip: int = Query(0, ge=0, deprecated=True),
     limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
     admin_user = Depends(require_admin),
 ) -> List[PropertyResponse]:
     """List all properties (admin only)."""
-    properties = db.query(Property).offset(skip).limit(limit).all()
+    properties, next_cursor = paginate(
+        db.query(Property),
+        sort="id",
+        columns={"id": Property.id},
+        id_column=Property.id,
+        limit=limit,
+        cursor=cursor,
+        skip=skip,
+    )
+    set_next_cursor(response, next_cursor)
     return [PropertyResponse.model_validate(prop) for prop in properties]
+
+
+@router.post("/deals/recalculate", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+def recalculate_all_deals(
+    db: Session = Depends(get_db),
+    admin_user = Depends(require_admin),
+) -> JobResponse:
+    """Start a background job that re-underwrites every deal with the current assumptions."""
+    running = db.query(Job).filter(
+        Job.kind == RECOMPUTE_JOB_KIND,
+        Job.status.in_([JobStatus.PENDING, JobStatus.RUNNING]),
+    ).first()
+    if running:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Recompute job {running.id} is already in progress",
+        )
+
+    job = create_recompute_job(db, get_assumptions(), user_id=admin_user.id)
+    start_recompute_job(job.id, SessionLocal, settings.SIMULATION_MAX_WORKERS)
+    return JobResponse.model_validate(job)
+
+
+@router.get("/jobs/{job_id}", response_model=JobResponse)
+def get_job(
+    job_id: int,
+    db: Session = Depends(get_db),
+    admin_user = Depends(require_admin),
+) -> JobResponse:
+    """Get a background job's status and progress."""
+    job = db.query(Job).filter(Job.id == job_id).first()
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    return JobResponse.model_validate(job)
+
+
+@router.post("/jobs/{job_id}/resume", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+def resume_job(
+    job_id: int,
+    db: Session = Depends(get_db),
+    admin_user = Depends(require_admin),
+) -> JobResponse:
+    """Resume a failed or stalled recompute job after its last committed deal."""
+    job = db.query(Job).filter(Job.id == job_id).first()
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    # The claim is a conditional UPDATE, so of two concurrent resumes only one starts a worker.
+    if not claim_recompute_job(db, job):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Only failed or stalled recompute jobs can be resumed",
+        )
+
+    start_recompute_job(job.id, SessionLocal, settings.SIMULATION_MAX_WORKERS, claimed=True)
+    db.refresh(job)
+    return JobResponse.model_validate(job)
@@ -1,7 +1,12 @@
 """API routes for analytics calculations."""
 from __future__ import annotations
 
-from fastapi import APIRouter
+from math import isnan
+from typing import Any
+
+import numpy as np
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
 
 from app.core.analytics import (
     analyze_deal,
@@ -10,19 +15,50 @@ from app.core.analytics import (
     calculate_dscr,
     estimate_rent,
 )
-from app.core.assumptions import Assumptions, get_assumptions, update_assumptions
+from app.core.assumption_versions import save_assumptions
+from app.core.assumptions import Assumptions, get_assumptions
+from app.core.batch import analyze_deals_batch
+from app.core.dependencies import require_admin
+from app.core.goal_seek import goal_seek
+from app.core.rent_index import rent_index
+from app.core.sensitivity import sensitivity_grid, tornado_analysis
+from app.db.base import get_db
 from app.models.schemas import (
     CapRateRequest,
     CashFlowRequest,
     DSCRRequest,
     DealAnalysisRequest,
+    DealBatchAnalysisRequest,
+    GoalSeekRequest,
     RentEstimateRequest,
     ResponseEnvelope,
+    SensitivityGridRequest,
+    TornadoRequest,
 )
+from app.models.user import User
 
 router = APIRouter(prefix="/api/v1", tags=["analytics"])
 
 
+def _json_safe(value: Any) -> Any:
+    """Convert NumPy values to plain Python, mapping NaN to None."""
+
+    if isinstance(value, np.ndarray):
+        as_objects = value.astype(object)
+        if value.dtype.kind == "f":
+            as_objects[np.isnan(value)] = None
+        return as_objects.tolist()
+    if isinstance(value, dict):
+        return {key: _json_safe(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_json_safe(item) for item in value]
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and isnan(value):
+        return None
+    return value
+
+
 @router.post("/calculate/cap-rate", response_model=ResponseEnvelope, summary="Calculate cap rate")
 def cap_rate_endpoint(payload: CapRateRequest) -> ResponseEnvelope:
     """Compute cap rate using purchase price, annual rent, and expenses."""
@@ -53,24 +89,32 @@ def dscr_endpoint(payload: DSCRRequest) -> ResponseEnvelope:
 
 @router.post("/estimate/rent", response_model=ResponseEnvelope, summary="Estimate market rent")
 def rent_estimate_endpoint(payload: RentEstimateRequest) -> ResponseEnvelope:
-    """Estimate rent using a rule-based model with tunable coefficients."""
+    """Estimate rent using a rule-based model blended with observed rents in the zip code."""
 
-    estimated_rent, assumptions = estimate_rent(payload.model_dump())
+    zip_stats = None
+    if payload.zip_code:
+        entry = rent_index.lookup(payload.zip_code, payload.property_type)
+        zip_stats = (entry.rent_per_sqft, entry.samples) if entry else None
+    estimated_rent, assumptions = estimate_rent(payload.model_dump(), zip_stats)
     return ResponseEnvelope(data={"estimated_rent": estimated_rent, "assumptions": assumptions})
 
 
 @router.get("/assumptions", response_model=ResponseEnvelope, summary="Get default assumptions")
 def get_assumptions_endpoint() -> ResponseEnvelope:
-    """Return the current in-memory assumption set used by calculations."""
+    """Return the assumption set currently used by calculations in this worker."""
 
     return ResponseEnvelope(data=get_assumptions().model_dump())
 
 
 @router.put("/assumptions", response_model=ResponseEnvelope, summary="Override assumptions")
-def update_assumptions_endpoint(payload: Assumptions) -> ResponseEnvelope:
-    """Update the in-memory default assumptions."""
-
-    updated = update_assumptions(payload)
+def update_assumptions_endpoint(
+    payload: Assumptions,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_admin),
+) -> ResponseEnvelope:
+    """Store a new version of the default assumptions; other workers pick it up on their next check."""
+
+    updated, _ = save_assumptions(db, payload, user_id=current_user.id)
     return ResponseEnvelope(data=updated.model_dump())
 
 
@@ -84,3 +128,73 @@ def analyze_deal_endpoint(payload: DealAnalysisRequest) -> ResponseEnvelope:
     result = analyze_deal(analysis_payload)
 
     return ResponseEnvelope(data=result)
+
+
+@router.post("/analyze/deals:batch", response_model=ResponseEnvelope, summary="Analyze many deals in one pass")
+def analyze_deals_batch_endpoint(payload: DealBatchAnalysisRequest) -> ResponseEnvelope:
+    """Score a columnar batch of deals with the vectorized engine.
+
+    Returns one list per metric, aligned with the input columns. ``dscr`` is
+    ``null`` for deals without debt service, matching the single-deal endpoint.
+    """
+
+    assumptions = payload.assumptions or get_assumptions()
+    result = analyze_deals_batch(payload.model_dump(exclude={"assumptions"}), assumptions)
+
+    data = _json_safe(result)
+    data["count"] = len(payload.purchase_price)
+    return ResponseEnvelope(data=data)
+
+
+@router.post("/analyze/sensitivity", response_model=ResponseEnvelope, summary="Sensitivity grid for a deal")
+def sensitivity_grid_endpoint(payload: SensitivityGridRequest) -> ResponseEnvelope:
+    """Evaluate cash flow, DSCR and score over the cartesian grid of 1-3 varied inputs.
+
+    Metric matrices are nested lists indexed in axis order; ``dscr`` is
+    ``null`` where a scenario has no debt service.
+    """
+
+    assumptions = payload.assumptions or get_assumptions()
+    base = payload.model_dump(exclude={"assumptions", "axes"})
+    axes = [(axis.field, axis.values) for axis in payload.axes]
+    try:
+        grid = sensitivity_grid(base, axes, assumptions)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+
+    return ResponseEnvelope(
+        data={
+            "axes": [{"field": name, "values": values} for name, values in axes],
+            "shape": [len(values) for _, values in axes],
+            **_json_safe(grid),
+        }
+    )
+
+
+@router.post("/analyze/tornado", response_model=ResponseEnvelope, summary="Tornado sensitivity for a deal")
+def tornado_endpoint(payload: TornadoRequest) -> ResponseEnvelope:
+    """Swing each input by +/- ``percent`` and report metric deltas, largest swing first."""
+
+    assumptions = payload.assumptions or get_assumptions()
+    base = payload.model_dump(exclude={"assumptions", "percent", "fields"})
+    result = tornado_analysis(base, assumptions, percent=payload.percent, fields=payload.fields)
+    return ResponseEnvelope(data=_json_safe(result))
+
+
+@router.post("/analyze/goal-seek", response_model=ResponseEnvelope, summary="Solve for offer price, rent or down payment")
+def goal_seek_endpoint(payload: GoalSeekRequest) -> ResponseEnvelope:
+    """Find the highest purchase price, or the lowest rent or down payment, that meets each goal.
+
+    Every goal is solved for every deal in the columnar batch. ``value`` is
+    ``null`` where no value meets the target; ``combined`` is the most
+    restrictive bound across goals that solve for the same input.
+    """
+
+    assumptions = payload.assumptions or get_assumptions()
+    columns = payload.model_dump(exclude={"assumptions", "goals"})
+    goals = [goal.model_dump() for goal in payload.goals]
+    try:
+        result = goal_seek(columns, goals, assumptions)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+    return ResponseEnvelope(data=_json_safe(result))
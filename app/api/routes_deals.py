@@ -1,23 +1,43 @@
 """Deal management routes with analytics integration."""
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status, Request
 from sqlalchemy.orm import Session
 
-from app.core.analytics import analyze_deal, calculate_cash_flow, calculate_dscr
+from app.api.pagination import paginate, set_next_cursor
+from app.core.amortization import amortization_schedule
+from app.core.analytics import analyze_deal, calculate_cash_flow, calculate_dscr, calculate_returns
 from app.core.assumptions import Assumptions, get_assumptions
+from app.core.batch import deal_columns
+from app.core.config import settings
 from app.core.dependencies import get_current_active_user, require_admin
 from app.db.base import get_db
 from app.models.deal import Deal
 from app.models.property import Property
 from app.models.user import User, UserRole
-from app.schemas.deal import DealCreate, DealResponse, DealUpdate
+from app.schemas.deal import (
+    DealAmortizationResponse,
+    DealCompResponse,
+    DealCreate,
+    DealProjectionResponse,
+    DealResponse,
+    DealSimulationRequest,
+    DealSimulationResponse,
+    DealUpdate,
+)
 from app.core.audit import log_action
+from app.core.projection import MAX_PROJECTION_YEARS, project_deals
+from app.core.comps import comps_index, observe_deal as observe_comps, sync_owner as sync_comps
+from app.core.rent_index import observe_deal, rent_index
+from app.core.simulation import simulate_deal
+from app.core.underwriting import refresh_stale_snapshots, store_snapshot
 
 router = APIRouter(prefix="/api/v1/deals", tags=["deals"])
 
+DEAL_SORTS = {"id": Deal.id, "created_at": Deal.created_at, "purchase_price": Deal.purchase_price}
+
 
 def _calculate_deal_analytics(deal: Deal, assumptions: Assumptions) -> Dict[str, Any]:
     """Calculate analytics for a deal and return results."""
@@ -58,11 +78,44 @@ def _calculate_deal_analytics(deal: Deal, assumptions: Assumptions) -> Dict[str,
         "cash_flow": analysis_result["cash_flow"],
         "dscr": analysis_result["dscr"],
         "deal_analysis": analysis_result,
+        "returns": calculate_returns(deal_payload),
     }
 
     return analytics_snapshot
 
 
+def _fresh_responses(db: Session, deals: List[Deal]) -> List[DealResponse]:
+    """Serialize deals, first recomputing stale snapshots with one commit for the batch."""
+    refreshed = refresh_stale_snapshots(deals, get_assumptions())
+    responses = [DealResponse.model_validate(deal) for deal in deals]
+    if refreshed:
+        db.commit()
+    return responses
+
+
+def _get_deal_for_user(db: Session, deal_id: int, current_user: User) -> Deal:
+    """Fetch a deal, raising 404/403 unless it exists and the user may access it."""
+    deal = db.query(Deal).filter(Deal.id == deal_id).first()
+    if not deal:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Deal not found",
+        )
+
+    # Check ownership (unless admin)
+    if current_user.role != UserRole.ADMIN and deal.user_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions",
+        )
+    return deal
+
+
+def _deal_assumptions(deal: Deal) -> Assumptions:
+    """Return the assumptions a deal was analyzed with, falling back to the defaults."""
+    return Assumptions(**deal.snapshot_of_assumptions) if deal.snapshot_of_assumptions else get_assumptions()
+
+
 @router.post("", response_model=DealResponse, status_code=status.HTTP_201_CREATED)
 def create_deal(
     deal_data: DealCreate,
@@ -97,12 +150,13 @@ def create_deal(
 
     # Calculate and store analytics
     analytics_snapshot = _calculate_deal_analytics(db_deal, assumptions)
-    db_deal.snapshot_of_analytics_result = analytics_snapshot
-    db_deal.snapshot_of_assumptions = assumptions.model_dump()
+    store_snapshot(db_deal, analytics_snapshot, assumptions)
 
     db.add(db_deal)
     db.commit()
     db.refresh(db_deal)
+    observe_deal(db_deal)
+    observe_comps(db_deal)
     
     log_action(
         db=db,
@@ -119,17 +173,23 @@ def create_deal(
 
 @router.get("", response_model=List[DealResponse])
 def list_deals(
-    skip: int = Query(0, ge=0),
+    response: Response,
+    skip: int = Query(0, ge=0, deprecated=True),
     limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = None,
+    sort: str = Query("id", description="id, created_at or purchase_price; prefix with - for descending"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ) -> List[DealResponse]:
-    """List deals for current user (or all if admin)."""
+    """List deals for current user (or all if admin), one keyset page at a time."""
     query = db.query(Deal)
     if current_user.role != UserRole.ADMIN:
         query = query.filter(Deal.user_id == current_user.id)
-    deals = query.offset(skip).limit(limit).all()
-    return [DealResponse.model_validate(deal) for deal in deals]
+    deals, next_cursor = paginate(
+        query, sort=sort, columns=DEAL_SORTS, id_column=Deal.id, limit=limit, cursor=cursor, skip=skip
+    )
+    set_next_cursor(response, next_cursor)
+    return _fresh_responses(db, deals)
 
 
 @router.get("/{deal_id}", response_model=DealResponse)
@@ -153,7 +213,7 @@ def get_deal(
             detail="Not enough permissions",
         )
 
-    return DealResponse.model_validate(deal)
+    return _fresh_responses(db, [deal])[0]
 
 
 @router.put("/{deal_id}", response_model=DealResponse)
@@ -207,12 +267,14 @@ def update_deal(
             )
 
     # Recalculate analytics
-    assumptions = Assumptions(**deal.snapshot_of_assumptions) if deal.snapshot_of_assumptions else get_assumptions()
+    assumptions = _deal_assumptions(deal)
     analytics_snapshot = _calculate_deal_analytics(deal, assumptions)
-    deal.snapshot_of_analytics_result = analytics_snapshot
+    store_snapshot(deal, analytics_snapshot, assumptions)
 
     db.commit()
     db.refresh(deal)
+    observe_deal(deal)
+    observe_comps(deal)
     
     log_action(
         db=db,
@@ -250,14 +312,82 @@ def recalculate_deal_analytics(
     # Use latest assumptions
     assumptions = get_assumptions()
     analytics_snapshot = _calculate_deal_analytics(deal, assumptions)
-    deal.snapshot_of_analytics_result = analytics_snapshot
-    deal.snapshot_of_assumptions = assumptions.model_dump()
+    store_snapshot(deal, analytics_snapshot, assumptions)
 
     db.commit()
     db.refresh(deal)
     return DealResponse.model_validate(deal)
 
 
+@router.get("/{deal_id}/projection", response_model=DealProjectionResponse)
+def get_deal_projection(
+    deal_id: int,
+    years: int = Query(10, ge=1, le=MAX_PROJECTION_YEARS),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+) -> DealProjectionResponse:
+    """Project rent, expenses, NOI, debt service, loan balance, value and equity by year."""
+    deal = _get_deal_for_user(db, deal_id, current_user)
+    assumptions = _deal_assumptions(deal)
+
+    projection = project_deals(deal_columns([deal]), years, assumptions)
+    return DealProjectionResponse(
+        deal_id=deal.id,
+        rent_growth_percent_annual=assumptions.rent_growth_percent_annual,
+        appreciation_percent_annual=assumptions.appreciation_percent_annual,
+        expense_growth_percent_annual=assumptions.expense_growth_percent_annual,
+        **{name: series[0].tolist() for name, series in projection.items()},
+    )
+
+
+@router.get("/{deal_id}/amortization", response_model=DealAmortizationResponse)
+def get_deal_amortization(
+    deal_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+) -> DealAmortizationResponse:
+    """Return the full monthly principal/interest schedule for the deal's loan."""
+    deal = _get_deal_for_user(db, deal_id, current_user)
+
+    loan_amount = max(deal.purchase_price - deal.down_payment, 0.0)
+    schedule = amortization_schedule(loan_amount, deal.interest_rate, deal.loan_term_years)
+    return DealAmortizationResponse(
+        deal_id=deal.id,
+        loan_amount=loan_amount,
+        interest_rate=deal.interest_rate,
+        loan_term_years=deal.loan_term_years,
+        monthly_payment=schedule["payment"][0] if len(schedule["payment"]) else 0.0,
+        total_interest=schedule["cumulative_interest"][-1] if len(schedule["cumulative_interest"]) else 0.0,
+        **{name: series.tolist() for name, series in schedule.items()},
+    )
+
+
+@router.post("/{deal_id}/simulate", response_model=DealSimulationResponse)
+def simulate_deal_outcomes(
+    deal_id: int,
+    simulation: DealSimulationRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+) -> DealSimulationResponse:
+    """Monte Carlo simulation of cash flow, IRR and DSCR risk for a deal."""
+    deal = _get_deal_for_user(db, deal_id, current_user)
+
+    distributions = simulation.model_dump(exclude={"paths", "seed"}, exclude_none=True)
+    try:
+        result = simulate_deal(
+            {name: values[0] for name, values in deal_columns([deal]).items()},
+            _deal_assumptions(deal),
+            distributions,
+            paths=simulation.paths,
+            seed=simulation.seed,
+            max_workers=settings.SIMULATION_MAX_WORKERS,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+
+    return DealSimulationResponse(deal_id=deal.id, **result)
+
+
 @router.delete("/{deal_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_deal(
     deal_id: int,
@@ -291,62 +421,29 @@ def delete_deal(
 
     db.delete(deal)
     db.commit()
+    rent_index.discard(deal_id)
+    comps_index.discard(deal_id)
 
 
-@router.get("/{deal_id}/comps", response_model=List[DealResponse])
+@router.get("/{deal_id}/comps", response_model=List[DealCompResponse])
 def get_deal_comps(
     deal_id: int,
     limit: int = Query(5, ge=1, le=20),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
-) -> List[DealResponse]:
-    """Get comparable deals based on property criteria."""
-    # 1. Fetch the source deal
-    deal = db.query(Deal).filter(Deal.id == deal_id).first()
-    if not deal:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Deal not found",
-        )
-
-    # Check ownership/access
-    if current_user.role != UserRole.ADMIN and deal.user_id != current_user.id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not enough permissions",
-        )
-
-    # 2. Define base query for potential comps
-    # Restrict to user's own deals unless admin (simplifying assumption for this MVP)
-    query = db.query(Deal).filter(Deal.id != deal_id)
-    if current_user.role != UserRole.ADMIN:
-        query = query.filter(Deal.user_id == current_user.id)
-
-    # 3. Apply comparison logic
-    # If deal has a property, try to match on property characteristics
-    if deal.property_id:
-        # Join with Property to access its fields
-        target_property = db.query(Property).filter(Property.id == deal.property_id).first()
-        
-        if target_property:
-            # We want deals that refer to properties of the same type or same city
-            # Explicitly join Deal -> Property using the relationship
-            query = query.join(Property, Deal.property_id == Property.id).filter(
-                (Property.property_type == target_property.property_type) |
-                (Property.city == target_property.city) |
-                (Property.zip_code == target_property.zip_code)
-            )
-        else:
-            # Orphaned property_id: property doesn't exist, fall back to price proximity
-            min_price = deal.purchase_price * 0.8
-            max_price = deal.purchase_price * 1.2
-            query = query.filter(Deal.purchase_price >= min_price, Deal.purchase_price <= max_price)
-    else:
-        # Fallback: price proximity (+/- 20%)
-        min_price = deal.purchase_price * 0.8
-        max_price = deal.purchase_price * 1.2
-        query = query.filter(Deal.purchase_price >= min_price, Deal.purchase_price <= max_price)
-
-    # 4. Execute and return
-    comps = query.limit(limit).all()
-    return [DealResponse.model_validate(comp) for comp in comps]
+) -> List[DealCompResponse]:
+    """Get the most similar deals, ranked by weighted distance over price, size, location and rent."""
+    deal = _get_deal_for_user(db, deal_id, current_user)
+
+    # Comps come from the deal owner's portfolio; pick up writes made by other workers first.
+    sync_comps(db, deal.user_id)
+    ranked = comps_index.query(deal_id, limit)
+    comps = db.query(Deal).filter(Deal.id.in_([comp.deal_id for comp in ranked]), Deal.user_id == deal.user_id)
+    found = {comp.id: comp for comp in comps.all()}
+    ranked = [comp for comp in ranked if comp.deal_id in found]
+
+    responses = _fresh_responses(db, [found[comp.deal_id] for comp in ranked])
+    return [
+        DealCompResponse(**response.model_dump(), similarity=comp.similarity, distance=comp.distance)
+        for response, comp in zip(responses, ranked)
+    ]
@@ -0,0 +1,51 @@
+"""Background job status routes."""
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.dependencies import get_current_active_user
+from app.core.import_jobs import IMPORT_JOB_KIND, submit_import_job
+from app.db.base import SessionLocal, get_db
+from app.models.job import Job, JobStatus
+from app.models.user import User, UserRole
+from app.schemas.job import JobResponse
+
+router = APIRouter(prefix="/api/v1/jobs", tags=["jobs"])
+
+
+def _get_own_job(db: Session, job_id: int, current_user: User) -> Job:
+    job = db.query(Job).filter(Job.id == job_id).first()
+    # Other users' jobs are reported as missing rather than forbidden.
+    if not job or (current_user.role != UserRole.ADMIN and job.user_id != current_user.id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    return job
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+def get_job(
+    job_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+) -> JobResponse:
+    """Get a job's status, rows processed, errors and throughput."""
+    return JobResponse.model_validate(_get_own_job(db, job_id, current_user))
+
+
+@router.post("/{job_id}/resume", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+def resume_job(
+    job_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+) -> JobResponse:
+    """Resume a failed import job after its last committed chunk."""
+    job = _get_own_job(db, job_id, current_user)
+    if job.kind != IMPORT_JOB_KIND or job.status != JobStatus.FAILED:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Only failed import jobs can be resumed",
+        )
+
+    submit_import_job(job.id, SessionLocal, settings.IMPORT_MAX_WORKERS, settings.SIMULATION_MAX_WORKERS)
+    return JobResponse.model_validate(job)
@@ -1,11 +1,12 @@
 """Lead management routes."""
 from __future__ import annotations
 
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
 
+from app.api.pagination import paginate, set_next_cursor
 from app.core.dependencies import get_current_active_user, require_admin
 from app.db.base import get_db
 from app.models.lead import Lead, LeadActivity, LeadStatus
@@ -20,11 +21,16 @@ from app.schemas.lead import (
 
 router = APIRouter(prefix="/api/v1/leads", tags=["leads"])
 
+LEAD_SORTS = {"id": Lead.id, "created_at": Lead.created_at}
+
 
 @router.get("", response_model=List[LeadResponse])
 def list_leads(
-    skip: int = Query(0, ge=0),
+    response: Response,
+    skip: int = Query(0, ge=0, deprecated=True),
     limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = None,
+    sort: str = Query("id", description="id or created_at; prefix with - for descending"),
     status_filter: List[LeadStatus] = Query(None, alias="status"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
@@ -38,7 +44,10 @@ def list_leads(
     if status_filter:
         query = query.filter(Lead.status.in_(status_filter))
         
-    leads = query.offset(skip).limit(limit).all()
+    leads, next_cursor = paginate(
+        query, sort=sort, columns=LEAD_SORTS, id_column=Lead.id, limit=limit, cursor=cursor, skip=skip
+    )
+    set_next_cursor(response, next_cursor)
     return [LeadResponse.model_validate(lead) for lead in leads]
 
 
@@ -0,0 +1,119 @@
+"""Portfolio rollup routes."""
+from __future__ import annotations
+
+from typing import List
+
+from fastapi import APIRouter, Depends
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.dependencies import get_current_active_user
+from app.db.base import get_db
+from app.models.deal import Deal
+from app.models.property import Property
+from app.models.user import User
+from app.schemas.portfolio import PortfolioGroup, PortfolioSummary
+
+router = APIRouter(prefix="/api/v1/portfolio", tags=["portfolio"])
+
+UNASSIGNED_PROPERTY_TYPE = "unassigned"
+
+
+def _group_columns():
+    return (
+        func.count(Deal.id),
+        func.coalesce(func.sum(Deal.purchase_price), 0.0),
+        func.coalesce(func.sum(Deal.monthly_cash_flow), 0.0),
+        func.coalesce(func.sum(Deal.noi_annual), 0.0),
+    )
+
+
+def _groups(rows) -> List[PortfolioGroup]:
+    return [
+        PortfolioGroup(
+            key=getattr(key, "value", key) or UNASSIGNED_PROPERTY_TYPE,
+            deal_count=count,
+            total_purchase_price=price,
+            total_monthly_cash_flow=cash_flow,
+            total_noi_annual=noi,
+        )
+        for key, count, price, cash_flow, noi in rows
+    ]
+
+
+@router.get("/summary", response_model=PortfolioSummary)
+def get_portfolio_summary(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+) -> PortfolioSummary:
+    """Totals, weighted averages and stage/property-type splits for the current user's deals.
+
+    Computed with SQL aggregates over the denormalized metric columns, so the
+    response size and cost do not depend on the number of deals returned.
+    Deals without stored metrics count towards totals of their inputs only.
+    """
+    has_metrics = Deal.monthly_cash_flow.isnot(None)
+    (
+        deal_count,
+        deals_with_metrics,
+        total_purchase_price,
+        total_down_payment,
+        total_monthly_rent,
+        total_monthly_cash_flow,
+        total_noi_annual,
+        metric_purchase_price,
+        metric_down_payment,
+        average_cap_rate,
+        average_score,
+    ) = (
+        db.query(
+            func.count(Deal.id),
+            func.count(Deal.monthly_cash_flow),
+            func.coalesce(func.sum(Deal.purchase_price), 0.0),
+            func.coalesce(func.sum(Deal.down_payment), 0.0),
+            func.coalesce(func.sum(Deal.monthly_rent), 0.0),
+            func.coalesce(func.sum(Deal.monthly_cash_flow), 0.0),
+            func.coalesce(func.sum(Deal.noi_annual), 0.0),
+            func.sum(Deal.purchase_price).filter(has_metrics),
+            func.sum(Deal.down_payment).filter(has_metrics),
+            func.avg(Deal.noi_annual * 100.0 / Deal.purchase_price),
+            func.avg(Deal.overall_score),
+        )
+        .filter(Deal.user_id == current_user.id)
+        .one()
+    )
+
+    by_stage = (
+        db.query(Deal.stage, *_group_columns())
+        .filter(Deal.user_id == current_user.id)
+        .group_by(Deal.stage)
+        .order_by(Deal.stage)
+        .all()
+    )
+    by_property_type = (
+        db.query(Property.property_type, *_group_columns())
+        .select_from(Deal)
+        .outerjoin(Property, Deal.property_id == Property.id)
+        .filter(Deal.user_id == current_user.id)
+        .group_by(Property.property_type)
+        .order_by(Property.property_type)
+        .all()
+    )
+
+    return PortfolioSummary(
+        deal_count=deal_count,
+        deals_with_metrics=deals_with_metrics,
+        total_purchase_price=total_purchase_price,
+        total_down_payment=total_down_payment,
+        total_monthly_rent=total_monthly_rent,
+        total_monthly_cash_flow=total_monthly_cash_flow,
+        total_noi_annual=total_noi_annual,
+        average_cap_rate=average_cap_rate,
+        weighted_cap_rate=total_noi_annual * 100 / metric_purchase_price if metric_purchase_price else None,
+        weighted_cash_on_cash_return=(
+            total_monthly_cash_flow * 12 * 100 / metric_down_payment if metric_down_payment else None
+        ),
+        average_score=average_score,
+        by_stage=_groups(by_stage),
+        by_property_type=_groups(by_property_type),
+    )
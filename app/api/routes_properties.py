@@ -3,20 +3,42 @@ from __future__ import annotations
 
 import os
 import shutil
-import csv
-import io
-import math
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from pathlib import Path
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, Path as PathParam, Query, Request, Response, status, UploadFile, File
 from fastapi.responses import StreamingResponse
+from sqlalchemy import Float, func, literal_column, select
 from sqlalchemy.orm import Session
 
+from app.api import streaming
+from app.api.pagination import (
+    TOTAL_COUNT_HEADER,
+    paginate,
+    paginate_positions,
+    resolve_sort,
+    set_next_cursor,
+    set_total_count,
+)
+from app.core import geo_search, import_jobs, property_import
+from app.core.address import address_key
+from app.core.autocomplete import (
+    AUTOCOMPLETE_FIELDS,
+    autocomplete_index,
+    observe_property as observe_autocomplete,
+    sync_owner as sync_autocomplete,
+)
+from app.core.config import settings
+from app.core.geo import WORLD, BoundingBox, bounding_box, geohash_precision_for_zoom, intersect
 from app.core.dependencies import get_current_active_user, require_admin
-from app.db.base import get_db
-from app.models.property import Property, PropertyImage, PropertyStatus, PropertyType
+from app.core.comps import comps_index, observe_deal as observe_comps
+from app.core.map_index import map_index, observe_property, sync_owner as sync_map
+from app.core.map_tiles import MAP_TILE_CONFIG, get_tile
+from app.core.rent_index import observe_deal, rent_index
+from app.db.base import SessionLocal, get_db
+from app.models.property import Property, PropertyImage, PropertyStatus, PropertyTag, PropertyType, normalize_tags
 from app.models.user import User, UserRole
+from app.schemas.job import JobResponse
 from app.schemas.property import (
     PropertyCreate,
     PropertyResponse,
@@ -25,30 +47,30 @@ from app.schemas.property import (
     PropertyComparisonItem,
     PropertyComparisonMetrics,
     PropertyComparisonSummary,
+    PropertyMapCluster,
     PropertyMapResponse,
     PropertyMapPoint,
     PropertyImportResult,
+    PropertyAutocompleteResponse,
 )
 
 router = APIRouter(prefix="/api/v1/properties", tags=["properties"])
 
+PROPERTY_SORTS = {"id": Property.id, "created_at": Property.created_at}
+
+# Distance from the requested point, computed per search rather than stored.
+DISTANCE_SORT = literal_column("distance", Float())
+GEO_PROPERTY_SORTS = {**PROPERTY_SORTS, "distance": DISTANCE_SORT}
+
+# Rows fetched per round trip when map and export stream their results.
+STREAM_BATCH_SIZE = 500
+
 # Configure upload directory
 UPLOAD_DIR = Path("static/uploads/properties")
 UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 
 
-def _haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-    """Calculate the great-circle distance between two points on Earth in miles."""
-    radius_earth_miles = 3958.8
-    lat1_rad, lon1_rad, lat2_rad, lon2_rad = map(math.radians, [lat1, lon1, lat2, lon2])
-    dlat = lat2_rad - lat1_rad
-    dlon = lon2_rad - lon1_rad
-    a = math.sin(dlat / 2) ** 2 + math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(dlon / 2) ** 2
-    c = 2 * math.asin(math.sqrt(a))
-    return radius_earth_miles * c
-
-
-def _filter_properties(
+def _property_query(
     *,
     query,
     current_user: User,
@@ -69,11 +91,11 @@ def _filter_properties(
     min_year_built: Optional[int] = None,
     max_year_built: Optional[int] = None,
     tags: Optional[List[str]] = None,
-    latitude: Optional[float] = None,
-    longitude: Optional[float] = None,
-    radius_miles: Optional[float] = None,
-) -> List[Property]:
-    """Apply filtering options to a property query and return matching records."""
+):
+    """Apply the column and tag filters to ``query`` in SQL; nothing is loaded here.
+
+    Radius and nearest-neighbour filters are applied by ``app.core.geo_search``.
+    """
 
     if current_user.role != UserRole.ADMIN:
         query = query.filter(Property.owner_user_id == current_user.id)
@@ -111,46 +133,124 @@ def _filter_properties(
     if max_year_built is not None:
         query = query.filter(Property.year_built <= max_year_built)
 
-    filtered = query.all()
+    tag_set = normalize_tags(tags)
+    if tag_set:
+        # Properties carrying every requested tag.
+        tagged = (
+            select(PropertyTag.property_id)
+            .where(PropertyTag.tag.in_(tag_set))
+            .group_by(PropertyTag.property_id)
+            .having(func.count() == len(tag_set))
+        )
+        query = query.filter(Property.id.in_(tagged))
 
-    if tags:
-        tag_set = {t.lower() for t in tags}
-        filtered = [
-            prop for prop in filtered
-            if prop.tags and tag_set.issubset({t.lower() for t in prop.tags})
-        ]
+    return query
 
-    if radius_miles and latitude is not None and longitude is not None:
-        filtered = [
-            prop for prop in filtered
-            if prop.latitude is not None
-            and prop.longitude is not None
-            and _haversine_distance(latitude, longitude, prop.latitude, prop.longitude) <= radius_miles
-        ]
 
-    return filtered
+def _geo_page(
+    query,
+    *,
+    latitude: float,
+    longitude: float,
+    radius_miles: Optional[float],
+    nearest: Optional[int],
+    sort: str,
+    limit: int,
+    cursor: Optional[str],
+    skip: int,
+) -> Tuple[List[Property], Optional[str], int]:
+    """One page of a radius or nearest-N search, plus the next cursor and the match count."""
+
+    _, sort_column, _ = resolve_sort(sort, GEO_PROPERTY_SORTS)
+    extra_column = None if sort_column is DISTANCE_SORT or sort_column is Property.id else sort_column
+    if nearest:
+        found = geo_search.nearest_candidates(query, latitude, longitude, nearest, radius_miles, extra_column)
+    else:
+        found = geo_search.radius_candidates(query, latitude, longitude, radius_miles, extra_column)
+
+    ids = found.ids.tolist()
+    if sort_column is DISTANCE_SORT:
+        values = found.distances.tolist()
+    else:
+        values = found.sort_values or ids
+    page_ids, next_cursor = paginate_positions(
+        list(zip(values, ids)),
+        sort=sort,
+        columns=GEO_PROPERTY_SORTS,
+        id_column=Property.id,
+        limit=limit,
+        cursor=cursor,
+        skip=skip,
+    )
+    by_id = {prop.id: prop for prop in query.filter(Property.id.in_(page_ids))} if page_ids else {}
+    return [by_id[prop_id] for prop_id in page_ids], next_cursor, len(ids)
+
+
+def _parse_bbox(bbox: str) -> BoundingBox:
+    """Parse a ``min_lon,min_lat,max_lon,max_lat`` viewport."""
+
+    try:
+        min_lon, min_lat, max_lon, max_lat = (float(part) for part in bbox.split(","))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="bbox must be min_lon,min_lat,max_lon,max_lat")
+    box = BoundingBox(min_lat, min_lon, max_lat, max_lon)
+    if intersect(box, WORLD) != box:
+        raise HTTPException(status_code=400, detail="bbox must be min_lon,min_lat,max_lon,max_lat")
+    return box
+
 
 @router.post("", response_model=PropertyResponse, status_code=status.HTTP_201_CREATED)
 def create_property(
     property_data: PropertyCreate,
+    response: Response,
+    duplicate_policy: str = Query(
+        "flag",
+        pattern="^(skip|update|flag)$",
+        description="For an address you already have: skip (409), update the existing property, or flag (create it tagged duplicate)",
+    ),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ) -> PropertyResponse:
     """Create a new property."""
-    db_property = Property(
-        owner_user_id=current_user.id,
-        **property_data.model_dump(),
+    values = property_data.model_dump()
+    key = address_key(values["address_line1"], values.get("address_line2"), values["zip_code"])
+    existing = (
+        db.query(Property)
+        .filter(Property.owner_user_id == current_user.id, Property.address_key == key)
+        .order_by(Property.id)
+        .first()
     )
+    if existing is not None:
+        if duplicate_policy == "skip":
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Duplicate of property {existing.id}",
+            )
+        if duplicate_policy == "update":
+            response.status_code = status.HTTP_200_OK
+            return _apply_update(db, existing, property_data.model_dump(exclude_unset=True))
+        values["tags"] = [*(values.get("tags") or []), property_import.DUPLICATE_TAG]
+
+    db_property = Property(owner_user_id=current_user.id, **values)
     db.add(db_property)
     db.commit()
     db.refresh(db_property)
+    observe_property(db_property)
+    observe_autocomplete(db_property)
     return PropertyResponse.model_validate(db_property)
 
 
 @router.get("", response_model=List[PropertyResponse])
 def list_properties(
-    skip: int = Query(0, ge=0),
+    response: Response,
+    skip: int = Query(0, ge=0, deprecated=True),
     limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = None,
+    sort: Optional[str] = Query(
+        None,
+        description="id, created_at or distance; prefix with - for descending. "
+        "Defaults to distance for nearest-N searches and id otherwise.",
+    ),
     city: Optional[str] = None,
     state: Optional[str] = Query(None, min_length=2, max_length=2),
     zip_code: Optional[str] = None,
@@ -171,13 +271,14 @@ def list_properties(
     latitude: Optional[float] = Query(None, ge=-90, le=90),
     longitude: Optional[float] = Query(None, ge=-180, le=180),
     radius_miles: Optional[float] = Query(None, gt=0),
+    nearest: Optional[int] = Query(None, ge=1, le=1000, description="Only the N properties nearest to latitude/longitude"),
+    include_total: bool = Query(False, description="Return the number of matches in X-Total-Count"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ) -> List[PropertyResponse]:
     """List properties for current user (or all if admin) with advanced filtering."""
-    query = db.query(Property)
-    filtered = _filter_properties(
-        query=query,
+    query = _property_query(
+        query=db.query(Property),
         current_user=current_user,
         owner_user_id=owner_user_id,
         city=city,
@@ -196,13 +297,35 @@ def list_properties(
         min_year_built=min_year_built,
         max_year_built=max_year_built,
         tags=tags,
-        latitude=latitude,
-        longitude=longitude,
-        radius_miles=radius_miles,
     )
-
-    paginated = filtered[skip: skip + limit]
-    return [PropertyResponse.model_validate(prop) for prop in paginated]
+    sort = sort or ("distance" if nearest else "id")
+    has_point = latitude is not None and longitude is not None
+    if (nearest or sort.lstrip("-") == "distance") and not has_point:
+        # ``status`` is the status filter here, not fastapi.status.
+        raise HTTPException(status_code=400, detail="Distance search requires latitude and longitude")
+
+    if has_point and (radius_miles or nearest or sort.lstrip("-") == "distance"):
+        properties, next_cursor, total = _geo_page(
+            query,
+            latitude=latitude,
+            longitude=longitude,
+            radius_miles=radius_miles,
+            nearest=nearest,
+            sort=sort,
+            limit=limit,
+            cursor=cursor,
+            skip=skip,
+        )
+        if include_total:
+            response.headers[TOTAL_COUNT_HEADER] = str(total)
+    else:
+        properties, next_cursor = paginate(
+            query, sort=sort, columns=PROPERTY_SORTS, id_column=Property.id, limit=limit, cursor=cursor, skip=skip
+        )
+        if include_total:
+            set_total_count(response, query, Property.id)
+    set_next_cursor(response, next_cursor)
+    return [PropertyResponse.model_validate(prop) for prop in properties]
 
 
 @router.get("/compare", response_model=PropertyComparisonResponse)
@@ -295,12 +418,21 @@ def map_properties(
     latitude: Optional[float] = Query(None, ge=-90, le=90),
     longitude: Optional[float] = Query(None, ge=-180, le=180),
     radius_miles: Optional[float] = Query(None, gt=0),
+    zoom: Optional[int] = Query(None, ge=0, le=22, description="Map zoom; below the points zoom, clusters are returned"),
+    bbox: Optional[str] = Query(None, description="Viewport as min_lon,min_lat,max_lon,max_lat"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ) -> PropertyMapResponse:
-    """Interactive map-friendly representation of properties."""
+    """Interactive map-friendly representation of properties.
 
-    filtered = _filter_properties(
+    Without ``zoom`` every matching property is returned as a point. With
+    ``zoom`` below ``full_points_zoom``, properties in the viewport are
+    grouped into grid clusters instead. Points honour ``radius_miles``
+    exactly, while clusters are approximate: they cover the radius' bounding
+    box, so they may include properties up to its corners.
+    """
+
+    query = _property_query(
         query=db.query(Property),
         current_user=current_user,
         owner_user_id=owner_user_id,
@@ -310,10 +442,47 @@ def map_properties(
         property_type=property_type,
         status=status,
         tags=tags,
-        latitude=latitude,
-        longitude=longitude,
-        radius_miles=radius_miles,
     )
+    use_radius = bool(radius_miles) and latitude is not None and longitude is not None
+    box = _parse_bbox(bbox) if bbox else None
+
+    if zoom is not None and zoom < geo_search.GEO_SEARCH_CONFIG["full_points_zoom"]:
+        # Clusters cover the viewport, narrowed to the radius' bounding box (not the circle).
+        box = box or WORLD
+        if use_radius:
+            box = intersect(box, bounding_box(latitude, longitude, radius_miles))
+        precision = geohash_precision_for_zoom(zoom)
+        # A single owner's unfiltered map is served from the in-memory index;
+        # attribute filters and cross-owner admin views group in SQL.
+        owner = current_user.id if current_user.role != UserRole.ADMIN else owner_user_id
+        has_filters = any(value for value in (city, state, zip_code, property_type, status, tags))
+        if not box:
+            cells = []
+        elif owner and not has_filters:
+            sync_map(db, owner)
+            cells = map_index.clusters(owner, box, precision)
+        else:
+            cells = geo_search.cluster_cells(query, box, precision)
+        clusters = [
+            PropertyMapCluster(
+                cell=cell.cell,
+                latitude=cell.latitude,
+                longitude=cell.longitude,
+                count=cell.count,
+                heat_value=cell.list_price_avg,
+                heat_min=cell.list_price_min,
+                heat_max=cell.list_price_max,
+            )
+            for cell in cells
+        ]
+        return PropertyMapResponse(points=[], clusters=clusters, zoom=zoom)
+
+    if box:
+        query = geo_search.box_filter(query, box)
+    if use_radius:
+        filtered = geo_search.stream_within_radius(query, latitude, longitude, radius_miles, STREAM_BATCH_SIZE)
+    else:
+        filtered = query.yield_per(STREAM_BATCH_SIZE)
 
     points = [
         PropertyMapPoint(
@@ -335,7 +504,169 @@ def map_properties(
         for prop in filtered
     ]
 
-    return PropertyMapResponse(points=points)
+    return PropertyMapResponse(points=points, zoom=zoom)
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {candidate.strip() for candidate in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+@router.get("/map/tiles/{z}/{x}/{y}")
+def map_tile(
+    request: Request,
+    z: int = PathParam(..., ge=0, le=MAP_TILE_CONFIG["max_zoom"]),
+    x: int = PathParam(..., ge=0),
+    y: int = PathParam(..., ge=0),
+    owner_user_id: Optional[int] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+) -> Response:
+    """One slippy-map tile of properties as columnar JSON.
+
+    Below ``full_points_zoom`` the tile holds clusters, otherwise bare points.
+    Tiles carry a strong ETag; send it back as ``If-None-Match`` to get a 304
+    while nothing in the tile has changed.
+    """
+
+    if x >= 2 ** z or y >= 2 ** z:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Tile not found")
+    if current_user.role != UserRole.ADMIN:
+        owner = current_user.id
+    elif owner_user_id:
+        owner = owner_user_id
+    else:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="owner_user_id is required for admin tiles")
+
+    sync_map(db, owner)
+    etag, body = get_tile(owner, z, x, y)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@router.get("/autocomplete", response_model=PropertyAutocompleteResponse)
+def autocomplete_properties(
+    prefix: str = Query(..., min_length=1, max_length=100),
+    fields: Optional[List[str]] = Query(None, description="cities, zip_codes and/or addresses (default: all)"),
+    limit: int = Query(10, ge=1, le=50, description="Suggestions per field"),
+    owner_user_id: Optional[int] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+) -> PropertyAutocompleteResponse:
+    """Suggest cities, zip codes and address lines starting with ``prefix``.
+
+    Served from an in-memory index kept current on this worker's property
+    writes, and resynced with other workers' writes within a few seconds,
+    so it is cheap enough to call on each keystroke. Address lines also
+    match from the street name. Admins may complete another owner's properties.
+    """
+
+    unknown = set(fields or ()) - set(AUTOCOMPLETE_FIELDS)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown autocomplete fields: {sorted(unknown)}")
+    owner = owner_user_id if current_user.role == UserRole.ADMIN and owner_user_id else current_user.id
+    sync_autocomplete(db, owner)
+    suggestions = autocomplete_index.complete(owner, prefix, limit, fields or AUTOCOMPLETE_FIELDS)
+    return PropertyAutocompleteResponse(prefix=prefix, **suggestions)
+
+
+EXPORT_FIELDS = (
+    "id",
+    "address_line1",
+    "address_line2",
+    "city",
+    "state",
+    "zip_code",
+    "country",
+    "property_type",
+    "status",
+    "bedrooms",
+    "bathrooms",
+    "square_feet",
+    "year_built",
+    "list_price",
+    "tags",
+    "latitude",
+    "longitude",
+)
+_EXPORT_TAGS = EXPORT_FIELDS.index("tags")
+
+EXPORT_FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "excel": ("application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", "xlsx"),
+}
+
+
+def _export_rows(rows, *, join_tags: bool):
+    """Plain values for export: enum values, and tags joined with ``|`` for tabular formats."""
+
+    for row in rows:
+        values = [getattr(value, "value", value) for value in row]
+        if join_tags:
+            values[_EXPORT_TAGS] = "|".join(values[_EXPORT_TAGS] or [])
+        yield values
+
+
+@router.get("/export")
+def export_properties(
+    format: str = Query("csv", pattern="^(csv|ndjson|excel)$"),
+    compress: bool = Query(False, description="Gzip the csv or ndjson body"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+    city: Optional[str] = None,
+    state: Optional[str] = Query(None, min_length=2, max_length=2),
+    zip_code: Optional[str] = None,
+    property_type: Optional[PropertyType] = None,
+    status: Optional[List[PropertyStatus]] = Query(None),
+    owner_user_id: Optional[int] = None,
+) -> StreamingResponse:
+    """Export filtered properties to CSV, NDJSON or Excel for reporting.
+
+    Rows are streamed from the database in batches, so memory stays flat
+    however many properties are exported.
+    """
+
+    if compress and format == "excel":
+        raise HTTPException(status_code=400, detail="Excel exports are already compressed")
+
+    rows = (
+        _property_query(
+            query=db.query(*(getattr(Property, field) for field in EXPORT_FIELDS)),
+            current_user=current_user,
+            owner_user_id=owner_user_id,
+            city=city,
+            state=state,
+            zip_code=zip_code,
+            property_type=property_type,
+            status=status,
+        )
+        .order_by(Property.id)
+        .yield_per(STREAM_BATCH_SIZE)
+    )
+
+    media_type, extension = EXPORT_FORMATS[format]
+    if format == "excel":
+        body = streaming.file_chunks(
+            streaming.xlsx_file(EXPORT_FIELDS, _export_rows(rows, join_tags=True), title="Properties")
+        )
+    elif format == "ndjson":
+        body = streaming.ndjson_chunks(EXPORT_FIELDS, _export_rows(rows, join_tags=False))
+    else:
+        body = streaming.csv_chunks(EXPORT_FIELDS, _export_rows(rows, join_tags=True))
+
+    filename = f"properties.{extension}"
+    if compress:
+        body, media_type, filename = streaming.gzip_chunks(body), "application/gzip", f"{filename}.gz"
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename={filename}"},
+    )
 
 
 @router.get("/{property_id}", response_model=PropertyResponse)
@@ -384,13 +715,24 @@ def update_property(
             detail="Not enough permissions",
         )
 
-    # Update fields
-    update_data = property_data.model_dump(exclude_unset=True)
+    return _apply_update(db, property_obj, property_data.model_dump(exclude_unset=True))
+
+
+def _apply_update(db: Session, property_obj: Property, update_data: dict) -> PropertyResponse:
+    """Write ``update_data`` to a property and re-index it (and its deals where affected)."""
     for field, value in update_data.items():
         setattr(property_obj, field, value)
 
     db.commit()
     db.refresh(property_obj)
+    observe_property(property_obj)
+    observe_autocomplete(property_obj)
+    if {"zip_code", "property_type", "square_feet"} & update_data.keys():
+        for deal in property_obj.deals:
+            observe_deal(deal)
+    if {"square_feet", "bedrooms", "bathrooms", "year_built", "latitude", "longitude"} & update_data.keys():
+        for deal in property_obj.deals:
+            observe_comps(deal)
     return PropertyResponse.model_validate(property_obj)
 
 
@@ -415,192 +757,87 @@ def delete_property(
             detail="Not enough permissions",
         )
 
+    deal_ids = [deal.id for deal in property_obj.deals]
     db.delete(property_obj)
     db.commit()
+    map_index.discard(property_id)
+    autocomplete_index.discard(property_id)
+    for deal_id in deal_ids:
+        rent_index.discard(deal_id)
+        comps_index.discard(deal_id)
 
 
 @router.post("/import", response_model=PropertyImportResult)
 def import_properties(
     file: UploadFile = File(...),
+    duplicate_policy: str = Query("skip", pattern="^(skip|update|flag)$"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ) -> PropertyImportResult:
-    """Bulk import properties via CSV or Excel."""
+    """Bulk import properties via CSV or Excel.
 
-    filename = file.filename or ""
-    content = file.file.read()
+    The upload is read and inserted in chunks of ``IMPORT_CHUNK_SIZE`` rows,
+    each committed on its own, so memory stays bounded for large files.
+    Rows repeating an address the owner already has are skipped, update the
+    existing property or are imported tagged ``duplicate``, per ``duplicate_policy``.
+    """
 
-    if filename.lower().endswith(".csv"):
-        text = content.decode("utf-8")
-        reader = csv.DictReader(io.StringIO(text))
-        rows = list(reader)
-    elif filename.lower().endswith((".xlsx", ".xls")):
-        from openpyxl import load_workbook
-
-        workbook = load_workbook(io.BytesIO(content))
-        sheet = workbook.active
-        headers = [cell.value for cell in next(sheet.iter_rows(min_row=1, max_row=1))]
-        rows = [dict(zip(headers, [cell.value for cell in row])) for row in sheet.iter_rows(min_row=2)]
-    else:
+    try:
+        rows = property_import.upload_rows(file.filename or "", file.file)
+    except property_import.UploadError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    if rows is None:
         raise HTTPException(status_code=400, detail="Unsupported file format. Use CSV or Excel.")
 
-    required_fields = {"address_line1", "city", "state", "zip_code", "property_type", "bedrooms", "bathrooms", "square_feet"}
     created_ids: List[int] = []
+    updated_ids: List[int] = []
     errors: List[str] = []
-
-    for idx, row in enumerate(rows, start=1):
-        missing = required_fields - {k for k, v in row.items() if v not in (None, "")}
-        if missing:
-            errors.append(f"Row {idx}: missing fields {sorted(missing)}")
-            continue
-
-        try:
-            prop = Property(
-                owner_user_id=current_user.id,
-                address_line1=str(row.get("address_line1")),
-                address_line2=row.get("address_line2"),
-                city=str(row.get("city")),
-                state=str(row.get("state")),
-                zip_code=str(row.get("zip_code")),
-                country=row.get("country") or "USA",
-                property_type=PropertyType(str(row.get("property_type")).lower()),
-                status=PropertyStatus(str(row.get("status", PropertyStatus.EVALUATING.value)).lower()),
-                bedrooms=int(row.get("bedrooms")),
-                bathrooms=float(row.get("bathrooms")),
-                square_feet=int(row.get("square_feet")),
-                year_built=int(row.get("year_built")) if row.get("year_built") else None,
-                list_price=float(row.get("list_price")) if row.get("list_price") else None,
-                tags=row.get("tags").split("|") if row.get("tags") else None,
-                latitude=float(row.get("latitude")) if row.get("latitude") else None,
-                longitude=float(row.get("longitude")) if row.get("longitude") else None,
-            )
-        except Exception as exc:  # noqa: BLE001
-            errors.append(f"Row {idx}: {exc}")
-            continue
-
-        db.add(prop)
-        db.flush()
-        created_ids.append(prop.id)
-
-    db.commit()
+    duplicates = 0
+    read = 0
+    for chunk, written in property_import.import_chunks(
+        db, current_user.id, rows, duplicate_policy=duplicate_policy
+    ):
+        db.commit()
+        property_import.observe_imported(db, chunk, written)
+        created_ids.extend(chunk.created_ids)
+        updated_ids.extend(chunk.updated_ids)
+        errors.extend(chunk.errors)
+        duplicates += chunk.duplicates
+        read = chunk.last_row
 
     return PropertyImportResult(
         imported=len(created_ids),
-        skipped=len(rows) - len(created_ids),
+        updated=len(updated_ids),
+        skipped=read - len(created_ids) - len(updated_ids),
+        duplicates=duplicates,
         errors=errors,
         created_ids=created_ids,
+        updated_ids=updated_ids,
     )
 
 
-@router.get("/export")
-def export_properties(
-    format: str = Query("csv", pattern="^(csv|excel)$"),
+@router.post("/import/jobs", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+def start_import_job(
+    file: UploadFile = File(...),
+    duplicate_policy: str = Query("skip", pattern="^(skip|update|flag)$"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
-    city: Optional[str] = None,
-    state: Optional[str] = Query(None, min_length=2, max_length=2),
-    zip_code: Optional[str] = None,
-    property_type: Optional[PropertyType] = None,
-    status: Optional[List[PropertyStatus]] = Query(None),
-    owner_user_id: Optional[int] = None,
-) -> StreamingResponse:
-    """Export filtered properties to CSV or Excel for reporting."""
+) -> JobResponse:
+    """Queue a CSV or Excel import as a background job; poll ``GET /api/v1/jobs/{id}`` for progress."""
 
-    filtered = _filter_properties(
-        query=db.query(Property),
-        current_user=current_user,
-        owner_user_id=owner_user_id,
-        city=city,
-        state=state,
-        zip_code=zip_code,
-        property_type=property_type,
-        status=status,
-    )
-
-    fieldnames = [
-        "id",
-        "address_line1",
-        "address_line2",
-        "city",
-        "state",
-        "zip_code",
-        "country",
-        "property_type",
-        "status",
-        "bedrooms",
-        "bathrooms",
-        "square_feet",
-        "year_built",
-        "list_price",
-        "tags",
-        "latitude",
-        "longitude",
-    ]
-
-    if format == "csv":
-        buffer = io.StringIO()
-        writer = csv.DictWriter(buffer, fieldnames=fieldnames)
-        writer.writeheader()
-        for prop in filtered:
-            writer.writerow({
-                "id": prop.id,
-                "address_line1": prop.address_line1,
-                "address_line2": prop.address_line2,
-                "city": prop.city,
-                "state": prop.state,
-                "zip_code": prop.zip_code,
-                "country": prop.country,
-                "property_type": prop.property_type.value,
-                "status": prop.status.value,
-                "bedrooms": prop.bedrooms,
-                "bathrooms": prop.bathrooms,
-                "square_feet": prop.square_feet,
-                "year_built": prop.year_built,
-                "list_price": prop.list_price,
-                "tags": "|".join(prop.tags or []),
-                "latitude": prop.latitude,
-                "longitude": prop.longitude,
-            })
-        buffer.seek(0)
-        return StreamingResponse(
-            iter([buffer.getvalue()]),
-            media_type="text/csv",
-            headers={"Content-Disposition": "attachment; filename=properties.csv"},
-        )
-
-    from openpyxl import Workbook
-
-    workbook = Workbook()
-    sheet = workbook.active
-    sheet.append(fieldnames)
-    for prop in filtered:
-        sheet.append([
-            prop.id,
-            prop.address_line1,
-            prop.address_line2,
-            prop.city,
-            prop.state,
-            prop.zip_code,
-            prop.country,
-            prop.property_type.value,
-            prop.status.value,
-            prop.bedrooms,
-            prop.bathrooms,
-            prop.square_feet,
-            prop.year_built,
-            prop.list_price,
-            "|".join(prop.tags or []),
-            prop.latitude,
-            prop.longitude,
-        ])
-    output = io.BytesIO()
-    workbook.save(output)
-    output.seek(0)
-    return StreamingResponse(
-        output,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={"Content-Disposition": "attachment; filename=properties.xlsx"},
-    )
+    filename = file.filename or ""
+    if not filename.lower().endswith((".csv", ".xlsx", ".xls")):
+        raise HTTPException(status_code=400, detail="Unsupported file format. Use CSV or Excel.")
+    if filename.lower().endswith(".csv"):
+        try:
+            property_import.check_utf8(file.file)
+        except property_import.UploadError as exc:
+            raise HTTPException(status_code=400, detail=str(exc))
+
+    path = import_jobs.save_upload(settings.IMPORT_UPLOAD_DIR, filename, file.file)
+    job = import_jobs.create_import_job(db, current_user.id, filename, path, duplicate_policy)
+    import_jobs.submit_import_job(job.id, SessionLocal, settings.IMPORT_MAX_WORKERS, settings.SIMULATION_MAX_WORKERS)
+    return JobResponse.model_validate(job)
 
 
 @router.post("/{property_id}/images", status_code=status.HTTP_201_CREATED)
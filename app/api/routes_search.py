@@ -0,0 +1,37 @@
+"""Full-text search routes."""
+from __future__ import annotations
+
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from app.core.dependencies import get_current_active_user
+from app.core.search import SEARCH_ENTITIES, search
+from app.db.base import get_db
+from app.models.user import User, UserRole
+from app.schemas.search import SearchResponse
+
+router = APIRouter(prefix="/api/v1/search", tags=["search"])
+
+
+@router.get("", response_model=SearchResponse)
+def search_all(
+    q: str = Query(..., min_length=1, max_length=200),
+    types: Optional[List[str]] = Query(None, description="properties, leads and/or deals (default: all)"),
+    limit: int = Query(10, ge=1, le=50, description="Matches per type"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+) -> SearchResponse:
+    """Search property addresses, leads and deal notes in one request.
+
+    Every word must match the start of a word in the record ("main aus"
+    finds "12 Main St, Austin"). Admins search everyone's records.
+    """
+    unknown = set(types or ()) - set(SEARCH_ENTITIES)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown search types: {sorted(unknown)}")
+
+    owner_id = None if current_user.role == UserRole.ADMIN else current_user.id
+    results = search(db, q, owner_id, types or SEARCH_ENTITIES, limit)
+    return SearchResponse(query=q, **results)
@@ -1,11 +1,12 @@
 """User management routes."""
 from __future__ import annotations
 
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, Query, Request
+from fastapi import APIRouter, Depends, Query, Request, Response
 from sqlalchemy.orm import Session
 
+from app.api.pagination import paginate, set_next_cursor
 from app.core.dependencies import get_current_active_user, require_admin
 from app.db.base import get_db
 from app.models.user import User
@@ -14,6 +15,8 @@ from app.core.audit import log_action
 
 router = APIRouter(prefix="/api/v1/users", tags=["users"])
 
+USER_SORTS = {"id": User.id, "created_at": User.created_at}
+
 
 @router.get("/me", response_model=UserResponse)
 def get_current_user_profile(
@@ -74,11 +77,17 @@ def update_current_user_profile(
 
 @router.get("", response_model=List[UserResponse])
 def list_users(
-    skip: int = Query(0, ge=0),
+    response: Response,
+    skip: int = Query(0, ge=0, deprecated=True),
     limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = None,
+    sort: str = Query("id", description="id or created_at; prefix with - for descending"),
     db: Session = Depends(get_db),
     admin_user: User = Depends(require_admin),
 ) -> List[UserResponse]:
     """List all users (admin only)."""
-    users = db.query(User).offset(skip).limit(limit).all()
+    users, next_cursor = paginate(
+        db.query(User), sort=sort, columns=USER_SORTS, id_column=User.id, limit=limit, cursor=cursor, skip=skip
+    )
+    set_next_cursor(response, next_cursor)
     return [UserResponse.model_validate(user) for user in users]
@@ -0,0 +1,54 @@
+"""Normalized address keys for duplicate detection.
+
+Two spellings of the same address ("12 North Main Street, Apt 4" and
+"12 n main st #4") map to the same key: case, punctuation and whitespace are
+dropped, street suffixes and directionals are abbreviated the USPS way, any
+unit designator becomes ``#`` and the zip is cut to its five-digit form.
+"""
+from __future__ import annotations
+
+import re
+from typing import List, Optional
+
+ABBREVIATIONS = {
+    "avenue": "ave", "av": "ave", "boulevard": "blvd", "circle": "cir", "court": "ct", "drive": "dr",
+    "expressway": "expy", "freeway": "fwy", "highway": "hwy", "lane": "ln", "parkway": "pkwy", "place": "pl",
+    "road": "rd", "square": "sq", "street": "st", "terrace": "ter", "trail": "trl", "north": "n", "south": "s",
+    "east": "e", "west": "w", "northeast": "ne", "northwest": "nw", "southeast": "se", "southwest": "sw",
+}
+
+UNIT_DESIGNATORS = frozenset({"#", "apt", "apartment", "unit", "suite", "ste", "rm", "room"})
+
+_SEPARATORS = re.compile(r"[^\w#]+|(#)")
+
+
+def _tokens(text: Optional[str]) -> List[str]:
+    return [token for token in _SEPARATORS.split((text or "").lower()) if token]
+
+
+def normalize_zip(zip_code: Optional[str]) -> str:
+    """The five-digit zip, or the trimmed value when it has no digits."""
+
+    digits = re.sub(r"\D", "", zip_code or "")
+    return digits[:5] if digits else (zip_code or "").strip().lower()
+
+
+def address_key(address_line1: Optional[str], address_line2: Optional[str], zip_code: Optional[str]) -> str:
+    """Normalized ``"<street> #<unit>|<zip>"`` key of an address."""
+
+    street: List[str] = []
+    unit: List[str] = []
+    tokens = _tokens(address_line1)
+    for position, token in enumerate(tokens):
+        if token in UNIT_DESIGNATORS:
+            # Everything after a designator ("apt 4 b", "# 4b") is the unit.
+            unit.extend(tokens[position + 1:])
+            break
+        street.append(ABBREVIATIONS.get(token, token))
+    # A second address line is always the unit, designator or not.
+    unit.extend(_tokens(address_line2))
+    unit = [token for token in unit if token not in UNIT_DESIGNATORS]
+    key = " ".join(street)
+    if unit:
+        key += " #" + "".join(unit)
+    return f"{key}|{normalize_zip(zip_code)}"
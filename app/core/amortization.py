@@ -0,0 +1,155 @@
+"""Closed-form loan amortization with cached annuity factors.
+
+Deals cluster on a few dozen (interest rate, term) combinations, so the
+payment factor and the ``(1 + r) ** k`` growth table for each combination are
+computed once and kept in bounded LRU caches. Cached tables are read-only.
+"""
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Dict, NamedTuple
+
+import numpy as np
+
+ANNUITY_FACTOR_CACHE_SIZE = 1024
+GROWTH_TABLE_CACHE_SIZE = 64
+
+
+class AnnuityFactor(NamedTuple):
+    """Loan constants for one (interest rate, term) combination."""
+
+    monthly_rate: float
+    periods: int
+    payment_factor: float  # Monthly payment per $1 borrowed
+
+
+@lru_cache(maxsize=ANNUITY_FACTOR_CACHE_SIZE)
+def annuity_factor(interest_rate: float, loan_term_years: float) -> AnnuityFactor:
+    """Return the monthly rate, number of payments and payment per $1 borrowed."""
+
+    rate = interest_rate / 100 / 12
+    periods = int(round(loan_term_years * 12))
+    if periods <= 0:
+        return AnnuityFactor(rate, 0, 0.0)
+    if rate == 0:
+        return AnnuityFactor(rate, periods, 1 / periods)
+    growth = (1 + rate) ** periods
+    return AnnuityFactor(rate, periods, rate * growth / (growth - 1))
+
+
+@lru_cache(maxsize=GROWTH_TABLE_CACHE_SIZE)
+def growth_table(interest_rate: float, loan_term_years: float) -> np.ndarray:
+    """Return the read-only table ``(1 + r) ** k`` for ``k = 0..periods``."""
+
+    factor = annuity_factor(interest_rate, loan_term_years)
+    table = (1 + factor.monthly_rate) ** np.arange(factor.periods + 1, dtype=np.float64)
+    table.setflags(write=False)
+    return table
+
+
+def monthly_payment(loan_amount: float, interest_rate: float, loan_term_years: float) -> float:
+    """Level monthly payment for a fully amortizing loan (0 when there is no loan)."""
+
+    factor = annuity_factor(interest_rate, loan_term_years)
+    if loan_amount <= 0 or factor.periods <= 0:
+        return 0.0
+    return loan_amount * factor.payment_factor
+
+
+def payment_factors(interest_rate: np.ndarray, loan_term_years: np.ndarray) -> np.ndarray:
+    """Vectorized payment-per-dollar lookup.
+
+    Goes through the cache once per unique (rate, term) combination; when a
+    batch has more unique combinations than the cache holds, the factors are
+    computed directly instead of thrashing the cache.
+    """
+
+    keys = np.asarray(interest_rate, dtype=np.float64) + 1j * np.asarray(loan_term_years, dtype=np.float64)
+    unique_keys, inverse = np.unique(keys, return_inverse=True)
+    if unique_keys.shape[0] <= ANNUITY_FACTOR_CACHE_SIZE:
+        factors = np.array(
+            [annuity_factor(key.real, key.imag).payment_factor for key in unique_keys.tolist()], dtype=np.float64
+        )
+        return factors[inverse.reshape(-1)]
+
+    rate = keys.real / 100 / 12
+    periods = np.round(keys.imag * 12)
+    growth = (1 + rate) ** periods
+    with np.errstate(divide="ignore", invalid="ignore"):
+        factors = np.where(rate == 0, 1 / periods, rate * growth / (growth - 1))
+    return np.where(periods <= 0, 0.0, factors)
+
+
+def monthly_payment_batch(loan_amount: np.ndarray, interest_rate: np.ndarray, loan_term_years: np.ndarray) -> np.ndarray:
+    """Vectorized ``monthly_payment``."""
+
+    loan_amount = np.asarray(loan_amount, dtype=np.float64)
+    payment = loan_amount * payment_factors(interest_rate, loan_term_years)
+    return np.where(loan_amount <= 0, 0.0, payment)
+
+
+def remaining_balance_batch(
+    loan_amount: np.ndarray,
+    interest_rate: np.ndarray,
+    loan_term_years: np.ndarray,
+    months_paid: np.ndarray,
+) -> np.ndarray:
+    """Closed-form balance after ``months_paid`` payments; broadcasts over trailing axes.
+
+    ``loan_amount``, ``interest_rate`` and ``loan_term_years`` are per-loan
+    vectors; ``months_paid`` may be a vector or a ``(loans, k)`` matrix.
+    """
+
+    loan_amount = np.maximum(np.asarray(loan_amount, dtype=np.float64), 0.0)
+    interest_rate = np.asarray(interest_rate, dtype=np.float64)
+    periods = np.round(np.asarray(loan_term_years, dtype=np.float64) * 12)
+    months_paid = np.asarray(months_paid, dtype=np.float64)
+
+    def per_loan(values: np.ndarray) -> np.ndarray:
+        return values.reshape(values.shape + (1,) * (months_paid.ndim - 1))
+
+    payment = per_loan(monthly_payment_batch(loan_amount, interest_rate, loan_term_years))
+    rate = per_loan(interest_rate / 100 / 12)
+    principal = per_loan(loan_amount)
+    months = np.minimum(months_paid, per_loan(periods))
+
+    growth = (1 + rate) ** months
+    with np.errstate(divide="ignore", invalid="ignore"):
+        amortized = principal * growth - payment * (growth - 1) / rate
+    balance = np.where(rate == 0, principal - payment * months, amortized)
+    balance = np.where(months >= per_loan(periods), 0.0, balance)
+    return np.clip(balance, 0.0, None)
+
+
+def amortization_schedule(loan_amount: float, interest_rate: float, loan_term_years: float) -> Dict[str, np.ndarray]:
+    """Full month-by-month schedule computed in closed form from the cached growth table.
+
+    Each series has one entry per payment; ``balance`` is the balance after
+    that payment.
+    """
+
+    factor = annuity_factor(interest_rate, loan_term_years)
+    periods = factor.periods if loan_amount > 0 else 0
+    payment = monthly_payment(loan_amount, interest_rate, loan_term_years)
+    rate = factor.monthly_rate
+
+    if periods == 0:
+        balances = np.zeros(1)
+    elif rate == 0:
+        balances = loan_amount - payment * np.arange(periods + 1, dtype=np.float64)
+    else:
+        growth = growth_table(interest_rate, loan_term_years)
+        balances = loan_amount * growth - payment * (growth - 1) / rate
+    balances = np.clip(balances, 0.0, None)
+    balances[-1] = 0.0
+
+    interest = balances[:-1] * rate
+    principal = payment - interest
+    return {
+        "month": np.arange(1, periods + 1),
+        "payment": np.full(periods, payment),
+        "principal": principal,
+        "interest": interest,
+        "balance": balances[1:],
+        "cumulative_interest": np.cumsum(interest),
+    }
@@ -1,9 +1,15 @@
 """Pure calculation helpers for the analytics engine."""
 from __future__ import annotations
 
-from typing import Dict, Optional, Tuple
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
 
+import numpy as np
+
+from app.core.amortization import monthly_payment
 from app.core.assumptions import Assumptions
+from app.core.batch import DEAL_INPUT_COLUMNS
+from app.core.cache import memoized
+from app.core.projection import project_deals
 
 
 RENT_CONFIG = {
@@ -16,8 +22,22 @@ RENT_CONFIG = {
         "condo": 0.9,
         "townhouse": 0.97,
     },
+    # Zip-code index blending: no weight below the minimum sample count, full
+    # weight once a bucket reaches ``zip_full_weight_samples``.
+    "zip_min_samples": 5,
+    "zip_full_weight_samples": 30,
+}
+
+IRR_SOLVER_CONFIG = {
+    "initial_guess": 0.1,
+    "tolerance": 1e-10,
+    "max_newton_iterations": 50,
+    "bisection_bounds": (-0.9999, 10.0),
+    "max_bisection_iterations": 200,
 }
 
+IRR_SOLVERS = np.array(["none", "newton", "bisection"])
+
 
 def calculate_cap_rate(purchase_price: float, annual_rent: float, annual_expenses: float) -> Tuple[float, float]:
     """Return cap rate percentage and NOI based on inputs."""
@@ -28,15 +48,7 @@ def calculate_cap_rate(purchase_price: float, annual_rent: float, annual_expense
 
 
 def _compute_monthly_debt_service(loan_amount: float, interest_rate: float, loan_term_years: int) -> float:
-    rate = interest_rate / 100 / 12
-    periods = loan_term_years * 12
-    if loan_amount <= 0 or periods <= 0:
-        return 0.0
-    if rate == 0:
-        return loan_amount / periods
-    numerator = loan_amount * rate * (1 + rate) ** periods
-    denominator = (1 + rate) ** periods - 1
-    return numerator / denominator
+    return monthly_payment(loan_amount, interest_rate, loan_term_years)
 
 
 def calculate_cash_flow(data: Dict[str, float]) -> Dict[str, float]:
@@ -64,23 +76,30 @@ def calculate_cash_flow(data: Dict[str, float]) -> Dict[str, float]:
     annual_cash_flow = monthly_cash_flow * 12
     cash_on_cash_return = (annual_cash_flow / data["down_payment"] * 100) if data["down_payment"] else 0.0
 
-    summary_parts = [
-        f"NOI: ${noi_monthly:,.2f}/mo",
-        f"Debt Service: ${monthly_debt_service:,.2f}/mo",
-        f"Cash Flow: ${monthly_cash_flow:,.2f}/mo",
-        f"Cash-on-Cash: {cash_on_cash_return:.2f}%",
-    ]
-
     return {
         "monthly_cash_flow": monthly_cash_flow,
         "annual_cash_flow": annual_cash_flow,
         "noi_annual": noi_annual,
         "monthly_debt_service": monthly_debt_service,
         "cash_on_cash_return": cash_on_cash_return,
-        "summary": " | ".join(summary_parts),
+        "summary": cash_flow_summary(noi_monthly, monthly_debt_service, monthly_cash_flow, cash_on_cash_return),
     }
 
 
+def cash_flow_summary(
+    noi_monthly: float, monthly_debt_service: float, monthly_cash_flow: float, cash_on_cash_return: float
+) -> str:
+    """Human-readable one-line cash flow summary."""
+
+    summary_parts = [
+        f"NOI: ${noi_monthly:,.2f}/mo",
+        f"Debt Service: ${monthly_debt_service:,.2f}/mo",
+        f"Cash Flow: ${monthly_cash_flow:,.2f}/mo",
+        f"Cash-on-Cash: {cash_on_cash_return:.2f}%",
+    ]
+    return " | ".join(summary_parts)
+
+
 def calculate_dscr(noi_annual: float, annual_debt_service: float) -> Tuple[Optional[float], str]:
     """Calculate DSCR and provide interpretation.
     
@@ -100,11 +119,60 @@ def calculate_dscr(noi_annual: float, annual_debt_service: float) -> Tuple[Optio
     return dscr_value, interpretation
 
 
-def estimate_rent(request: Dict[str, float]) -> Tuple[float, Dict[str, float]]:
-    """Estimate rent using rule-based multipliers.
-    
-    Note: zip_code is accepted in the request but not currently used in calculations.
-    It is reserved for future location-based rent adjustments.
+def score_deal(monthly_cash_flow: float, dscr_value: Optional[float], vacancy_percent: float) -> Tuple[float, str, List[str]]:
+    """Apply the rule-based deal score; returns the score, its label and the reasons."""
+
+    score = 50.0
+    reasons = []
+
+    if monthly_cash_flow > 300:
+        score += 20
+        reasons.append("Monthly cash flow exceeds $300")
+    elif monthly_cash_flow > 0:
+        score += 10
+        reasons.append("Positive monthly cash flow")
+    else:
+        score -= 10
+        reasons.append("Negative monthly cash flow")
+
+    if dscr_value is None:
+        # Cash purchase - no debt service, which is generally positive
+        score += 15
+        reasons.append("Cash purchase - no debt service required")
+    elif dscr_value > 1.25:
+        score += 20
+        reasons.append("DSCR above 1.25 indicates strong coverage")
+    elif dscr_value > 1.1:
+        score += 10
+        reasons.append("DSCR above 1.1 is acceptable")
+    else:
+        score -= 10
+        reasons.append("DSCR below 1.1 may be risky")
+
+    # Use the actual vacancy_percent used in calculations (deal-specific or assumption)
+    if vacancy_percent <= 5:
+        score += 5
+        reasons.append("Low assumed vacancy")
+
+    score = max(0, min(100, score))
+    if score >= 75:
+        label = "Strong Deal"
+    elif score >= 50:
+        label = "Neutral"
+    else:
+        label = "Weak Deal"
+    return score, label, reasons
+
+
+def estimate_rent(
+    request: Dict[str, float], zip_stats: Optional[Tuple[float, int]] = None
+) -> Tuple[float, Dict[str, float]]:
+    """Estimate rent using rule-based multipliers, blended with observed zip-code rents.
+
+    ``zip_stats`` is ``(rent_per_sqft, samples)`` for the request's zip code and
+    property type (see ``app.core.rent_index``). Once a bucket has
+    ``zip_min_samples`` samples its rent per square foot is blended in, with a
+    weight growing linearly to 1 at ``zip_full_weight_samples``.
     """
 
     base = RENT_CONFIG["base_rent_per_sqft"] * request["square_feet"]
@@ -112,9 +180,6 @@ def estimate_rent(request: Dict[str, float]) -> Tuple[float, Dict[str, float]]:
     bathroom_adj = RENT_CONFIG["bathroom_multiplier"] * request["bathrooms"]
     property_adjustment = RENT_CONFIG["property_type_adjustments"].get(request["property_type"], 1.0)
 
-    # TODO: Implement zip_code-based adjustments in future enhancement
-    # zip_code = request.get("zip_code")  # Reserved for future use
-
     estimated = (base + bedroom_adj + bathroom_adj) * property_adjustment
     assumptions = {
         "base_rent_per_sqft": RENT_CONFIG["base_rent_per_sqft"],
@@ -122,11 +187,19 @@ def estimate_rent(request: Dict[str, float]) -> Tuple[float, Dict[str, float]]:
         "bathroom_multiplier": RENT_CONFIG["bathroom_multiplier"],
         "property_type_adjustment": property_adjustment,
     }
-    
-    # Only add zip_code_used flag if zip_code was provided
+
+    # Only report zip-code usage if zip_code was provided
     if "zip_code" in request and request["zip_code"]:
-        assumptions["zip_code_used"] = False
-        
+        zip_rent_per_sqft, samples = zip_stats or (None, 0)
+        weight = 0.0
+        if samples >= RENT_CONFIG["zip_min_samples"]:
+            weight = min(1.0, samples / RENT_CONFIG["zip_full_weight_samples"])
+            estimated = (1 - weight) * estimated + weight * zip_rent_per_sqft * request["square_feet"]
+            assumptions["zip_rent_per_sqft"] = zip_rent_per_sqft
+        assumptions["zip_code_used"] = weight > 0
+        assumptions["zip_sample_count"] = samples
+        assumptions["zip_weight"] = weight
+
     return estimated, assumptions
 
 
@@ -168,45 +241,7 @@ def analyze_deal(payload: Dict) -> Dict:
         annual_debt_service=cash_flow_result["monthly_debt_service"] * 12,
     )
 
-    score = 50.0
-    reasons = []
-
-    if cash_flow_result["monthly_cash_flow"] > 300:
-        score += 20
-        reasons.append("Monthly cash flow exceeds $300")
-    elif cash_flow_result["monthly_cash_flow"] > 0:
-        score += 10
-        reasons.append("Positive monthly cash flow")
-    else:
-        score -= 10
-        reasons.append("Negative monthly cash flow")
-
-    if dscr_value is None:
-        # Cash purchase - no debt service, which is generally positive
-        score += 15
-        reasons.append("Cash purchase - no debt service required")
-    elif dscr_value > 1.25:
-        score += 20
-        reasons.append("DSCR above 1.25 indicates strong coverage")
-    elif dscr_value > 1.1:
-        score += 10
-        reasons.append("DSCR above 1.1 is acceptable")
-    else:
-        score -= 10
-        reasons.append("DSCR below 1.1 may be risky")
-
-    # Use the actual vacancy_percent used in calculations (deal-specific or assumption)
-    if vacancy_percent <= 5:
-        score += 5
-        reasons.append("Low assumed vacancy")
-
-    score = max(0, min(100, score))
-    if score >= 75:
-        label = "Strong Deal"
-    elif score >= 50:
-        label = "Neutral"
-    else:
-        label = "Weak Deal"
+    score, label, reasons = score_deal(cash_flow_result["monthly_cash_flow"], dscr_value, vacancy_percent)
 
     return {
         "overall_score": score,
@@ -215,3 +250,174 @@ def analyze_deal(payload: Dict) -> Dict:
         "cash_flow": cash_flow_result,
         "dscr": {"dscr": dscr_value, "interpretation": dscr_interp},
     }
+
+
+def _present_value(cash_flows: np.ndarray, rate: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Return NPV and its derivative with respect to ``rate`` for each row."""
+
+    periods = np.arange(cash_flows.shape[1], dtype=np.float64)
+    base = 1 + rate[:, None]
+    discounted = cash_flows * base ** -periods
+    return discounted.sum(axis=1), (-periods * discounted / base).sum(axis=1)
+
+
+def calculate_npv(cash_flows: np.ndarray, discount_rate_percent: float) -> np.ndarray:
+    """NPV of each row of yearly cash flows (column 0 is today)."""
+
+    cash_flows = np.atleast_2d(np.asarray(cash_flows, dtype=np.float64))
+    rate = np.full(cash_flows.shape[0], discount_rate_percent / 100)
+    return _present_value(cash_flows, rate)[0]
+
+
+def solve_irr(cash_flows: np.ndarray) -> Dict[str, np.ndarray]:
+    """Solve IRR for every row of yearly cash flows at once.
+
+    Runs vectorized Newton iterations from ``IRR_SOLVER_CONFIG["initial_guess"]``
+    and falls back to bisection for rows that diverge or stall. Rows whose NPV
+    never changes sign inside the bisection bounds have no IRR (NaN).
+
+    Returns ``irr`` (fraction), ``converged``, ``iterations`` and ``solver``
+    ("newton", "bisection" or "none") per row.
+    """
+
+    cash_flows = np.atleast_2d(np.asarray(cash_flows, dtype=np.float64))
+    size = cash_flows.shape[0]
+    tolerance = IRR_SOLVER_CONFIG["tolerance"]
+
+    rate = np.full(size, IRR_SOLVER_CONFIG["initial_guess"])
+    iterations = np.zeros(size, dtype=np.int64)
+    method = np.zeros(size, dtype=np.int64)
+    active = np.ones(size, dtype=bool)
+
+    with np.errstate(all="ignore"):
+        for _ in range(IRR_SOLVER_CONFIG["max_newton_iterations"]):
+            if not active.any():
+                break
+            npv, derivative = _present_value(cash_flows[active], rate[active])
+            step = npv / derivative
+            updated = rate[active] - step
+            iterations[active] += 1
+
+            failed = ~np.isfinite(updated) | (updated <= -1)
+            done = ~failed & (np.abs(step) <= tolerance * (1 + np.abs(updated)))
+            indices = np.flatnonzero(active)
+            rate[indices[~failed]] = updated[~failed]
+            method[indices[done]] = 1
+            active[indices[done | failed]] = False
+
+        pending = method == 0
+        if pending.any():
+            lower_bound, upper_bound = IRR_SOLVER_CONFIG["bisection_bounds"]
+            indices = np.flatnonzero(pending)
+            low = np.full(indices.shape[0], lower_bound)
+            high = np.full(indices.shape[0], upper_bound)
+            npv_low = _present_value(cash_flows[indices], low)[0]
+            npv_high = _present_value(cash_flows[indices], high)[0]
+            bracketed = np.sign(npv_low) != np.sign(npv_high)
+
+            steps = 0
+            while steps < IRR_SOLVER_CONFIG["max_bisection_iterations"] and np.any((high - low)[bracketed] > tolerance):
+                middle = (low + high) / 2
+                npv_middle = _present_value(cash_flows[indices], middle)[0]
+                same_side = np.sign(npv_middle) == np.sign(npv_low)
+                low = np.where(same_side, middle, low)
+                npv_low = np.where(same_side, npv_middle, npv_low)
+                high = np.where(same_side, high, middle)
+                steps += 1
+
+            rate[indices] = np.where(bracketed, (low + high) / 2, np.nan)
+            method[indices] = np.where(bracketed, 2, 0)
+            iterations[indices] += np.where(bracketed, steps, 0)
+
+    return {
+        "irr": rate,
+        "converged": method > 0,
+        "iterations": iterations,
+        "solver": IRR_SOLVERS[method],
+    }
+
+
+def holding_period_cash_flows(
+    columns: Mapping[str, Optional[Sequence[float]]],
+    assumptions: Optional[Assumptions] = None,
+    **growth_overrides: float | Sequence[float],
+) -> np.ndarray:
+    """Yearly equity cash flows for a buy, hold and sell scenario, one row per deal.
+
+    Column 0 is the down payment going out; years ``1..holding_period_years``
+    are operating cash flows, with the final year also receiving the sale
+    proceeds net of selling costs and the remaining loan balance. Growth
+    overrides are passed through to ``project_deals``.
+    """
+
+    assumptions = assumptions or Assumptions()
+    holding_years = assumptions.holding_period_years
+    projection = project_deals(columns, holding_years, assumptions, **growth_overrides)
+
+    sale_price = projection["property_value"][:, -1]
+    sale_proceeds = sale_price * (1 - assumptions.selling_cost_percent / 100) - projection["loan_balance"][:, -1]
+
+    cash_flows = np.empty((sale_price.shape[0], holding_years + 1))
+    cash_flows[:, 0] = -np.asarray(columns["down_payment"], dtype=np.float64)
+    cash_flows[:, 1:] = projection["cash_flow"]
+    cash_flows[:, -1] += sale_proceeds
+    return cash_flows
+
+
+def calculate_returns_batch(
+    columns: Mapping[str, Optional[Sequence[float]]],
+    assumptions: Optional[Assumptions] = None,
+) -> Dict[str, np.ndarray]:
+    """IRR, NPV and equity multiple for many deals held for ``holding_period_years``.
+
+    IRR and NPV are returned as percentages/dollars per deal alongside the
+    solver diagnostics from ``solve_irr``; sort on ``irr_percent`` to rank.
+    """
+
+    assumptions = assumptions or Assumptions()
+    cash_flows = holding_period_cash_flows(columns, assumptions)
+    solution = solve_irr(cash_flows)
+    invested = -cash_flows[:, 0]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        equity_multiple = np.where(invested > 0, cash_flows[:, 1:].sum(axis=1) / invested, np.nan)
+
+    return {
+        "irr_percent": solution["irr"] * 100,
+        "npv": calculate_npv(cash_flows, assumptions.discount_rate_percent),
+        "equity_multiple": equity_multiple,
+        "converged": solution["converged"],
+        "iterations": solution["iterations"],
+        "solver": solution["solver"],
+    }
+
+
+@memoized()
+def calculate_returns(payload: Dict) -> Dict:
+    """Return IRR, NPV and equity multiple for a single deal payload.
+
+    Accepts the same payload as ``analyze_deal``; ``irr_percent`` and
+    ``equity_multiple`` are None when they are undefined for the deal.
+    """
+
+    assumptions: Assumptions = payload.get("assumptions") or Assumptions()
+    columns = {name: [payload.get(name)] for name in DEAL_INPUT_COLUMNS}
+    return returns_summary(calculate_returns_batch(columns, assumptions), 0, assumptions)
+
+
+def returns_summary(result: Mapping[str, np.ndarray], index: int, assumptions: Assumptions) -> Dict:
+    """JSON-safe ``calculate_returns`` payload for row ``index`` of a ``calculate_returns_batch`` result."""
+
+    irr_percent = float(result["irr_percent"][index])
+    equity_multiple = float(result["equity_multiple"][index])
+    return {
+        "irr_percent": None if np.isnan(irr_percent) else irr_percent,
+        "npv": float(result["npv"][index]),
+        "equity_multiple": None if np.isnan(equity_multiple) else equity_multiple,
+        "holding_period_years": assumptions.holding_period_years,
+        "discount_rate_percent": assumptions.discount_rate_percent,
+        "solver": {
+            "converged": bool(result["converged"][index]),
+            "method": str(result["solver"][index]),
+            "iterations": int(result["iterations"][index]),
+        },
+    }
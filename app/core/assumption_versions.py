@@ -0,0 +1,92 @@
+"""Persistence and cross-worker refresh for the default assumptions.
+
+Every save appends an ``AssumptionSet`` row with the next version number.
+Workers poll ``max(version)`` (a single read on a unique index) every
+``ASSUMPTIONS_REFRESH_SECONDS`` from a background thread and only load the
+full row when a newer version exists, so request handlers keep reading the
+in-memory copy through ``get_assumptions``.
+"""
+from __future__ import annotations
+
+import logging
+from threading import Event, Thread
+from typing import Callable, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.assumptions import Assumptions, get_assumptions_version, update_assumptions
+from app.models.admin import AssumptionSet
+
+logger = logging.getLogger(__name__)
+
+SAVE_RETRIES = 5
+
+_poller: Optional[Tuple[Thread, Event]] = None
+
+
+def latest_version(db: Session) -> int:
+    """Return the newest stored version (0 when nothing has been saved)."""
+
+    return db.query(func.max(AssumptionSet.version)).scalar() or 0
+
+
+def save_assumptions(db: Session, payload: Assumptions, user_id: Optional[int] = None) -> Tuple[Assumptions, int]:
+    """Persist ``payload`` as the next version and install it in this worker."""
+
+    for _ in range(SAVE_RETRIES):
+        version = latest_version(db) + 1
+        db.add(AssumptionSet(version=version, values=payload.model_dump(), created_by_user_id=user_id))
+        try:
+            db.commit()
+        except IntegrityError:
+            # Another worker took this version number; retry with the next one.
+            db.rollback()
+            continue
+        update_assumptions(payload, version, force=True)
+        return payload, version
+    raise RuntimeError("Could not allocate an assumptions version")
+
+
+def refresh_assumptions(db: Session) -> bool:
+    """Load the newest stored assumptions if they are newer than this worker's copy."""
+
+    version = latest_version(db)
+    if version <= get_assumptions_version():
+        return False
+    row = db.query(AssumptionSet).filter(AssumptionSet.version == version).one()
+    return update_assumptions(Assumptions(**row.values), version)
+
+
+def _poll(session_factory: Callable[[], Session], interval: float, stop: Event) -> None:
+    while not stop.wait(interval):
+        db = session_factory()
+        try:
+            refresh_assumptions(db)
+        except Exception:
+            logger.exception("Assumptions refresh failed")
+        finally:
+            db.close()
+
+
+def start_assumptions_poller(session_factory: Callable[[], Session], interval: float) -> None:
+    """Start this worker's background version check (idempotent)."""
+
+    global _poller
+    if _poller is not None:
+        return
+    stop = Event()
+    thread = Thread(target=_poll, args=(session_factory, interval, stop), name="assumptions-poller", daemon=True)
+    thread.start()
+    _poller = (thread, stop)
+
+
+def stop_assumptions_poller() -> None:
+    global _poller
+    if _poller is None:
+        return
+    thread, stop = _poller
+    stop.set()
+    thread.join(timeout=5)
+    _poller = None
@@ -1,7 +1,13 @@
-"""Shared assumptions model and in-memory storage for configurable defaults."""
+"""Shared assumptions model and the per-process copy of the current defaults.
+
+The defaults are persisted as versioned rows (see ``app.core.assumption_versions``);
+every worker keeps the newest version it has seen here, so ``get_assumptions``
+never touches the database.
+"""
 from __future__ import annotations
 
-from typing import Dict
+from threading import Lock
+from typing import Tuple
 
 from pydantic import BaseModel, Field, field_validator
 
@@ -18,6 +24,12 @@ class Assumptions(BaseModel):
         0.6, ge=0, description="Annual insurance cost as a percentage of property value.")
     appreciation_percent_annual: float = Field(3.0, ge=0, description="Annual property value appreciation assumption.")
     rent_growth_percent_annual: float = Field(2.5, ge=0, description="Annual rent growth assumption.")
+    expense_growth_percent_annual: float = Field(
+        2.0, ge=0, description="Annual growth of fixed expenses (taxes, insurance, HOA).")
+    holding_period_years: int = Field(10, ge=1, le=50, description="Years a deal is held before an assumed sale.")
+    discount_rate_percent: float = Field(8.0, ge=0, description="Annual discount rate used for NPV.")
+    selling_cost_percent: float = Field(
+        6.0, ge=0, le=100, description="Selling costs at exit as a percentage of sale price.")
 
     @field_validator(
         "vacancy_percent",
@@ -27,6 +39,9 @@ class Assumptions(BaseModel):
         "insurance_percent",
         "appreciation_percent_annual",
         "rent_growth_percent_annual",
+        "expense_growth_percent_annual",
+        "discount_rate_percent",
+        "selling_cost_percent",
     )
     @classmethod
     def _non_negative(cls, value: float) -> float:
@@ -35,17 +50,32 @@ class Assumptions(BaseModel):
         return value
 
 
-_assumptions_store: Dict[str, Assumptions] = {"defaults": Assumptions()}
+_assumptions_lock = Lock()
+_assumptions_store: Tuple[int, Assumptions] = (0, Assumptions())  # (version, assumptions); 0 = built-in defaults
 
 
 def get_assumptions() -> Assumptions:
     """Return the current in-memory assumptions."""
 
-    return _assumptions_store["defaults"]
+    return _assumptions_store[1]
+
+
+def get_assumptions_version() -> int:
+    """Return the version of the in-memory assumptions (0 for the built-in defaults)."""
+
+    return _assumptions_store[0]
+
 
+def update_assumptions(payload: Assumptions, version: int, force: bool = False) -> bool:
+    """Install ``payload`` as the in-memory assumptions if ``version`` is newer.
 
-def update_assumptions(payload: Assumptions) -> Assumptions:
-    """Update the in-memory assumptions and return the new copy."""
+    Returns whether the store changed. Older versions are ignored unless
+    ``force`` is set, so a slow refresh can never roll back a newer set.
+    """
 
-    _assumptions_store["defaults"] = payload
-    return _assumptions_store["defaults"]
+    global _assumptions_store
+    with _assumptions_lock:
+        if not force and version <= _assumptions_store[0]:
+            return False
+        _assumptions_store = (version, payload)
+        return True
@@ -0,0 +1,302 @@
+"""In-memory address, city and zip autocomplete.
+
+Each owner has one sorted list of keys per field, and completing a prefix is
+a ``bisect`` plus a short forward scan, so lookups never touch the
+database. A key is ``<term>\\0<value>``, both case-folded with whitespace
+collapsed. The term is what a prefix must match and the value identifies
+the suggestion, so the same city typed twice is one suggestion. Address
+lines are indexed from their start and again from the street name ("12 Main
+St" completes from "12 m" and from "mai").
+
+Keys are reference counted per property, so creates, updates, deletes and
+imports applied through ``observe``/``discard`` keep the lists exact
+without rebuilding them. The whole index is rebuilt from the database at
+startup. Writes served by other workers are picked up by ``sync_owner``,
+which compares a per-owner ``(count, max id, newest update)`` fingerprint
+with the database at most once per ``sync_interval_seconds``, like the map
+index does.
+"""
+from __future__ import annotations
+
+import time
+from bisect import bisect_left, insort
+from datetime import datetime
+from threading import Lock
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.models.property import Property
+
+AUTOCOMPLETE_FIELDS = ("cities", "zip_codes", "addresses")
+
+AUTOCOMPLETE_CONFIG = {
+    "sync_interval_seconds": 5.0,  # Staleness bound for writes made by other workers
+}
+
+_SEPARATOR = "\0"
+
+Entry = Tuple[str, str, str]  # (field, key, label)
+
+
+def normalize(text: Optional[str]) -> str:
+    """Case-folded text with runs of whitespace collapsed to one space."""
+
+    return " ".join((text or "").lower().replace(_SEPARATOR, " ").split())
+
+
+def _entries(city: Optional[str], zip_code: Optional[str], address_line1: Optional[str]) -> List[Entry]:
+    entries = []
+    for field, label in (("cities", city), ("zip_codes", zip_code)):
+        value = normalize(label)
+        if value:
+            entries.append((field, f"{value}{_SEPARATOR}{value}", label.strip()))
+    address = normalize(address_line1)
+    if address:
+        entries.append(("addresses", f"{address}{_SEPARATOR}{address}", address_line1.strip()))
+        number, _, street = address.partition(" ")
+        if street and number[0].isdigit():
+            entries.append(("addresses", f"{street}{_SEPARATOR}{address}", address_line1.strip()))
+    return entries
+
+
+class _SortedKeys:
+    """Sorted, reference-counted keys of one field with the label shown for each."""
+
+    __slots__ = ("keys", "counts", "labels")
+
+    def __init__(self) -> None:
+        self.keys: List[str] = []
+        self.counts: Dict[str, int] = {}
+        self.labels: Dict[str, str] = {}
+
+    def add(self, key: str, label: str) -> None:
+        count = self.counts.get(key, 0)
+        if not count:
+            insort(self.keys, key)
+            self.labels[key] = label
+        self.counts[key] = count + 1
+
+    def remove(self, key: str) -> None:
+        count = self.counts.get(key, 0)
+        if count > 1:
+            self.counts[key] = count - 1
+        elif count:
+            del self.counts[key], self.labels[key]
+            del self.keys[bisect_left(self.keys, key)]
+
+    def finalize(self) -> None:
+        """Sort keys appended in bulk by ``rebuild``."""
+
+        self.keys = sorted(self.counts)
+
+    def complete(self, prefix: str, limit: int) -> List[str]:
+        keys, labels = self.keys, self.labels
+        suggestions: List[str] = []
+        seen = set()
+        index = bisect_left(keys, prefix)
+        while index < len(keys) and len(suggestions) < limit:
+            key = keys[index]
+            if not key.startswith(prefix):
+                break
+            value = key.partition(_SEPARATOR)[2]
+            if value not in seen:
+                seen.add(value)
+                suggestions.append(labels[key])
+            index += 1
+        return suggestions
+
+
+class AutocompleteIndex:
+    """Per-owner prefix lists over cities, zip codes and address lines."""
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._owners: Dict[int, Dict[str, _SortedKeys]] = {}
+        # Property id -> (owner id, city, zip code, address line); entries are re-derived on removal.
+        self._rows: Dict[int, Tuple] = {}
+        self._ids: Dict[int, Set[int]] = {}  # Owner id -> property ids
+        self._newest: Dict[int, datetime] = {}  # Owner id -> newest ``updated_at`` observed
+        self._checked: Dict[int, float] = {}  # Owner id -> monotonic time of the last fingerprint check
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def _fields(self, owner_id: int) -> Dict[str, _SortedKeys]:
+        fields = self._owners.get(owner_id)
+        if fields is None:
+            fields = self._owners[owner_id] = {field: _SortedKeys() for field in AUTOCOMPLETE_FIELDS}
+        return fields
+
+    def _discard(self, property_id: int) -> None:
+        previous = self._rows.pop(property_id, None)
+        if previous is None:
+            return
+        self._ids[previous[0]].discard(property_id)
+        fields = self._owners[previous[0]]
+        for field, key, _ in _entries(*previous[1:]):
+            fields[field].remove(key)
+
+    def _observe(
+        self, property_id: int, owner_id: int, city, zip_code, address_line1, updated_at: Optional[datetime] = None
+    ) -> None:
+        if updated_at is not None and updated_at > self._newest.get(owner_id, updated_at.min):
+            self._newest[owner_id] = updated_at
+        row = (owner_id, city, zip_code, address_line1)
+        if self._rows.get(property_id) == row:
+            return
+        self._discard(property_id)
+        fields = self._fields(owner_id)
+        for field, key, label in _entries(city, zip_code, address_line1):
+            fields[field].add(key, label)
+        self._rows[property_id] = row
+        self._ids.setdefault(owner_id, set()).add(property_id)
+
+    def observe(
+        self,
+        property_id: int,
+        owner_id: int,
+        city: Optional[str],
+        zip_code: Optional[str],
+        address_line1: Optional[str],
+        updated_at: Optional[datetime] = None,
+    ) -> None:
+        with self._lock:
+            self._observe(property_id, owner_id, city, zip_code, address_line1, updated_at)
+
+    def observe_many(self, rows: Iterable[Tuple]) -> None:
+        """``observe`` for ``(id, owner_id, city, zip_code, address_line1, updated_at)`` rows."""
+
+        with self._lock:
+            for row in rows:
+                self._observe(*row)
+
+    def discard(self, property_id: int) -> None:
+        with self._lock:
+            self._discard(property_id)
+
+    def claim_check(self, owner_id: int, interval: float) -> bool:
+        """True (and restart the clock) when an owner's fingerprint is due for a check."""
+
+        now = time.monotonic()
+        with self._lock:
+            checked = self._checked.get(owner_id)
+            if checked is not None and now - checked < interval:
+                return False
+            self._checked[owner_id] = now
+            return True
+
+    def fingerprint(self, owner_id: int) -> Tuple[int, Optional[int], Optional[datetime]]:
+        """``(property count, max id, newest update)`` for an owner."""
+
+        with self._lock:
+            ids = self._ids.get(owner_id)
+            if not ids:
+                return (0, None, None)
+            return (len(ids), max(ids), self._newest.get(owner_id))
+
+    def replace_owner(self, owner_id: int, rows: Iterable[Tuple]) -> None:
+        """Replace one owner's entries with ``(id, city, zip_code, address_line1, updated_at)`` rows."""
+
+        rows = list(rows)
+        with self._lock:
+            for property_id in list(self._ids.get(owner_id, ())):
+                self._discard(property_id)
+            self._owners.pop(owner_id, None)
+            self._newest.pop(owner_id, None)
+            for property_id, city, zip_code, address_line1, updated_at in rows:
+                self._observe(property_id, owner_id, city, zip_code, address_line1, updated_at)
+
+    def rebuild(self, rows: Iterable[Tuple]) -> None:
+        """Replace the index with ``(id, owner_id, city, zip_code, address_line1, updated_at)`` rows, sorting once."""
+
+        owners: Dict[int, Dict[str, _SortedKeys]] = {}
+        stored: Dict[int, Tuple] = {}
+        ids: Dict[int, Set[int]] = {}
+        newest: Dict[int, datetime] = {}
+        for property_id, owner_id, city, zip_code, address_line1, updated_at in rows:
+            fields = owners.get(owner_id)
+            if fields is None:
+                fields = owners[owner_id] = {field: _SortedKeys() for field in AUTOCOMPLETE_FIELDS}
+                ids[owner_id] = set()
+            for field, key, label in _entries(city, zip_code, address_line1):
+                keys = fields[field]
+                keys.counts[key] = keys.counts.get(key, 0) + 1
+                keys.labels.setdefault(key, label)
+            stored[property_id] = (owner_id, city, zip_code, address_line1)
+            ids[owner_id].add(property_id)
+            if updated_at is not None and updated_at > newest.get(owner_id, updated_at.min):
+                newest[owner_id] = updated_at
+        for fields in owners.values():
+            for keys in fields.values():
+                keys.finalize()
+        with self._lock:
+            self._owners, self._rows, self._ids, self._newest = owners, stored, ids, newest
+            self._checked.clear()
+
+    def complete(
+        self, owner_id: int, prefix: str, limit: int, fields: Sequence[str] = AUTOCOMPLETE_FIELDS
+    ) -> Dict[str, List[str]]:
+        """Up to ``limit`` suggestions per field whose term starts with ``prefix``, in sorted order."""
+
+        prefix = normalize(prefix)
+        with self._lock:
+            owner = self._owners.get(owner_id)
+            if owner is None or not prefix:
+                return {field: [] for field in fields}
+            return {field: owner[field].complete(prefix, limit) for field in fields}
+
+
+autocomplete_index = AutocompleteIndex()
+
+
+def observe_property(prop: Property, index: AutocompleteIndex = autocomplete_index) -> None:
+    """Update the index after a property was created or updated."""
+
+    index.observe(prop.id, prop.owner_user_id, prop.city, prop.zip_code, prop.address_line1, prop.updated_at)
+
+
+def _row_query(db: Session):
+    return db.query(
+        Property.id,
+        Property.owner_user_id,
+        Property.city,
+        Property.zip_code,
+        Property.address_line1,
+        Property.updated_at,
+    )
+
+
+def owner_fingerprint(db: Session, owner_id: int) -> Tuple[int, Optional[int], Optional[datetime]]:
+    """The database side of ``AutocompleteIndex.fingerprint`` (one aggregate query)."""
+
+    count, max_id, updated_at = (
+        db.query(func.count(Property.id), func.max(Property.id), func.max(Property.updated_at))
+        .filter(Property.owner_user_id == owner_id)
+        .one()
+    )
+    return (count, max_id, updated_at)
+
+
+def sync_owner(
+    db: Session,
+    owner_id: int,
+    index: AutocompleteIndex = autocomplete_index,
+    interval: float = AUTOCOMPLETE_CONFIG["sync_interval_seconds"],
+) -> bool:
+    """Reload an owner's entries if the database has changed behind them; True when reloaded."""
+
+    if not index.claim_check(owner_id, interval):
+        return False
+    if index.fingerprint(owner_id) == owner_fingerprint(db, owner_id):
+        return False
+    rows = _row_query(db).filter(Property.owner_user_id == owner_id).yield_per(5000)
+    index.replace_owner(owner_id, ((row[0], *row[2:]) for row in rows))
+    return True
+
+
+def rebuild_from_db(db: Session, index: AutocompleteIndex = autocomplete_index) -> None:
+    """Rebuild the index with one query over all properties."""
+
+    index.rebuild(tuple(row) for row in _row_query(db).yield_per(5000))
@@ -0,0 +1,172 @@
+"""Columnar (NumPy) versions of the analytics engine calculations.
+
+Each function takes equal-length arrays where index ``i`` across all columns
+describes one deal, and mirrors the scalar helpers in ``app.core.analytics``
+operation for operation so both paths produce the same numbers.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from app.core.amortization import monthly_payment_batch
+from app.core.assumptions import Assumptions
+
+DEAL_LABELS = np.array(["Weak Deal", "Neutral", "Strong Deal"])
+
+REQUIRED_COLUMNS = ("purchase_price", "down_payment", "interest_rate", "loan_term_years", "monthly_rent")
+DEAL_INPUT_COLUMNS = REQUIRED_COLUMNS + (
+    "property_tax_annual",
+    "insurance_annual",
+    "hoa_monthly",
+    "maintenance_percent",
+    "vacancy_percent",
+    "management_percent",
+)
+
+
+def _column(columns: Mapping[str, Optional[Sequence[float]]], name: str, size: int, default: np.ndarray | float) -> np.ndarray:
+    """Return a column as float64, filling a missing column or ``None`` entries from ``default``."""
+
+    fallback = np.broadcast_to(np.asarray(default, dtype=np.float64), (size,))
+    values = columns.get(name)
+    if values is None:
+        return fallback
+    column = np.asarray(values, dtype=np.float64)
+    return np.where(np.isnan(column), fallback, column)
+
+
+def deal_columns(deals: Iterable[Any]) -> Dict[str, List[Optional[float]]]:
+    """Transpose deal rows (ORM objects or anything with deal attributes) into columns."""
+
+    rows = list(deals)
+    return {name: [getattr(deal, name) for deal in rows] for name in DEAL_INPUT_COLUMNS}
+
+
+def calculate_cash_flow_batch(columns: Mapping[str, Sequence[float]]) -> Dict[str, np.ndarray]:
+    """Vectorized ``calculate_cash_flow`` (without the per-deal summary string)."""
+
+    purchase_price = np.asarray(columns["purchase_price"], dtype=np.float64)
+    size = purchase_price.shape[0]
+    down_payment = np.asarray(columns["down_payment"], dtype=np.float64)
+    monthly_rent = np.asarray(columns["monthly_rent"], dtype=np.float64)
+
+    monthly_debt_service = monthly_payment_batch(
+        loan_amount=purchase_price - down_payment,
+        interest_rate=np.asarray(columns["interest_rate"], dtype=np.float64),
+        loan_term_years=np.asarray(columns["loan_term_years"], dtype=np.float64),
+    )
+
+    maintenance = monthly_rent * np.asarray(columns["maintenance_percent"], dtype=np.float64) / 100
+    management = monthly_rent * np.asarray(columns["management_percent"], dtype=np.float64) / 100
+    vacancy_loss = monthly_rent * np.asarray(columns["vacancy_percent"], dtype=np.float64) / 100
+    property_tax_monthly = np.asarray(columns["property_tax_annual"], dtype=np.float64) / 12
+    insurance_monthly = np.asarray(columns["insurance_annual"], dtype=np.float64) / 12
+    hoa_monthly = _column(columns, "hoa_monthly", size, 0.0)
+
+    effective_gross_income = monthly_rent - vacancy_loss
+    operating_expenses = maintenance + management + property_tax_monthly + insurance_monthly + hoa_monthly
+    noi_monthly = effective_gross_income - operating_expenses
+    noi_annual = noi_monthly * 12
+
+    monthly_cash_flow = noi_monthly - monthly_debt_service
+    annual_cash_flow = monthly_cash_flow * 12
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cash_on_cash_return = np.where(down_payment != 0, annual_cash_flow / down_payment * 100, 0.0)
+
+    return {
+        "monthly_cash_flow": monthly_cash_flow,
+        "annual_cash_flow": annual_cash_flow,
+        "noi_annual": noi_annual,
+        "monthly_debt_service": monthly_debt_service,
+        "cash_on_cash_return": cash_on_cash_return,
+    }
+
+
+def calculate_dscr_batch(noi_annual: np.ndarray, annual_debt_service: np.ndarray) -> np.ndarray:
+    """Vectorized ``calculate_dscr``; NaN marks deals without debt service."""
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(annual_debt_service == 0, np.nan, noi_annual / annual_debt_service)
+
+
+def score_deals_batch(monthly_cash_flow: np.ndarray, dscr: np.ndarray, vacancy_percent: np.ndarray) -> np.ndarray:
+    """Apply the ``analyze_deal`` scoring rules to whole columns."""
+
+    score = np.full(monthly_cash_flow.shape, 50.0)
+    score += np.select([monthly_cash_flow > 300, monthly_cash_flow > 0], [20.0, 10.0], default=-10.0)
+
+    no_debt = np.isnan(dscr)
+    with np.errstate(invalid="ignore"):
+        score += np.select(
+            [no_debt, dscr > 1.25, dscr > 1.1],
+            [15.0, 20.0, 10.0],
+            default=-10.0,
+        )
+    score += np.where(vacancy_percent <= 5, 5.0, 0.0)
+    return np.clip(score, 0, 100)
+
+
+def label_scores_batch(score: np.ndarray) -> np.ndarray:
+    """Map scores to the ``analyze_deal`` labels."""
+
+    return DEAL_LABELS[(score >= 50).astype(np.intp) + (score >= 75).astype(np.intp)]
+
+
+def resolve_deal_columns(
+    columns: Mapping[str, Optional[Sequence[float]]],
+    assumptions: Optional[Assumptions] = None,
+) -> Dict[str, np.ndarray]:
+    """Validate a columnar deal set and fill optional columns from assumptions.
+
+    Taxes, insurance, HOA and the expense percentages fall back to the
+    assumptions exactly like the scalar analyzer does, per column or per
+    ``None`` entry.
+    """
+
+    assumptions = assumptions or Assumptions()
+    missing = [name for name in REQUIRED_COLUMNS if columns.get(name) is None]
+    if missing:
+        raise ValueError(f"Missing required columns: {missing}")
+
+    purchase_price = np.asarray(columns["purchase_price"], dtype=np.float64)
+    size = purchase_price.shape[0]
+    lengths = {name: len(values) for name, values in columns.items() if values is not None}
+    if any(length != size for length in lengths.values()):
+        raise ValueError(f"All columns must have the same length: {lengths}")
+
+    return {
+        "purchase_price": purchase_price,
+        "down_payment": np.asarray(columns["down_payment"], dtype=np.float64),
+        "interest_rate": np.asarray(columns["interest_rate"], dtype=np.float64),
+        "loan_term_years": np.asarray(columns["loan_term_years"], dtype=np.float64),
+        "monthly_rent": np.asarray(columns["monthly_rent"], dtype=np.float64),
+        "property_tax_annual": _column(
+            columns, "property_tax_annual", size, purchase_price * assumptions.property_tax_percent / 100
+        ),
+        "insurance_annual": _column(columns, "insurance_annual", size, purchase_price * assumptions.insurance_percent / 100),
+        "hoa_monthly": _column(columns, "hoa_monthly", size, 0.0),
+        "maintenance_percent": _column(columns, "maintenance_percent", size, assumptions.maintenance_percent),
+        "vacancy_percent": _column(columns, "vacancy_percent", size, assumptions.vacancy_percent),
+        "management_percent": _column(columns, "management_percent", size, assumptions.management_percent),
+    }
+
+
+def analyze_deals_batch(
+    columns: Mapping[str, Optional[Sequence[float]]],
+    assumptions: Optional[Assumptions] = None,
+) -> Dict[str, np.ndarray]:
+    """Vectorized ``analyze_deal`` over a columnar set of deals."""
+
+    resolved = resolve_deal_columns(columns, assumptions)
+    cash_flow = calculate_cash_flow_batch(resolved)
+    dscr = calculate_dscr_batch(cash_flow["noi_annual"], cash_flow["monthly_debt_service"] * 12)
+    score = score_deals_batch(cash_flow["monthly_cash_flow"], dscr, resolved["vacancy_percent"])
+
+    return {
+        **cash_flow,
+        "dscr": dscr,
+        "overall_score": score,
+        "label": label_scores_batch(score),
+    }
@@ -0,0 +1,156 @@
+"""Bounded, content-addressed memoization for analytics calculations.
+
+Results are keyed by a canonical hash of the call's numeric inputs (including
+any ``Assumptions`` in the payload) and stored pickled, so every hit hands the
+caller a fresh copy and the byte budget is measured on the stored payload.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import pickle
+import time
+from collections import OrderedDict
+from functools import wraps
+from threading import Lock
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar
+
+from pydantic import BaseModel
+
+ANALYTICS_CACHE_CONFIG = {
+    "max_entries": int(os.getenv("ANALYTICS_CACHE_MAX_ENTRIES", "20000")),
+    "max_bytes": int(os.getenv("ANALYTICS_CACHE_MAX_BYTES", str(32 * 1024 * 1024))),
+    "ttl_seconds": float(os.getenv("ANALYTICS_CACHE_TTL_SECONDS", "3600")),
+}
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def _canonical(value: Any) -> Any:
+    """Normalize a value so equal inputs always serialize identically."""
+
+    if isinstance(value, BaseModel):
+        return _canonical(value.model_dump())
+    if isinstance(value, dict):
+        return {str(key): _canonical(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(item) for item in value]
+    if isinstance(value, bool) or value is None or isinstance(value, str):
+        return value
+    if isinstance(value, (int, float)):
+        return repr(float(value))
+    if hasattr(value, "value"):  # Enums
+        return _canonical(value.value)
+    return repr(value)
+
+
+def cache_key(namespace: str, *args: Any, **kwargs: Any) -> str:
+    """Return the canonical hash for a call in ``namespace``."""
+
+    material = json.dumps([namespace, _canonical(args), _canonical(kwargs)], sort_keys=True, separators=(",", ":"))
+    return hashlib.blake2b(material.encode("utf-8"), digest_size=20).hexdigest()
+
+
+class AnalyticsCache:
+    """Thread-safe LRU cache with a TTL, an entry cap and a byte cap."""
+
+    def __init__(self, max_entries: int, max_bytes: int, ttl_seconds: float) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._lock = Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """Return ``(found, value)``; the value is a private copy."""
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return False, None
+            stored_at, payload = entry
+            if time.monotonic() - stored_at > self.ttl_seconds:
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return True, pickle.loads(payload)
+
+    def set(self, key: str, value: Any) -> None:
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(payload) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic(), payload)
+            self._bytes += len(payload)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+    def _remove(self, key: str) -> None:
+        _, payload = self._entries.pop(key)
+        self._bytes -= len(payload)
+
+
+analytics_cache = AnalyticsCache(**ANALYTICS_CACHE_CONFIG)
+
+
+def memoized(namespace: Optional[str] = None, cache: Optional[AnalyticsCache] = None) -> Callable[[F], F]:
+    """Memoize a pure analytics function in the shared analytics cache.
+
+    A hit costs a key hash and an unpickle (tens of microseconds), so only
+    decorate functions that take clearly longer than that.
+    """
+
+    def decorator(func: F) -> F:
+        name = namespace or func.__qualname__
+
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            target = cache or analytics_cache
+            key = cache_key(name, *args, **kwargs)
+            found, value = target.get(key)
+            if found:
+                return value
+            value = func(*args, **kwargs)
+            # The cache keeps its own pickle, so the fresh result can go to the caller as is.
+            target.set(key, value)
+            return value
+
+        wrapper.uncached = func  # type: ignore[attr-defined]
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
@@ -0,0 +1,348 @@
+"""Similarity-ranked comparable deals.
+
+Every deal is a row of raw features (log price, square feet, bedrooms,
+bathrooms, year built, latitude, longitude and rent per square foot) in its
+owner's partition of ``ComparablesIndex``. A partition is a dense NumPy matrix
+plus running per-feature sums, so observing or removing a deal is O(1)
+(removal swaps the last row into the freed slot). A query standardizes every
+candidate against the source deal using the source owner's feature spread and
+ranks by weighted Euclidean distance over the source deal's known features,
+in one vectorized pass with ``argpartition`` for the top k. Comps are always
+drawn from the source deal's owner.
+"""
+from __future__ import annotations
+
+import math
+from datetime import datetime
+from threading import Lock
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.models.deal import Deal
+from app.models.property import Property
+
+COMPS_FEATURES = (
+    "log_price",
+    "square_feet",
+    "bedrooms",
+    "bathrooms",
+    "year_built",
+    "latitude",
+    "longitude",
+    "rent_per_sqft",
+)
+
+COMPS_CONFIG = {
+    "initial_capacity": 64,
+    "weights": {
+        "log_price": 3.0,
+        "square_feet": 2.0,
+        "bedrooms": 1.0,
+        "bathrooms": 1.0,
+        "year_built": 0.5,
+        "latitude": 1.5,
+        "longitude": 1.5,
+        "rent_per_sqft": 1.5,
+    },
+    # Candidates must share at least this fraction of the total feature weight
+    # with the source deal to be ranked at all.
+    "min_shared_weight": 0.25,
+    # Distance charged (in standard deviations) for a feature the candidate lacks.
+    "missing_feature_penalty": 1.0,
+}
+
+_WEIGHTS = np.array([COMPS_CONFIG["weights"][name] for name in COMPS_FEATURES], dtype=np.float64)
+
+
+class Comparable(NamedTuple):
+    """One ranked comparable: the deal id, its distance and a 0-1 similarity score."""
+
+    deal_id: int
+    distance: float
+    similarity: float
+
+
+def deal_features(
+    purchase_price: Optional[float],
+    monthly_rent: Optional[float],
+    square_feet: Optional[float] = None,
+    bedrooms: Optional[float] = None,
+    bathrooms: Optional[float] = None,
+    year_built: Optional[float] = None,
+    latitude: Optional[float] = None,
+    longitude: Optional[float] = None,
+) -> np.ndarray:
+    """Raw feature vector for a deal (NaN where a feature is unknown)."""
+
+    def value(raw: Optional[float]) -> float:
+        return float("nan") if raw is None else float(raw)
+
+    log_price = math.log(purchase_price) if purchase_price and purchase_price > 0 else float("nan")
+    rent_per_sqft = monthly_rent / square_feet if monthly_rent and square_feet else None
+    return np.array(
+        [
+            log_price,
+            value(square_feet),
+            value(bedrooms),
+            value(bathrooms),
+            value(year_built),
+            value(latitude),
+            value(longitude),
+            value(rent_per_sqft),
+        ],
+        dtype=np.float64,
+    )
+
+
+class _Partition:
+    """Dense feature matrix for one owner's deals."""
+
+    def __init__(self, capacity: int) -> None:
+        self.ids = np.zeros(capacity, dtype=np.int64)
+        self.features = np.full((capacity, len(COMPS_FEATURES)), np.nan)
+        self.slots: Dict[int, int] = {}
+        self.counts = np.zeros(len(COMPS_FEATURES), dtype=np.int64)
+        self.sums = np.zeros(len(COMPS_FEATURES), dtype=np.float64)
+        self.sum_squares = np.zeros(len(COMPS_FEATURES), dtype=np.float64)
+        self.updated_at: Optional[datetime] = None
+
+    def __len__(self) -> int:
+        return len(self.slots)
+
+    def _account(self, row: np.ndarray, sign: int) -> None:
+        present = ~np.isnan(row)
+        self.counts += sign * present
+        values = np.where(present, row, 0.0)
+        self.sums += sign * values
+        self.sum_squares += sign * values * values
+
+    def add(self, deal_id: int, row: np.ndarray) -> None:
+        slot = len(self.slots)
+        if slot == self.ids.shape[0]:
+            capacity = max(2 * slot, 1)
+            self.ids = np.resize(self.ids, capacity)
+            grown = np.full((capacity, len(COMPS_FEATURES)), np.nan)
+            grown[:slot] = self.features[:slot]
+            self.features = grown
+        self.ids[slot] = deal_id
+        self.features[slot] = row
+        self.slots[deal_id] = slot
+        self._account(row, 1)
+
+    def remove(self, deal_id: int) -> bool:
+        slot = self.slots.pop(deal_id, None)
+        if slot is None:
+            return False
+        self._account(self.features[slot], -1)
+        last = len(self.slots)
+        if slot != last:
+            moved = int(self.ids[last])
+            self.ids[slot] = moved
+            self.features[slot] = self.features[last]
+            self.slots[moved] = slot
+        self.features[last] = np.nan
+        return True
+
+    def scale(self) -> np.ndarray:
+        """Per-feature standard deviation, 1 where it is undefined or zero."""
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean = self.sums / self.counts
+            variance = self.sum_squares / self.counts - mean * mean
+        std = np.sqrt(np.maximum(np.nan_to_num(variance), 0.0))
+        return np.where((self.counts > 1) & (std > 1e-12), std, 1.0)
+
+
+class ComparablesIndex:
+    """Thread-safe, incrementally maintained per-owner feature index.
+
+    Each partition remembers the newest deal/property ``updated_at`` it has
+    seen, so ``fingerprint`` can be compared with the database to detect
+    writes made by other workers (see ``sync_owner``).
+    """
+
+    def __init__(self, capacity: int = COMPS_CONFIG["initial_capacity"]) -> None:
+        self._lock = Lock()
+        self._capacity = capacity
+        self._partitions: Dict[int, _Partition] = {}
+        self._owners: Dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._owners)
+
+    def __contains__(self, deal_id: int) -> bool:
+        return deal_id in self._owners
+
+    def _discard(self, deal_id: int) -> None:
+        owner = self._owners.pop(deal_id, None)
+        if owner is not None:
+            self._partitions[owner].remove(deal_id)
+
+    def _observe(self, deal_id: int, owner_id: int, features: np.ndarray, updated_at: Optional[datetime]) -> None:
+        self._discard(deal_id)
+        partition = self._partitions.get(owner_id)
+        if partition is None:
+            partition = self._partitions[owner_id] = _Partition(self._capacity)
+        partition.add(deal_id, features)
+        if updated_at is not None and (partition.updated_at is None or updated_at > partition.updated_at):
+            partition.updated_at = updated_at
+        self._owners[deal_id] = owner_id
+
+    def observe(
+        self, deal_id: int, owner_id: int, features: np.ndarray, updated_at: Optional[datetime] = None
+    ) -> None:
+        """Record (or replace) a deal's feature vector."""
+
+        with self._lock:
+            self._observe(deal_id, owner_id, features, updated_at)
+
+    def discard(self, deal_id: int) -> None:
+        with self._lock:
+            self._discard(deal_id)
+
+    def fingerprint(self, owner_id: int) -> Tuple[int, Optional[int], Optional[datetime]]:
+        """``(deal count, max deal id, newest update)`` for an owner's partition."""
+
+        with self._lock:
+            partition = self._partitions.get(owner_id)
+            if partition is None or not len(partition):
+                return (0, None, None)
+            return (len(partition), int(partition.ids[: len(partition)].max()), partition.updated_at)
+
+    def replace_owner(self, owner_id: int, rows: Iterable[Tuple[int, np.ndarray, Optional[datetime]]]) -> None:
+        """Replace one owner's partition with ``(deal_id, features, updated_at)`` rows."""
+
+        fresh = ComparablesIndex(self._capacity)
+        for deal_id, features, updated_at in rows:
+            fresh._observe(deal_id, owner_id, features, updated_at)
+        with self._lock:
+            previous = self._partitions.pop(owner_id, None)
+            if previous is not None:
+                for deal_id in previous.slots:
+                    self._owners.pop(deal_id, None)
+            if owner_id in fresh._partitions:
+                self._partitions[owner_id] = fresh._partitions[owner_id]
+                self._owners.update(fresh._owners)
+
+    def rebuild(self, rows: Iterable[Tuple[int, int, np.ndarray, Optional[datetime]]]) -> None:
+        """Replace the index with ``(deal_id, owner_id, features, updated_at)`` rows."""
+
+        fresh = ComparablesIndex(self._capacity)
+        for deal_id, owner_id, features, updated_at in rows:
+            fresh._observe(deal_id, owner_id, features, updated_at)
+        with self._lock:
+            self._partitions, self._owners = fresh._partitions, fresh._owners
+
+    def query(self, deal_id: int, k: int) -> List[Comparable]:
+        """The ``k`` deals in the same owner's partition most similar to ``deal_id``."""
+
+        with self._lock:
+            owner = self._owners.get(deal_id)
+            if owner is None:
+                return []
+            partition = self._partitions[owner]
+            size = len(partition)
+            target = partition.features[partition.slots[deal_id]].copy()
+            scale = partition.scale()
+            ids = partition.ids[:size].copy()
+            features = partition.features[:size].copy()
+
+        # Features the source deal lacks are left out; features only the
+        # candidate lacks cost a fixed penalty instead of counting as a match.
+        weights = np.where(np.isnan(target), 0.0, _WEIGHTS)
+        total_weight = weights.sum()
+        standardized = (features - target) / scale
+        squared = np.where(np.isnan(features), COMPS_CONFIG["missing_feature_penalty"] ** 2, standardized**2)
+        shared_weight = (weights * ~np.isnan(features)).sum(axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            distance = np.sqrt((weights * np.nan_to_num(squared)).sum(axis=1) / total_weight)
+        eligible = (ids != deal_id) & (shared_weight >= COMPS_CONFIG["min_shared_weight"] * _WEIGHTS.sum())
+        distance = np.where(eligible, distance, np.inf)
+
+        count = min(k, int(eligible.sum()))
+        if count == 0:
+            return []
+        nearest = np.argpartition(distance, count - 1)[:count]
+        nearest = nearest[np.lexsort((ids[nearest], distance[nearest]))]
+        return [
+            Comparable(int(ids[i]), float(distance[i]), float(1.0 / (1.0 + distance[i])))
+            for i in nearest
+        ]
+
+
+comps_index = ComparablesIndex()
+
+
+def _newest(*timestamps: Optional[datetime]) -> Optional[datetime]:
+    present = [timestamp for timestamp in timestamps if timestamp is not None]
+    return max(present) if present else None
+
+
+def observe_deal(deal: Deal, index: ComparablesIndex = comps_index) -> None:
+    """Update the index after a deal (or its property) was created or updated."""
+
+    property_obj = deal.property
+    if property_obj is None:
+        features = deal_features(deal.purchase_price, deal.monthly_rent)
+    else:
+        features = deal_features(
+            deal.purchase_price,
+            deal.monthly_rent,
+            property_obj.square_feet,
+            property_obj.bedrooms,
+            property_obj.bathrooms,
+            property_obj.year_built,
+            property_obj.latitude,
+            property_obj.longitude,
+        )
+    updated_at = _newest(deal.updated_at, property_obj.updated_at if property_obj is not None else None)
+    index.observe(deal.id, deal.user_id, features, updated_at)
+
+
+def _feature_query(db: Session):
+    return db.query(
+        Deal.id,
+        Deal.user_id,
+        Deal.updated_at,
+        Property.updated_at,
+        Deal.purchase_price,
+        Deal.monthly_rent,
+        Property.square_feet,
+        Property.bedrooms,
+        Property.bathrooms,
+        Property.year_built,
+        Property.latitude,
+        Property.longitude,
+    ).outerjoin(Property, Deal.property_id == Property.id)
+
+
+def owner_fingerprint(db: Session, owner_id: int) -> Tuple[int, Optional[int], Optional[datetime]]:
+    """The database side of ``ComparablesIndex.fingerprint`` (one aggregate query)."""
+
+    count, max_id, deal_updated, property_updated = (
+        db.query(func.count(Deal.id), func.max(Deal.id), func.max(Deal.updated_at), func.max(Property.updated_at))
+        .outerjoin(Property, Deal.property_id == Property.id)
+        .filter(Deal.user_id == owner_id)
+        .one()
+    )
+    return (count, max_id, _newest(deal_updated, property_updated))
+
+
+def sync_owner(db: Session, owner_id: int, index: ComparablesIndex = comps_index) -> bool:
+    """Reload an owner's partition if the database has changed behind it; True when reloaded."""
+
+    if index.fingerprint(owner_id) == owner_fingerprint(db, owner_id):
+        return False
+    rows = _feature_query(db).filter(Deal.user_id == owner_id).yield_per(5000)
+    index.replace_owner(owner_id, ((row[0], deal_features(*row[4:]), _newest(row[2], row[3])) for row in rows))
+    return True
+
+
+def rebuild_from_db(db: Session, index: ComparablesIndex = comps_index) -> None:
+    """Rebuild the index with one joined query over deals and their properties."""
+
+    rows = _feature_query(db).yield_per(5000)
+    index.rebuild((row[0], row[1], deal_features(*row[4:]), _newest(row[2], row[3])) for row in rows)
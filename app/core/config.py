@@ -44,6 +44,37 @@ class Settings(BaseSettings):
         description="Comma-separated list of allowed CORS origins"
     )
 
+    # Analytics workers
+    SIMULATION_MAX_WORKERS: int = Field(
+        default=int(os.getenv("SIMULATION_MAX_WORKERS", "2")),
+        ge=0,
+        description="Processes used for Monte Carlo simulations and bulk recomputes (0 runs them in-process)"
+    )
+
+    # Import jobs
+    IMPORT_MAX_WORKERS: int = Field(
+        default=int(os.getenv("IMPORT_MAX_WORKERS", "2")),
+        ge=1,
+        description="Background threads running property import jobs"
+    )
+    IMPORT_UPLOAD_DIR: str = Field(
+        default=os.getenv("IMPORT_UPLOAD_DIR", "./uploads/imports"),
+        description="Where import uploads wait for their job (must survive restarts)"
+    )
+
+    # Assumptions
+    ASSUMPTIONS_REFRESH_SECONDS: float = Field(
+        default=float(os.getenv("ASSUMPTIONS_REFRESH_SECONDS", "5")),
+        gt=0,
+        description="How often each worker checks for a newer assumptions version"
+    )
+
+    # Rent index
+    RENT_INDEX_PATH: str = Field(
+        default=os.getenv("RENT_INDEX_PATH", "./rent_index.npz"),
+        description="Snapshot file used to warm-start the zip-code rent index"
+    )
+
     @model_validator(mode="after")
     def validate_secret_key(self):
         """Validate or generate secret key."""
@@ -0,0 +1,173 @@
+"""Geospatial helpers: geohash cells, bounding boxes and vectorized haversine."""
+from __future__ import annotations
+
+import math
+from typing import List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+EARTH_RADIUS_MILES = 3958.8
+
+# Half the Earth's circumference: no two points are further apart.
+MAX_DISTANCE_MILES = math.pi * EARTH_RADIUS_MILES
+
+GEO_CONFIG = {
+    "geohash_precision": 9,  # Stored precision (~5 m cells)
+    "max_cover_cells": 16,  # Geohash ranges OR-ed into one radius query
+    "cluster_cells_per_tile": 8,  # Map clusters per 256px tile width (~32px apart)
+}
+
+GEOHASH_ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
+_GEOHASH_VALUES = {char: value for value, char in enumerate(GEOHASH_ALPHABET)}
+
+
+class BoundingBox(NamedTuple):
+    min_lat: float
+    min_lon: float
+    max_lat: float
+    max_lon: float
+
+
+WORLD = BoundingBox(-90.0, -180.0, 90.0, 180.0)
+
+
+def geohash_encode(latitude: float, longitude: float, precision: int = GEO_CONFIG["geohash_precision"]) -> str:
+    """Standard base-32 geohash of a point."""
+
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars = []
+    bits, bit_count, even = 0, 0, True
+    while len(chars) < precision:
+        bounds, value = (lon_range, longitude) if even else (lat_range, latitude)
+        middle = (bounds[0] + bounds[1]) / 2
+        bits <<= 1
+        if value >= middle:
+            bits |= 1
+            bounds[0] = middle
+        else:
+            bounds[1] = middle
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(GEOHASH_ALPHABET[bits])
+            bits, bit_count = 0, 0
+    return "".join(chars)
+
+
+def geohash_encode_many(
+    latitudes: np.ndarray, longitudes: np.ndarray, precision: int = GEO_CONFIG["geohash_precision"]
+) -> np.ndarray:
+    """Vectorized ``geohash_encode`` for arrays of points (an array of strings)."""
+
+    latitudes = np.asarray(latitudes, dtype=np.float64)
+    longitudes = np.asarray(longitudes, dtype=np.float64)
+    lat_low, lat_high = np.full(latitudes.shape, -90.0), np.full(latitudes.shape, 90.0)
+    lon_low, lon_high = np.full(longitudes.shape, -180.0), np.full(longitudes.shape, 180.0)
+    codes = np.zeros(latitudes.shape, dtype=np.int64)
+    for bit in range(5 * precision):
+        if bit % 2 == 0:
+            values, low, high = longitudes, lon_low, lon_high
+        else:
+            values, low, high = latitudes, lat_low, lat_high
+        middle = (low + high) / 2
+        upper = values >= middle
+        codes = (codes << 1) | upper
+        np.copyto(low, middle, where=upper)
+        np.copyto(high, middle, where=~upper)
+    alphabet = np.array(list(GEOHASH_ALPHABET))
+    chars = [alphabet[(codes >> 5 * (precision - 1 - index)) & 31] for index in range(precision)]
+    return np.stack(chars, axis=-1).view(f"<U{precision}").reshape(latitudes.shape)
+
+
+def geohash_to_int(geohash: str) -> int:
+    """The geohash as an integer (5 bits per character); prefixes become right shifts."""
+
+    value = 0
+    for char in geohash:
+        value = (value << 5) | _GEOHASH_VALUES[char]
+    return value
+
+
+def int_to_geohash(value: int, precision: int) -> str:
+    """Inverse of ``geohash_to_int`` for a ``precision``-character geohash."""
+
+    return "".join(GEOHASH_ALPHABET[(value >> 5 * (precision - 1 - index)) & 31] for index in range(precision))
+
+
+def _cell_size(precision: int) -> Tuple[float, float]:
+    """(height, width) in degrees of a geohash cell at ``precision``."""
+
+    lon_bits = (5 * precision + 1) // 2
+    lat_bits = 5 * precision // 2
+    return 180.0 / 2 ** lat_bits, 360.0 / 2 ** lon_bits
+
+
+def geohash_cover(box: BoundingBox, max_cells: int = GEO_CONFIG["max_cover_cells"]) -> List[str]:
+    """The finest set of at most ``max_cells`` geohash prefixes covering ``box``.
+
+    Returns an empty list when even single-character cells would exceed the
+    budget; callers then rely on the bounding box alone.
+    """
+
+    for precision in range(GEO_CONFIG["geohash_precision"], 0, -1):
+        height, width = _cell_size(precision)
+        first_row, last_row = math.floor((box.min_lat + 90) / height), math.floor((box.max_lat + 90) / height)
+        first_col, last_col = math.floor((box.min_lon + 180) / width), math.floor((box.max_lon + 180) / width)
+        last_row = min(last_row, round(180 / height) - 1)
+        last_col = min(last_col, round(360 / width) - 1)
+        if (last_row - first_row + 1) * (last_col - first_col + 1) > max_cells:
+            continue
+        return sorted(
+            {
+                geohash_encode(-90 + (row + 0.5) * height, -180 + (col + 0.5) * width, precision)
+                for row in range(first_row, last_row + 1)
+                for col in range(first_col, last_col + 1)
+            }
+        )
+    return []
+
+
+def geohash_precision_for_zoom(zoom: int) -> int:
+    """Coarsest geohash precision whose cells are at most 1/``cluster_cells_per_tile`` of a map tile wide."""
+
+    target_lon_bits = zoom + math.ceil(math.log2(GEO_CONFIG["cluster_cells_per_tile"]))
+    for precision in range(1, GEO_CONFIG["geohash_precision"] + 1):
+        if (5 * precision + 1) // 2 >= target_lon_bits:
+            return precision
+    return GEO_CONFIG["geohash_precision"]
+
+
+def intersect(first: BoundingBox, second: BoundingBox) -> Optional[BoundingBox]:
+    """Overlap of two boxes, or None when they are disjoint."""
+
+    box = BoundingBox(
+        max(first.min_lat, second.min_lat),
+        max(first.min_lon, second.min_lon),
+        min(first.max_lat, second.max_lat),
+        min(first.max_lon, second.max_lon),
+    )
+    if box.min_lat > box.max_lat or box.min_lon > box.max_lon:
+        return None
+    return box
+
+
+def bounding_box(latitude: float, longitude: float, radius_miles: float) -> BoundingBox:
+    """Smallest lat/lon box containing the circle; spans all longitudes near the poles or antimeridian."""
+
+    lat_delta = math.degrees(radius_miles / EARTH_RADIUS_MILES)
+    min_lat, max_lat = max(latitude - lat_delta, -90.0), min(latitude + lat_delta, 90.0)
+    cos_lat = math.cos(math.radians(latitude))
+    if min_lat > -90 and max_lat < 90 and cos_lat > 1e-9:
+        lon_delta = math.degrees(radius_miles / (EARTH_RADIUS_MILES * cos_lat))
+        if lon_delta < 180 and -180 <= longitude - lon_delta and longitude + lon_delta <= 180:
+            return BoundingBox(min_lat, longitude - lon_delta, max_lat, longitude + lon_delta)
+    return BoundingBox(min_lat, -180.0, max_lat, 180.0)
+
+
+def haversine_miles(latitude: float, longitude: float, latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+    """Great-circle distances in miles from one point to arrays of points."""
+
+    lat1, lon1 = math.radians(latitude), math.radians(longitude)
+    lat2, lon2 = np.radians(latitudes), np.radians(longitudes)
+    a = np.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_MILES * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
@@ -0,0 +1,159 @@
+"""Radius, nearest-neighbour and map-cluster property search.
+
+Every property stores the geohash of its coordinates. A radius search
+covers the radius' bounding box with a handful of geohash cells, reads only
+``(id, latitude, longitude)`` for rows inside those cells and the box (a
+range scan on the ``(owner, geohash, latitude, longitude)`` index), and then
+computes exact great-circle distances for the survivors in one NumPy pass.
+
+The geohash is also a precomputed grid hierarchy for map clustering: a
+zoom level maps to a prefix length, and clusters are a ``GROUP BY`` on that
+prefix evaluated entirely in the database.
+"""
+from __future__ import annotations
+
+from itertools import islice
+from typing import Any, Iterator, List, NamedTuple, Optional
+
+import numpy as np
+from sqlalchemy import and_, func, or_
+
+from app.core.geo import MAX_DISTANCE_MILES, BoundingBox, bounding_box, geohash_cover, haversine_miles
+from app.models.property import Property
+
+GEO_SEARCH_CONFIG = {
+    "nearest_initial_radius_miles": 2.0,  # First ring searched by nearest-N
+    "nearest_growth": 4.0,  # Ring growth factor while too few neighbours are found
+    "full_points_zoom": 15,  # Map zoom from which individual points replace clusters
+}
+
+
+class MapCluster(NamedTuple):
+    """Aggregate of the properties in one geohash cell."""
+
+    cell: str
+    count: int
+    latitude: float
+    longitude: float
+    list_price_avg: Optional[float]
+    list_price_min: Optional[float]
+    list_price_max: Optional[float]
+
+
+class GeoCandidates(NamedTuple):
+    """Properties within a radius: ids, distances in miles and the requested sort key."""
+
+    ids: np.ndarray
+    distances: np.ndarray
+    sort_values: List[Any]
+
+
+def box_filter(query, box: BoundingBox):
+    """Restrict a property query to ``box`` through the geohash index."""
+
+    cells = geohash_cover(box)
+    if cells:
+        query = query.filter(or_(*[and_(Property.geohash >= cell, Property.geohash < cell + "~") for cell in cells]))
+    query = query.filter(Property.latitude.between(box.min_lat, box.max_lat))
+    if box.min_lon > -180 or box.max_lon < 180:
+        query = query.filter(Property.longitude.between(box.min_lon, box.max_lon))
+    return query
+
+
+def radius_candidates(
+    query, latitude: float, longitude: float, radius_miles: Optional[float], sort_column: Any = None
+) -> GeoCandidates:
+    """Properties of ``query`` within ``radius_miles`` (all with coordinates when None)."""
+
+    if radius_miles is not None:
+        query = box_filter(query, bounding_box(latitude, longitude, radius_miles))
+    else:
+        query = query.filter(Property.latitude.isnot(None), Property.longitude.isnot(None))
+    columns = [Property.id, Property.latitude, Property.longitude]
+    if sort_column is not None:
+        columns.append(sort_column)
+    rows = query.order_by(None).with_entities(*columns).all()
+    if not rows:
+        return GeoCandidates(np.empty(0, dtype=np.int64), np.empty(0), [])
+
+    transposed = list(zip(*rows))
+    ids = np.asarray(transposed[0], dtype=np.int64)
+    distances = haversine_miles(
+        latitude, longitude, np.asarray(transposed[1], dtype=np.float64), np.asarray(transposed[2], dtype=np.float64)
+    )
+    sort_values = list(transposed[3]) if sort_column is not None else []
+    if radius_miles is not None:
+        inside = np.flatnonzero(distances <= radius_miles)
+        ids, distances = ids[inside], distances[inside]
+        sort_values = [sort_values[index] for index in inside.tolist()] if sort_values else []
+    return GeoCandidates(ids, distances, sort_values)
+
+
+def nearest_candidates(
+    query,
+    latitude: float,
+    longitude: float,
+    count: int,
+    max_radius_miles: Optional[float] = None,
+    sort_column: Any = None,
+) -> GeoCandidates:
+    """The ``count`` properties of ``query`` nearest to a point, searched in growing rings."""
+
+    limit = min(max_radius_miles or MAX_DISTANCE_MILES, MAX_DISTANCE_MILES)
+    radius = min(GEO_SEARCH_CONFIG["nearest_initial_radius_miles"], limit)
+    while True:
+        found = radius_candidates(query, latitude, longitude, radius, sort_column)
+        if len(found.ids) >= count or radius >= limit:
+            break
+        radius = min(radius * GEO_SEARCH_CONFIG["nearest_growth"], limit)
+
+    order = np.lexsort((found.ids, found.distances))[:count]
+    return GeoCandidates(
+        found.ids[order],
+        found.distances[order],
+        [found.sort_values[index] for index in order.tolist()] if found.sort_values else [],
+    )
+
+
+def stream_within_radius(
+    query, latitude: float, longitude: float, radius_miles: float, batch_size: int
+) -> Iterator[Property]:
+    """Yield properties of ``query`` within ``radius_miles``, checked one NumPy batch at a time."""
+
+    rows = iter(box_filter(query, bounding_box(latitude, longitude, radius_miles)).yield_per(batch_size))
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            return
+        distances = haversine_miles(
+            latitude,
+            longitude,
+            np.fromiter((prop.latitude for prop in batch), dtype=np.float64, count=len(batch)),
+            np.fromiter((prop.longitude for prop in batch), dtype=np.float64, count=len(batch)),
+        )
+        for prop, inside in zip(batch, (distances <= radius_miles).tolist()):
+            if inside:
+                yield prop
+
+
+def cluster_cells(query, box: BoundingBox, precision: int) -> List[MapCluster]:
+    """Group the properties of ``query`` inside ``box`` by geohash prefix of length ``precision``."""
+
+    cell = func.substr(Property.geohash, 1, precision)
+    rows = (
+        box_filter(query, box)
+        .order_by(None)
+        .with_entities(
+            cell,
+            func.count(Property.id),
+            func.avg(Property.latitude),
+            func.avg(Property.longitude),
+            func.avg(Property.list_price),
+            func.min(Property.list_price),
+            func.max(Property.list_price),
+        )
+        .group_by(cell)
+        .order_by(cell)
+        .all()
+    )
+    return [MapCluster(*row) for row in rows]
@@ -0,0 +1,248 @@
+"""Goal seek: invert the deal model to find offer prices, rents and down payments.
+
+Monthly cash flow, DSCR and cash-on-cash return are linear in rent, price and
+down payment once the deal's other inputs are fixed (taxes and insurance that
+default from the assumptions scale with price), so those targets are solved in
+closed form for every deal at once. IRR has no closed form and is solved by
+vectorized bisection over a search bracket.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from app.core.amortization import payment_factors
+from app.core.analytics import calculate_returns_batch
+from app.core.assumptions import Assumptions
+from app.core.batch import DEAL_INPUT_COLUMNS, analyze_deals_batch, resolve_deal_columns
+
+GOAL_SEEK_VARIABLES = ("purchase_price", "monthly_rent", "down_payment")
+GOAL_SEEK_METRICS = ("monthly_cash_flow", "dscr", "cash_on_cash_return", "irr_percent")
+
+GOAL_SEEK_CONFIG = {
+    "tolerance": 0.01,  # Dollars; bisection stops once every bracket is narrower
+    "max_bisection_iterations": 100,
+    "price_bracket_multiplier": 10.0,  # Highest price searched, as a multiple of the input price
+    "rent_bracket_percent_of_price": 10.0,  # Highest monthly rent searched, as a percent of price
+}
+
+# Purchase price is maximized; rent and down payment are minimized.
+_MAXIMIZE = {"purchase_price"}
+
+
+def _derived_mask(columns: Mapping[str, Optional[Sequence[float]]], name: str, size: int) -> np.ndarray:
+    """True where a column value is missing and therefore derived from the assumptions."""
+
+    values = columns.get(name)
+    if values is None:
+        return np.ones(size, dtype=bool)
+    return np.isnan(np.asarray(values, dtype=np.float64))
+
+
+def _linear_terms(
+    columns: Mapping[str, Optional[Sequence[float]]], assumptions: Assumptions
+) -> Dict[str, np.ndarray]:
+    """Coefficients of the monthly model ``NOI = rent * k - fixed - price_rate * price``."""
+
+    deals = resolve_deal_columns(columns, assumptions)
+    size = deals["purchase_price"].shape[0]
+    derived_tax = _derived_mask(columns, "property_tax_annual", size)
+    derived_insurance = _derived_mask(columns, "insurance_annual", size)
+
+    price_rate = (
+        np.where(derived_tax, assumptions.property_tax_percent, 0.0)
+        + np.where(derived_insurance, assumptions.insurance_percent, 0.0)
+    ) / 100 / 12
+    fixed = (
+        np.where(derived_tax, 0.0, deals["property_tax_annual"])
+        + np.where(derived_insurance, 0.0, deals["insurance_annual"])
+    ) / 12 + deals["hoa_monthly"]
+    rent_share = 1 - (deals["vacancy_percent"] + deals["maintenance_percent"] + deals["management_percent"]) / 100
+
+    return {
+        **deals,
+        "price_rate": price_rate,
+        "fixed": fixed,
+        "rent_share": rent_share,
+        "payment_factor": payment_factors(deals["interest_rate"], deals["loan_term_years"]),
+    }
+
+
+def _solve_closed_form(terms: Mapping[str, np.ndarray], solve_for: str, metric: str, target: np.ndarray) -> np.ndarray:
+    """Boundary value of ``solve_for`` at which ``metric`` equals ``target``; NaN when unreachable."""
+
+    rent, price, down = terms["monthly_rent"], terms["purchase_price"], terms["down_payment"]
+    k, fixed, t, f = terms["rent_share"], terms["fixed"], terms["price_rate"], terms["payment_factor"]
+    loan = np.maximum(price - down, 0.0)
+    noi = rent * k - fixed - t * price
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if metric == "cash_on_cash_return" and solve_for == "down_payment":
+            # 1200 * (noi - f * (price - down)) >= target * down, for down > 0: the
+            # model reports 0% cash-on-cash with no down payment, so zero only
+            # qualifies for targets that are not positive.
+            slope = 1200 * f - target
+            bound = 1200 * (f * price - noi)
+            smallest = np.where(target <= 0, 0.0, GOAL_SEEK_CONFIG["tolerance"])
+            # With slope <= 0 the target holds only up to bound / slope (all of
+            # (0, price] when slope == 0), so the answer is the smallest payment.
+            below_ceiling = (slope == 0) | (smallest <= bound / slope)
+            value = np.where(
+                slope > 0,
+                np.maximum(bound / slope, smallest),
+                np.where((bound < 0) & below_ceiling, smallest, np.nan),
+            )
+        else:
+            if metric == "dscr":
+                # noi >= target * f * loan
+                if solve_for == "monthly_rent":
+                    value = (target * f * loan + fixed + t * price) / k
+                elif solve_for == "purchase_price":
+                    value = (rent * k - fixed + target * f * down) / (t + target * f)
+                else:
+                    value = price - noi / (target * f)
+            else:
+                required = target * down / 1200 if metric == "cash_on_cash_return" else target
+                # noi - f * loan >= required
+                if solve_for == "monthly_rent":
+                    value = (required + fixed + t * price + f * loan) / k
+                elif solve_for == "purchase_price":
+                    value = (rent * k - fixed + f * down - required) / (t + f)
+                else:
+                    value = price - (noi - required) / f
+
+            if solve_for == "monthly_rent":
+                value = np.where(k > 0, np.maximum(value, 0.0), np.nan)
+            elif solve_for == "down_payment":
+                value = np.maximum(value, 0.0)
+
+    value = np.where(np.isfinite(value), value, np.nan)
+    if solve_for == "purchase_price":
+        value = np.where(value > down, value, np.nan)
+    elif solve_for == "down_payment":
+        value = np.where(value < price, value, np.nan)
+    return value
+
+
+def _with_value(
+    columns: Mapping[str, Optional[Sequence[float]]], solve_for: str, value: np.ndarray
+) -> Dict[str, Optional[Sequence[float]]]:
+    return {**columns, solve_for: value}
+
+
+def _solve_irr_bisection(
+    columns: Mapping[str, Optional[Sequence[float]]],
+    assumptions: Assumptions,
+    solve_for: str,
+    target: np.ndarray,
+) -> np.ndarray:
+    """Bisect every deal's bracket at once for the IRR boundary.
+
+    Assumes IRR crosses the target at most once inside the bracket; deals
+    whose bracket never reaches the target are NaN.
+    """
+
+    price = np.asarray(columns["purchase_price"], dtype=np.float64)
+    down = np.asarray(columns["down_payment"], dtype=np.float64)
+    if solve_for == "purchase_price":
+        low, high = down.copy(), np.maximum(price, down) * GOAL_SEEK_CONFIG["price_bracket_multiplier"]
+    elif solve_for == "monthly_rent":
+        low, high = np.zeros_like(price), price * GOAL_SEEK_CONFIG["rent_bracket_percent_of_price"] / 100
+    else:
+        low, high = np.zeros_like(price), price.copy()
+
+    def meets(value: np.ndarray) -> np.ndarray:
+        irr = calculate_returns_batch(_with_value(columns, solve_for, value), assumptions)["irr_percent"]
+        with np.errstate(invalid="ignore"):
+            return irr >= target
+
+    maximize = solve_for in _MAXIMIZE
+    meets_low, meets_high = meets(low), meets(high)
+    # Keep the invariant that `inside` meets the target and `outside` does not.
+    inside, outside = (low, high) if maximize else (high, low)
+    already = meets_high if maximize else meets_low
+    reachable = meets_low if maximize else meets_high
+
+    width = float(np.max(np.abs(high - low), initial=0.0))
+    iterations = int(np.ceil(np.log2(max(width, GOAL_SEEK_CONFIG["tolerance"]) / GOAL_SEEK_CONFIG["tolerance"])))
+    for _ in range(min(iterations, GOAL_SEEK_CONFIG["max_bisection_iterations"])):
+        middle = (inside + outside) / 2
+        ok = meets(middle)
+        inside = np.where(ok, middle, inside)
+        outside = np.where(ok, outside, middle)
+
+    value = np.where(already, high if maximize else low, inside)
+    return np.where(reachable | already, value, np.nan)
+
+
+def _metric_values(
+    columns: Mapping[str, Optional[Sequence[float]]], assumptions: Assumptions, metric: str
+) -> np.ndarray:
+    if metric == "irr_percent":
+        return calculate_returns_batch(columns, assumptions)["irr_percent"]
+    return analyze_deals_batch(columns, assumptions)[metric]
+
+
+def goal_seek(
+    columns: Mapping[str, Optional[Sequence[float]]],
+    goals: Sequence[Mapping[str, Any]],
+    assumptions: Optional[Assumptions] = None,
+) -> Dict[str, Any]:
+    """Solve each goal for every deal in a columnar deal set.
+
+    A goal is ``{"solve_for", "metric", "target"}``; ``target`` is a scalar or
+    one value per deal. Each result holds the boundary value per deal (the
+    highest price, or the lowest rent or down payment, that still meets the
+    target; NaN when no value does), whether it was feasible, and the metric
+    re-evaluated at that value. ``combined`` gives, per solved variable, the
+    most restrictive bound across all goals for that variable.
+    """
+
+    assumptions = assumptions or Assumptions()
+    columns = {name: columns.get(name) for name in DEAL_INPUT_COLUMNS}
+    terms = _linear_terms(columns, assumptions)
+    size = terms["purchase_price"].shape[0]
+
+    results: List[Dict[str, Any]] = []
+    bounds: Dict[str, List[np.ndarray]] = {}
+    for goal in goals:
+        solve_for, metric = goal["solve_for"], goal["metric"]
+        if solve_for not in GOAL_SEEK_VARIABLES:
+            raise ValueError(f"Cannot solve for '{solve_for}'; choose one of {list(GOAL_SEEK_VARIABLES)}")
+        if metric not in GOAL_SEEK_METRICS:
+            raise ValueError(f"Unknown goal metric '{metric}'; choose one of {list(GOAL_SEEK_METRICS)}")
+        target = np.broadcast_to(np.asarray(goal["target"], dtype=np.float64), (size,))
+
+        if metric == "irr_percent":
+            value = _solve_irr_bisection(columns, assumptions, solve_for, target)
+            method = "bisection"
+        else:
+            if metric == "dscr" and np.any(target <= 0):
+                raise ValueError("DSCR targets must be positive.")
+            value = _solve_closed_form(terms, solve_for, metric, target)
+            method = "closed_form"
+
+        feasible = ~np.isnan(value)
+        probe = np.where(feasible, value, terms[solve_for])
+        achieved = np.where(feasible, _metric_values(_with_value(columns, solve_for, probe), assumptions, metric), np.nan)
+
+        results.append(
+            {
+                "solve_for": solve_for,
+                "metric": metric,
+                "target": target,
+                "method": method,
+                "value": value,
+                "feasible": feasible,
+                "achieved": achieved,
+            }
+        )
+        bounds.setdefault(solve_for, []).append(value)
+
+    combined = {}
+    for solve_for, values in bounds.items():
+        stacked = np.vstack(values)
+        combined[solve_for] = stacked.min(axis=0) if solve_for in _MAXIMIZE else stacked.max(axis=0)
+
+    return {"count": size, "goals": results, "combined": combined}
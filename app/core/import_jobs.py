@@ -0,0 +1,251 @@
+"""Background property import jobs.
+
+``POST /properties/import/jobs`` saves the upload under ``IMPORT_UPLOAD_DIR``,
+creates a ``Job`` row and hands it to a bounded thread pool. The thread
+streams the file through ``app.core.property_import`` and commits each chunk
+in the same transaction as the job's progress (``last_id`` is the last data
+row committed). A restarted import therefore continues after its last
+committed chunk without duplicating rows. XLSX uploads are first converted
+to CSV on the process pool, since parsing them is CPU-bound.
+
+A running job bumps ``updated_at`` with every chunk. The poller started by
+each app worker claims jobs that are pending or running but have gone quiet
+for ``stale_seconds`` (their worker died) and resumes them. Claims are a
+conditional UPDATE, so only one worker wins. Each claim stores a new
+``claim_token`` and every commit first checks it in the same transaction,
+so a worker that was only slow, not dead, stops at its next chunk instead
+of writing alongside the one that took over.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import shutil
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta
+from threading import Event, Lock, Thread
+from typing import IO, Callable, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core import property_import
+from app.core.pool import get_process_pool
+from app.models.job import Job, JobStatus, claim_job, renew_claim
+
+logger = logging.getLogger(__name__)
+
+IMPORT_JOB_KIND = "import_properties"
+
+IMPORT_JOB_CONFIG = {
+    "stale_seconds": 300.0,  # A running job silent for this long is presumed dead
+    "poll_seconds": 30.0,  # How often each worker looks for stale jobs
+    "max_errors": 1000,  # Row errors kept on the job ("skipped" counts them all)
+}
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = Lock()
+_poller: Optional[Tuple[Thread, Event]] = None
+
+
+def get_import_pool(max_workers: int) -> ThreadPoolExecutor:
+    """The shared import thread pool (created on first use)."""
+
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="import-job")
+        return _executor
+
+
+def save_upload(upload_dir: str, filename: str, file: IO[bytes]) -> str:
+    """Copy an upload to ``upload_dir`` and return its path."""
+
+    os.makedirs(upload_dir, exist_ok=True)
+    extension = os.path.splitext(filename)[1].lower()
+    path = os.path.join(upload_dir, f"{uuid.uuid4().hex}{extension}")
+    with open(path, "wb") as output:
+        shutil.copyfileobj(file, output, 1024 * 1024)
+    return path
+
+
+def create_import_job(db: Session, user_id: int, filename: str, path: str, duplicate_policy: str = "skip") -> Job:
+    """Create a pending import job for a saved upload."""
+
+    job = Job(
+        kind=IMPORT_JOB_KIND,
+        status=JobStatus.PENDING,
+        user_id=user_id,
+        params={"filename": filename, "path": path, "duplicate_policy": duplicate_policy},
+        result={"imported": 0, "updated": 0, "skipped": 0, "duplicates": 0, "errors": []},
+    )
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+def _commit_claimed(db: Session, job_id: int, token: str) -> bool:
+    """Commit the open transaction if this worker still holds the job's claim, else roll it back."""
+
+    if renew_claim(db, job_id, token):
+        db.commit()
+        return True
+    db.rollback()
+    logger.warning("Import job %s was claimed by another worker; stopping", job_id)
+    return False
+
+
+def _csv_path(db: Session, job: Job, process_workers: int) -> str:
+    """The CSV to import, converting an XLSX upload (once) on the process pool."""
+
+    path = job.params["path"]
+    if path.endswith(".csv"):
+        return path
+    converted = job.params.get("csv_path")
+    if converted and os.path.exists(converted):
+        return converted
+    converted = f"{path}.csv"
+    if process_workers > 0:
+        get_process_pool(process_workers).submit(property_import.xlsx_to_csv, path, converted).result()
+    else:
+        property_import.xlsx_to_csv(path, converted)
+    job.params = {**job.params, "csv_path": converted}
+    db.commit()
+    return converted
+
+
+def run_import_job(
+    job_id: int,
+    session_factory: Callable[[], Session],
+    process_workers: int = 0,
+    chunk_size: Optional[int] = None,
+) -> None:
+    """Claim and run (or resume) an import job to completion, recording failures on the job row."""
+
+    chunk_size = chunk_size or property_import.IMPORT_CHUNK_SIZE
+    max_errors = IMPORT_JOB_CONFIG["max_errors"]
+    db = session_factory()
+    token: Optional[str] = None
+    try:
+        job = db.query(Job).filter(Job.id == job_id).one()
+        token = claim_job(db, job, IMPORT_JOB_CONFIG["stale_seconds"])
+        if token is None:
+            return
+        db.refresh(job)
+        job.started_at = job.started_at or datetime.utcnow()
+        db.commit()
+
+        path = _csv_path(db, job, process_workers)
+        job.total = property_import.count_csv_rows(path)
+        if not _commit_claimed(db, job_id, token):
+            return
+
+        with open(path, "rb") as file:
+            rows = property_import.csv_rows(file)
+            for chunk, written in property_import.import_chunks(
+                db,
+                job.user_id,
+                rows,
+                chunk_size=chunk_size,
+                skip_rows=job.last_id,
+                duplicate_policy=job.params.get("duplicate_policy", "skip"),
+            ):
+                result = dict(job.result or {})
+                result["imported"] = result.get("imported", 0) + len(chunk.created_ids)
+                result["updated"] = result.get("updated", 0) + len(chunk.updated_ids)
+                result["skipped"] = result.get("skipped", 0) + len(chunk.errors)
+                result["duplicates"] = result.get("duplicates", 0) + chunk.duplicates
+                result["errors"] = (result.get("errors", []) + chunk.errors)[:max_errors]
+                job.result = result
+                job.processed = chunk.last_row
+                job.last_id = chunk.last_row
+                # The chunk's rows and the job's progress land together, or not at all.
+                if not _commit_claimed(db, job_id, token):
+                    return
+                property_import.observe_imported(db, chunk, written)
+
+        job.status = JobStatus.COMPLETED
+        job.finished_at = datetime.utcnow()
+        if not _commit_claimed(db, job_id, token):
+            return
+        for leftover in {job.params["path"], job.params.get("csv_path")} - {None}:
+            if os.path.exists(leftover):
+                os.remove(leftover)
+    except Exception as exc:
+        logger.exception("Import job %s failed", job_id)
+        db.rollback()
+        if token is not None:
+            # Only the claim holder may fail the job.
+            db.query(Job).filter(Job.id == job_id, Job.claim_token == token).update(
+                {Job.status: JobStatus.FAILED, Job.error: str(exc)[:500]}, synchronize_session=False
+            )
+            db.commit()
+    finally:
+        db.close()
+
+
+def submit_import_job(
+    job_id: int, session_factory: Callable[[], Session], max_workers: int, process_workers: int = 0
+) -> Future:
+    """Queue an import job on the thread pool."""
+
+    return get_import_pool(max_workers).submit(run_import_job, job_id, session_factory, process_workers)
+
+
+def resume_stale_jobs(
+    session_factory: Callable[[], Session], max_workers: int, process_workers: int = 0
+) -> int:
+    """Queue every import job whose worker appears to have died; returns how many."""
+
+    cutoff = datetime.utcnow() - timedelta(seconds=IMPORT_JOB_CONFIG["stale_seconds"])
+    db = session_factory()
+    try:
+        stale = (
+            db.query(Job.id)
+            .filter(
+                Job.kind == IMPORT_JOB_KIND,
+                Job.status.in_([JobStatus.PENDING, JobStatus.RUNNING]),
+                Job.updated_at < cutoff,
+            )
+            .all()
+        )
+    finally:
+        db.close()
+    for (job_id,) in stale:
+        submit_import_job(job_id, session_factory, max_workers, process_workers)
+    return len(stale)
+
+
+def _poll(session_factory: Callable[[], Session], max_workers: int, process_workers: int, stop: Event) -> None:
+    while True:
+        try:
+            resume_stale_jobs(session_factory, max_workers, process_workers)
+        except Exception:
+            logger.exception("Import job poll failed")
+        if stop.wait(IMPORT_JOB_CONFIG["poll_seconds"]):
+            return
+
+
+def start_import_job_poller(session_factory: Callable[[], Session], max_workers: int, process_workers: int = 0) -> None:
+    """Start this worker's stale-job check (idempotent); the first check runs immediately."""
+
+    global _poller
+    if _poller is not None:
+        return
+    stop = Event()
+    thread = Thread(
+        target=_poll, args=(session_factory, max_workers, process_workers, stop), name="import-job-poller", daemon=True
+    )
+    thread.start()
+    _poller = (thread, stop)
+
+
+def stop_import_job_poller() -> None:
+    global _poller
+    if _poller is None:
+        return
+    thread, stop = _poller
+    stop.set()
+    thread.join(timeout=5)
+    _poller = None
@@ -0,0 +1,386 @@
+"""In-memory map clustering index.
+
+Each owner's geolocated properties live in a partition of parallel NumPy
+arrays (id, integer geohash, latitude, longitude, list price). Ordering a
+partition by its integer geohash turns every zoom level's grid cells into
+contiguous runs (a cell at precision ``p`` is ``key >> 5 * (9 - p)``), so
+clustering a viewport is a few ``searchsorted`` range lookups (the
+viewport's geohash cover), a mask and one ``reduceat`` per aggregate rather
+than a ``GROUP BY`` over the owner's rows. The sorted copy is built lazily
+and reused until the partition changes. Writes served by other workers are
+picked up by ``sync_owner``, which compares a per-owner fingerprint with the
+database the same way the comparables index does. Over a large portfolio the
+fingerprint itself costs a scan of the owner's rows, so it is checked at most
+once per ``sync_interval_seconds``; this worker's own writes are applied
+immediately regardless.
+"""
+from __future__ import annotations
+
+from datetime import datetime
+import time
+from threading import Lock
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.geo import GEO_CONFIG, BoundingBox, geohash_cover, geohash_to_int, int_to_geohash
+from app.core.geo_search import MapCluster
+from app.models.property import Property
+
+MAP_INDEX_CONFIG = {
+    "initial_capacity": 64,
+    "sync_interval_seconds": 5.0,  # Staleness bound for writes made by other workers
+}
+
+_STORED_PRECISION = GEO_CONFIG["geohash_precision"]
+
+# Called after writes with ``(owner_id, [(lat, lon), ...])`` for the locations
+# a change touched; ``None`` means every location (of the owner, or of all owners).
+ChangeListener = Callable[[Optional[int], Optional[List[Tuple[float, float]]]], None]
+
+
+class _Partition:
+    """Parallel arrays for one owner's geolocated properties."""
+
+    def __init__(self, capacity: int) -> None:
+        self.ids = np.zeros(capacity, dtype=np.int64)
+        self.keys = np.zeros(capacity, dtype=np.int64)
+        self.latitudes = np.zeros(capacity, dtype=np.float64)
+        self.longitudes = np.zeros(capacity, dtype=np.float64)
+        self.prices = np.full(capacity, np.nan)
+        self.slots: Dict[int, int] = {}
+        self.updated_at: Optional[datetime] = None
+        self._sorted: Optional[Tuple[np.ndarray, ...]] = None
+
+    def __len__(self) -> int:
+        return len(self.slots)
+
+    def add(self, property_id: int, key: int, latitude: float, longitude: float, price: float) -> None:
+        slot = len(self.slots)
+        if slot == self.ids.shape[0]:
+            capacity = max(2 * slot, 1)
+            self.ids = np.resize(self.ids, capacity)
+            self.keys = np.resize(self.keys, capacity)
+            self.latitudes = np.resize(self.latitudes, capacity)
+            self.longitudes = np.resize(self.longitudes, capacity)
+            self.prices = np.resize(self.prices, capacity)
+        self.ids[slot] = property_id
+        self.keys[slot] = key
+        self.latitudes[slot] = latitude
+        self.longitudes[slot] = longitude
+        self.prices[slot] = price
+        self.slots[property_id] = slot
+        self._sorted = None
+
+    def remove(self, property_id: int) -> Optional[Tuple[float, float]]:
+        """Drop a property, returning the location it had."""
+
+        slot = self.slots.pop(property_id, None)
+        if slot is None:
+            return None
+        location = (float(self.latitudes[slot]), float(self.longitudes[slot]))
+        last = len(self.slots)
+        if slot != last:
+            moved = int(self.ids[last])
+            for array in (self.ids, self.keys, self.latitudes, self.longitudes, self.prices):
+                array[slot] = array[last]
+            self.slots[moved] = slot
+        self._sorted = None
+        return location
+
+    def sorted_view(self) -> Tuple[np.ndarray, ...]:
+        """(ids, keys, latitudes, longitudes, prices) ordered by geohash; never mutated once built."""
+
+        if self._sorted is None:
+            size = len(self.slots)
+            order = np.argsort(self.keys[:size], kind="stable")
+            self._sorted = tuple(
+                array[order] for array in (self.ids, self.keys, self.latitudes, self.longitudes, self.prices)
+            )
+        return self._sorted
+
+
+def _in_box(view: Tuple[np.ndarray, ...], box: BoundingBox) -> Tuple[np.ndarray, ...]:
+    """The rows of a sorted view inside ``box``, still ordered by geohash."""
+
+    keys, latitudes, longitudes = view[1], view[2], view[3]
+    # Only the key ranges of the viewport's geohash cover can match.
+    ranges = []
+    for cell in geohash_cover(box):
+        shift = 5 * (_STORED_PRECISION - len(cell))
+        value = geohash_to_int(cell)
+        ranges.append(np.searchsorted(keys, [value << shift, (value + 1) << shift]))
+    if ranges and sum(stop - start for start, stop in ranges) < keys.shape[0]:
+        rows = np.concatenate([np.arange(start, stop) for start, stop in ranges])
+        view = tuple(array[rows] for array in view)
+        keys, latitudes, longitudes = view[1], view[2], view[3]
+
+    inside = (
+        (latitudes >= box.min_lat)
+        & (latitudes <= box.max_lat)
+        & (longitudes >= box.min_lon)
+        & (longitudes <= box.max_lon)
+    )
+    return tuple(array[inside] for array in view)
+
+
+class MapClusterIndex:
+    """Thread-safe, incrementally maintained per-owner geohash index."""
+
+    def __init__(self, capacity: int = MAP_INDEX_CONFIG["initial_capacity"]) -> None:
+        self._lock = Lock()
+        self._capacity = capacity
+        self._partitions: Dict[int, _Partition] = {}
+        self._owners: Dict[int, int] = {}
+        self._checked: Dict[int, float] = {}
+        self._listeners: List[ChangeListener] = []
+
+    def __len__(self) -> int:
+        return len(self._owners)
+
+    def _partition(self, owner_id: int) -> _Partition:
+        partition = self._partitions.get(owner_id)
+        if partition is None:
+            partition = self._partitions[owner_id] = _Partition(self._capacity)
+        return partition
+
+    def add_listener(self, listener: ChangeListener) -> None:
+        """Notify ``listener`` of every change (used to invalidate cached map tiles)."""
+
+        self._listeners.append(listener)
+
+    def _notify(self, owner_id: Optional[int], locations: Optional[List[Tuple[float, float]]]) -> None:
+        for listener in self._listeners:
+            listener(owner_id, locations)
+
+    def _discard(self, property_id: int) -> Optional[Tuple[int, Tuple[float, float]]]:
+        owner = self._owners.pop(property_id, None)
+        if owner is None:
+            return None
+        return owner, self._partitions[owner].remove(property_id)
+
+    def _observe(
+        self,
+        property_id: int,
+        owner_id: int,
+        geohash: Optional[str],
+        latitude: Optional[float],
+        longitude: Optional[float],
+        price: Optional[float],
+        updated_at: Optional[datetime],
+    ) -> List[Tuple[int, Tuple[float, float]]]:
+        """Apply a write; returns the ``(owner, location)`` pairs it touched."""
+
+        previous = self._discard(property_id)
+        touched = [previous] if previous else []
+        partition = self._partition(owner_id)
+        if updated_at is not None and (partition.updated_at is None or updated_at > partition.updated_at):
+            partition.updated_at = updated_at
+        if not geohash or latitude is None or longitude is None:
+            return touched
+        partition.add(
+            property_id,
+            geohash_to_int(geohash[:_STORED_PRECISION]),
+            latitude,
+            longitude,
+            np.nan if price is None else price,
+        )
+        self._owners[property_id] = owner_id
+        touched.append((owner_id, (latitude, longitude)))
+        return touched
+
+    def observe(
+        self,
+        property_id: int,
+        owner_id: int,
+        geohash: Optional[str],
+        latitude: Optional[float],
+        longitude: Optional[float],
+        price: Optional[float] = None,
+        updated_at: Optional[datetime] = None,
+    ) -> None:
+        """Record (or replace) a property; properties without coordinates are only forgotten."""
+
+        with self._lock:
+            touched = self._observe(property_id, owner_id, geohash, latitude, longitude, price, updated_at)
+        for owner, location in touched:
+            self._notify(owner, [location])
+
+    def observe_many(self, rows: Iterable[Tuple]) -> None:
+        """``observe`` for ``(id, owner_id, geohash, lat, lon, price, updated_at)`` rows, notifying once per owner."""
+
+        touched: Dict[int, List[Tuple[float, float]]] = {}
+        with self._lock:
+            for row in rows:
+                for owner, location in self._observe(*row):
+                    touched.setdefault(owner, []).append(location)
+        for owner, locations in touched.items():
+            self._notify(owner, locations)
+
+    def discard(self, property_id: int) -> None:
+        with self._lock:
+            previous = self._discard(property_id)
+        if previous:
+            self._notify(previous[0], [previous[1]])
+
+    def claim_check(self, owner_id: int, interval: float) -> bool:
+        """True (and restart the clock) when an owner's fingerprint is due for a check."""
+
+        now = time.monotonic()
+        with self._lock:
+            checked = self._checked.get(owner_id)
+            if checked is not None and now - checked < interval:
+                return False
+            self._checked[owner_id] = now
+            return True
+
+    def fingerprint(self, owner_id: int) -> Tuple[int, Optional[int], Optional[datetime]]:
+        """``(geolocated count, max id, newest update)`` for an owner's partition."""
+
+        with self._lock:
+            partition = self._partitions.get(owner_id)
+            if partition is None:
+                return (0, None, None)
+            size = len(partition)
+            max_id = int(partition.ids[:size].max()) if size else None
+            return (size, max_id, partition.updated_at)
+
+    def replace_owner(self, owner_id: int, rows: Iterable[Tuple]) -> None:
+        """Replace one owner's partition with ``(id, geohash, lat, lon, price, updated_at)`` rows."""
+
+        fresh = MapClusterIndex(self._capacity)
+        for property_id, geohash, latitude, longitude, price, updated_at in rows:
+            fresh._observe(property_id, owner_id, geohash, latitude, longitude, price, updated_at)
+        with self._lock:
+            previous = self._partitions.pop(owner_id, None)
+            if previous is not None:
+                for property_id in previous.slots:
+                    self._owners.pop(property_id, None)
+            if owner_id in fresh._partitions:
+                self._partitions[owner_id] = fresh._partitions[owner_id]
+                self._owners.update(fresh._owners)
+        self._notify(owner_id, None)
+
+    def rebuild(self, rows: Iterable[Tuple]) -> None:
+        """Replace the index with ``(id, owner_id, geohash, lat, lon, price, updated_at)`` rows."""
+
+        fresh = MapClusterIndex(self._capacity)
+        for property_id, owner_id, geohash, latitude, longitude, price, updated_at in rows:
+            fresh._observe(property_id, owner_id, geohash, latitude, longitude, price, updated_at)
+        with self._lock:
+            self._partitions, self._owners = fresh._partitions, fresh._owners
+            self._checked.clear()
+        self._notify(None, None)
+
+    def clusters(self, owner_id: int, box: BoundingBox, precision: int) -> List[MapCluster]:
+        """Clusters of an owner's properties inside ``box`` at geohash ``precision``."""
+
+        with self._lock:
+            partition = self._partitions.get(owner_id)
+            if partition is None or not len(partition):
+                return []
+            view = partition.sorted_view()
+
+        _, keys, latitudes, longitudes, prices = _in_box(view, box)
+        if not keys.shape[0]:
+            return []
+        cells = keys >> 5 * (_STORED_PRECISION - precision)
+
+        # Rows are ordered by geohash, so each cell is one contiguous run.
+        starts = np.concatenate(([0], np.flatnonzero(np.diff(cells)) + 1))
+        counts = np.diff(np.append(starts, cells.shape[0]))
+        priced = ~np.isnan(prices)
+        price_counts = np.add.reduceat(priced.astype(np.int64), starts)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            price_avg = np.add.reduceat(np.where(priced, prices, 0.0), starts) / price_counts
+        price_min = np.fmin.reduceat(prices, starts)
+        price_max = np.fmax.reduceat(prices, starts)
+        lat_avg = np.add.reduceat(latitudes, starts) / counts
+        lon_avg = np.add.reduceat(longitudes, starts) / counts
+
+        def optional(values: np.ndarray, index: int) -> Optional[float]:
+            return float(values[index]) if price_counts[index] else None
+
+        return [
+            MapCluster(
+                int_to_geohash(int(cells[start]), precision),
+                int(counts[index]),
+                float(lat_avg[index]),
+                float(lon_avg[index]),
+                optional(price_avg, index),
+                optional(price_min, index),
+                optional(price_max, index),
+            )
+            for index, start in enumerate(starts.tolist())
+        ]
+
+    def points(self, owner_id: int, box: BoundingBox) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """``(ids, latitudes, longitudes, prices)`` of an owner's properties inside ``box``, by geohash."""
+
+        with self._lock:
+            partition = self._partitions.get(owner_id)
+            view = partition.sorted_view() if partition is not None else _Partition(0).sorted_view()
+
+        ids, _, latitudes, longitudes, prices = _in_box(view, box)
+        return ids, latitudes, longitudes, prices
+
+
+map_index = MapClusterIndex()
+
+
+def observe_property(prop: Property, index: MapClusterIndex = map_index) -> None:
+    """Update the index after a property was created or updated."""
+
+    index.observe(
+        prop.id, prop.owner_user_id, prop.geohash, prop.latitude, prop.longitude, prop.list_price, prop.updated_at
+    )
+
+
+def _row_query(db: Session):
+    return db.query(
+        Property.id,
+        Property.owner_user_id,
+        Property.geohash,
+        Property.latitude,
+        Property.longitude,
+        Property.list_price,
+        Property.updated_at,
+    )
+
+
+def owner_fingerprint(db: Session, owner_id: int) -> Tuple[int, Optional[int], Optional[datetime]]:
+    """The database side of ``MapClusterIndex.fingerprint`` (one aggregate query)."""
+
+    geolocated = Property.geohash.isnot(None)
+    count, max_id = (
+        db.query(func.count(Property.id), func.max(Property.id))
+        .filter(Property.owner_user_id == owner_id, geolocated)
+        .one()
+    )
+    updated_at = db.query(func.max(Property.updated_at)).filter(Property.owner_user_id == owner_id).scalar()
+    return (count, max_id, updated_at)
+
+
+def sync_owner(
+    db: Session,
+    owner_id: int,
+    index: MapClusterIndex = map_index,
+    interval: float = MAP_INDEX_CONFIG["sync_interval_seconds"],
+) -> bool:
+    """Reload an owner's partition if the database has changed behind it; True when reloaded."""
+
+    if not index.claim_check(owner_id, interval):
+        return False
+    if index.fingerprint(owner_id) == owner_fingerprint(db, owner_id):
+        return False
+    rows = _row_query(db).filter(Property.owner_user_id == owner_id).yield_per(5000)
+    index.replace_owner(owner_id, ((row[0], *row[2:]) for row in rows))
+    return True
+
+
+def rebuild_from_db(db: Session, index: MapClusterIndex = map_index) -> None:
+    """Rebuild the index with one query over all properties."""
+
+    index.rebuild(tuple(row) for row in _row_query(db).yield_per(5000))
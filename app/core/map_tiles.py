@@ -0,0 +1,216 @@
+"""Cached slippy-map tiles built from the map clustering index.
+
+A tile ``z/x/y`` (Web Mercator, as used by Leaflet/Mapbox) is encoded as
+compact columnar JSON: clusters below ``full_points_zoom``, bare points
+(id, position, list price) from there up. Encoded tiles are kept in a bounded
+LRU keyed by owner and tile. The index notifies the cache of every write with
+the locations it touched, so only the tiles containing those locations (one
+per zoom level) are dropped; a reload of an owner's partition after another
+worker wrote drops that owner's tiles.
+
+ETags are a digest of the encoded tile, so a tile that no write touched keeps
+its ETag even across evictions and reloads. Each owner also has a data
+version, bumped on every invalidation, which stops a tile that was being
+built while a write landed from being cached.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+from collections import OrderedDict
+from threading import Lock
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from app.core.geo import BoundingBox, geohash_precision_for_zoom
+from app.core.geo_search import GEO_SEARCH_CONFIG
+from app.core.map_index import MapClusterIndex, map_index
+
+MAP_TILE_CONFIG = {
+    "max_tiles": 4096,
+    "max_bytes": 32 * 1024 * 1024,
+    "max_zoom": 22,
+    "max_tracked_locations": 256,  # Larger writes (e.g. imports) drop all of the owner's tiles
+}
+
+# Web Mercator cannot show the poles; the edge rows of tiles extend to them.
+MAX_MERCATOR_LATITUDE = 85.0511287798066
+
+# Coordinates nudged by this much decide which tiles an edge point touches.
+_EDGE_EPSILON = 1e-9
+
+TileKey = Tuple[int, int, int, int]  # (owner, z, x, y)
+
+
+def tile_bounds(z: int, x: int, y: int) -> BoundingBox:
+    """Lat/lon box covered by a tile."""
+
+    n = 2 ** z
+    min_lon, max_lon = x / n * 360.0 - 180.0, (x + 1) / n * 360.0 - 180.0
+    max_lat = 90.0 if y == 0 else math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * y / n))))
+    min_lat = -90.0 if y == n - 1 else math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * (y + 1) / n))))
+    return BoundingBox(min_lat, min_lon, max_lat, max_lon)
+
+
+def tile_for(latitude: float, longitude: float, z: int) -> Tuple[int, int]:
+    """``(x, y)`` of the tile containing a point at zoom ``z``."""
+
+    n = 2 ** z
+    latitude = max(min(latitude, MAX_MERCATOR_LATITUDE), -MAX_MERCATOR_LATITUDE)
+    x = math.floor((longitude + 180.0) / 360.0 * n)
+    lat = math.radians(latitude)
+    y = math.floor((1 - math.log(math.tan(lat) + 1 / math.cos(lat)) / math.pi) / 2 * n)
+    return min(max(x, 0), n - 1), min(max(y, 0), n - 1)
+
+
+def tiles_touching(
+    latitude: float, longitude: float, max_zoom: int = MAP_TILE_CONFIG["max_zoom"]
+) -> Set[Tuple[int, int, int]]:
+    """Every ``(z, x, y)`` whose box contains the point, including both sides of a tile edge."""
+
+    tiles = set()
+    for z in range(max_zoom + 1):
+        for lat in (latitude - _EDGE_EPSILON, latitude + _EDGE_EPSILON):
+            for lon in (longitude - _EDGE_EPSILON, longitude + _EDGE_EPSILON):
+                tiles.add((z, *tile_for(lat, lon, z)))
+    return tiles
+
+
+def _column(values: np.ndarray, digits: int) -> List[Optional[float]]:
+    return [None if math.isnan(value) else round(value, digits) for value in values.tolist()]
+
+
+def encode_tile(index: MapClusterIndex, owner_id: int, z: int, x: int, y: int) -> bytes:
+    """Columnar JSON for one tile of an owner's properties."""
+
+    box = tile_bounds(z, x, y)
+    tile: Dict[str, object] = {"z": z, "x": x, "y": y}
+    if z < GEO_SEARCH_CONFIG["full_points_zoom"]:
+        clusters = index.clusters(owner_id, box, geohash_precision_for_zoom(z))
+        tile["clusters"] = {
+            "cell": [cluster.cell for cluster in clusters],
+            "latitude": [round(cluster.latitude, 6) for cluster in clusters],
+            "longitude": [round(cluster.longitude, 6) for cluster in clusters],
+            "count": [cluster.count for cluster in clusters],
+            "heat_value": [cluster.list_price_avg for cluster in clusters],
+            "heat_min": [cluster.list_price_min for cluster in clusters],
+            "heat_max": [cluster.list_price_max for cluster in clusters],
+        }
+    else:
+        ids, latitudes, longitudes, prices = index.points(owner_id, box)
+        tile["points"] = {
+            "id": ids.tolist(),
+            "latitude": _column(latitudes, 6),
+            "longitude": _column(longitudes, 6),
+            "list_price": _column(prices, 2),
+        }
+    return json.dumps(tile, separators=(",", ":")).encode("utf-8")
+
+
+def tile_etag(body: bytes) -> str:
+    """Strong ETag for an encoded tile."""
+
+    return '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+
+
+class TileCache:
+    """Thread-safe LRU of encoded tiles with an entry cap and a byte cap."""
+
+    def __init__(self, max_tiles: int, max_bytes: int, max_zoom: int, max_tracked_locations: int = 256) -> None:
+        self.max_tiles = max_tiles
+        self.max_bytes = max_bytes
+        self.max_zoom = max_zoom
+        self.max_tracked_locations = max_tracked_locations
+        self._entries: "OrderedDict[TileKey, Tuple[str, bytes]]" = OrderedDict()
+        self._versions: Dict[int, int] = {}
+        self._epoch = 0  # Bumped when every owner's tiles are dropped at once
+        self._lock = Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def version(self, owner_id: int) -> Tuple[int, int]:
+        """The owner's data version; changes whenever any of their tiles is invalidated."""
+
+        with self._lock:
+            return self._epoch, self._versions.get(owner_id, 0)
+
+    def get(self, key: TileKey) -> Optional[Tuple[str, bytes]]:
+        """``(etag, body)`` of a cached tile, or None."""
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def set(self, key: TileKey, etag: str, body: bytes, version: Tuple[int, int]) -> None:
+        """Cache a tile built at data ``version``; dropped if the owner changed since."""
+
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            if (self._epoch, self._versions.get(key[0], 0)) != version:
+                return
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (etag, body)
+            self._bytes += len(body)
+            while len(self._entries) > self.max_tiles or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, owner_id: Optional[int], locations: Optional[List[Tuple[float, float]]]) -> None:
+        """Drop the tiles containing ``locations``; all of an owner's (or everyone's) tiles when None."""
+
+        with self._lock:
+            if owner_id is None:
+                self._epoch += 1
+                self.invalidations += len(self._entries)
+                self._entries.clear()
+                self._bytes = 0
+                return
+            self._versions[owner_id] = self._versions.get(owner_id, 0) + 1
+            if locations is None or len(locations) > self.max_tracked_locations:
+                keys = [key for key in self._entries if key[0] == owner_id]
+            else:
+                keys = [
+                    (owner_id, *tile)
+                    for latitude, longitude in locations
+                    for tile in tiles_touching(latitude, longitude, self.max_zoom)
+                ]
+            for key in keys:
+                if key in self._entries:
+                    self._remove(key)
+                    self.invalidations += 1
+
+    def _remove(self, key: TileKey) -> None:
+        _, body = self._entries.pop(key)
+        self._bytes -= len(body)
+
+
+tile_cache = TileCache(**MAP_TILE_CONFIG)
+map_index.add_listener(tile_cache.invalidate)
+
+
+def get_tile(
+    owner_id: int, z: int, x: int, y: int, index: MapClusterIndex = map_index, cache: TileCache = tile_cache
+) -> Tuple[str, bytes]:
+    """``(etag, body)`` for a tile, from the cache when possible."""
+
+    key = (owner_id, z, x, y)
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+    version = cache.version(owner_id)
+    body = encode_tile(index, owner_id, z, x, y)
+    etag = tile_etag(body)
+    cache.set(key, etag, body, version)
+    return etag, body
@@ -0,0 +1,23 @@
+"""Shared, lazily created process pool for CPU-heavy analytics work."""
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from threading import Lock
+from typing import Optional
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_workers = 0
+_executor_lock = Lock()
+
+
+def get_process_pool(max_workers: int) -> ProcessPoolExecutor:
+    """Return the worker pool, recreating it if a different size is requested."""
+
+    global _executor, _executor_workers
+    with _executor_lock:
+        if _executor is None or _executor_workers != max_workers:
+            if _executor is not None:
+                _executor.shutdown(wait=False)
+            _executor = ProcessPoolExecutor(max_workers=max_workers)
+            _executor_workers = max_workers
+        return _executor
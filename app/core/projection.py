@@ -0,0 +1,91 @@
+"""Multi-year deal projections computed as (deals x years) NumPy arrays."""
+from __future__ import annotations
+
+from typing import Dict, Mapping, Optional, Sequence
+
+import numpy as np
+
+from app.core.amortization import monthly_payment_batch, remaining_balance_batch
+from app.core.assumptions import Assumptions
+from app.core.batch import resolve_deal_columns
+
+MAX_PROJECTION_YEARS = 50
+
+
+def _per_deal(value: float | Sequence[float], size: int) -> np.ndarray:
+    return np.broadcast_to(np.asarray(value, dtype=np.float64), (size,))[:, None]
+
+
+def project_deals(
+    columns: Mapping[str, Optional[Sequence[float]]],
+    years: int,
+    assumptions: Optional[Assumptions] = None,
+    *,
+    rent_growth_percent: Optional[float | Sequence[float]] = None,
+    appreciation_percent: Optional[float | Sequence[float]] = None,
+    expense_growth_percent: Optional[float | Sequence[float]] = None,
+) -> Dict[str, np.ndarray]:
+    """Project yearly operating and balance-sheet figures for a set of deals.
+
+    Every returned series has shape ``(len(deals), years)``; column ``t`` is
+    operating year ``t + 1``. Rent and the rent-based expenses (vacancy,
+    maintenance, management) grow with rent, while taxes, insurance and HOA
+    grow at the expense rate. Loan balance, property value and equity are
+    end-of-year values. Growth rates default to the assumptions and may be
+    given per deal.
+    """
+
+    if not 1 <= years <= MAX_PROJECTION_YEARS:
+        raise ValueError(f"years must be between 1 and {MAX_PROJECTION_YEARS}")
+
+    assumptions = assumptions or Assumptions()
+    deals = resolve_deal_columns(columns, assumptions)
+    size = deals["purchase_price"].shape[0]
+
+    rent_growth = _per_deal(
+        assumptions.rent_growth_percent_annual if rent_growth_percent is None else rent_growth_percent, size
+    )
+    appreciation = _per_deal(
+        assumptions.appreciation_percent_annual if appreciation_percent is None else appreciation_percent, size
+    )
+    expense_growth = _per_deal(
+        assumptions.expense_growth_percent_annual if expense_growth_percent is None else expense_growth_percent, size
+    )
+
+    year = np.arange(1, years + 1, dtype=np.float64)[None, :]
+
+    gross_rent = (deals["monthly_rent"] * 12)[:, None] * (1 + rent_growth / 100) ** (year - 1)
+    vacancy_loss = gross_rent * deals["vacancy_percent"][:, None] / 100
+    variable_expenses = gross_rent * (deals["maintenance_percent"] + deals["management_percent"])[:, None] / 100
+    fixed_expenses = (deals["property_tax_annual"] + deals["insurance_annual"] + deals["hoa_monthly"] * 12)[:, None] * (
+        1 + expense_growth / 100
+    ) ** (year - 1)
+    operating_expenses = variable_expenses + fixed_expenses
+    noi = gross_rent - vacancy_loss - operating_expenses
+
+    loan_amount = deals["purchase_price"] - deals["down_payment"]
+    monthly_payment = monthly_payment_batch(loan_amount, deals["interest_rate"], deals["loan_term_years"])
+    debt_service = np.where(year <= deals["loan_term_years"][:, None], (monthly_payment * 12)[:, None], 0.0)
+    loan_balance = remaining_balance_batch(
+        loan_amount,
+        deals["interest_rate"],
+        deals["loan_term_years"],
+        np.broadcast_to(year * 12, (size, years)),
+    )
+
+    property_value = deals["purchase_price"][:, None] * (1 + appreciation / 100) ** year
+    cash_flow = noi - debt_service
+
+    return {
+        "year": np.broadcast_to(year.astype(np.int64), (size, years)),
+        "gross_rent": gross_rent,
+        "vacancy_loss": vacancy_loss,
+        "operating_expenses": operating_expenses,
+        "noi": noi,
+        "debt_service": debt_service,
+        "cash_flow": cash_flow,
+        "cumulative_cash_flow": np.cumsum(cash_flow, axis=1),
+        "loan_balance": loan_balance,
+        "property_value": property_value,
+        "equity": property_value - loan_balance,
+    }
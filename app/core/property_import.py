@@ -0,0 +1,380 @@
+"""Streaming bulk property import.
+
+Uploads are read incrementally (CSV through a text wrapper around the
+spooled upload, XLSX with openpyxl's read-only mode), validated a chunk of
+rows at a time and written with one Core executemany ``INSERT ... RETURNING`` per
+chunk, plus one for the chunk's tags. Memory is bounded by the chunk size,
+not the file size. Rows that fail validation are reported by their 1-based
+data row number and skipped, as before. A CSV upload that is not valid UTF-8
+is rejected as a whole (``UploadError``) before any chunk is written, since
+a decoding error part way through would otherwise leave earlier chunks
+committed.
+
+Bulk inserts bypass the ORM validators, so the geohash (encoded for the
+whole chunk at once), the address key and the ``property_tags`` rows they
+would maintain are filled in here.
+
+Rows whose normalized address key matches one of the owner's properties (or
+an earlier row of the same upload) are duplicates, found with one indexed
+query per chunk. The duplicate policy decides what happens to them:
+``skip`` reports and drops them, ``update`` overwrites the existing property
+with the row, and ``flag`` inserts them with a ``duplicate`` tag for review.
+"""
+from __future__ import annotations
+
+import codecs
+import csv
+import io
+from dataclasses import dataclass, field
+from datetime import datetime
+from itertools import islice
+from typing import IO, Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import bindparam, delete, func, insert, update
+from sqlalchemy.orm import Session
+
+from app.core.address import address_key
+from app.core.autocomplete import autocomplete_index
+from app.core.comps import observe_deal as observe_comps
+from app.core.geo import geohash_encode_many
+from app.core.map_index import map_index
+from app.core.rent_index import observe_deal
+from app.models.deal import Deal
+from app.models.property import Property, PropertyStatus, PropertyTag, PropertyType, normalize_tags
+
+IMPORT_CHUNK_SIZE = 1000
+
+DUPLICATE_POLICIES = ("skip", "update", "flag")
+DUPLICATE_TAG = "duplicate"
+
+REQUIRED_FIELDS = frozenset(
+    {"address_line1", "city", "state", "zip_code", "property_type", "bedrooms", "bathrooms", "square_feet"}
+)
+
+
+class UploadError(ValueError):
+    """An upload that cannot be read at all, as opposed to one with invalid rows."""
+
+
+@dataclass
+class ImportChunk:
+    """Outcome of one chunk: ids created or updated, duplicates seen, per-row errors and the last row read."""
+
+    created_ids: List[int] = field(default_factory=list)
+    updated_ids: List[int] = field(default_factory=list)
+    duplicates: int = 0
+    errors: List[str] = field(default_factory=list)
+    last_row: int = 0
+
+
+def check_utf8(file: IO[bytes]) -> None:
+    """Raise ``UploadError`` unless the rest of ``file`` decodes as UTF-8, then seek back."""
+
+    start = file.tell()
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    offset = 0
+    try:
+        for block in iter(lambda: file.read(1024 * 1024), b""):
+            decoder.decode(block)
+            offset += len(block)
+        decoder.decode(b"", final=True)
+    except UnicodeDecodeError as exc:
+        raise UploadError(f"File is not valid UTF-8 (byte {offset + exc.start})") from exc
+    finally:
+        file.seek(start)
+
+
+def csv_rows(file: IO[bytes]) -> Iterator[Dict[str, Any]]:
+    """Decode a binary CSV upload row by row."""
+
+    text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    try:
+        yield from csv.DictReader(text)
+    except UnicodeDecodeError as exc:
+        raise UploadError("File is not valid UTF-8") from exc
+    finally:
+        # Leave ``file`` open for its owner; it may already be closed when
+        # the generator is finalized after the owner's ``with`` block.
+        if not file.closed:
+            text.detach()
+
+
+def xlsx_rows(file: IO[bytes]) -> Iterator[Dict[str, Any]]:
+    """Rows of the first worksheet, keyed by its header row, without loading the workbook."""
+
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(file, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        headers = next(rows, None) or ()
+        for values in rows:
+            yield dict(zip(headers, values))
+    finally:
+        workbook.close()
+
+
+def _csv_cell(value: Any) -> Any:
+    # Whole-number floats (Excel's only number type) are written as ints so
+    # integer columns parse the same way they do from a native CSV.
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def xlsx_to_csv(source: str, destination: str) -> int:
+    """Convert an XLSX upload to CSV with the same rows; returns the data row count.
+
+    A top-level function so the parsing can run on a worker process.
+    """
+
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(source, read_only=True, data_only=True)
+    count = -1
+    try:
+        with open(destination, "w", encoding="utf-8", newline="") as output:
+            writer = csv.writer(output)
+            for count, values in enumerate(workbook.active.iter_rows(values_only=True)):
+                writer.writerow([_csv_cell(value) for value in values])
+    finally:
+        workbook.close()
+    return max(count, 0)
+
+
+def count_csv_rows(path: str) -> int:
+    """Data rows in a CSV file (quoted newlines included); raises ``UploadError`` if it is not UTF-8."""
+
+    with open(path, encoding="utf-8-sig", newline="") as file:
+        try:
+            return max(sum(1 for _ in csv.reader(file)) - 1, 0)
+        except UnicodeDecodeError as exc:
+            raise UploadError("File is not valid UTF-8") from exc
+
+
+def upload_rows(filename: str, file: IO[bytes]) -> Optional[Iterator[Dict[str, Any]]]:
+    """Row iterator for a supported upload, or None for an unsupported format.
+
+    Raises ``UploadError`` for a CSV that is not valid UTF-8.
+    """
+
+    name = filename.lower()
+    if name.endswith(".csv"):
+        check_utf8(file)
+        return csv_rows(file)
+    if name.endswith((".xlsx", ".xls")):
+        return xlsx_rows(file)
+    return None
+
+
+def parse_row(row: Mapping[str, Any], owner_id: int, now: datetime) -> Dict[str, Any]:
+    """Column values for one row; raises ``ValueError`` (or similar) when a value is invalid."""
+
+    latitude = float(row.get("latitude")) if row.get("latitude") else None
+    longitude = float(row.get("longitude")) if row.get("longitude") else None
+    address_line1, zip_code = str(row.get("address_line1")), str(row.get("zip_code"))
+    return {
+        "owner_user_id": owner_id,
+        "address_line1": address_line1,
+        "address_line2": row.get("address_line2"),
+        "address_key": address_key(address_line1, row.get("address_line2"), zip_code),
+        "city": str(row.get("city")),
+        "state": str(row.get("state")),
+        "zip_code": zip_code,
+        "country": row.get("country") or "USA",
+        "property_type": PropertyType(str(row.get("property_type")).lower()),
+        "status": PropertyStatus(str(row.get("status") or PropertyStatus.EVALUATING.value).lower()),
+        "bedrooms": int(row.get("bedrooms")),
+        "bathrooms": float(row.get("bathrooms")),
+        "square_feet": int(row.get("square_feet")),
+        "year_built": int(row.get("year_built")) if row.get("year_built") else None,
+        "list_price": float(row.get("list_price")) if row.get("list_price") else None,
+        "tags": str(row.get("tags")).split("|") if row.get("tags") else None,
+        "latitude": latitude,
+        "longitude": longitude,
+        "geohash": None,
+        "created_at": now,
+        "updated_at": now,
+    }
+
+
+def _fill_geohashes(values: List[Dict[str, Any]]) -> None:
+    located = [row for row in values if row["latitude"] is not None and row["longitude"] is not None]
+    if located:
+        geohashes = geohash_encode_many(
+            np.array([row["latitude"] for row in located]), np.array([row["longitude"] for row in located])
+        )
+        for row, geohash in zip(located, geohashes.tolist()):
+            row["geohash"] = geohash
+
+
+def _insert_tags(db: Session, written: List[Tuple[int, Dict[str, Any]]]) -> None:
+    tag_rows = [
+        {"property_id": property_id, "tag": tag}
+        for property_id, row in written
+        for tag in normalize_tags(row["tags"])
+    ]
+    if tag_rows:
+        db.connection().execute(insert(PropertyTag.__table__), tag_rows)
+
+
+def _insert_chunk(db: Session, values: List[Dict[str, Any]]) -> List[int]:
+    """Insert validated rows (and their tags) with one statement each; returns ids in row order."""
+
+    if not values:
+        return []
+    table = Property.__table__
+    connection = db.connection()
+    if connection.dialect.name == "sqlite":
+        # SQLite gives each row of one INSERT the next rowid in VALUES order,
+        # so sorting restores row order; ``sort_by_parameter_order`` has no
+        # sentinel to use here and would insert row at a time.
+        ids = sorted(connection.execute(insert(table).returning(table.c.id), values).scalars())
+    else:
+        # Elsewhere (PostgreSQL) RETURNING order is unspecified; SQLAlchemy
+        # restores it in batches with the autoincrement id as sentinel.
+        statement = insert(table).returning(table.c.id, sort_by_parameter_order=True)
+        ids = list(connection.execute(statement, values).scalars())
+    _insert_tags(db, list(zip(ids, values)))
+    return ids
+
+
+def _update_chunk(db: Session, updates: Dict[int, Dict[str, Any]]) -> List[int]:
+    """Overwrite existing properties with validated rows (replacing their tags); returns the ids."""
+
+    if not updates:
+        return []
+    table = Property.__table__
+    columns = [name for name in next(iter(updates.values())) if name not in ("owner_user_id", "created_at")]
+    # SET parameters need names distinct from the columns they assign.
+    statement = (
+        update(table)
+        .where(table.c.id == bindparam("property_id"))
+        .values({name: bindparam(f"new_{name}") for name in columns})
+    )
+    db.connection().execute(
+        statement,
+        [
+            {"property_id": property_id, **{f"new_{name}": row[name] for name in columns}}
+            for property_id, row in updates.items()
+        ],
+    )
+    ids = list(updates)
+    db.connection().execute(delete(PropertyTag.__table__).where(PropertyTag.__table__.c.property_id.in_(ids)))
+    _insert_tags(db, list(updates.items()))
+    return ids
+
+
+def _existing_keys(db: Session, owner_id: int, keys: Iterable[str]) -> Dict[str, int]:
+    """Oldest property id for each of ``keys`` the owner already has."""
+
+    keys = list(keys)
+    if not keys:
+        return {}
+    rows = (
+        db.query(Property.address_key, func.min(Property.id))
+        .filter(Property.owner_user_id == owner_id, Property.address_key.in_(keys))
+        .group_by(Property.address_key)
+    )
+    return dict(rows.all())
+
+
+def _apply_duplicate_policy(
+    db: Session, owner_id: int, parsed: List[Tuple[int, Dict[str, Any]]], policy: str, chunk: ImportChunk
+) -> Tuple[List[Dict[str, Any]], Dict[int, Dict[str, Any]]]:
+    """Split a chunk's parsed rows into inserts and updates of existing ids."""
+
+    existing = _existing_keys(db, owner_id, {values["address_key"] for _, values in parsed})
+    inserts: List[Dict[str, Any]] = []
+    updates: Dict[int, Dict[str, Any]] = {}
+    pending: Dict[str, Tuple[int, int]] = {}  # New key -> (row number, position in inserts)
+    for index, values in parsed:
+        key = values["address_key"]
+        match = existing.get(key)
+        if match is None and key not in pending:
+            pending[key] = (index, len(inserts))
+            inserts.append(values)
+            continue
+        chunk.duplicates += 1
+        if policy == "skip":
+            original = f"property {match}" if match is not None else f"row {pending[key][0]}"
+            chunk.errors.append(f"Row {index}: duplicate of {original}")
+        elif policy == "update":
+            # The last row for an address wins, whether it exists already or earlier in this chunk.
+            if match is not None:
+                updates[match] = values
+            else:
+                inserts[pending[key][1]] = values
+        else:
+            values["tags"] = [*(values["tags"] or []), DUPLICATE_TAG]
+            inserts.append(values)
+    return inserts, updates
+
+
+def import_chunks(
+    db: Session,
+    owner_id: int,
+    rows: Iterable[Mapping[str, Any]],
+    *,
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+    skip_rows: int = 0,
+    duplicate_policy: str = "skip",
+) -> Iterator[Tuple[ImportChunk, List[Tuple[int, Dict[str, Any]]]]]:
+    """Validate and write ``rows`` a chunk at a time, yielding each chunk's outcome and ``(id, values)`` written.
+
+    Nothing is committed here; callers commit per chunk or once at the end.
+    ``skip_rows`` data rows are read and ignored first (to resume an import).
+    """
+
+    numbered = enumerate(rows, start=1)
+    for _ in islice(numbered, skip_rows):
+        pass
+    while True:
+        batch = list(islice(numbered, chunk_size))
+        if not batch:
+            return
+        chunk = ImportChunk(last_row=batch[-1][0])
+        now = datetime.utcnow()
+        parsed = []
+        for index, row in batch:
+            missing = REQUIRED_FIELDS - {key for key, value in row.items() if value not in (None, "")}
+            if missing:
+                chunk.errors.append(f"Row {index}: missing fields {sorted(missing)}")
+                continue
+            try:
+                parsed.append((index, parse_row(row, owner_id, now)))
+            except Exception as exc:  # noqa: BLE001
+                chunk.errors.append(f"Row {index}: {exc}")
+        inserts, updates = _apply_duplicate_policy(db, owner_id, parsed, duplicate_policy, chunk)
+        _fill_geohashes([*inserts, *updates.values()])
+        chunk.created_ids = _insert_chunk(db, inserts)
+        chunk.updated_ids = _update_chunk(db, updates)
+        yield chunk, [*zip(chunk.created_ids, inserts), *updates.items()]
+
+
+def observe_imported(db: Session, chunk: ImportChunk, written: List[Tuple[int, Dict[str, Any]]]) -> None:
+    """Add a committed chunk's rows to the in-memory indexes in one batch and re-index deals on updated properties."""
+
+    map_index.observe_many(
+        (
+            property_id,
+            row["owner_user_id"],
+            row["geohash"],
+            row["latitude"],
+            row["longitude"],
+            row["list_price"],
+            row["updated_at"],
+        )
+        for property_id, row in written
+    )
+    autocomplete_index.observe_many(
+        (property_id, row["owner_user_id"], row["city"], row["zip_code"], row["address_line1"], row["updated_at"])
+        for property_id, row in written
+    )
+    if chunk.updated_ids:
+        for deal in db.query(Deal).filter(Deal.property_id.in_(chunk.updated_ids)):
+            observe_deal(deal)
+            observe_comps(deal)
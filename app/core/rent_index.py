@@ -0,0 +1,255 @@
+"""Zip-code rent index: observed rent per square foot by zip code and property type.
+
+Each (zip code, property type) bucket is one slot in a set of parallel NumPy
+arrays holding the sample count, the sum and the sum of squares of rent per
+square foot. The contribution of every deal is remembered, so creating,
+updating or deleting a deal adjusts its bucket in O(1) instead of rebuilding.
+The index is rebuilt from the database and written to ``RENT_INDEX_PATH`` on
+shutdown; on startup the snapshot is reused when the deal/property tables
+still match the fingerprint stored with it.
+"""
+from __future__ import annotations
+
+import os
+import tempfile
+from threading import Lock
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.models.deal import Deal
+from app.models.property import Property
+
+RENT_INDEX_CONFIG = {
+    "initial_capacity": 256,
+    "snapshot_version": 1,
+}
+
+BucketKey = Tuple[str, str]
+
+
+class RentIndexEntry(NamedTuple):
+    """Aggregate rent per square foot for one bucket."""
+
+    rent_per_sqft: float
+    samples: int
+    std: float
+
+
+def _normalize_zip(zip_code: Optional[str]) -> str:
+    return (zip_code or "").strip()[:5]
+
+
+def _normalize_type(property_type: object) -> str:
+    return str(getattr(property_type, "value", property_type) or "")
+
+
+class ZipRentIndex:
+    """Thread-safe, incrementally maintained rent-per-sqft index."""
+
+    def __init__(self, capacity: int = RENT_INDEX_CONFIG["initial_capacity"]) -> None:
+        self._lock = Lock()
+        self._reset(capacity)
+
+    def _reset(self, capacity: int) -> None:
+        self._slots: Dict[BucketKey, int] = {}
+        self._keys: List[BucketKey] = []
+        self._counts = np.zeros(capacity, dtype=np.int64)
+        self._sums = np.zeros(capacity, dtype=np.float64)
+        self._sum_squares = np.zeros(capacity, dtype=np.float64)
+        self._contributions: Dict[int, Tuple[int, float]] = {}
+        self.fingerprint: Optional[Tuple] = None
+
+    def __len__(self) -> int:
+        return len(self._contributions)
+
+    def _slot(self, key: BucketKey) -> int:
+        slot = self._slots.get(key)
+        if slot is not None:
+            return slot
+        slot = len(self._keys)
+        if slot == self._counts.shape[0]:
+            capacity = max(2 * slot, 1)
+            self._counts = np.resize(self._counts, capacity)
+            self._sums = np.resize(self._sums, capacity)
+            self._sum_squares = np.resize(self._sum_squares, capacity)
+            self._counts[slot:] = 0
+            self._sums[slot:] = 0.0
+            self._sum_squares[slot:] = 0.0
+        self._slots[key] = slot
+        self._keys.append(key)
+        return slot
+
+    def _discard(self, deal_id: int) -> None:
+        previous = self._contributions.pop(deal_id, None)
+        if previous is None:
+            return
+        slot, value = previous
+        self._counts[slot] -= 1
+        self._sums[slot] -= value
+        self._sum_squares[slot] -= value * value
+        if self._counts[slot] == 0:
+            # Reset exactly so floating-point residue never leaks into new samples.
+            self._sums[slot] = 0.0
+            self._sum_squares[slot] = 0.0
+
+    def observe(
+        self,
+        deal_id: int,
+        zip_code: Optional[str],
+        property_type: object,
+        monthly_rent: Optional[float],
+        square_feet: Optional[float],
+    ) -> None:
+        """Record (or replace) a deal's rent sample; invalid samples only remove the old one."""
+
+        with self._lock:
+            self._discard(deal_id)
+            zip_key = _normalize_zip(zip_code)
+            if not zip_key or not monthly_rent or not square_feet or monthly_rent <= 0 or square_feet <= 0:
+                return
+            value = float(monthly_rent) / float(square_feet)
+            slot = self._slot((zip_key, _normalize_type(property_type)))
+            self._counts[slot] += 1
+            self._sums[slot] += value
+            self._sum_squares[slot] += value * value
+            self._contributions[deal_id] = (slot, value)
+
+    def discard(self, deal_id: int) -> None:
+        """Remove a deal's sample, if it has one."""
+
+        with self._lock:
+            self._discard(deal_id)
+
+    def lookup(self, zip_code: Optional[str], property_type: object) -> Optional[RentIndexEntry]:
+        """Return the bucket aggregate, or None when there are no samples."""
+
+        with self._lock:
+            slot = self._slots.get((_normalize_zip(zip_code), _normalize_type(property_type)))
+            if slot is None or self._counts[slot] == 0:
+                return None
+            count = int(self._counts[slot])
+            mean = self._sums[slot] / count
+            variance = max(self._sum_squares[slot] / count - mean * mean, 0.0)
+        return RentIndexEntry(float(mean), count, float(np.sqrt(variance)))
+
+    def rebuild(self, rows: Iterable[Tuple[int, str, object, float, float]], fingerprint: Optional[Tuple] = None) -> None:
+        """Replace the index with ``(deal_id, zip, type, rent, sqft)`` rows."""
+
+        fresh = ZipRentIndex()
+        for row in rows:
+            fresh.observe(*row)
+        with self._lock:
+            self._slots, self._keys = fresh._slots, fresh._keys
+            self._counts, self._sums, self._sum_squares = fresh._counts, fresh._sums, fresh._sum_squares
+            self._contributions = fresh._contributions
+            self.fingerprint = fingerprint
+
+    def save(self, path: str) -> None:
+        """Write the index to ``path`` atomically."""
+
+        with self._lock:
+            size = len(self._keys)
+            deal_ids = np.fromiter(self._contributions.keys(), dtype=np.int64, count=len(self._contributions))
+            contributions = list(self._contributions.values())
+            arrays = {
+                "version": np.array(RENT_INDEX_CONFIG["snapshot_version"]),
+                "fingerprint": np.array([str(part) for part in (self.fingerprint or ())]),
+                "zip_codes": np.array([key[0] for key in self._keys], dtype=str),
+                "property_types": np.array([key[1] for key in self._keys], dtype=str),
+                "counts": self._counts[:size],
+                "sums": self._sums[:size],
+                "sum_squares": self._sum_squares[:size],
+                "deal_ids": deal_ids,
+                "deal_slots": np.array([slot for slot, _ in contributions], dtype=np.int64),
+                "deal_values": np.array([value for _, value in contributions], dtype=np.float64),
+            }
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        handle, temp_path = tempfile.mkstemp(dir=directory, suffix=".npz")
+        try:
+            with os.fdopen(handle, "wb") as stream:
+                np.savez_compressed(stream, **arrays)
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def load(self, path: str) -> bool:
+        """Load a snapshot written by ``save``; returns False when there is none."""
+
+        if not os.path.exists(path):
+            return False
+        with np.load(path, allow_pickle=False) as data:
+            if int(data["version"]) != RENT_INDEX_CONFIG["snapshot_version"]:
+                return False
+            keys = list(zip(data["zip_codes"].tolist(), data["property_types"].tolist()))
+            with self._lock:
+                self._reset(max(len(keys), RENT_INDEX_CONFIG["initial_capacity"]))
+                self._keys = keys
+                self._slots = {key: slot for slot, key in enumerate(keys)}
+                self._counts[: len(keys)] = data["counts"]
+                self._sums[: len(keys)] = data["sums"]
+                self._sum_squares[: len(keys)] = data["sum_squares"]
+                self._contributions = dict(
+                    zip(data["deal_ids"].tolist(), zip(data["deal_slots"].tolist(), data["deal_values"].tolist()))
+                )
+                self.fingerprint = tuple(data["fingerprint"].tolist())
+        return True
+
+
+rent_index = ZipRentIndex()
+
+
+def observe_deal(deal: Deal, index: ZipRentIndex = rent_index) -> None:
+    """Update the index after a deal was created or updated."""
+
+    property_obj = deal.property
+    if property_obj is None:
+        index.discard(deal.id)
+        return
+    index.observe(deal.id, property_obj.zip_code, property_obj.property_type, deal.monthly_rent, property_obj.square_feet)
+
+
+def table_fingerprint(db: Session) -> Tuple[str, ...]:
+    """Cheap summary of the deal/property tables used to validate a snapshot."""
+
+    deals = db.query(func.count(Deal.id), func.max(Deal.id), func.max(Deal.updated_at)).one()
+    properties = db.query(func.count(Property.id), func.max(Property.updated_at)).one()
+    return tuple(str(part) for part in (*deals, *properties))
+
+
+def rebuild_from_db(db: Session, index: ZipRentIndex = rent_index) -> None:
+    """Rebuild the index with one joined query over deals and their properties."""
+
+    rows = (
+        db.query(Deal.id, Property.zip_code, Property.property_type, Deal.monthly_rent, Property.square_feet)
+        .join(Property, Deal.property_id == Property.id)
+        .yield_per(5000)
+    )
+    fingerprint = table_fingerprint(db)
+    index.rebuild(rows, fingerprint)
+
+
+def warm_start(db: Session, path: str, index: ZipRentIndex = rent_index) -> bool:
+    """Load the snapshot at ``path`` if it is current, otherwise rebuild; True when loaded."""
+
+    if index.load(path) and index.fingerprint == table_fingerprint(db):
+        return True
+    rebuild_from_db(db, index)
+    return False
+
+
+def persist(db: Session, path: str, index: ZipRentIndex = rent_index) -> None:
+    """Rebuild from the database and snapshot, so the file matches its fingerprint exactly.
+
+    Rebuilding (rather than saving the live index) also picks up writes served
+    by other workers.
+    """
+
+    rebuild_from_db(db, index)
+    index.save(path)
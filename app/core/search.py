@@ -0,0 +1,182 @@
+"""Full-text search over properties, leads and deals.
+
+Each searchable table has a full-text index that the database maintains on
+every write, including bulk Core inserts and updates:
+
+* SQLite: an external-content FTS5 table (``<table>_fts``) kept in step by
+  insert, delete and update triggers.
+* PostgreSQL: a generated ``search_vector`` tsvector column with a GIN index.
+
+The DDL is attached to the tables' ``after_create`` events so ``create_all``
+builds it; existing databases get it from the migration. Both backends use
+unstemmed, case-folded tokens with prefix matching, so "aus" finds "Austin"
+either way, and the entity's primary column (address or name) weighs double.
+
+``search`` answers one query for every entity type with a single
+``UNION ALL`` statement, each branch ranked and limited on its own.
+"""
+from __future__ import annotations
+
+import re
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+from sqlalchemy import DDL, event, text
+from sqlalchemy.orm import Session
+
+from app.models.deal import Deal
+from app.models.lead import Lead
+from app.models.property import Property
+
+SEARCH_CONFIG = {
+    "max_terms": 8,  # Words of a query used (each must match)
+    "snippet_words": 12,  # Words around the match in a snippet
+}
+
+
+class SearchEntity(NamedTuple):
+    table: str
+    owner_column: str
+    columns: tuple  # Indexed text columns; the first is weighted highest
+    title: str  # SQL expression over alias ``t``
+
+
+SEARCH_ENTITIES = {
+    "properties": SearchEntity(
+        "properties",
+        "owner_user_id",
+        ("address_line1", "address_line2", "city", "state", "zip_code"),
+        "t.address_line1 || ', ' || t.city",
+    ),
+    "leads": SearchEntity(
+        "leads",
+        "owner_id",
+        ("first_name", "last_name", "email", "phone", "source", "notes"),
+        "t.first_name || ' ' || t.last_name",
+    ),
+    "deals": SearchEntity("deals", "user_id", ("notes",), "'Deal #' || t.id"),
+}
+
+
+def sqlite_ddl(entity: SearchEntity) -> List[str]:
+    """FTS5 table and sync triggers for one entity."""
+
+    fts = f"{entity.table}_fts"
+    columns = ", ".join(entity.columns)
+    new = ", ".join(f"new.{column}" for column in entity.columns)
+    old = ", ".join(f"old.{column}" for column in entity.columns)
+    delete_old = f"INSERT INTO {fts}({fts}, rowid, {columns}) VALUES ('delete', old.id, {old});"
+    insert_new = f"INSERT INTO {fts}(rowid, {columns}) VALUES (new.id, {new});"
+    return [
+        f"DROP TABLE IF EXISTS {fts}",
+        f"CREATE VIRTUAL TABLE {fts} USING fts5({columns}, content='{entity.table}', content_rowid='id', "
+        "tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+        f"CREATE TRIGGER {fts}_insert AFTER INSERT ON {entity.table} BEGIN {insert_new} END",
+        f"CREATE TRIGGER {fts}_delete AFTER DELETE ON {entity.table} BEGIN {delete_old} END",
+        f"CREATE TRIGGER {fts}_update AFTER UPDATE OF {columns} ON {entity.table} BEGIN {delete_old} {insert_new} END",
+    ]
+
+
+def _text(columns: Sequence[str], alias: str = "") -> str:
+    return " || ' ' || ".join(f"coalesce({alias}{column}, '')" for column in columns) or "''"
+
+
+def _weighted_vector(entity: SearchEntity) -> str:
+    return (
+        f"setweight(to_tsvector('simple'::regconfig, {_text(entity.columns[:1])}), 'A') || "
+        f"setweight(to_tsvector('simple'::regconfig, {_text(entity.columns[1:])}), 'B')"
+    )
+
+
+def postgres_ddl(entity: SearchEntity) -> List[str]:
+    """Generated tsvector column and GIN index for one entity."""
+
+    return [
+        f"ALTER TABLE {entity.table} ADD COLUMN search_vector tsvector "
+        f"GENERATED ALWAYS AS ({_weighted_vector(entity)}) STORED",
+        f"CREATE INDEX ix_{entity.table}_search_vector ON {entity.table} USING GIN (search_vector)",
+    ]
+
+
+def _register_ddl() -> None:
+    for model in (Property, Lead, Deal):
+        entity = SEARCH_ENTITIES[model.__tablename__]
+        for statement in sqlite_ddl(entity):
+            event.listen(model.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+        for statement in postgres_ddl(entity):
+            event.listen(model.__table__, "after_create", DDL(statement).execute_if(dialect="postgresql"))
+        # The FTS5 table outlives its content table unless dropped with it.
+        event.listen(
+            model.__table__,
+            "before_drop",
+            DDL(f"DROP TABLE IF EXISTS {entity.table}_fts").execute_if(dialect="sqlite"),
+        )
+
+
+_register_ddl()
+
+
+def query_terms(query: str) -> List[str]:
+    """The words of a query, case-folded; punctuation and operators are dropped."""
+
+    return re.findall(r"\w+", query.lower())[: SEARCH_CONFIG["max_terms"]]
+
+
+def _sqlite_branch(key: str, entity: SearchEntity, owner_filter: str) -> str:
+    fts = f"{entity.table}_fts"
+    weights = ", ".join("2.0" if index == 0 else "1.0" for index in range(len(entity.columns)))
+    return (
+        f"SELECT '{key}' AS kind, t.id AS id, {entity.title} AS title, "
+        f"snippet({fts}, -1, '[', ']', '…', {SEARCH_CONFIG['snippet_words']}) AS snippet, "
+        f"-bm25({fts}, {weights}) AS score "
+        f"FROM {fts} JOIN {entity.table} AS t ON t.id = {fts}.rowid "
+        f"WHERE {fts} MATCH :query{owner_filter} ORDER BY score DESC LIMIT :limit"
+    )
+
+
+def _postgres_branch(key: str, entity: SearchEntity, owner_filter: str) -> str:
+    options = f"StartSel=[, StopSel=], MaxWords={SEARCH_CONFIG['snippet_words']}, MinWords=3"
+    return (
+        f"SELECT '{key}' AS kind, t.id AS id, {entity.title} AS title, "
+        f"ts_headline('simple', {_text(entity.columns, 't.')}, q, '{options}') AS snippet, "
+        f"ts_rank(t.search_vector, q) AS score "
+        f"FROM {entity.table} AS t, to_tsquery('simple', :query) AS q "
+        f"WHERE t.search_vector @@ q{owner_filter} ORDER BY score DESC LIMIT :limit"
+    )
+
+
+def search(
+    db: Session,
+    query: str,
+    owner_id: Optional[int],
+    kinds: Iterable[str] = SEARCH_ENTITIES,
+    limit: int = 10,
+) -> Dict[str, List[dict]]:
+    """Best ``limit`` matches of every word of ``query`` per entity kind, in one statement.
+
+    ``owner_id`` limits results to one user's records (``None`` searches everyone's).
+    """
+
+    wanted = set(kinds)
+    kinds = [kind for kind in SEARCH_ENTITIES if kind in wanted]
+    results: Dict[str, List[dict]] = {kind: [] for kind in kinds}
+    terms = query_terms(query)
+    if not terms or not kinds:
+        return results
+
+    postgres = db.get_bind().dialect.name == "postgresql"
+    branch = _postgres_branch if postgres else _sqlite_branch
+    branches = []
+    for kind in kinds:
+        entity = SEARCH_ENTITIES[kind]
+        owner_filter = f" AND t.{entity.owner_column} = :owner" if owner_id is not None else ""
+        branches.append(f"SELECT * FROM ({branch(kind, entity, owner_filter)}) AS {kind}_hits")
+    params = {
+        "query": " & ".join(f"{term}:*" for term in terms) if postgres else " ".join(f'"{term}"*' for term in terms),
+        "owner": owner_id,
+        "limit": limit,
+    }
+    for row in db.execute(text(" UNION ALL ".join(branches)), params).mappings():
+        results[row["kind"]].append(
+            {"id": row["id"], "title": row["title"], "snippet": row["snippet"] or "", "score": float(row["score"])}
+        )
+    return results
@@ -0,0 +1,107 @@
+"""Sensitivity grids and tornado analysis on top of the batch engine."""
+from __future__ import annotations
+
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.core.assumptions import Assumptions
+from app.core.batch import DEAL_INPUT_COLUMNS, analyze_deals_batch, resolve_deal_columns
+
+SENSITIVITY_METRICS = ("monthly_cash_flow", "cash_on_cash_return", "dscr", "overall_score")
+MAX_GRID_CELLS = 250_000
+
+
+def sensitivity_grid(
+    base: Mapping[str, Optional[float]],
+    axes: Sequence[Tuple[str, Sequence[float]]],
+    assumptions: Optional[Assumptions] = None,
+) -> Dict[str, np.ndarray]:
+    """Evaluate a deal over the cartesian product of 1-3 varied inputs.
+
+    Each axis is broadcast along its own dimension, so the returned metric
+    arrays have shape ``(len(axis_0), len(axis_1), ...)``. Inputs that are not
+    varied keep their base value; derived inputs (taxes and insurance when not
+    given) follow the varied purchase price as they would in ``analyze_deal``.
+    """
+
+    names = [name for name, _ in axes]
+    if not 1 <= len(axes) <= 3:
+        raise ValueError("Provide between 1 and 3 axes.")
+    if len(set(names)) != len(names):
+        raise ValueError("Each input may only appear on one axis.")
+    unknown = set(names) - set(DEAL_INPUT_COLUMNS)
+    if unknown:
+        raise ValueError(f"Unknown sensitivity inputs: {sorted(unknown)}")
+
+    shape = tuple(len(values) for _, values in axes)
+    if int(np.prod(shape)) > MAX_GRID_CELLS:
+        raise ValueError(f"Grid has more than {MAX_GRID_CELLS} cells.")
+
+    columns: Dict[str, np.ndarray] = {}
+    for name in DEAL_INPUT_COLUMNS:
+        value = base.get(name)
+        columns[name] = np.broadcast_to(np.float64(np.nan if value is None else value), shape)
+    for axis, (name, values) in enumerate(axes):
+        view = [1] * len(axes)
+        view[axis] = -1
+        columns[name] = np.broadcast_to(np.asarray(values, dtype=np.float64).reshape(view), shape)
+
+    result = analyze_deals_batch({name: column.ravel() for name, column in columns.items()}, assumptions)
+    return {metric: result[metric].reshape(shape) for metric in SENSITIVITY_METRICS}
+
+
+def tornado_analysis(
+    base: Mapping[str, Optional[float]],
+    assumptions: Optional[Assumptions] = None,
+    percent: float = 10.0,
+    fields: Optional[Sequence[str]] = None,
+) -> Dict[str, Any]:
+    """Swing every input by +/- ``percent`` and report metric deltas against the base.
+
+    All ``2 * len(fields) + 1`` scenarios are evaluated in one batch. Inputs
+    are resolved against the assumptions first and the others held fixed
+    while one moves. Rows are sorted by the size of the monthly cash-flow
+    swing, largest first.
+    """
+
+    fields = list(fields or DEAL_INPUT_COLUMNS)
+    unknown = set(fields) - set(DEAL_INPUT_COLUMNS)
+    if unknown:
+        raise ValueError(f"Unknown sensitivity inputs: {sorted(unknown)}")
+
+    resolved = resolve_deal_columns({name: [base.get(name)] for name in DEAL_INPUT_COLUMNS}, assumptions)
+    base_values = {name: float(column[0]) for name, column in resolved.items()}
+
+    scenarios = 2 * len(fields) + 1
+    columns = {name: np.full(scenarios, value) for name, value in base_values.items()}
+    for index, name in enumerate(fields):
+        columns[name][2 * index + 1] = base_values[name] * (1 - percent / 100)
+        columns[name][2 * index + 2] = base_values[name] * (1 + percent / 100)
+
+    result = analyze_deals_batch(columns, assumptions)
+    base_metrics = {metric: result[metric][0] for metric in SENSITIVITY_METRICS}
+
+    rows: List[Dict[str, Any]] = []
+    for index, name in enumerate(fields):
+        low, high = 2 * index + 1, 2 * index + 2
+        row: Dict[str, Any] = {
+            "field": name,
+            "base_value": base_values[name],
+            "low_value": float(columns[name][low]),
+            "high_value": float(columns[name][high]),
+        }
+        for metric in SENSITIVITY_METRICS:
+            row[metric] = {
+                "low": result[metric][low],
+                "high": result[metric][high],
+                "delta_low": result[metric][low] - base_metrics[metric],
+                "delta_high": result[metric][high] - base_metrics[metric],
+            }
+        rows.append(row)
+
+    rows.sort(
+        key=lambda row: abs(row["monthly_cash_flow"]["high"] - row["monthly_cash_flow"]["low"]),
+        reverse=True,
+    )
+    return {"percent": percent, "base": base_metrics, "inputs": rows}
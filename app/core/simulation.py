@@ -0,0 +1,259 @@
+"""Monte Carlo risk simulation for a single deal.
+
+Paths are generated in chunks; each chunk is fully vectorized (every path is
+one row for the projection and IRR engines) and chunks are spread over a
+process pool. Chunks only return fixed-size histograms and counters, so
+memory stays bounded no matter how many paths are requested. Every chunk
+draws from its own child of one ``SeedSequence``, so a seeded run gives the
+same answer regardless of worker count or scheduling.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.core.analytics import holding_period_cash_flows, solve_irr
+from app.core.assumptions import Assumptions
+from app.core.batch import DEAL_INPUT_COLUMNS, calculate_cash_flow_batch, resolve_deal_columns
+from app.core.pool import get_process_pool
+
+SIMULATION_CONFIG = {
+    "histogram_bins": 4096,
+    "default_chunk_size": 5000,
+    "percentiles": (5, 10, 25, 50, 75, 90, 95),
+}
+
+# Defaults centre on the deal's own inputs/assumptions; spreads are in percentage points.
+DEFAULT_DISTRIBUTIONS: Dict[str, Dict[str, Any]] = {
+    "vacancy_percent": {"kind": "normal", "std": 2.0},
+    "maintenance_percent": {"kind": "normal", "std": 2.0},
+    "rent_growth_percent": {"kind": "normal", "std": 1.5},
+    "appreciation_percent": {"kind": "normal", "std": 2.5},
+    "interest_rate_shock": {"kind": "normal", "mean": 0.0, "std": 0.75},
+}
+
+
+@dataclass
+class StreamingHistogram:
+    """Fixed-bin histogram that merges across chunks and answers percentile queries.
+
+    Values below/above the edges land in under/overflow bins whose extent is
+    bounded by the exact minimum/maximum seen, so percentiles stay within the
+    observed range.
+    """
+
+    low: float
+    high: float
+    bins: int = SIMULATION_CONFIG["histogram_bins"]
+    counts: np.ndarray = field(init=False)
+    minimum: float = np.inf
+    maximum: float = -np.inf
+    total: int = 0
+    value_sum: float = 0.0
+
+    def __post_init__(self) -> None:
+        self.counts = np.zeros(self.bins + 2, dtype=np.int64)
+
+    @property
+    def edges(self) -> np.ndarray:
+        return np.linspace(self.low, self.high, self.bins + 1)
+
+    def add(self, values: np.ndarray) -> None:
+        values = values[np.isfinite(values)]
+        if values.size == 0:
+            return
+        self.counts += np.bincount(np.searchsorted(self.edges, values, side="right"), minlength=self.bins + 2)
+        self.minimum = min(self.minimum, float(values.min()))
+        self.maximum = max(self.maximum, float(values.max()))
+        self.total += int(values.size)
+        self.value_sum += float(values.sum())
+
+    def merge(self, other: "StreamingHistogram") -> None:
+        self.counts += other.counts
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        self.total += other.total
+        self.value_sum += other.value_sum
+
+    def mean(self) -> Optional[float]:
+        return self.value_sum / self.total if self.total else None
+
+    def percentiles(self, quantiles: Sequence[float]) -> Dict[str, Optional[float]]:
+        if not self.total:
+            return {f"p{q}": None for q in quantiles}
+
+        edges = self.edges
+        lower = np.concatenate(([min(self.minimum, self.low)], edges))
+        upper = np.concatenate((edges, [max(self.maximum, self.high)]))
+        cumulative = np.cumsum(self.counts)
+        result = {}
+        for q in quantiles:
+            rank = q / 100 * self.total
+            index = int(np.searchsorted(cumulative, rank, side="left"))
+            index = min(index, self.bins + 1)
+            before = cumulative[index - 1] if index else 0
+            fraction = (rank - before) / self.counts[index] if self.counts[index] else 0.0
+            value = lower[index] + fraction * (upper[index] - lower[index])
+            result[f"p{q}"] = float(min(max(value, self.minimum), self.maximum))
+        return result
+
+
+def _sample(rng: np.random.Generator, spec: Mapping[str, Any], base: float, size: int) -> np.ndarray:
+    kind = spec.get("kind", "normal")
+    if kind == "fixed":
+        value = spec.get("value")
+        return np.full(size, base if value is None else value)
+    if kind == "uniform":
+        return rng.uniform(spec["low"], spec["high"], size)
+    if kind == "triangular":
+        mode = spec.get("mode")
+        return rng.triangular(spec["low"], base if mode is None else mode, spec["high"], size)
+    if kind == "normal":
+        mean = spec.get("mean")
+        return rng.normal(base if mean is None else mean, spec.get("std", 0.0), size)
+    raise ValueError(f"Unknown distribution kind: {kind}")
+
+
+def _simulate_paths(
+    deal: Mapping[str, float],
+    assumptions: Assumptions,
+    distributions: Mapping[str, Mapping[str, Any]],
+    size: int,
+    seed: np.random.SeedSequence,
+) -> Dict[str, np.ndarray]:
+    """Sample ``size`` paths and return per-path metrics for one chunk."""
+
+    rng = np.random.default_rng(seed)
+    columns = {
+        name: np.full(size, np.nan if deal.get(name) is None else deal[name], dtype=np.float64)
+        for name in DEAL_INPUT_COLUMNS
+    }
+    resolved = resolve_deal_columns(columns, assumptions)
+
+    resolved["vacancy_percent"] = np.clip(
+        _sample(rng, distributions["vacancy_percent"], float(resolved["vacancy_percent"][0]), size), 0, 100
+    )
+    resolved["maintenance_percent"] = np.clip(
+        _sample(rng, distributions["maintenance_percent"], float(resolved["maintenance_percent"][0]), size), 0, 100
+    )
+    rent_growth = _sample(rng, distributions["rent_growth_percent"], assumptions.rent_growth_percent_annual, size)
+    appreciation = _sample(rng, distributions["appreciation_percent"], assumptions.appreciation_percent_annual, size)
+    rate_shock = _sample(rng, distributions["interest_rate_shock"], 0.0, size)
+    resolved["interest_rate"] = np.maximum(resolved["interest_rate"] + rate_shock, 0.0)
+
+    cash_flow = calculate_cash_flow_batch(resolved)
+    annual_debt_service = cash_flow["monthly_debt_service"] * 12
+    with np.errstate(divide="ignore", invalid="ignore"):
+        dscr = np.where(annual_debt_service > 0, cash_flow["noi_annual"] / annual_debt_service, np.inf)
+
+    holding_cash_flows = holding_period_cash_flows(
+        resolved, assumptions, rent_growth_percent=rent_growth, appreciation_percent=appreciation
+    )
+    irr_percent = solve_irr(holding_cash_flows)["irr"] * 100
+
+    return {
+        "monthly_cash_flow": cash_flow["monthly_cash_flow"],
+        "irr_percent": irr_percent,
+        "dscr": dscr,
+    }
+
+
+def _histogram_bounds(values: np.ndarray) -> Tuple[float, float]:
+    finite = values[np.isfinite(values)]
+    if finite.size == 0:
+        return -1.0, 1.0
+    low, high = float(finite.min()), float(finite.max())
+    padding = max(high - low, abs(high), 1.0) * 0.5
+    return low - padding, high + padding
+
+
+def _aggregate_chunk(
+    metrics: Mapping[str, np.ndarray], bounds: Mapping[str, Tuple[float, float]]
+) -> Dict[str, Any]:
+    histograms = {}
+    for name in ("monthly_cash_flow", "irr_percent"):
+        histogram = StreamingHistogram(*bounds[name])
+        histogram.add(metrics[name])
+        histograms[name] = histogram
+    return {
+        "paths": int(metrics["dscr"].shape[0]),
+        "histograms": histograms,
+        "dscr_below_one": int(np.count_nonzero(metrics["dscr"] < 1.0)),
+        "negative_cash_flow": int(np.count_nonzero(metrics["monthly_cash_flow"] < 0)),
+        "irr_undefined": int(np.count_nonzero(~np.isfinite(metrics["irr_percent"]))),
+    }
+
+
+def _simulate_chunk(args: Tuple) -> Dict[str, Any]:
+    """Process-pool entrypoint: simulate one chunk and return only its aggregates."""
+
+    deal, assumptions_data, distributions, size, seed, bounds = args
+    metrics = _simulate_paths(deal, Assumptions(**assumptions_data), distributions, size, seed)
+    return _aggregate_chunk(metrics, bounds)
+
+
+def simulate_deal(
+    deal: Mapping[str, Optional[float]],
+    assumptions: Optional[Assumptions] = None,
+    distributions: Optional[Mapping[str, Mapping[str, Any]]] = None,
+    *,
+    paths: int = 10_000,
+    seed: Optional[int] = None,
+    chunk_size: int = SIMULATION_CONFIG["default_chunk_size"],
+    max_workers: int = 0,
+) -> Dict[str, Any]:
+    """Run a Monte Carlo simulation of a deal and return streaming aggregates.
+
+    ``deal`` holds the scalar deal inputs (as for ``analyze_deal``).
+    ``distributions`` overrides entries of ``DEFAULT_DISTRIBUTIONS``. The first
+    chunk runs in-process to fix the histogram ranges; the rest go to a
+    process pool of ``max_workers`` (0 keeps everything in-process).
+    """
+
+    assumptions = assumptions or Assumptions()
+    specs = {**DEFAULT_DISTRIBUTIONS, **{name: dict(spec) for name, spec in (distributions or {}).items()}}
+    unknown = set(specs) - set(DEFAULT_DISTRIBUTIONS)
+    if unknown:
+        raise ValueError(f"Unknown simulation variables: {sorted(unknown)}")
+
+    chunk_sizes: List[int] = [chunk_size] * (paths // chunk_size)
+    if paths % chunk_size:
+        chunk_sizes.append(paths % chunk_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(chunk_sizes))
+    deal_inputs = {name: deal.get(name) for name in DEAL_INPUT_COLUMNS}
+
+    pilot = _simulate_paths(deal_inputs, assumptions, specs, chunk_sizes[0], seeds[0])
+    bounds = {name: _histogram_bounds(pilot[name]) for name in ("monthly_cash_flow", "irr_percent")}
+    total = _aggregate_chunk(pilot, bounds)
+
+    remaining = [
+        (deal_inputs, assumptions.model_dump(), specs, size, chunk_seed, bounds)
+        for size, chunk_seed in zip(chunk_sizes[1:], seeds[1:])
+    ]
+    if remaining and max_workers > 0:
+        chunks = get_process_pool(max_workers).map(_simulate_chunk, remaining)
+    else:
+        chunks = map(_simulate_chunk, remaining)
+
+    for chunk in chunks:
+        total["paths"] += chunk["paths"]
+        for name, histogram in chunk["histograms"].items():
+            total["histograms"][name].merge(histogram)
+        for counter in ("dscr_below_one", "negative_cash_flow", "irr_undefined"):
+            total[counter] += chunk[counter]
+
+    quantiles = SIMULATION_CONFIG["percentiles"]
+    cash_flow_histogram = total["histograms"]["monthly_cash_flow"]
+    irr_histogram = total["histograms"]["irr_percent"]
+    return {
+        "paths": total["paths"],
+        "seed": seed,
+        "monthly_cash_flow": {"mean": cash_flow_histogram.mean(), **cash_flow_histogram.percentiles(quantiles)},
+        "irr_percent": {"mean": irr_histogram.mean(), **irr_histogram.percentiles(quantiles)},
+        "probability_dscr_below_1": total["dscr_below_one"] / total["paths"],
+        "probability_negative_cash_flow": total["negative_cash_flow"] / total["paths"],
+        "irr_undefined_paths": total["irr_undefined"],
+        "distributions": specs,
+    }
@@ -0,0 +1,319 @@
+"""Bulk re-underwriting: recompute every stored deal snapshot in one background job.
+
+Deals are read in keyset pages (``id > last_id ORDER BY id``), each page is
+analyzed with the columnar engine (optionally on the shared process pool) and
+written back with one bulk ``UPDATE`` per page. The job row's ``last_id`` and
+``processed`` counters are committed in the same transaction as the page, so
+an interrupted job resumes exactly after the last committed deal.
+
+Every stored snapshot is stamped with ``ANALYTICS_ENGINE_VERSION`` and a hash
+of the assumptions it was computed with. Read paths call
+``refresh_stale_snapshots`` so snapshots left behind by an engine upgrade are
+recomputed in one batch per request the first time they are read.
+"""
+from __future__ import annotations
+
+import logging
+from collections import deque
+from datetime import datetime
+from threading import Thread
+from typing import Any, Callable, Deque, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from sqlalchemy import func, update
+from sqlalchemy.orm import Session
+
+from app.core.analytics import (
+    calculate_dscr,
+    calculate_returns_batch,
+    cash_flow_summary,
+    returns_summary,
+    score_deal,
+)
+from app.core.assumptions import Assumptions
+from app.core.batch import DEAL_INPUT_COLUMNS, analyze_deals_batch, deal_columns, resolve_deal_columns
+from app.core.cache import cache_key
+from app.core.pool import get_process_pool
+from app.models.deal import Deal, snapshot_metrics
+from app.models.job import Job, JobStatus, claim_job
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever analytics formulas change; older snapshots are then recomputed on read.
+ANALYTICS_ENGINE_VERSION = 1
+
+RECOMPUTE_JOB_KIND = "recompute_deals"
+
+RECOMPUTE_CONFIG = {
+    "chunk_size": 5000,  # Deals per keyset page, bulk UPDATE and commit
+    "max_pending_chunks": 4,  # Pages in flight on the process pool
+    "stale_seconds": 300.0,  # A running job silent for this long is presumed dead
+}
+
+
+def deal_snapshots_batch(
+    columns: Dict[str, Sequence[Optional[float]]], assumptions: Assumptions
+) -> List[Dict[str, Any]]:
+    """Analytics snapshots for a columnar deal set, identical to the per-deal route output."""
+
+    resolved = resolve_deal_columns(columns, assumptions)
+    analysis = analyze_deals_batch(resolved, assumptions)
+    returns = calculate_returns_batch(resolved, assumptions)
+
+    monthly_cash_flow = analysis["monthly_cash_flow"].tolist()
+    annual_cash_flow = analysis["annual_cash_flow"].tolist()
+    noi_annual = analysis["noi_annual"].tolist()
+    monthly_debt_service = analysis["monthly_debt_service"].tolist()
+    cash_on_cash_return = analysis["cash_on_cash_return"].tolist()
+    vacancy_percent = resolved["vacancy_percent"].tolist()
+
+    snapshots = []
+    for index in range(len(monthly_cash_flow)):
+        cash_flow = {
+            "monthly_cash_flow": monthly_cash_flow[index],
+            "annual_cash_flow": annual_cash_flow[index],
+            "noi_annual": noi_annual[index],
+            "monthly_debt_service": monthly_debt_service[index],
+            "cash_on_cash_return": cash_on_cash_return[index],
+            "summary": cash_flow_summary(
+                noi_annual[index] / 12,
+                monthly_debt_service[index],
+                monthly_cash_flow[index],
+                cash_on_cash_return[index],
+            ),
+        }
+        dscr_value, dscr_interp = calculate_dscr(noi_annual[index], monthly_debt_service[index] * 12)
+        score, label, reasons = score_deal(monthly_cash_flow[index], dscr_value, vacancy_percent[index])
+        dscr = {"dscr": dscr_value, "interpretation": dscr_interp}
+        snapshots.append(
+            {
+                "cash_flow": cash_flow,
+                "dscr": dscr,
+                "deal_analysis": {
+                    "overall_score": score,
+                    "label": label,
+                    "reasons": reasons,
+                    "cash_flow": cash_flow,
+                    "dscr": dscr,
+                },
+                "returns": returns_summary(returns, index, assumptions),
+            }
+        )
+    return snapshots
+
+
+def assumptions_hash(assumptions: Assumptions) -> str:
+    """Stable hash of a full assumptions set (new fields take their defaults)."""
+
+    return cache_key("assumptions", assumptions)
+
+
+def snapshot_stamp(assumptions: Assumptions) -> Dict[str, Any]:
+    """Columns recording which engine and assumptions produced a snapshot."""
+
+    return {
+        "snapshot_of_assumptions": assumptions.model_dump(),
+        "analytics_engine_version": ANALYTICS_ENGINE_VERSION,
+        "analytics_assumptions_hash": assumptions_hash(assumptions),
+    }
+
+
+def store_snapshot(deal: Deal, snapshot: Dict[str, Any], assumptions: Assumptions) -> None:
+    """Attach an analytics snapshot to a deal, refreshing its metric and stamp columns."""
+
+    deal.snapshot_of_analytics_result = snapshot
+    for column, value in {**snapshot_metrics(snapshot), **snapshot_stamp(assumptions)}.items():
+        setattr(deal, column, value)
+
+
+def _pinned_assumptions(
+    deal: Deal, default: Assumptions, memo: Dict[Tuple, Tuple[Assumptions, str]]
+) -> Tuple[Assumptions, str]:
+    """The deal's own assumptions (or ``default``) and their hash, memoized per call."""
+
+    values: Mapping[str, Any] = deal.snapshot_of_assumptions or default.model_dump()
+    key = tuple(sorted(values.items()))
+    if key not in memo:
+        assumptions = Assumptions(**values)
+        memo[key] = (assumptions, assumptions_hash(assumptions))
+    return memo[key]
+
+
+def refresh_stale_snapshots(deals: Iterable[Deal], default: Assumptions) -> int:
+    """Recompute, in place, the snapshots of deals whose stamp no longer matches.
+
+    A snapshot is stale when it is missing, was produced by another engine
+    version, or its assumptions hash differs from the deal's pinned
+    assumptions (falling back to ``default`` for deals without any). Stale
+    deals sharing assumptions are recomputed as one batch. Nothing is
+    committed; the caller commits once per request. Returns how many deals
+    were refreshed.
+    """
+
+    memo: Dict[Tuple, Tuple[Assumptions, str]] = {}
+    groups: Dict[str, Tuple[Assumptions, List[Deal]]] = {}
+    for deal in deals:
+        assumptions, digest = _pinned_assumptions(deal, default, memo)
+        if (
+            deal.snapshot_of_analytics_result is not None
+            and deal.analytics_engine_version == ANALYTICS_ENGINE_VERSION
+            and deal.analytics_assumptions_hash == digest
+        ):
+            continue
+        groups.setdefault(digest, (assumptions, []))[1].append(deal)
+
+    refreshed = 0
+    for assumptions, stale in groups.values():
+        for deal, snapshot in zip(stale, deal_snapshots_batch(deal_columns(stale), assumptions)):
+            store_snapshot(deal, snapshot, assumptions)
+        refreshed += len(stale)
+    return refreshed
+
+
+def _recompute_chunk(args: Tuple[List[int], Dict[str, List[Optional[float]]], Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Pool entry point: bulk-update rows (deal id, snapshot, metric columns) for one page."""
+
+    deal_ids, columns, assumption_values = args
+    assumptions = Assumptions(**assumption_values)
+    snapshots = deal_snapshots_batch(columns, assumptions)
+    stamp = snapshot_stamp(assumptions)
+    return [
+        {
+            "id": deal_id,
+            "snapshot_of_analytics_result": snapshot,
+            **snapshot_metrics(snapshot),
+            **stamp,
+        }
+        for deal_id, snapshot in zip(deal_ids, snapshots)
+    ]
+
+
+def _load_chunk(db: Session, after_id: int, limit: int) -> Tuple[List[int], Dict[str, List[Optional[float]]]]:
+    """Read the next keyset page of deal inputs as columns."""
+
+    query = (
+        db.query(Deal.id, *[getattr(Deal, name) for name in DEAL_INPUT_COLUMNS])
+        .filter(Deal.id > after_id)
+        .order_by(Deal.id)
+        .limit(limit)
+        .yield_per(limit)
+    )
+    rows = query.all()
+    if not rows:
+        return [], {}
+    transposed = list(zip(*rows))
+    return list(transposed[0]), {name: list(values) for name, values in zip(DEAL_INPUT_COLUMNS, transposed[1:])}
+
+
+def create_recompute_job(db: Session, assumptions: Assumptions, user_id: Optional[int] = None) -> Job:
+    """Create a pending recompute job that will apply ``assumptions`` to every deal."""
+
+    job = Job(
+        kind=RECOMPUTE_JOB_KIND,
+        status=JobStatus.PENDING,
+        user_id=user_id,
+        params={"assumptions": assumptions.model_dump()},
+        total=db.query(func.count(Deal.id)).scalar() or 0,
+    )
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+def claim_recompute_job(db: Session, job: Job) -> bool:
+    """Claim a failed recompute job, or a running one that has gone stale, for resuming."""
+
+    resumable = job.status == JobStatus.FAILED or (
+        job.status == JobStatus.RUNNING and job.is_stale(RECOMPUTE_CONFIG["stale_seconds"])
+    )
+    return (
+        job.kind == RECOMPUTE_JOB_KIND
+        and resumable
+        and claim_job(db, job, RECOMPUTE_CONFIG["stale_seconds"]) is not None
+    )
+
+
+def run_recompute_job(
+    job_id: int,
+    session_factory: Callable[[], Session],
+    max_workers: int = 0,
+    chunk_size: Optional[int] = None,
+    claimed: bool = False,
+) -> None:
+    """Claim and run (or resume) a recompute job to completion, recording failures on the job row.
+
+    Pass ``claimed=True`` when the caller already claimed the job (see ``claim_recompute_job``).
+    """
+
+    chunk_size = chunk_size or RECOMPUTE_CONFIG["chunk_size"]
+    db = session_factory()
+    try:
+        job = db.query(Job).filter(Job.id == job_id).one()
+        if not claimed and claim_job(db, job, RECOMPUTE_CONFIG["stale_seconds"]) is None:
+            return
+        db.refresh(job)
+        job.started_at = job.started_at or datetime.utcnow()
+        job.total = job.processed + (db.query(func.count(Deal.id)).filter(Deal.id > job.last_id).scalar() or 0)
+        db.commit()
+
+        assumption_values = job.params["assumptions"]
+        submit: Callable[[Tuple], Any]
+        if max_workers > 0:
+            submit = lambda args: get_process_pool(max_workers).submit(_recompute_chunk, args)  # noqa: E731
+            max_pending = RECOMPUTE_CONFIG["max_pending_chunks"]
+        else:
+            submit = _recompute_chunk
+            max_pending = 1
+
+        # Reads run ahead of writes by up to ``max_pending_chunks`` pages so
+        # the pool stays busy while this thread writes finished pages in order.
+        pending: Deque[Tuple[int, Any]] = deque()
+        cursor = job.last_id
+        exhausted = False
+        while pending or not exhausted:
+            while not exhausted and len(pending) < max_pending:
+                deal_ids, columns = _load_chunk(db, cursor, chunk_size)
+                if not deal_ids:
+                    exhausted = True
+                    break
+                cursor = deal_ids[-1]
+                pending.append((cursor, submit((deal_ids, columns, assumption_values))))
+            if not pending:
+                break
+
+            page_last_id, outcome = pending.popleft()
+            rows = outcome.result() if max_workers > 0 else outcome
+            db.execute(update(Deal), rows)
+            job.processed += len(rows)
+            job.last_id = page_last_id
+            db.commit()
+
+        job.status = JobStatus.COMPLETED
+        job.finished_at = datetime.utcnow()
+        db.commit()
+    except Exception as exc:
+        logger.exception("Recompute job %s failed", job_id)
+        db.rollback()
+        job = db.query(Job).filter(Job.id == job_id).first()
+        if job is not None:
+            job.status = JobStatus.FAILED
+            job.error = str(exc)[:500]
+            db.commit()
+    finally:
+        db.close()
+
+
+def start_recompute_job(
+    job_id: int, session_factory: Callable[[], Session], max_workers: int = 0, claimed: bool = False
+) -> Thread:
+    """Run a recompute job on a background thread."""
+
+    thread = Thread(
+        target=run_recompute_job,
+        args=(job_id, session_factory, max_workers),
+        kwargs={"claimed": claimed},
+        name=f"recompute-job-{job_id}",
+        daemon=True,
+    )
+    thread.start()
+    return thread
@@ -36,6 +36,8 @@ def init_db():
     import app.models.lead
     import app.models.admin
     import app.models.billing
+    import app.models.job
+    import app.core.search  # Full-text index DDL runs with its tables' CREATE
     
     # Ensure new models are imported
     # import app.models.property # Updated
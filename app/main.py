@@ -14,11 +14,24 @@ from app.api.routes_analytics import router as analytics_router
 from app.api.routes_auth import router as auth_router
 from app.api.routes_billing import router as billing_router
 from app.api.routes_deals import router as deals_router
+from app.api.routes_jobs import router as jobs_router
 from app.api.routes_leads import router as leads_router
+from app.api.routes_portfolio import router as portfolio_router
 from app.api.routes_properties import router as properties_router
+from app.api.routes_search import router as search_router
 from app.api.routes_users import router as users_router
+from app.core.assumption_versions import (
+    refresh_assumptions,
+    start_assumptions_poller,
+    stop_assumptions_poller,
+)
+from app.core.autocomplete import rebuild_from_db as rebuild_autocomplete_index
+from app.core.comps import rebuild_from_db as rebuild_comps_index
+from app.core.import_jobs import start_import_job_poller, stop_import_job_poller
+from app.core.map_index import rebuild_from_db as rebuild_map_index
 from app.core.config import settings
-from app.db.base import init_db
+from app.core.rent_index import persist as persist_rent_index, warm_start as warm_rent_index
+from app.db.base import SessionLocal, init_db
 
 from fastapi.staticfiles import StaticFiles
 
@@ -34,6 +47,28 @@ app.mount("/static", StaticFiles(directory="static"), name="static")
 @app.on_event("startup")
 def startup_event():
     init_db()
+    db = SessionLocal()
+    try:
+        refresh_assumptions(db)
+        warm_rent_index(db, settings.RENT_INDEX_PATH)
+        rebuild_comps_index(db)
+        rebuild_map_index(db)
+        rebuild_autocomplete_index(db)
+    finally:
+        db.close()
+    start_assumptions_poller(SessionLocal, settings.ASSUMPTIONS_REFRESH_SECONDS)
+    start_import_job_poller(SessionLocal, settings.IMPORT_MAX_WORKERS, settings.SIMULATION_MAX_WORKERS)
+
+
+@app.on_event("shutdown")
+def shutdown_event():
+    stop_assumptions_poller()
+    stop_import_job_poller()
+    db = SessionLocal()
+    try:
+        persist_rent_index(db, settings.RENT_INDEX_PATH)
+    finally:
+        db.close()
 
 # Security: Add security headers middleware
 class SecurityHeadersMiddleware(BaseHTTPMiddleware):
@@ -90,9 +125,12 @@ app.include_router(auth_router)
 app.include_router(users_router)
 app.include_router(properties_router)
 app.include_router(deals_router)
+app.include_router(portfolio_router)
 app.include_router(admin_router)
 app.include_router(analytics_router)  # Phase 1 analytics endpoints (still available)
 app.include_router(leads_router)
+app.include_router(jobs_router)
+app.include_router(search_router)
 app.include_router(ai_router)
 app.include_router(billing_router)
 
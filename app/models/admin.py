@@ -4,7 +4,7 @@ from __future__ import annotations
 from datetime import datetime
 import enum
 
-from sqlalchemy import Column, DateTime, Integer, String, Boolean, JSON, ForeignKey
+from sqlalchemy import Column, DateTime, Index, Integer, String, Boolean, JSON, ForeignKey
 from sqlalchemy.orm import relationship
 
 from app.db.base import Base
@@ -12,6 +12,7 @@ from app.db.base import Base
 class AuditLog(Base):
     """Audit log model for tracking user activity."""
     __tablename__ = "audit_logs"
+    __table_args__ = (Index("ix_audit_logs_created_at_id", "created_at", "id"),)
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
@@ -37,3 +38,13 @@ class FeatureFlag(Base):
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
+
+class AssumptionSet(Base):
+    """Versioned, append-only history of the default calculation assumptions."""
+    __tablename__ = "assumption_sets"
+
+    id = Column(Integer, primary_key=True, index=True)
+    version = Column(Integer, unique=True, index=True, nullable=False)
+    values = Column(JSON, nullable=False)
+    created_by_user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
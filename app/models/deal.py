@@ -3,8 +3,9 @@ from __future__ import annotations
 
 from datetime import datetime
 import enum
+from typing import Any, Dict, Optional
 
-from sqlalchemy import Column, DateTime, Float, ForeignKey, Integer, String, JSON, Enum
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Index, Integer, String, JSON, Enum
 from sqlalchemy.orm import relationship
 
 from app.db.base import Base
@@ -23,6 +24,13 @@ class Deal(Base):
     """Deal model."""
 
     __tablename__ = "deals"
+    __table_args__ = (
+        Index("ix_deals_user_id_stage", "user_id", "stage"),
+        # Keyset pagination: (owner, sort key, id) for each allowed sort.
+        Index("ix_deals_user_id_id", "user_id", "id"),
+        Index("ix_deals_user_id_created_at_id", "user_id", "created_at", "id"),
+        Index("ix_deals_user_id_purchase_price_id", "user_id", "purchase_price", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -53,9 +61,31 @@ class Deal(Base):
     snapshot_of_assumptions = Column(JSON, nullable=True)
     snapshot_of_analytics_result = Column(JSON, nullable=True)
 
+    # Denormalized from the analytics snapshot so portfolio rollups are plain SQL aggregates
+    monthly_cash_flow = Column(Float, nullable=True)
+    noi_annual = Column(Float, nullable=True)
+    cash_on_cash_return = Column(Float, nullable=True)
+    overall_score = Column(Float, nullable=True)
+
+    # Which engine version and assumptions produced the snapshot (see app.core.underwriting)
+    analytics_engine_version = Column(Integer, nullable=True)
+    analytics_assumptions_hash = Column(String(40), nullable=True)
+
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
     # Relationships
     user = relationship("User", back_populates="deals")
     property = relationship("Property", back_populates="deals")
+
+
+def snapshot_metrics(snapshot: Optional[Dict[str, Any]]) -> Dict[str, Optional[float]]:
+    """Extract the denormalized metric columns from an analytics snapshot."""
+    cash_flow = (snapshot or {}).get("cash_flow") or {}
+    deal_analysis = (snapshot or {}).get("deal_analysis") or {}
+    return {
+        "monthly_cash_flow": cash_flow.get("monthly_cash_flow"),
+        "noi_annual": cash_flow.get("noi_annual"),
+        "cash_on_cash_return": cash_flow.get("cash_on_cash_return"),
+        "overall_score": deal_analysis.get("overall_score"),
+    }
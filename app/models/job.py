@@ -0,0 +1,105 @@
+"""Background job model."""
+from __future__ import annotations
+
+import enum
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import Column, DateTime, Enum, ForeignKey, Integer, JSON, String
+from sqlalchemy.orm import Session
+
+from app.db.base import Base
+
+
+class JobStatus(str, enum.Enum):
+    """Job status enumeration."""
+
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class Job(Base):
+    """Long-running background job with resumable progress.
+
+    ``last_id`` is the highest source row id (for imports, the last data row
+    number of the upload) whose results are committed, so a failed or
+    interrupted job can continue from there. ``result`` holds kind-specific
+    outcome counters, such as an import's row errors. ``claim_token`` is set
+    afresh by every claim, so a worker whose job was reclaimed can tell.
+    """
+
+    __tablename__ = "jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String, nullable=False, index=True)  # e.g. "recompute_deals"
+    status = Column(Enum(JobStatus), default=JobStatus.PENDING, nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+    params = Column(JSON, nullable=True)
+
+    total = Column(Integer, default=0, nullable=False)
+    processed = Column(Integer, default=0, nullable=False)
+    last_id = Column(Integer, default=0, nullable=False)
+    error = Column(String, nullable=True)
+    result = Column(JSON, nullable=True)
+    claim_token = Column(String, nullable=True)
+
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+    @property
+    def rows_per_second(self) -> Optional[float]:
+        """Average throughput since the job first started."""
+        if self.started_at is None:
+            return None
+        elapsed = ((self.finished_at or datetime.utcnow()) - self.started_at).total_seconds()
+        return round(self.processed / elapsed, 1) if elapsed > 0 else None
+
+    def is_stale(self, stale_seconds: float) -> bool:
+        """Whether the job has committed nothing for ``stale_seconds`` (its worker is presumed dead)."""
+        return self.updated_at < datetime.utcnow() - timedelta(seconds=stale_seconds)
+
+
+def claim_job(db: Session, job: Job, stale_seconds: float) -> Optional[str]:
+    """Mark ``job`` running unless it is finished, live elsewhere, or another worker changed it first.
+
+    The UPDATE only matches the status and ``updated_at`` that were read, so
+    of several workers claiming the same job at once exactly one wins.
+    Returns the winner's claim token (None when not claimed).
+    """
+    if job.status == JobStatus.COMPLETED or (job.status == JobStatus.RUNNING and not job.is_stale(stale_seconds)):
+        return None
+    token = uuid.uuid4().hex
+    claimed = (
+        db.query(Job)
+        .filter(Job.id == job.id, Job.status == job.status, Job.updated_at == job.updated_at)
+        .update(
+            {
+                Job.status: JobStatus.RUNNING,
+                Job.error: None,
+                Job.claim_token: token,
+                Job.updated_at: datetime.utcnow(),
+            }
+        )
+    )
+    db.commit()
+    return token if claimed == 1 else None
+
+
+def renew_claim(db: Session, job_id: int, token: str) -> bool:
+    """Bump the job's heartbeat in the open transaction if ``token`` still holds its claim.
+
+    Call it just before committing work: when it returns False the job was
+    reclaimed (this worker was presumed dead) and the transaction must be
+    rolled back instead.
+    """
+    renewed = (
+        db.query(Job)
+        .filter(Job.id == job_id, Job.claim_token == token)
+        .update({Job.updated_at: datetime.utcnow()}, synchronize_session=False)
+    )
+    return renewed == 1
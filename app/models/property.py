@@ -4,9 +4,11 @@ from __future__ import annotations
 import enum
 from datetime import datetime
 
-from sqlalchemy import Column, DateTime, Enum, Float, ForeignKey, Integer, String, Boolean, JSON
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, DateTime, Enum, Float, ForeignKey, Index, Integer, String, Boolean, JSON
+from sqlalchemy.orm import relationship, validates
 
+from app.core.address import address_key
+from app.core.geo import geohash_encode
 from app.db.base import Base
 
 
@@ -33,6 +35,15 @@ class Property(Base):
     """Property model."""
 
     __tablename__ = "properties"
+    __table_args__ = (
+        Index("ix_properties_owner_user_id_id", "owner_user_id", "id"),
+        Index("ix_properties_owner_user_id_created_at_id", "owner_user_id", "created_at", "id"),
+        # Radius search: geohash range scans that also cover the coordinates.
+        Index("ix_properties_owner_user_id_geohash", "owner_user_id", "geohash", "latitude", "longitude"),
+        Index("ix_properties_geohash", "geohash", "latitude", "longitude"),
+        # Duplicate detection: one set-based lookup per import chunk.
+        Index("ix_properties_owner_user_id_address_key", "owner_user_id", "address_key"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     owner_user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -44,6 +55,7 @@ class Property(Base):
     state = Column(String, nullable=False)
     zip_code = Column(String, nullable=False)
     country = Column(String, default="USA", nullable=False)
+    address_key = Column(String, nullable=True)  # Normalized street, unit and zip (see app.core.address)
 
     # Property Details
     property_type = Column(Enum(PropertyType), nullable=False)
@@ -57,6 +69,7 @@ class Property(Base):
     # Geospatial (basic lat/long support for mapping)
     latitude = Column(Float, nullable=True)
     longitude = Column(Float, nullable=True)
+    geohash = Column(String(12), nullable=True)
     
     # Phase 2: Status
     status = Column(Enum(PropertyStatus), default=PropertyStatus.EVALUATING, nullable=False)
@@ -68,6 +81,45 @@ class Property(Base):
     owner = relationship("User", back_populates="properties")
     deals = relationship("Deal", back_populates="property", cascade="all, delete-orphan")
     images = relationship("PropertyImage", back_populates="property", cascade="all, delete-orphan")
+    tag_rows = relationship("PropertyTag", cascade="all, delete-orphan")
+
+    @validates("latitude", "longitude")
+    def _sync_geohash(self, key, value):
+        """Keep ``geohash`` in step with the coordinates."""
+        latitude = value if key == "latitude" else self.latitude
+        longitude = value if key == "longitude" else self.longitude
+        self.geohash = geohash_encode(latitude, longitude) if latitude is not None and longitude is not None else None
+        return value
+
+    @validates("address_line1", "address_line2", "zip_code")
+    def _sync_address_key(self, key, value):
+        """Keep ``address_key`` in step with the address."""
+        parts = {"address_line1": self.address_line1, "address_line2": self.address_line2, "zip_code": self.zip_code}
+        parts[key] = value
+        self.address_key = address_key(**parts)
+        return value
+
+    @validates("tags")
+    def _sync_tag_rows(self, key, tags):
+        """Mirror ``tags`` into ``property_tags`` so tag filters run as indexed SQL."""
+        existing = {row.tag: row for row in self.tag_rows}
+        self.tag_rows = [existing.get(tag) or PropertyTag(tag=tag) for tag in normalize_tags(tags)]
+        return tags
+
+
+def normalize_tags(tags) -> list:
+    """Distinct, case-folded tags in a stable order."""
+    return sorted({tag.strip().lower() for tag in tags or [] if tag and tag.strip()})
+
+
+class PropertyTag(Base):
+    """One normalized tag of a property (the searchable copy of ``Property.tags``)."""
+
+    __tablename__ = "property_tags"
+    __table_args__ = (Index("ix_property_tags_tag_property_id", "tag", "property_id"),)
+
+    property_id = Column(Integer, ForeignKey("properties.id", ondelete="CASCADE"), primary_key=True)
+    tag = Column(String, primary_key=True)
 
 
 class PropertyImage(Base):
@@ -1,9 +1,9 @@
 """Pydantic schemas for the analytics engine."""
 from __future__ import annotations
 
-from typing import List, Optional
+from typing import List, Literal, Optional
 
-from pydantic import BaseModel, Field, model_validator
+from pydantic import BaseModel, Field, NonNegativeFloat, PositiveFloat, PositiveInt, model_validator
 
 from app.core.assumptions import Assumptions
 
@@ -100,6 +100,104 @@ class DealAnalysisResponse(BaseModel):
     dscr: DSCRResponse
 
 
+MAX_BATCH_DEALS = 50_000
+
+
+class DealBatchAnalysisRequest(BaseModel):
+    """Columnar batch of deals: index ``i`` of every list describes deal ``i``."""
+
+    purchase_price: List[PositiveFloat] = Field(..., min_length=1, max_length=MAX_BATCH_DEALS)
+    down_payment: List[PositiveFloat] = Field(..., min_length=1, max_length=MAX_BATCH_DEALS)
+    monthly_rent: List[NonNegativeFloat] = Field(..., min_length=1, max_length=MAX_BATCH_DEALS)
+    interest_rate: List[NonNegativeFloat] = Field(..., min_length=1, max_length=MAX_BATCH_DEALS)
+    loan_term_years: List[PositiveInt] = Field(..., min_length=1, max_length=MAX_BATCH_DEALS)
+    hoa_monthly: Optional[List[NonNegativeFloat]] = None
+    property_tax_annual: Optional[List[NonNegativeFloat]] = None
+    insurance_annual: Optional[List[NonNegativeFloat]] = None
+    assumptions: Optional[Assumptions] = None
+
+    @model_validator(mode="after")
+    def columns_align(self) -> "DealBatchAnalysisRequest":
+        """Validate column lengths and that every down payment leaves room for financing."""
+        size = len(self.purchase_price)
+        for name in ("down_payment", "monthly_rent", "interest_rate", "loan_term_years",
+                     "hoa_monthly", "property_tax_annual", "insurance_annual"):
+            column = getattr(self, name)
+            if column is not None and len(column) != size:
+                raise ValueError(f"Column '{name}' has {len(column)} values, expected {size}.")
+        invalid = [i for i, (down, price) in enumerate(zip(self.down_payment, self.purchase_price)) if down >= price]
+        if invalid:
+            raise ValueError(f"Down payment must be less than purchase price (rows {invalid[:10]}).")
+        return self
+
+
+SensitivityField = Literal[
+    "purchase_price",
+    "down_payment",
+    "interest_rate",
+    "loan_term_years",
+    "monthly_rent",
+    "property_tax_annual",
+    "insurance_annual",
+    "hoa_monthly",
+    "maintenance_percent",
+    "vacancy_percent",
+    "management_percent",
+]
+
+
+class SensitivityBaseDeal(DealAnalysisRequest):
+    """Base deal for sensitivity runs; optional expenses fall back to assumptions."""
+
+    property_tax_annual: Optional[float] = Field(None, ge=0)
+    insurance_annual: Optional[float] = Field(None, ge=0)
+    maintenance_percent: Optional[float] = Field(None, ge=0, le=100)
+    vacancy_percent: Optional[float] = Field(None, ge=0, le=100)
+    management_percent: Optional[float] = Field(None, ge=0, le=100)
+
+
+class SensitivityAxis(BaseModel):
+    field: SensitivityField
+    values: List[float] = Field(..., min_length=1, max_length=200)
+
+
+class SensitivityGridRequest(SensitivityBaseDeal):
+    axes: List[SensitivityAxis] = Field(..., min_length=1, max_length=3)
+
+
+class TornadoRequest(SensitivityBaseDeal):
+    percent: float = Field(10.0, gt=0, le=100, description="Swing applied to each input, in percent.")
+    fields: Optional[List[SensitivityField]] = None
+
+
+GoalSeekVariable = Literal["purchase_price", "monthly_rent", "down_payment"]
+GoalSeekMetric = Literal["monthly_cash_flow", "dscr", "cash_on_cash_return", "irr_percent"]
+
+
+class GoalSeekGoal(BaseModel):
+    solve_for: GoalSeekVariable
+    metric: GoalSeekMetric
+    target: float | List[float] = Field(..., description="One target for every deal, or one per deal.")
+
+
+class GoalSeekRequest(DealBatchAnalysisRequest):
+    """Columnar deals plus the goals to solve for each of them."""
+
+    goals: List[GoalSeekGoal] = Field(..., min_length=1, max_length=20)
+
+    @model_validator(mode="after")
+    def targets_align(self) -> "GoalSeekRequest":
+        """Validate per-deal target lists and positive DSCR targets."""
+        size = len(self.purchase_price)
+        for index, goal in enumerate(self.goals):
+            targets = goal.target if isinstance(goal.target, list) else [goal.target]
+            if isinstance(goal.target, list) and len(targets) != size:
+                raise ValueError(f"Goal {index} has {len(targets)} targets, expected {size}.")
+            if goal.metric == "dscr" and any(target <= 0 for target in targets):
+                raise ValueError(f"Goal {index}: DSCR targets must be positive.")
+        return self
+
+
 __all__ = [
     "ResponseEnvelope",
     "CapRateRequest",
@@ -112,4 +210,11 @@ __all__ = [
     "RentEstimateResponse",
     "DealAnalysisRequest",
     "DealAnalysisResponse",
+    "DealBatchAnalysisRequest",
+    "GoalSeekGoal",
+    "GoalSeekRequest",
+    "SensitivityAxis",
+    "SensitivityBaseDeal",
+    "SensitivityGridRequest",
+    "TornadoRequest",
 ]
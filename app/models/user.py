@@ -4,7 +4,7 @@ from __future__ import annotations
 import enum
 from datetime import datetime
 
-from sqlalchemy import Column, DateTime, Enum, Integer, JSON, String, Boolean
+from sqlalchemy import Column, DateTime, Enum, Index, Integer, JSON, String, Boolean
 from sqlalchemy.orm import relationship
 
 from app.db.base import Base
@@ -22,6 +22,7 @@ class User(Base):
     """User model."""
 
     __tablename__ = "users"
+    __table_args__ = (Index("ix_users_created_at_id", "created_at", "id"),)
 
     id = Column(Integer, primary_key=True, index=True)
     email = Column(String, unique=True, index=True, nullable=False)
@@ -42,3 +42,15 @@ class SystemStats(BaseModel):
     total_leads: int
     active_subscriptions: int
 
+
+class AnalyticsCacheStats(BaseModel):
+    entries: int
+    bytes: int
+    max_entries: int
+    max_bytes: int
+    ttl_seconds: float
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    hit_rate: float
@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Literal, Optional
 
 from pydantic import BaseModel, Field, model_validator
 
@@ -67,6 +67,7 @@ class DealResponse(DealBase):
     user_id: int
     snapshot_of_assumptions: Optional[Dict[str, Any]] = None
     snapshot_of_analytics_result: Optional[Dict[str, Any]] = None
+    analytics_engine_version: Optional[int] = None
     created_at: datetime
     updated_at: datetime
     user: Optional[UserResponse] = None
@@ -75,3 +76,98 @@ class DealResponse(DealBase):
     class Config:
         from_attributes = True
 
+
+class DealCompResponse(DealResponse):
+    """A comparable deal with its similarity to the requested deal."""
+
+    similarity: float  # 1 / (1 + distance); 1 means identical features
+    distance: float  # Weighted, standardized feature distance
+
+
+
+class DealProjectionResponse(BaseModel):
+    """Yearly projection series for a deal; index ``i`` is operating year ``year[i]``."""
+
+    deal_id: int
+    rent_growth_percent_annual: float
+    appreciation_percent_annual: float
+    expense_growth_percent_annual: float
+    year: List[int]
+    gross_rent: List[float]
+    vacancy_loss: List[float]
+    operating_expenses: List[float]
+    noi: List[float]
+    debt_service: List[float]
+    cash_flow: List[float]
+    cumulative_cash_flow: List[float]
+    loan_balance: List[float]
+    property_value: List[float]
+    equity: List[float]
+
+
+class DealAmortizationResponse(BaseModel):
+    """Monthly amortization schedule for a deal's loan; index ``i`` is payment ``month[i]``."""
+
+    deal_id: int
+    loan_amount: float
+    interest_rate: float
+    loan_term_years: int
+    monthly_payment: float
+    total_interest: float
+    month: List[int]
+    payment: List[float]
+    principal: List[float]
+    interest: List[float]
+    balance: List[float]
+    cumulative_interest: List[float]
+
+
+class DistributionSpec(BaseModel):
+    """Sampling distribution for one simulated variable.
+
+    ``normal`` and ``triangular``/``fixed`` centre on the deal's own value when
+    ``mean``/``mode``/``value`` are omitted; ``uniform`` and ``triangular``
+    need explicit bounds.
+    """
+
+    kind: Literal["normal", "uniform", "triangular", "fixed"] = "normal"
+    mean: Optional[float] = None
+    std: float = Field(0.0, ge=0)
+    low: Optional[float] = None
+    high: Optional[float] = None
+    mode: Optional[float] = None
+    value: Optional[float] = None
+
+    @model_validator(mode="after")
+    def validate_bounds(self) -> "DistributionSpec":
+        """Validate that bounded distributions carry an ordered low/high pair."""
+        if self.kind in ("uniform", "triangular"):
+            if self.low is None or self.high is None or self.low > self.high:
+                raise ValueError(f"{self.kind} distributions require low <= high.")
+        return self
+
+
+class DealSimulationRequest(BaseModel):
+    """Monte Carlo simulation settings; omitted distributions use the engine defaults."""
+
+    paths: int = Field(10_000, ge=100, le=100_000)
+    seed: Optional[int] = Field(None, ge=0, description="Set for reproducible results.")
+    vacancy_percent: Optional[DistributionSpec] = None
+    maintenance_percent: Optional[DistributionSpec] = None
+    rent_growth_percent: Optional[DistributionSpec] = None
+    appreciation_percent: Optional[DistributionSpec] = None
+    interest_rate_shock: Optional[DistributionSpec] = None
+
+
+class DealSimulationResponse(BaseModel):
+    """Aggregated Monte Carlo results for a deal."""
+
+    deal_id: int
+    paths: int
+    seed: Optional[int] = None
+    monthly_cash_flow: Dict[str, Optional[float]]
+    irr_percent: Dict[str, Optional[float]]
+    probability_dscr_below_1: float
+    probability_negative_cash_flow: float
+    irr_undefined_paths: int
+    distributions: Dict[str, Dict[str, Any]]
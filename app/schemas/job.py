@@ -0,0 +1,30 @@
+"""Background job schemas."""
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from pydantic import BaseModel
+
+from app.models.job import JobStatus
+
+
+class JobResponse(BaseModel):
+    """Status and progress of a background job."""
+
+    id: int
+    kind: str
+    status: JobStatus
+    total: int
+    processed: int
+    last_id: int
+    error: Optional[str] = None
+    result: Optional[Dict[str, Any]] = None
+    rows_per_second: Optional[float] = None
+    created_at: datetime
+    updated_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,34 @@
+"""Portfolio summary schemas."""
+from __future__ import annotations
+
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class PortfolioGroup(BaseModel):
+    """Aggregates for one slice of the portfolio (a stage or a property type)."""
+
+    key: str
+    deal_count: int
+    total_purchase_price: float
+    total_monthly_cash_flow: float
+    total_noi_annual: float
+
+
+class PortfolioSummary(BaseModel):
+    """Portfolio-wide totals and averages for the current user's deals."""
+
+    deal_count: int
+    deals_with_metrics: int
+    total_purchase_price: float
+    total_down_payment: float
+    total_monthly_rent: float
+    total_monthly_cash_flow: float
+    total_noi_annual: float
+    average_cap_rate: Optional[float] = None  # Mean of per-deal cap rates, in percent
+    weighted_cap_rate: Optional[float] = None  # Total NOI / total purchase price, in percent
+    weighted_cash_on_cash_return: Optional[float] = None  # Total annual cash flow / total down payment, in percent
+    average_score: Optional[float] = None
+    by_stage: List[PortfolioGroup]
+    by_property_type: List[PortfolioGroup]
@@ -122,17 +122,44 @@ class PropertyMapPoint(BaseModel):
     key_metrics: Dict[str, Any]
 
 
+class PropertyMapCluster(BaseModel):
+    """A group of nearby properties shown as one marker at low zoom."""
+
+    cell: str
+    latitude: float
+    longitude: float
+    count: int
+    heat_metric: str = "list_price"
+    heat_value: Optional[float] = None
+    heat_min: Optional[float] = None
+    heat_max: Optional[float] = None
+
+
 class PropertyMapResponse(BaseModel):
     """Response for property map view."""
 
     points: List[PropertyMapPoint]
+    clusters: List[PropertyMapCluster] = []
+    zoom: Optional[int] = None
+
+
+class PropertyAutocompleteResponse(BaseModel):
+    """Autocomplete suggestions for a prefix, per field."""
+
+    prefix: str
+    cities: List[str] = []
+    zip_codes: List[str] = []
+    addresses: List[str] = []
 
 
 class PropertyImportResult(BaseModel):
     """Result of a property import operation."""
 
     imported: int
+    updated: int = 0
     skipped: int
+    duplicates: int = 0
     errors: List[str]
     created_ids: List[int]
+    updated_ids: List[int] = []
 
@@ -0,0 +1,24 @@
+"""Full-text search schemas."""
+from __future__ import annotations
+
+from typing import List
+
+from pydantic import BaseModel
+
+
+class SearchHit(BaseModel):
+    """One ranked match; ``snippet`` marks matched words with [brackets]."""
+
+    id: int
+    title: str
+    snippet: str
+    score: float
+
+
+class SearchResponse(BaseModel):
+    """Matches for a query, ranked within each entity type."""
+
+    query: str
+    properties: List[SearchHit] = []
+    leads: List[SearchHit] = []
+    deals: List[SearchHit] = []
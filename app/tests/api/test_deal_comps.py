@@ -20,7 +20,7 @@ def test_get_deal_comps_no_property(client: TestClient, normal_user_token_header
     )
     db.add(base_deal)
     
-    # Create a comparable deal (within 20% price)
+    # Create a comparable deal (close in price and rent)
     comp_deal = Deal(
         user_id=normal_user.id,
         purchase_price=110000,
@@ -34,7 +34,7 @@ def test_get_deal_comps_no_property(client: TestClient, normal_user_token_header
     )
     db.add(comp_deal)
     
-    # Create a non-comparable deal (outside price range)
+    # Create a less comparable deal (twice the price)
     non_comp_deal = Deal(
         user_id=normal_user.id,
         purchase_price=200000,
@@ -56,8 +56,8 @@ def test_get_deal_comps_no_property(client: TestClient, normal_user_token_header
     
     assert response.status_code == 200
     data = response.json()
-    assert len(data) == 1
-    assert data[0]["id"] == comp_deal.id
+    assert [d["id"] for d in data] == [comp_deal.id, non_comp_deal.id]
+    assert data[0]["similarity"] > data[1]["similarity"]
 
 def test_get_deal_comps_with_property(client: TestClient, normal_user_token_headers: dict, db: Session, normal_user: User):
     # Create properties
@@ -141,10 +141,9 @@ def test_get_deal_comps_with_property(client: TestClient, normal_user_token_head
     db.add(deal3)
     db.commit()
     
-    # Search comps for deal1 (Austin, Single Family)
-    # deal2 is Austin (match city)
-    # deal3 is Single Family (match type)
-    # Both should be returned
+    # Search comps for deal1 (1500 sqft, 3/2, $300k)
+    # deal3 has identical size, layout and price, so it ranks first
+    # deal2 is larger and pricier, so it ranks below deal3
     
     response = client.get(
         f"/api/v1/deals/{deal1.id}/comps",
@@ -154,7 +153,9 @@ def test_get_deal_comps_with_property(client: TestClient, normal_user_token_head
     assert response.status_code == 200
     data = response.json()
     ids = [d["id"] for d in data]
+    assert ids[0] == deal3.id
     assert deal2.id in ids
-    assert deal3.id in ids
-    assert len(data) == 2
+    assert data[0]["similarity"] == 1.0
+    similarities = [d["similarity"] for d in data]
+    assert similarities == sorted(similarities, reverse=True)
 
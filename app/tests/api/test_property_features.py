@@ -1,11 +1,12 @@
 from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
 
-from app.models.property import Property, PropertyType, PropertyStatus
+from app.models.property import Property, PropertyTag, PropertyType, PropertyStatus
 from app.models.user import User
 
 
 def create_sample_properties(db: Session, owner: User):
+    db.query(PropertyTag).delete()
     db.query(Property).delete()
     prop1 = Property(
         owner_user_id=owner.id,
@@ -2,12 +2,12 @@
  * Deals API client.
  */
 import { getApiClient } from '../api-client';
-import type { Deal, DealFormData } from '../../types';
+import type { Deal, DealAmortization, DealFormData, DealProjection } from '../../types';
 
 export const dealsApi = {
-  async getDeals(): Promise<Deal[]> {
+  async getDeals(limit = 100, sort = 'id'): Promise<Deal[]> {
     const client = getApiClient();
-    return client.get<Deal[]>('/api/v1/deals');
+    return client.get<Deal[]>(`/api/v1/deals?limit=${limit}&sort=${encodeURIComponent(sort)}`);
   },
 
   async getDeal(id: number): Promise<Deal> {
@@ -40,6 +40,16 @@ export const dealsApi = {
     return client.get<Deal[]>(`/api/v1/deals/${id}/comps`);
   },
 
+  async getProjection(id: number, years = 10): Promise<DealProjection> {
+    const client = getApiClient();
+    return client.get<DealProjection>(`/api/v1/deals/${id}/projection?years=${years}`);
+  },
+
+  async getAmortization(id: number): Promise<DealAmortization> {
+    const client = getApiClient();
+    return client.get<DealAmortization>(`/api/v1/deals/${id}/amortization`);
+  },
+
   // Note: CSV export is handled client-side in the component
   // For server-side export, use: GET /api/v1/deals/export.csv
 };
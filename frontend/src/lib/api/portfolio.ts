@@ -0,0 +1,12 @@
+/**
+ * Portfolio API client.
+ */
+import { getApiClient } from '../api-client';
+import type { PortfolioSummary } from '../../types';
+
+export const portfolioApi = {
+  async getSummary(): Promise<PortfolioSummary> {
+    const client = getApiClient();
+    return client.get<PortfolioSummary>('/api/v1/portfolio/summary');
+  },
+};
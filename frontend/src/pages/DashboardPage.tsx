@@ -4,7 +4,8 @@
 import { useQuery } from '@tanstack/react-query';
 import { Link } from 'react-router-dom';
 import { dealsApi } from '../lib/api/deals';
-import type { Deal } from '../types';
+import { portfolioApi } from '../lib/api/portfolio';
+import type { Deal, PortfolioSummary } from '../types';
 import { useAuth } from '../contexts/AuthContext';
 import { PageTitle } from '../components/PageTitle';
 import { Skeleton, SkeletonCard } from '../components/ui/Skeleton';
@@ -23,14 +24,21 @@ function formatPercent(value: number): string {
   return `${value.toFixed(2)}%`;
 }
 
+// Only the newest deals are shown; portfolio totals come from the summary endpoint
+const RECENT_DEALS_LIMIT = 5;
+
 export default function DashboardPage() {
   const { user } = useAuth();
   const { data: deals, isLoading, error } = useQuery<Deal[]>({
-    queryKey: ['deals'],
-    queryFn: () => dealsApi.getDeals(),
+    queryKey: ['deals', 'recent', RECENT_DEALS_LIMIT],
+    queryFn: () => dealsApi.getDeals(RECENT_DEALS_LIMIT, '-created_at'),
+  });
+  const { data: summary, isLoading: summaryLoading, error: summaryError } = useQuery<PortfolioSummary>({
+    queryKey: ['portfolio-summary'],
+    queryFn: () => portfolioApi.getSummary(),
   });
 
-  if (isLoading) {
+  if (isLoading || summaryLoading) {
     return (
       <>
         <PageTitle title="Dashboard" description="View your portfolio overview and recent deals" />
@@ -56,7 +64,8 @@ export default function DashboardPage() {
     );
   }
 
-  if (error) {
+  const loadError = error || summaryError;
+  if (loadError) {
     return (
       <div className="rounded-xl bg-red-50 p-6 border border-red-100">
         <div className="flex">
@@ -68,7 +77,7 @@ export default function DashboardPage() {
           <div className="ml-3">
             <h3 className="text-sm font-medium text-red-800">Error loading dashboard</h3>
             <div className="mt-2 text-sm text-red-700">
-              <p>{error instanceof Error ? error.message : 'Unknown error occurred'}</p>
+              <p>{loadError instanceof Error ? loadError.message : 'Unknown error occurred'}</p>
             </div>
           </div>
         </div>
@@ -78,32 +87,21 @@ export default function DashboardPage() {
 
   const dealsList = deals || [];
 
-  // Calculate summary metrics
-  const totalDeals = dealsList.length;
+  // Portfolio totals come from the server so they cover every deal, not just the recent ones
+  const totalDeals = summary?.deal_count ?? 0;
   const dealsWithAnalytics = dealsList.filter(
     (deal) => deal.snapshot_of_analytics_result?.cash_flow
   );
 
-  const totalPortfolioValue = dealsList.reduce((sum, deal) => sum + deal.purchase_price, 0);
-
-  const avgCapRate =
-    dealsWithAnalytics.length > 0
-      ? dealsWithAnalytics.reduce((sum, deal) => {
-          const noi = deal.snapshot_of_analytics_result?.cash_flow.noi_annual || 0;
-          const capRate = (noi / deal.purchase_price) * 100;
-          return sum + capRate;
-        }, 0) / dealsWithAnalytics.length
-      : 0;
-
-  const totalMonthlyCashFlow = dealsWithAnalytics.reduce((sum, deal) => {
-    return sum + (deal.snapshot_of_analytics_result?.cash_flow.monthly_cash_flow || 0);
-  }, 0);
+  const totalPortfolioValue = summary?.total_purchase_price ?? 0;
+  const avgCapRate = summary?.average_cap_rate ?? 0;
+  const totalMonthlyCashFlow = summary?.total_monthly_cash_flow ?? 0;
 
   // Prepare chart data
   const chartData = dealsWithAnalytics.map(deal => ({
     name: deal.property?.address_line1?.split(',')[0] || `Deal #${deal.id}`,
     cashFlow: deal.snapshot_of_analytics_result?.cash_flow.monthly_cash_flow || 0,
-  })).slice(0, 5); // Top 5
+  }));
 
   return (
     <>
@@ -268,7 +266,7 @@ export default function DashboardPage() {
                                 </tr>
                             </thead>
                             <tbody className="bg-white divide-y divide-slate-200">
-                                {dealsList.slice(0, 5).map((deal) => {
+                                {dealsList.map((deal) => {
                                     const analytics = deal.snapshot_of_analytics_result;
                                     const cashFlow = analytics?.cash_flow;
                                     const analysis = analytics?.deal_analysis;
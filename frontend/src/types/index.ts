@@ -68,10 +68,24 @@ export interface DealAnalysisSnapshot {
   dscr: DSCRSnapshot;
 }
 
+export interface ReturnsSnapshot {
+  irr_percent: number | null;
+  npv: number;
+  equity_multiple: number | null;
+  holding_period_years: number;
+  discount_rate_percent: number;
+  solver: {
+    converged: boolean;
+    method: 'newton' | 'bisection' | 'none';
+    iterations: number;
+  };
+}
+
 export interface AnalyticsSnapshot {
   cash_flow: CashFlowSnapshot;
   dscr: DSCRSnapshot;
   deal_analysis: DealAnalysisSnapshot;
+  returns?: ReturnsSnapshot;
 }
 
 export interface AssumptionsSnapshot {
@@ -82,6 +96,43 @@ export interface AssumptionsSnapshot {
   insurance_percent: number;
   appreciation_percent_annual: number;
   rent_growth_percent_annual: number;
+  expense_growth_percent_annual?: number;
+  holding_period_years?: number;
+  discount_rate_percent?: number;
+  selling_cost_percent?: number;
+}
+
+export interface DealProjection {
+  deal_id: number;
+  rent_growth_percent_annual: number;
+  appreciation_percent_annual: number;
+  expense_growth_percent_annual: number;
+  year: number[];
+  gross_rent: number[];
+  vacancy_loss: number[];
+  operating_expenses: number[];
+  noi: number[];
+  debt_service: number[];
+  cash_flow: number[];
+  cumulative_cash_flow: number[];
+  loan_balance: number[];
+  property_value: number[];
+  equity: number[];
+}
+
+export interface DealAmortization {
+  deal_id: number;
+  loan_amount: number;
+  interest_rate: number;
+  loan_term_years: number;
+  monthly_payment: number;
+  total_interest: number;
+  month: number[];
+  payment: number[];
+  principal: number[];
+  interest: number[];
+  balance: number[];
+  cumulative_interest: number[];
 }
 
 // Deal types
@@ -373,3 +424,27 @@ export interface Subscription {
   created_at: string;
   updated_at: string;
 }
+
+export interface PortfolioGroup {
+  key: string;
+  deal_count: number;
+  total_purchase_price: number;
+  total_monthly_cash_flow: number;
+  total_noi_annual: number;
+}
+
+export interface PortfolioSummary {
+  deal_count: number;
+  deals_with_metrics: number;
+  total_purchase_price: number;
+  total_down_payment: number;
+  total_monthly_rent: number;
+  total_monthly_cash_flow: number;
+  total_noi_annual: number;
+  average_cap_rate: number | null;
+  weighted_cap_rate: number | null;
+  weighted_cash_on_cash_return: number | null;
+  average_score: number | null;
+  by_stage: PortfolioGroup[];
+  by_property_type: PortfolioGroup[];
+}
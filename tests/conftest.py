@@ -12,7 +12,7 @@ ROOT_DIR = os.path.dirname(os.path.dirname(__file__))
 if ROOT_DIR not in sys.path:
     sys.path.insert(0, ROOT_DIR)
 
-from app.db.base import Base, get_db
+from app.db.base import Base, get_db, init_db
 from app.main import app
 
 # Use SQLite in-memory database for tests
@@ -24,6 +24,12 @@ engine = create_engine(
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
+@pytest.fixture(scope="session", autouse=True)
+def app_database() -> None:
+    """Make sure the application database has every table before module-level clients use it."""
+    init_db()
+
+
 @pytest.fixture(scope="function")
 def db_session() -> Generator:
     """Create a test database session."""
@@ -0,0 +1,18 @@
+"""Tests for normalized address keys."""
+from app.core.address import address_key
+
+
+def test_spellings_of_one_address_share_a_key():
+    expected = "12 n main st #4b|78701"
+    assert address_key("12 North Main Street, Apt 4B", None, "78701-1234") == expected
+    assert address_key("  12 n. MAIN st  #4b", "", "78701") == expected
+    assert address_key("12 N Main St", "Suite 4-B", "78701") == expected
+    assert address_key("12 N Main St", "4B", "78701") == expected
+
+
+def test_distinct_addresses_keep_distinct_keys():
+    base = address_key("12 Main St", None, "78701")
+    assert base == "12 main st|78701"
+    assert address_key("12 Main St", "Unit 1", "78701") != base
+    assert address_key("12 Main St", None, "78702") != base
+    assert address_key("12 Main Ave", None, "78701") != base
@@ -0,0 +1,74 @@
+"""Tests for the closed-form amortization module."""
+import math
+
+import numpy as np
+import pytest
+
+from app.core.amortization import (
+    amortization_schedule,
+    annuity_factor,
+    growth_table,
+    monthly_payment,
+    monthly_payment_batch,
+    remaining_balance_batch,
+)
+
+
+def _loop_schedule(loan_amount, interest_rate, loan_term_years):
+    rate = interest_rate / 100 / 12
+    payment = monthly_payment(loan_amount, interest_rate, loan_term_years)
+    balance = loan_amount
+    balances, interests = [], []
+    for _ in range(loan_term_years * 12):
+        interest = balance * rate
+        balance -= payment - interest
+        interests.append(interest)
+        balances.append(balance)
+    return np.array(balances), np.array(interests)
+
+
+def test_schedule_matches_month_by_month_loop():
+    schedule = amortization_schedule(200000, 5.0, 30)
+    balances, interests = _loop_schedule(200000, 5.0, 30)
+
+    assert schedule["month"].shape == (360,)
+    np.testing.assert_allclose(schedule["interest"], interests, rtol=1e-9)
+    np.testing.assert_allclose(schedule["balance"][:-1], balances[:-1], rtol=1e-7, atol=1e-6)
+    assert schedule["balance"][-1] == 0
+    np.testing.assert_allclose(schedule["principal"] + schedule["interest"], schedule["payment"])
+    assert math.isclose(schedule["principal"].sum(), 200000, rel_tol=1e-9)
+
+
+def test_zero_rate_and_no_loan():
+    schedule = amortization_schedule(120000, 0.0, 10)
+    assert np.allclose(schedule["payment"], 1000)
+    assert schedule["interest"].sum() == 0
+
+    empty = amortization_schedule(0, 5.0, 30)
+    assert empty["month"].shape == (0,)
+
+
+def test_batch_payment_and_balance_match_scalar():
+    loans = np.array([200000, 150000, 0, 90000])
+    rates = np.array([5.0, 0.0, 4.0, 6.5])
+    terms = np.array([30, 15, 30, 20])
+    payments = monthly_payment_batch(loans, rates, terms)
+    for i in range(4):
+        assert payments[i] == monthly_payment(loans[i], rates[i], terms[i])
+
+    balances = remaining_balance_batch(loans, rates, terms, np.array([12, 12, 12, 240]))
+    assert math.isclose(balances[0], amortization_schedule(200000, 5.0, 30)["balance"][11], rel_tol=1e-12)
+    assert math.isclose(balances[1], 150000 - payments[1] * 12)
+    assert balances[2] == 0 and balances[3] == 0
+
+
+def test_annuity_factors_are_cached_and_read_only():
+    annuity_factor.cache_clear()
+    monthly_payment(100000, 4.25, 30)
+    monthly_payment(250000, 4.25, 30)
+    assert annuity_factor.cache_info().hits >= 1
+
+    table = growth_table(4.25, 30)
+    assert table is growth_table(4.25, 30)
+    with pytest.raises(ValueError):
+        table[0] = 2.0
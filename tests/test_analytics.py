@@ -1,11 +1,18 @@
 import math
 
+import numpy as np
+
 from app.core.analytics import (
     analyze_deal,
     calculate_cap_rate,
     calculate_cash_flow,
     calculate_dscr,
+    calculate_npv,
+    calculate_returns,
+    calculate_returns_batch,
     estimate_rent,
+    holding_period_cash_flows,
+    solve_irr,
 )
 from app.core.assumptions import Assumptions
 
@@ -137,3 +144,63 @@ def test_analyze_deal_cash_purchase():
     result = analyze_deal(payload)
     assert result["dscr"]["dscr"] is None
     assert "Cash purchase" in " ".join(result["reasons"]) or "no debt" in " ".join(result["reasons"]).lower()
+
+
+def test_solve_irr_newton_and_bisection_fallback():
+    """IRR solver converges via Newton, falls back to bisection, and flags rows without an IRR."""
+    cash_flows = np.array(
+        [
+            [-100, 10, 10, 110],  # 10% bond-like flows
+            [-1000, 3000, -2500, 600],  # Newton stalls from the default guess
+            [-100, 0, 0, 0],  # Never pays back: no IRR
+        ],
+        dtype=float,
+    )
+    result = solve_irr(cash_flows)
+
+    assert math.isclose(result["irr"][0], 0.10, rel_tol=1e-9)
+    assert list(result["solver"]) == ["newton", "bisection", "none"]
+    assert list(result["converged"]) == [True, True, False]
+    assert math.isnan(result["irr"][2])
+    npv_at_irr = calculate_npv(cash_flows[1:2], result["irr"][1] * 100)[0]
+    assert abs(npv_at_irr) < 1e-6
+
+
+def test_calculate_returns_for_deal():
+    """Returns use the holding period, discount rate and sale assumptions."""
+    payload = {
+        "purchase_price": 250000,
+        "down_payment": 50000,
+        "interest_rate": 5.0,
+        "loan_term_years": 30,
+        "monthly_rent": 2200,
+        "assumptions": Assumptions(holding_period_years=5, discount_rate_percent=8),
+    }
+    returns = calculate_returns(payload)
+
+    assert returns["holding_period_years"] == 5
+    assert returns["solver"]["converged"]
+    assert returns["irr_percent"] > 8  # Positive NPV at 8% implies IRR above 8%
+    assert returns["npv"] > 0
+    assert returns["equity_multiple"] > 1
+
+    cash_flows = holding_period_cash_flows({k: [v] for k, v in payload.items() if k != "assumptions"}, payload["assumptions"])
+    assert cash_flows.shape == (1, 6)
+    assert abs(calculate_npv(cash_flows, returns["irr_percent"])[0]) < 1e-4
+
+
+def test_calculate_returns_batch_ranks_deals():
+    """Batch returns line up with the single-deal helper."""
+    columns = {
+        "purchase_price": [250000, 250000],
+        "down_payment": [50000, 50000],
+        "interest_rate": [5.0, 5.0],
+        "loan_term_years": [30, 30],
+        "monthly_rent": [2200, 1600],
+    }
+    batch = calculate_returns_batch(columns)
+    single = calculate_returns({name: values[1] for name, values in columns.items()})
+
+    assert batch["irr_percent"][0] > batch["irr_percent"][1]
+    assert math.isclose(batch["irr_percent"][1], single["irr_percent"], rel_tol=1e-12)
+    assert list(np.argsort(-batch["irr_percent"])) == [0, 1]
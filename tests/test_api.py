@@ -1,3 +1,4 @@
+import pytest
 from fastapi.testclient import TestClient
 
 from app.main import app
@@ -5,6 +6,16 @@ from app.main import app
 client = TestClient(app)
 
 
+def get_auth_headers(email: str, password: str = "apipass123", role: str = "investor") -> dict:
+    """Helper to register a user and get auth headers."""
+    client.post(
+        "/api/v1/auth/register",
+        json={"email": email, "password": password, "full_name": "API User", "role": role},
+    )
+    response = client.post("/api/v1/auth/login", json={"email": email, "password": password})
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
 def test_cap_rate_endpoint():
     response = client.post(
         "/api/v1/calculate/cap-rate",
@@ -29,11 +40,21 @@ def test_assumptions_round_trip():
     defaults = get_resp.json()["data"]
 
     updated_payload = {**defaults, "vacancy_percent": 4.0}
-    put_resp = client.put("/api/v1/assumptions", json=updated_payload)
+    headers = get_auth_headers("assumptions-admin@example.com", role="admin")
+    put_resp = client.put("/api/v1/assumptions", json=updated_payload, headers=headers)
     assert put_resp.status_code == 200
     assert put_resp.json()["data"]["vacancy_percent"] == 4.0
 
 
+def test_assumptions_update_requires_admin():
+    payload = {**client.get("/api/v1/assumptions").json()["data"], "vacancy_percent": 9.0}
+    assert client.put("/api/v1/assumptions", json=payload).status_code in (401, 403)
+
+    headers = get_auth_headers("assumptions-user@example.com")
+    assert client.put("/api/v1/assumptions", json=payload, headers=headers).status_code == 403
+    assert client.get("/api/v1/assumptions").json()["data"]["vacancy_percent"] != 9.0
+
+
 def test_analyze_deal_endpoint():
     response = client.post(
         "/api/v1/analyze/deal",
@@ -92,3 +113,126 @@ def test_deal_analysis_down_payment_validation():
         },
     )
     assert response.status_code == 422  # Validation error
+
+
+def test_analyze_deals_batch_endpoint_matches_single():
+    """Batch endpoint returns the same numbers as the single-deal endpoint."""
+    deal = {
+        "purchase_price": 300000,
+        "down_payment": 60000,
+        "monthly_rent": 2500,
+        "interest_rate": 4.5,
+        "loan_term_years": 30,
+        "hoa_monthly": 0,
+    }
+    single = client.post("/api/v1/analyze/deal", json=deal).json()["data"]
+    response = client.post(
+        "/api/v1/analyze/deals:batch",
+        json={name: [value, value] for name, value in deal.items()},
+    )
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert data["count"] == 2
+    assert data["overall_score"] == [single["overall_score"]] * 2
+    assert data["label"] == [single["label"]] * 2
+    assert data["dscr"][0] == pytest.approx(single["dscr"]["dscr"])
+    assert data["monthly_cash_flow"][1] == pytest.approx(single["cash_flow"]["monthly_cash_flow"])
+
+
+def test_analyze_deals_batch_rejects_ragged_columns():
+    response = client.post(
+        "/api/v1/analyze/deals:batch",
+        json={
+            "purchase_price": [300000, 200000],
+            "down_payment": [60000],
+            "monthly_rent": [2500, 2000],
+            "interest_rate": [4.5, 4.5],
+            "loan_term_years": [30, 30],
+        },
+    )
+    assert response.status_code == 422
+
+
+def test_sensitivity_grid_endpoint():
+    response = client.post(
+        "/api/v1/analyze/sensitivity",
+        json={
+            "purchase_price": 300000,
+            "down_payment": 60000,
+            "monthly_rent": 2500,
+            "interest_rate": 4.5,
+            "loan_term_years": 30,
+            "axes": [
+                {"field": "interest_rate", "values": [3, 4, 5, 6, 7]},
+                {"field": "monthly_rent", "values": [2000, 2500, 3000]},
+            ],
+        },
+    )
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert data["shape"] == [5, 3]
+    assert len(data["monthly_cash_flow"]) == 5 and len(data["monthly_cash_flow"][0]) == 3
+    assert data["monthly_cash_flow"][0][2] > data["monthly_cash_flow"][4][0]
+
+
+def test_tornado_endpoint():
+    response = client.post(
+        "/api/v1/analyze/tornado",
+        json={
+            "purchase_price": 300000,
+            "down_payment": 60000,
+            "monthly_rent": 2500,
+            "interest_rate": 4.5,
+            "loan_term_years": 30,
+            "percent": 20,
+            "fields": ["monthly_rent", "interest_rate"],
+        },
+    )
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert [row["field"] for row in data["inputs"]] == ["monthly_rent", "interest_rate"]
+    assert data["percent"] == 20
+
+
+def test_goal_seek_endpoint():
+    response = client.post(
+        "/api/v1/analyze/goal-seek",
+        json={
+            "purchase_price": [300000, 200000],
+            "down_payment": [60000, 40000],
+            "monthly_rent": [2500, 2000],
+            "interest_rate": [4.5, 6.0],
+            "loan_term_years": [30, 30],
+            "goals": [
+                {"solve_for": "purchase_price", "metric": "monthly_cash_flow", "target": 200},
+                {"solve_for": "purchase_price", "metric": "dscr", "target": [1.2, 1.3]},
+                {"solve_for": "monthly_rent", "metric": "cash_on_cash_return", "target": 8},
+            ],
+        },
+    )
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert data["count"] == 2
+    cash_flow_goal, dscr_goal, rent_goal = data["goals"]
+    assert cash_flow_goal["method"] == "closed_form"
+    assert cash_flow_goal["achieved"] == pytest.approx([200, 200])
+    assert dscr_goal["achieved"] == pytest.approx([1.2, 1.3])
+    assert rent_goal["achieved"] == pytest.approx([8, 8])
+    assert data["combined"]["purchase_price"] == pytest.approx(
+        [min(a, b) for a, b in zip(cash_flow_goal["value"], dscr_goal["value"])]
+    )
+
+
+def test_goal_seek_endpoint_rejects_misaligned_targets():
+    response = client.post(
+        "/api/v1/analyze/goal-seek",
+        json={
+            "purchase_price": [300000, 200000],
+            "down_payment": [60000, 40000],
+            "monthly_rent": [2500, 2000],
+            "interest_rate": [4.5, 6.0],
+            "loan_term_years": [30, 30],
+            "goals": [{"solve_for": "down_payment", "metric": "dscr", "target": [1.2]}],
+        },
+    )
+    assert response.status_code == 422
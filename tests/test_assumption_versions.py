@@ -0,0 +1,60 @@
+"""Tests for versioned, DB-backed assumptions."""
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core import assumptions as assumptions_module
+from app.core.assumption_versions import latest_version, refresh_assumptions, save_assumptions
+from app.core.assumptions import Assumptions, get_assumptions, get_assumptions_version, update_assumptions
+from app.db.base import Base
+from app.models.admin import AssumptionSet
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(bind=engine)
+    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture(autouse=True)
+def restore_store():
+    saved = assumptions_module._assumptions_store
+    yield
+    assumptions_module._assumptions_store = saved
+
+
+def test_update_ignores_older_versions():
+    update_assumptions(Assumptions(vacancy_percent=1), 10, force=True)
+    assert not update_assumptions(Assumptions(vacancy_percent=2), 9)
+    assert get_assumptions().vacancy_percent == 1
+    assert update_assumptions(Assumptions(vacancy_percent=3), 11)
+    assert get_assumptions_version() == 11
+
+
+def test_save_assigns_increasing_versions(session_factory):
+    db = session_factory()
+    _, first = save_assumptions(db, Assumptions(vacancy_percent=6))
+    _, second = save_assumptions(db, Assumptions(vacancy_percent=7))
+    assert second == first + 1
+    assert latest_version(db) == second
+    assert get_assumptions().vacancy_percent == 7
+    assert db.query(AssumptionSet).count() == 2
+
+
+def test_refresh_picks_up_other_workers_saves(session_factory):
+    db = session_factory()
+    update_assumptions(Assumptions(), 0, force=True)
+    assert not refresh_assumptions(db)
+
+    # Simulate another worker writing a newer version directly.
+    db.add(AssumptionSet(version=5, values=Assumptions(vacancy_percent=12).model_dump()))
+    db.commit()
+
+    assert get_assumptions().vacancy_percent == Assumptions().vacancy_percent
+    assert refresh_assumptions(db)
+    assert get_assumptions().vacancy_percent == 12
+    assert get_assumptions_version() == 5
+    assert not refresh_assumptions(db)
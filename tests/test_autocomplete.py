@@ -0,0 +1,152 @@
+"""Tests for the in-memory autocomplete index and endpoint."""
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.autocomplete import AutocompleteIndex, sync_owner
+from app.db.base import Base
+from app.main import app
+from app.models.property import Property, PropertyType
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    Base.metadata.drop_all(bind=engine)
+
+
+def get_auth_token(email: str, password: str = "completepass123") -> str:
+    """Helper to register and get auth token."""
+    client.post(
+        "/api/v1/auth/register",
+        json={"email": email, "password": password, "full_name": "Complete User"},
+    )
+    response = client.post("/api/v1/auth/login", json={"email": email, "password": password})
+    return response.json()["access_token"]
+
+
+def test_index_completes_prefixes_and_tracks_changes():
+    index = AutocompleteIndex()
+    index.rebuild(
+        [
+            (1, 7, "Austin", "78701", "12 Main St", None),
+            (2, 7, "austin ", "78702", "400 Maple  Ave", None),
+            (3, 7, "Aurora", "80010", "9 Mainsail Ct", None),
+            (4, 8, "Austin", "78701", "12 Main St", None),
+        ]
+    )
+    assert index.complete(7, "AU", 10) == {
+        "cities": ["Aurora", "Austin"],
+        "zip_codes": [],
+        "addresses": [],
+    }
+    assert index.complete(7, "ma", 10)["addresses"] == ["12 Main St", "9 Mainsail Ct", "400 Maple  Ave"]
+    assert index.complete(7, "12 m", 10)["addresses"] == ["12 Main St"]
+    assert index.complete(7, "787", 1)["zip_codes"] == ["78701"]
+    assert index.complete(9, "a", 10)["cities"] == []
+
+    # Austin stays while another property still references it.
+    index.observe(1, 7, "Boulder", "80301", "12 Main St")
+    assert index.complete(7, "au", 10)["cities"] == ["Aurora", "Austin"]
+    index.discard(2)
+    assert index.complete(7, "au", 10)["cities"] == ["Aurora"]
+    assert index.complete(7, "b", 10)["cities"] == ["Boulder"]
+    assert index.complete(7, "78", 10)["zip_codes"] == []
+
+    # Incremental writes and a rebuild leave the same lists.
+    rebuilt = AutocompleteIndex()
+    rebuilt.rebuild([(1, 7, "Boulder", "80301", "12 Main St", None), (3, 7, "Aurora", "80010", "9 Mainsail Ct", None)])
+    for prefix in ("a", "b", "8", "1", "m"):
+        assert index.complete(7, prefix, 10) == rebuilt.complete(7, prefix, 10)
+
+
+def add_property(db, owner_id, city, address_line1):
+    prop = Property(
+        owner_user_id=owner_id,
+        address_line1=address_line1,
+        city=city,
+        state="TX",
+        zip_code="78701",
+        property_type=PropertyType.CONDO,
+        bedrooms=2,
+        bathrooms=1,
+        square_feet=900,
+    )
+    db.add(prop)
+    db.commit()
+    return prop
+
+
+def test_sync_owner_picks_up_other_workers_writes(db):
+    index = AutocompleteIndex()
+    mine = add_property(db, 7, "Austin", "1 Elm St")
+    index.observe(mine.id, 7, mine.city, mine.zip_code, mine.address_line1, mine.updated_at)
+    assert not sync_owner(db, 7, index, interval=0.0)
+
+    # Rows written by another worker: a create, an update and a delete.
+    other = add_property(db, 7, "Boise", "2 Oak St")
+    assert not sync_owner(db, 7, index, interval=60.0)  # This check is not due yet
+    assert index.complete(7, "bo", 10)["cities"] == []
+    assert sync_owner(db, 7, index, interval=0.0)
+    assert index.complete(7, "bo", 10)["cities"] == ["Boise"]
+
+    mine.city = "Denver"
+    db.commit()
+    assert sync_owner(db, 7, index, interval=0.0)
+    assert index.complete(7, "d", 10)["cities"] == ["Denver"]
+    assert index.complete(7, "a", 10)["cities"] == []
+
+    db.delete(other)
+    db.commit()
+    assert sync_owner(db, 7, index, interval=0.0)
+    assert index.complete(7, "b", 10)["cities"] == []
+    assert not sync_owner(db, 7, index, interval=0.0)
+
+
+def test_autocomplete_endpoint_follows_property_writes():
+    headers = {"Authorization": f"Bearer {get_auth_token('autocomplete@example.com')}"}
+    other = {"Authorization": f"Bearer {get_auth_token('autocomplete-other@example.com')}"}
+    payload = {
+        "address_line1": "77 Juniperberry Lane",
+        "city": "Xanadu Springs",
+        "state": "TX",
+        "zip_code": "79999",
+        "property_type": "condo",
+        "bedrooms": 2,
+        "bathrooms": 1,
+        "square_feet": 900,
+    }
+    property_id = client.post("/api/v1/properties", headers=headers, json=payload).json()["id"]
+
+    response = client.get("/api/v1/properties/autocomplete", headers=headers, params={"prefix": "xana"})
+    assert response.status_code == 200
+    assert response.json()["cities"] == ["Xanadu Springs"]
+    suggestions = client.get(
+        "/api/v1/properties/autocomplete", headers=headers, params={"prefix": "junip", "fields": "addresses"}
+    ).json()
+    assert (suggestions["addresses"], suggestions["cities"]) == (["77 Juniperberry Lane"], [])
+    assert client.get("/api/v1/properties/autocomplete", headers=other, params={"prefix": "xana"}).json()["cities"] == []
+
+    client.put(f"/api/v1/properties/{property_id}", headers=headers, json={"city": "Yarrowville"})
+    assert client.get("/api/v1/properties/autocomplete", headers=headers, params={"prefix": "xana"}).json()["cities"] == []
+    client.delete(f"/api/v1/properties/{property_id}", headers=headers)
+    assert client.get("/api/v1/properties/autocomplete", headers=headers, params={"prefix": "yarr"}).json()["cities"] == []
+
+    content = (
+        "address_line1,city,state,zip_code,property_type,bedrooms,bathrooms,square_feet\n"
+        "5 Quartzite Row,Zephyr Falls,TX,79998,condo,2,1,900\n"
+    )
+    client.post("/api/v1/properties/import", headers=headers, files={"file": ("properties.csv", content.encode("utf-8"))})
+    assert client.get("/api/v1/properties/autocomplete", headers=headers, params={"prefix": "zeph"}).json()["cities"] == [
+        "Zephyr Falls"
+    ]
+    bad = client.get("/api/v1/properties/autocomplete", headers=headers, params={"prefix": "z", "fields": "states"})
+    assert bad.status_code == 400
@@ -0,0 +1,67 @@
+"""Parity tests for the vectorized batch engine."""
+import math
+
+import numpy as np
+import pytest
+
+from app.core.analytics import analyze_deal
+from app.core.assumptions import Assumptions
+from app.core.batch import analyze_deals_batch
+
+
+def _random_columns(size: int, seed: int = 7) -> dict:
+    rng = np.random.default_rng(seed)
+    purchase_price = rng.uniform(50_000, 1_000_000, size)
+    return {
+        "purchase_price": purchase_price,
+        "down_payment": purchase_price * rng.uniform(0.05, 0.6, size),
+        "interest_rate": np.where(rng.random(size) < 0.1, 0.0, rng.uniform(2.0, 9.0, size)),
+        "loan_term_years": rng.choice([10, 15, 20, 30], size),
+        "monthly_rent": rng.uniform(0, 8_000, size),
+        "hoa_monthly": rng.uniform(0, 400, size),
+    }
+
+
+def test_batch_matches_scalar_analyzer():
+    assumptions = Assumptions(vacancy_percent=4, maintenance_percent=7, management_percent=9)
+    columns = _random_columns(300)
+    result = analyze_deals_batch(columns, assumptions)
+
+    for i in range(300):
+        scalar = analyze_deal({**{name: values[i].item() for name, values in columns.items()}, "assumptions": assumptions})
+        for metric in ("monthly_cash_flow", "annual_cash_flow", "noi_annual", "monthly_debt_service", "cash_on_cash_return"):
+            assert math.isclose(result[metric][i], scalar["cash_flow"][metric], rel_tol=1e-12, abs_tol=1e-9)
+        assert math.isclose(result["dscr"][i], scalar["dscr"]["dscr"], rel_tol=1e-12)
+        assert result["overall_score"][i] == scalar["overall_score"]
+        assert result["label"][i] == scalar["label"]
+
+
+def test_batch_cash_purchase_has_no_dscr():
+    result = analyze_deals_batch(
+        {
+            "purchase_price": [300000],
+            "down_payment": [300000],
+            "interest_rate": [0.0],
+            "loan_term_years": [30],
+            "monthly_rent": [2500],
+        }
+    )
+    scalar = analyze_deal(
+        {"purchase_price": 300000, "down_payment": 300000, "interest_rate": 0.0, "loan_term_years": 30, "monthly_rent": 2500}
+    )
+    assert np.isnan(result["dscr"][0])
+    assert result["monthly_debt_service"][0] == 0.0
+    assert result["overall_score"][0] == scalar["overall_score"]
+
+
+def test_batch_rejects_ragged_columns():
+    with pytest.raises(ValueError):
+        analyze_deals_batch(
+            {
+                "purchase_price": [300000, 200000],
+                "down_payment": [60000],
+                "interest_rate": [5.0, 5.0],
+                "loan_term_years": [30, 30],
+                "monthly_rent": [2500, 2000],
+            }
+        )
@@ -0,0 +1,91 @@
+"""Tests for the analytics memoization cache."""
+import time
+
+from app.core.analytics import analyze_deal, calculate_cash_flow, calculate_returns, estimate_rent
+from app.core.assumptions import Assumptions
+from app.core.cache import AnalyticsCache, analytics_cache, cache_key, memoized
+
+
+CASH_FLOW_INPUTS = {
+    "purchase_price": 250000,
+    "down_payment": 50000,
+    "interest_rate": 5.0,
+    "loan_term_years": 30,
+    "monthly_rent": 2200,
+    "property_tax_annual": 3000,
+    "insurance_annual": 1200,
+    "hoa_monthly": 0,
+    "maintenance_percent": 5,
+    "vacancy_percent": 5,
+    "management_percent": 8,
+}
+
+
+def test_cache_key_is_canonical():
+    """Equal numbers, key order and Assumptions instances hash identically."""
+    assert cache_key("f", {"a": 1, "b": 2.0}) == cache_key("f", {"b": 2, "a": 1.0})
+    assert cache_key("f", {"assumptions": Assumptions()}) == cache_key("f", {"assumptions": Assumptions()})
+    assert cache_key("f", {"assumptions": Assumptions()}) != cache_key(
+        "f", {"assumptions": Assumptions(vacancy_percent=9)}
+    )
+    assert cache_key("f", {"a": 1}) != cache_key("g", {"a": 1})
+
+
+def test_memoized_counts_hits_and_returns_copies():
+    cache = AnalyticsCache(max_entries=10, max_bytes=1_000_000, ttl_seconds=60)
+    calls = []
+
+    @memoized("double", cache=cache)
+    def double(values):
+        calls.append(values)
+        return {"values": [value * 2 for value in values]}
+
+    first = double([1, 2])
+    first["values"].append(99)
+    second = double([1, 2])
+
+    assert second == {"values": [2, 4]}
+    assert len(calls) == 1
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+
+def test_cache_evicts_by_entries_and_bytes():
+    cache = AnalyticsCache(max_entries=2, max_bytes=1_000_000, ttl_seconds=60)
+    for key in ("a", "b", "c"):
+        cache.set(key, key)
+    assert cache.get("a") == (False, None)
+    assert cache.get("c") == (True, "c")
+    assert cache.stats()["evictions"] == 1
+
+    small = AnalyticsCache(max_entries=100, max_bytes=300, ttl_seconds=60)
+    for index in range(5):
+        small.set(str(index), "x" * 100)
+    stats = small.stats()
+    assert stats["bytes"] <= 300
+    assert stats["entries"] < 5
+    assert stats["evictions"] > 0
+
+
+def test_cache_entries_expire():
+    cache = AnalyticsCache(max_entries=10, max_bytes=1_000_000, ttl_seconds=0.01)
+    cache.set("a", 1)
+    time.sleep(0.02)
+    assert cache.get("a") == (False, None)
+    assert cache.stats()["expirations"] == 1
+
+
+def test_only_costly_analytics_functions_are_memoized():
+    analytics_cache.clear()
+    before = analytics_cache.stats()["hits"]
+
+    payload = {**CASH_FLOW_INPUTS, "assumptions": Assumptions()}
+    first = calculate_returns(payload)
+    first["npv"] = None
+    assert calculate_returns(dict(payload))["npv"] is not None
+    assert analytics_cache.stats()["hits"] - before == 1
+
+    # A hit costs more than recomputing these.
+    for cheap in (calculate_cash_flow, estimate_rent, analyze_deal):
+        assert not hasattr(cheap, "uncached")
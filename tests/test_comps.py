@@ -0,0 +1,85 @@
+"""Tests for the comparable-deals feature index."""
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from app.core.comps import ComparablesIndex, deal_features
+
+
+def house(price, sqft, beds=3, baths=2, year=2000, lat=40.0, lon=-75.0, rent=None):
+    return deal_features(price, rent if rent is not None else price * 0.008, sqft, beds, baths, year, lat, lon)
+
+
+def test_query_ranks_by_similarity_and_excludes_source():
+    index = ComparablesIndex(capacity=2)
+    index.observe(1, 10, house(300000, 1800))
+    index.observe(2, 10, house(310000, 1850))
+    index.observe(3, 10, house(900000, 4000, beds=5, baths=4, lat=41.0))
+    index.observe(4, 10, house(320000, 1700, year=1995))
+
+    ranked = index.query(1, k=3)
+    assert [comp.deal_id for comp in ranked] == [2, 4, 3]
+    assert all(0 < comp.similarity <= 1 for comp in ranked)
+    assert ranked[0].similarity > ranked[-1].similarity
+
+
+def test_query_stays_within_owner_and_follows_updates():
+    index = ComparablesIndex()
+    index.observe(1, 10, house(300000, 1800))
+    index.observe(2, 10, house(800000, 3500))
+    index.observe(3, 20, house(300000, 1800))
+
+    assert [comp.deal_id for comp in index.query(1, k=5)] == [2]
+
+    # Moving deal 2 next to deal 1 makes it identical; removing it swaps rows safely.
+    index.observe(2, 10, house(300000, 1800))
+    assert index.query(1, k=1)[0].distance == 0.0
+    index.discard(2)
+    assert index.query(1, k=5) == []
+    assert len(index) == 2
+
+
+def test_fingerprint_and_replace_owner():
+    stamp = datetime(2026, 1, 1)
+    index = ComparablesIndex()
+    index.observe(5, 10, house(300000, 1800), stamp)
+    index.observe(9, 10, house(310000, 1800), stamp + timedelta(days=1))
+    index.observe(7, 20, house(300000, 1800))
+    assert index.fingerprint(10) == (2, 9, stamp + timedelta(days=1))
+    assert index.fingerprint(99) == (0, None, None)
+
+    index.replace_owner(10, [(11, house(300000, 1800), stamp), (12, house(500000, 2500), None)])
+    assert 5 not in index and 9 not in index
+    assert index.fingerprint(10) == (2, 12, stamp)
+    assert [comp.deal_id for comp in index.query(11, k=5)] == [12]
+    assert 7 in index
+
+
+def test_missing_candidate_features_are_penalized():
+    index = ComparablesIndex()
+    for deal_id, (price, sqft) in enumerate([(200000, 1200), (450000, 2600), (600000, 3200), (250000, 1500)], start=10):
+        index.observe(deal_id, 10, house(price, sqft))
+    index.observe(1, 10, house(300000, 1800))
+    index.observe(2, 10, deal_features(300000, 2400))  # No property: only price is known
+    index.observe(3, 10, house(310000, 1850))
+    index.observe(4, 10, deal_features(305000, 2400))
+
+    distances = {comp.deal_id: comp.distance for comp in index.query(1, k=10)}
+    assert min(distances, key=distances.get) == 3
+    # Same price but nothing else known ranks below a fully described, similar house.
+    assert distances[2] > distances[13]
+
+    # Features the source lacks are ignored: to a price-only deal, deals 1 and 2 look the same.
+    distances = {comp.deal_id: comp.distance for comp in index.query(4, k=10)}
+    assert distances[1] == distances[2]
+
+
+def test_rebuild_matches_incremental_index():
+    rows = [(deal_id, 10, house(250000 + 10000 * deal_id, 1500 + 20 * deal_id), None) for deal_id in range(1, 40)]
+    incremental = ComparablesIndex()
+    for row in rows:
+        incremental.observe(*row)
+    rebuilt = ComparablesIndex()
+    rebuilt.rebuild(rows)
+
+    assert incremental.query(7, k=5) == rebuilt.query(7, k=5)
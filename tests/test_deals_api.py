@@ -1,4 +1,5 @@
 """Tests for deals API with analytics integration."""
+import pytest
 from fastapi.testclient import TestClient
 
 from app.main import app
@@ -300,3 +301,265 @@ def test_delete_deal():
     )
     assert get_response.status_code == 404
 
+
+
+def test_get_deal_projection():
+    """Test the server-side multi-year projection for a deal."""
+    token = get_auth_token("projection@example.com")
+
+    create_response = client.post(
+        "/api/v1/deals",
+        headers={"Authorization": f"Bearer {token}"},
+        json={
+            "purchase_price": 200000,
+            "down_payment": 40000,
+            "interest_rate": 6.0,
+            "loan_term_years": 30,
+            "monthly_rent": 1800,
+            "maintenance_percent": 8,
+            "vacancy_percent": 5,
+            "management_percent": 8,
+        },
+    )
+    deal_id = create_response.json()["id"]
+
+    response = client.get(
+        f"/api/v1/deals/{deal_id}/projection?years=30",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["year"] == list(range(1, 31))
+    assert len(data["equity"]) == 30
+    assert data["loan_balance"][0] < 160000
+    assert data["loan_balance"][-1] == 0
+    assert data["gross_rent"][1] > data["gross_rent"][0]
+
+
+def test_get_deal_amortization():
+    """Test the monthly amortization schedule for a deal."""
+    token = get_auth_token("amortization@example.com")
+
+    create_response = client.post(
+        "/api/v1/deals",
+        headers={"Authorization": f"Bearer {token}"},
+        json={
+            "purchase_price": 200000,
+            "down_payment": 40000,
+            "interest_rate": 6.0,
+            "loan_term_years": 15,
+            "monthly_rent": 1800,
+            "maintenance_percent": 8,
+            "vacancy_percent": 5,
+            "management_percent": 8,
+        },
+    )
+    deal = create_response.json()
+
+    response = client.get(
+        f"/api/v1/deals/{deal['id']}/amortization",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["loan_amount"] == 160000
+    assert len(data["month"]) == 180
+    assert data["balance"][-1] == 0
+    assert data["interest"][0] > data["interest"][-1]
+    assert abs(data["monthly_payment"] - deal["snapshot_of_analytics_result"]["cash_flow"]["monthly_debt_service"]) < 1e-9
+
+
+def test_deal_snapshot_includes_returns():
+    """Test that deal snapshots record IRR, NPV and equity multiple."""
+    token = get_auth_token("returns@example.com")
+
+    response = client.post(
+        "/api/v1/deals",
+        headers={"Authorization": f"Bearer {token}"},
+        json={
+            "purchase_price": 200000,
+            "down_payment": 40000,
+            "interest_rate": 6.0,
+            "loan_term_years": 30,
+            "monthly_rent": 1800,
+            "maintenance_percent": 8,
+            "vacancy_percent": 5,
+            "management_percent": 8,
+        },
+    )
+    assert response.status_code == 201
+    returns = response.json()["snapshot_of_analytics_result"]["returns"]
+    assert returns["holding_period_years"] == 10
+    assert returns["solver"]["converged"] is True
+    assert returns["irr_percent"] is not None
+    assert "npv" in returns and "equity_multiple" in returns
+
+
+def test_simulate_deal_is_reproducible_with_seed():
+    """Test Monte Carlo simulation endpoint in seeded mode."""
+    token = get_auth_token("simulate@example.com")
+
+    create_response = client.post(
+        "/api/v1/deals",
+        headers={"Authorization": f"Bearer {token}"},
+        json={
+            "purchase_price": 200000,
+            "down_payment": 40000,
+            "interest_rate": 6.0,
+            "loan_term_years": 30,
+            "monthly_rent": 1800,
+            "maintenance_percent": 8,
+            "vacancy_percent": 5,
+            "management_percent": 8,
+        },
+    )
+    deal_id = create_response.json()["id"]
+
+    payload = {"paths": 1000, "seed": 11, "vacancy_percent": {"kind": "uniform", "low": 3, "high": 12}}
+    first = client.post(f"/api/v1/deals/{deal_id}/simulate", headers={"Authorization": f"Bearer {token}"}, json=payload)
+    second = client.post(f"/api/v1/deals/{deal_id}/simulate", headers={"Authorization": f"Bearer {token}"}, json=payload)
+
+    assert first.status_code == 200
+    data = first.json()
+    assert data == second.json()
+    assert data["paths"] == 1000
+    assert data["monthly_cash_flow"]["p5"] <= data["monthly_cash_flow"]["p50"] <= data["monthly_cash_flow"]["p95"]
+    assert 0 <= data["probability_dscr_below_1"] <= 1
+    assert data["distributions"]["vacancy_percent"]["kind"] == "uniform"
+
+    invalid = client.post(
+        f"/api/v1/deals/{deal_id}/simulate",
+        headers={"Authorization": f"Bearer {token}"},
+        json={"paths": 1000, "vacancy_percent": {"kind": "uniform", "low": 10, "high": 2}},
+    )
+    assert invalid.status_code == 422
+
+
+def test_rent_estimate_uses_zip_index_from_deals():
+    """Deals on properties in a zip code feed the rent estimate for that zip."""
+    token = get_auth_token("zipindex@example.com")
+    headers = {"Authorization": f"Bearer {token}"}
+    request = {"bedrooms": 2, "bathrooms": 1, "square_feet": 1000, "zip_code": "73301", "property_type": "condo"}
+
+    before = client.post("/api/v1/estimate/rent", json=request).json()["data"]["assumptions"]["zip_sample_count"]
+
+    deal_ids = []
+    for _ in range(5):
+        property_id = client.post(
+            "/api/v1/properties",
+            headers=headers,
+            json={
+                "address_line1": "1 Congress Ave",
+                "city": "Austin",
+                "state": "TX",
+                "zip_code": "73301",
+                "property_type": "condo",
+                "bedrooms": 2,
+                "bathrooms": 1,
+                "square_feet": 1000,
+            },
+        ).json()["id"]
+        deal = client.post(
+            "/api/v1/deals",
+            headers=headers,
+            json={
+                "property_id": property_id,
+                "purchase_price": 250000,
+                "down_payment": 50000,
+                "interest_rate": 6.0,
+                "loan_term_years": 30,
+                "monthly_rent": 2000,
+                "maintenance_percent": 5,
+                "vacancy_percent": 5,
+                "management_percent": 8,
+            },
+        )
+        assert deal.status_code == 201
+        deal_ids.append(deal.json()["id"])
+
+    data = client.post("/api/v1/estimate/rent", json=request).json()["data"]
+    assert data["assumptions"]["zip_sample_count"] == before + 5
+
+    client.delete(f"/api/v1/deals/{deal_ids[0]}", headers=headers)
+    data = client.post("/api/v1/estimate/rent", json=request).json()["data"]
+    assert data["assumptions"]["zip_sample_count"] == before + 4
+
+
+def test_get_deal_recomputes_stale_snapshot():
+    """Snapshots from an older engine version are recomputed and written back on read."""
+    from app.db.base import SessionLocal
+    from app.core.underwriting import ANALYTICS_ENGINE_VERSION
+    from app.models.deal import Deal
+
+    token = get_auth_token("staledeal@example.com")
+    headers = {"Authorization": f"Bearer {token}"}
+    create_response = client.post(
+        "/api/v1/deals",
+        headers=headers,
+        json={
+            "purchase_price": 200000,
+            "down_payment": 40000,
+            "interest_rate": 6.0,
+            "loan_term_years": 30,
+            "monthly_rent": 1900,
+            "maintenance_percent": 5,
+            "vacancy_percent": 5,
+            "management_percent": 8,
+        },
+    )
+    created = create_response.json()
+    assert created["analytics_engine_version"] == ANALYTICS_ENGINE_VERSION
+
+    db = SessionLocal()
+    try:
+        deal = db.query(Deal).filter(Deal.id == created["id"]).one()
+        deal.snapshot_of_analytics_result = {"cash_flow": {"monthly_cash_flow": 0.0}}
+        deal.analytics_engine_version = None
+        db.commit()
+    finally:
+        db.close()
+
+    response = client.get(f"/api/v1/deals/{created['id']}", headers=headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["analytics_engine_version"] == ANALYTICS_ENGINE_VERSION
+    assert data["snapshot_of_analytics_result"]["cash_flow"]["monthly_cash_flow"] == pytest.approx(
+        created["snapshot_of_analytics_result"]["cash_flow"]["monthly_cash_flow"]
+    )
+
+    db = SessionLocal()
+    try:
+        assert db.query(Deal).filter(Deal.id == created["id"]).one().analytics_engine_version == ANALYTICS_ENGINE_VERSION
+    finally:
+        db.close()
+
+
+def test_deal_comps_are_ranked_by_similarity():
+    """Comps come back nearest first, with similarity scores, from the user's own deals."""
+    token = get_auth_token("compsdeal@example.com")
+    headers = {"Authorization": f"Bearer {token}"}
+    deal_ids = []
+    for price, rent in [(200000, 1800), (800000, 5000), (210000, 1850), (400000, 3000)]:
+        response = client.post(
+            "/api/v1/deals",
+            headers=headers,
+            json={
+                "purchase_price": price,
+                "down_payment": price * 0.2,
+                "interest_rate": 6.0,
+                "loan_term_years": 30,
+                "monthly_rent": rent,
+                "maintenance_percent": 5,
+                "vacancy_percent": 5,
+                "management_percent": 8,
+            },
+        )
+        deal_ids.append(response.json()["id"])
+
+    response = client.get(f"/api/v1/deals/{deal_ids[0]}/comps?limit=3", headers=headers)
+    assert response.status_code == 200
+    comps = response.json()
+    assert [comp["id"] for comp in comps] == [deal_ids[2], deal_ids[3], deal_ids[1]]
+    similarities = [comp["similarity"] for comp in comps]
+    assert similarities == sorted(similarities, reverse=True)
+    assert "snapshot_of_analytics_result" in comps[0]
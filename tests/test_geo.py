@@ -0,0 +1,53 @@
+"""Tests for geohash cells, bounding boxes and vectorized distances."""
+import math
+import random
+
+import numpy as np
+import pytest
+
+from app.core.geo import bounding_box, geohash_cover, geohash_encode, geohash_encode_many, haversine_miles
+
+
+def test_geohash_matches_reference_values():
+    assert geohash_encode(42.6, -5.6, precision=5) == "ezs42"
+    assert geohash_encode(57.64911, 10.40744, precision=11) == "u4pruydqqvj"
+
+
+def test_vectorized_geohash_matches_scalar():
+    rng = random.Random(7)
+    points = [(rng.uniform(-90, 90), rng.uniform(-180, 180)) for _ in range(200)] + [(90.0, 180.0), (-90.0, -180.0)]
+    latitudes, longitudes = np.array(points).T
+    assert geohash_encode_many(latitudes, longitudes).tolist() == [geohash_encode(lat, lon) for lat, lon in points]
+
+
+def test_haversine_matches_scalar_formula():
+    # Austin to Dallas is roughly 182 miles.
+    distances = haversine_miles(30.2672, -97.7431, np.array([30.2672, 32.7767]), np.array([-97.7431, -96.7970]))
+    assert distances[0] == 0
+    assert distances[1] == pytest.approx(182, abs=2)
+
+
+@pytest.mark.parametrize("radius", [0.5, 5, 50, 500])
+def test_cover_contains_every_point_of_the_circle(radius):
+    rng = random.Random(radius)
+    for _ in range(50):
+        latitude, longitude = rng.uniform(-70, 70), rng.uniform(-170, 170)
+        box = bounding_box(latitude, longitude, radius)
+        cells = geohash_cover(box)
+        assert cells
+        for _ in range(20):
+            bearing, fraction = rng.uniform(0, 2 * math.pi), rng.random()
+            point_lat = latitude + math.degrees(fraction * radius / 3958.8) * math.cos(bearing)
+            point_lon = longitude + math.degrees(fraction * radius / 3958.8) * math.sin(bearing) / math.cos(
+                math.radians(point_lat)
+            )
+            if haversine_miles(latitude, longitude, np.array([point_lat]), np.array([point_lon]))[0] > radius:
+                continue
+            assert box.min_lat <= point_lat <= box.max_lat
+            assert box.min_lon <= point_lon <= box.max_lon
+            assert any(geohash_encode(point_lat, point_lon).startswith(cell) for cell in cells)
+
+
+def test_bounding_box_spans_all_longitudes_across_the_antimeridian():
+    box = bounding_box(10.0, 179.9, 50)
+    assert (box.min_lon, box.max_lon) == (-180.0, 180.0)
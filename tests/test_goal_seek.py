@@ -0,0 +1,103 @@
+"""Tests for the goal-seek solver."""
+import numpy as np
+import pytest
+
+from app.core.assumptions import Assumptions
+from app.core.batch import analyze_deals_batch
+from app.core.analytics import calculate_returns_batch
+from app.core.goal_seek import GOAL_SEEK_CONFIG, goal_seek
+
+DEALS = {
+    "purchase_price": [250000, 300000, 180000],
+    "down_payment": [50000, 60000, 36000],
+    "interest_rate": [5.0, 6.5, 7.0],
+    "loan_term_years": [30, 30, 15],
+    "monthly_rent": [2200, 2100, 1900],
+    "property_tax_annual": [None, 3600, None],
+}
+
+
+@pytest.mark.parametrize("solve_for", ["purchase_price", "monthly_rent", "down_payment"])
+@pytest.mark.parametrize(
+    "metric,target", [("monthly_cash_flow", 150.0), ("dscr", 1.25), ("cash_on_cash_return", 6.0)]
+)
+def test_closed_form_hits_target(solve_for, metric, target):
+    result = goal_seek(DEALS, [{"solve_for": solve_for, "metric": metric, "target": target}])
+    goal = result["goals"][0]
+    assert goal["method"] == "closed_form"
+
+    feasible = goal["feasible"]
+    assert feasible.any()
+    assert np.all(goal["achieved"][feasible] >= target - 1e-9)
+    # At the boundary the target is met exactly, unless the bound was clipped at its minimum.
+    clipped = goal["value"][feasible] <= GOAL_SEEK_CONFIG["tolerance"]
+    assert np.allclose(goal["achieved"][feasible][~clipped], target)
+
+    # Moving the solved input the "wrong" way by a dollar misses the target.
+    step = 1.0 if solve_for == "purchase_price" else -1.0
+    nudged = np.where(feasible, goal["value"] + step, np.asarray(DEALS[solve_for], dtype=float))
+    metric_after = analyze_deals_batch({**DEALS, solve_for: nudged})[metric]
+    assert np.all(metric_after[feasible][~clipped] < target)
+
+
+def test_price_follows_assumption_based_taxes():
+    assumptions = Assumptions(property_tax_percent=2.0)
+    result = goal_seek(DEALS, [{"solve_for": "purchase_price", "metric": "monthly_cash_flow", "target": 0}], assumptions)
+    value = result["goals"][0]["value"]
+    cash_flow = analyze_deals_batch({**DEALS, "purchase_price": value}, assumptions)["monthly_cash_flow"]
+    assert cash_flow == pytest.approx([0, 0, 0], abs=1e-6)
+
+
+def test_infeasible_goal_is_nan():
+    result = goal_seek(DEALS, [{"solve_for": "purchase_price", "metric": "monthly_cash_flow", "target": 100000}])
+    goal = result["goals"][0]
+    assert not goal["feasible"].any()
+    assert np.isnan(goal["value"]).all()
+    assert np.isnan(result["combined"]["purchase_price"]).all()
+
+
+def test_down_payment_for_cash_on_cash_never_reports_zero_as_success():
+    deals = {
+        "purchase_price": [300000, 300000],
+        "down_payment": [60000, 60000],
+        "interest_rate": [7.0, 7.0],
+        "loan_term_years": [30, 30],
+        "monthly_rent": [1000, 6000],  # Negative cash flow; positive even fully financed
+    }
+    assert analyze_deals_batch(deals)["monthly_cash_flow"][0] < 0
+    goal = goal_seek(deals, [{"solve_for": "down_payment", "metric": "cash_on_cash_return", "target": 50.0}])["goals"][0]
+
+    assert goal["feasible"].tolist() == [False, True]
+    assert np.isnan(goal["value"][0])
+    # The target is met by any small down payment, never by none at all.
+    assert goal["value"][1] == GOAL_SEEK_CONFIG["tolerance"]
+    assert goal["achieved"][1] >= 50.0
+
+
+def test_irr_goal_uses_bisection():
+    result = goal_seek(DEALS, [{"solve_for": "monthly_rent", "metric": "irr_percent", "target": [8, 10, 12]}])
+    goal = result["goals"][0]
+    assert goal["method"] == "bisection"
+    assert goal["feasible"].all()
+    assert goal["achieved"] == pytest.approx([8, 10, 12], abs=0.01)
+    below = calculate_returns_batch({**DEALS, "monthly_rent": goal["value"] - 1})["irr_percent"]
+    assert np.all(below < [8, 10, 12])
+
+
+def test_combined_takes_most_restrictive_bound():
+    result = goal_seek(
+        DEALS,
+        [
+            {"solve_for": "purchase_price", "metric": "monthly_cash_flow", "target": 100},
+            {"solve_for": "purchase_price", "metric": "dscr", "target": 1.4},
+            {"solve_for": "down_payment", "metric": "dscr", "target": 1.2},
+        ],
+    )
+    prices = np.vstack([goal["value"] for goal in result["goals"][:2]])
+    assert result["combined"]["purchase_price"] == pytest.approx(np.nanmin(prices, axis=0))
+    assert result["combined"]["down_payment"] == pytest.approx(result["goals"][2]["value"], nan_ok=True)
+
+
+def test_unknown_goal_is_rejected():
+    with pytest.raises(ValueError):
+        goal_seek(DEALS, [{"solve_for": "interest_rate", "metric": "dscr", "target": 1.2}])
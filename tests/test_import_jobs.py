@@ -0,0 +1,193 @@
+"""Tests for background property import jobs."""
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from openpyxl import Workbook
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core import import_jobs, property_import
+from app.core.config import settings
+from app.db.base import Base
+from app.main import app
+from app.models.job import Job, JobStatus, claim_job
+from app.models.property import Property
+
+client = TestClient(app)
+
+HEADER = "address_line1,city,state,zip_code,property_type,bedrooms,bathrooms,square_feet,list_price\n"
+OWNER_ID = 9100
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(bind=engine)
+    Base.metadata.drop_all(bind=engine)
+
+
+def get_auth_token(email: str, password: str = "jobspass123") -> str:
+    """Helper to register and get auth token."""
+    client.post(
+        "/api/v1/auth/register",
+        json={"email": email, "password": password, "full_name": "Jobs User"},
+    )
+    response = client.post("/api/v1/auth/login", json={"email": email, "password": password})
+    return response.json()["access_token"]
+
+
+def write_csv(path, count, bad_rows=()):
+    lines = [HEADER]
+    for row in range(1, count + 1):
+        kind = "castle" if row in bad_rows else "single_family"
+        lines.append(f"{row} Job St,Austin,TX,78701,{kind},3,2,1500,{200000 + row}\n")
+    path.write_text("".join(lines), encoding="utf-8")
+    return str(path)
+
+
+def make_job(session_factory, path, filename="properties.csv"):
+    db = session_factory()
+    try:
+        return import_jobs.create_import_job(db, OWNER_ID, filename, path).id
+    finally:
+        db.close()
+
+
+def test_import_job_records_progress_and_removes_upload(session_factory, tmp_path):
+    path = write_csv(tmp_path / "upload.csv", 7, bad_rows={4})
+    job_id = make_job(session_factory, path)
+
+    import_jobs.run_import_job(job_id, session_factory, chunk_size=3)
+
+    db = session_factory()
+    job = db.query(Job).filter(Job.id == job_id).one()
+    assert (job.status, job.total, job.processed, job.last_id) == (JobStatus.COMPLETED, 7, 7, 7)
+    assert (job.result["imported"], job.result["skipped"]) == (6, 1)
+    assert job.result["errors"][0].startswith("Row 4:")
+    assert job.rows_per_second > 0
+    assert db.query(Property).count() == 6
+    assert not (tmp_path / "upload.csv").exists()
+    db.close()
+
+    # A finished job is never claimed again.
+    import_jobs.run_import_job(job_id, session_factory, chunk_size=3)
+    assert session_factory().query(Property).count() == 6
+
+
+def test_failed_import_job_resumes_after_last_committed_chunk(session_factory, tmp_path, monkeypatch):
+    path = write_csv(tmp_path / "upload.csv", 5)
+    job_id = make_job(session_factory, path)
+
+    def crash(db, chunk, written):
+        raise RuntimeError("worker died")
+
+    monkeypatch.setattr(property_import, "observe_imported", crash)
+    import_jobs.run_import_job(job_id, session_factory, chunk_size=2)
+    db = session_factory()
+    job = db.query(Job).filter(Job.id == job_id).one()
+    assert (job.status, job.error, job.last_id) == (JobStatus.FAILED, "worker died", 2)
+    assert db.query(Property).count() == 2
+    db.close()
+
+    monkeypatch.undo()
+    import_jobs.run_import_job(job_id, session_factory, chunk_size=2)
+    db = session_factory()
+    job = db.query(Job).filter(Job.id == job_id).one()
+    assert (job.status, job.error, job.result["imported"]) == (JobStatus.COMPLETED, None, 5)
+    addresses = sorted(address for (address,) in db.query(Property.address_line1))
+    assert addresses == sorted(f"{row} Job St" for row in range(1, 6))
+    db.close()
+
+
+def test_reclaimed_import_job_fences_off_the_original_worker(session_factory, tmp_path, monkeypatch):
+    path = write_csv(tmp_path / "upload.csv", 5)
+    job_id = make_job(session_factory, path)
+    observe_imported = property_import.observe_imported
+    tokens = []
+
+    def reclaim_after_first_chunk(db, chunk, written):
+        # The first worker stalls past ``stale_seconds`` and the poller hands the job to another.
+        observe_imported(db, chunk, written)
+        if not tokens:
+            other = session_factory()
+            job = other.query(Job).filter(Job.id == job_id).one()
+            job.updated_at = datetime.utcnow() - timedelta(seconds=import_jobs.IMPORT_JOB_CONFIG["stale_seconds"] + 1)
+            other.commit()
+            tokens.append(claim_job(other, job, import_jobs.IMPORT_JOB_CONFIG["stale_seconds"]))
+            other.close()
+
+    monkeypatch.setattr(property_import, "observe_imported", reclaim_after_first_chunk)
+    import_jobs.run_import_job(job_id, session_factory, chunk_size=2)
+
+    # The original worker stopped without writing its second chunk or progress.
+    db = session_factory()
+    job = db.query(Job).filter(Job.id == job_id).one()
+    assert tokens[0] is not None
+    assert (job.status, job.claim_token, job.last_id) == (JobStatus.RUNNING, tokens[0], 2)
+    assert db.query(Property).count() == 2
+    db.close()
+
+
+def test_xlsx_import_job_converts_to_csv(session_factory, tmp_path):
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(HEADER.strip().split(","))
+    sheet.append(["1 Sheet St", "Austin", "TX", 78701, "townhouse", 3, 2.5, 1600, 300000])
+    sheet.append(["2 Sheet St", "Austin", "TX", 78701, "condo", 2, 1, 900, None])
+    path = tmp_path / "upload.xlsx"
+    workbook.save(path)
+    job_id = make_job(session_factory, str(path), "properties.xlsx")
+
+    import_jobs.run_import_job(job_id, session_factory)
+
+    db = session_factory()
+    job = db.query(Job).filter(Job.id == job_id).one()
+    assert (job.status, job.total, job.result["imported"]) == (JobStatus.COMPLETED, 2, 2)
+    prop = db.query(Property).filter(Property.address_line1 == "1 Sheet St").one()
+    assert (prop.zip_code, prop.bedrooms, prop.bathrooms) == ("78701", 3, 2.5)
+    assert list(tmp_path.iterdir()) == []
+    db.close()
+
+
+def test_import_job_with_undecodable_csv_fails_without_writing(session_factory, tmp_path):
+    path = tmp_path / "upload.csv"
+    path.write_bytes(HEADER.encode("utf-8") + "1 Caf\xe9 St,Austin,TX,78701,condo,2,1,900,150000\n".encode("latin-1"))
+    job_id = make_job(session_factory, str(path))
+
+    import_jobs.run_import_job(job_id, session_factory)
+
+    db = session_factory()
+    job = db.query(Job).filter(Job.id == job_id).one()
+    assert (job.status, job.error, job.processed) == (JobStatus.FAILED, "File is not valid UTF-8", 0)
+    assert db.query(Property).count() == 0
+    db.close()
+
+
+def test_import_job_api_accepts_upload_and_reports_progress(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "IMPORT_UPLOAD_DIR", str(tmp_path))
+    headers = {"Authorization": f"Bearer {get_auth_token('import-job@example.com')}"}
+    content = (HEADER + "1 Api St,Austin,TX,78701,condo,2,1,900,150000\n").encode("utf-8")
+
+    response = client.post(
+        "/api/v1/properties/import/jobs", headers=headers, files={"file": ("properties.csv", content)}
+    )
+    assert response.status_code == 202
+    job_id = response.json()["id"]
+
+    for _ in range(100):
+        job = client.get(f"/api/v1/jobs/{job_id}", headers=headers).json()
+        if job["status"] == "completed":
+            break
+        time.sleep(0.05)
+    assert (job["status"], job["total"], job["processed"]) == ("completed", 1, 1)
+    assert job["result"]["imported"] == 1
+
+    other = {"Authorization": f"Bearer {get_auth_token('import-job-other@example.com')}"}
+    assert client.get(f"/api/v1/jobs/{job_id}", headers=other).status_code == 404
+    assert client.post(f"/api/v1/jobs/{job_id}/resume", headers=headers).status_code == 409
+    bad = client.post("/api/v1/properties/import/jobs", headers=headers, files={"file": ("x.txt", b"x")})
+    assert bad.status_code == 400
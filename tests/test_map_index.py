@@ -0,0 +1,64 @@
+"""Tests for the in-memory map clustering index."""
+from datetime import datetime
+
+from app.core.geo import WORLD, BoundingBox, geohash_encode
+from app.core.map_index import MapClusterIndex
+
+
+def observe(index, property_id, owner_id, latitude, longitude, price=None, updated_at=None):
+    index.observe(property_id, owner_id, geohash_encode(latitude, longitude), latitude, longitude, price, updated_at)
+
+
+def test_clusters_group_by_geohash_prefix_within_viewport():
+    index = MapClusterIndex(capacity=1)
+    observe(index, 1, 10, 30.2672, -97.7431, 200000)
+    observe(index, 2, 10, 30.2673, -97.7431, 400000)
+    observe(index, 3, 10, 30.2674, -97.7431)
+    observe(index, 4, 10, 32.7767, -96.7970, 500000)
+    observe(index, 5, 20, 30.2672, -97.7431, 900000)  # Another owner
+
+    clusters = index.clusters(10, WORLD, 5)
+    assert sorted(cluster.count for cluster in clusters) == [1, 3]
+    downtown = max(clusters, key=lambda cluster: cluster.count)
+    assert downtown.cell == geohash_encode(30.2672, -97.7431, 5)
+    assert (downtown.list_price_avg, downtown.list_price_min, downtown.list_price_max) == (300000, 200000, 400000)
+
+    austin = BoundingBox(30.0, -98.0, 30.5, -97.5)
+    assert [cluster.count for cluster in index.clusters(10, austin, 2)] == [3]
+    assert index.clusters(30, WORLD, 5) == []
+
+
+def test_updates_and_discards_follow_writes():
+    index = MapClusterIndex(capacity=1)
+    observe(index, 1, 10, 30.2672, -97.7431, updated_at=datetime(2024, 1, 1))
+    observe(index, 2, 10, 32.7767, -96.7970, updated_at=datetime(2024, 1, 2))
+    assert index.fingerprint(10) == (2, 2, datetime(2024, 1, 2))
+
+    # Moving property 2 next to property 1 merges the clusters; clearing coordinates drops it.
+    observe(index, 2, 10, 30.2672, -97.7431, 100000)
+    assert [cluster.count for cluster in index.clusters(10, WORLD, 5)] == [2]
+    index.observe(2, 10, None, None, None)
+    assert [cluster.list_price_avg for cluster in index.clusters(10, WORLD, 5)] == [None]
+
+    index.discard(1)
+    assert index.clusters(10, WORLD, 5) == []
+    assert index.fingerprint(10) == (0, None, datetime(2024, 1, 2))
+
+
+def test_replace_owner_leaves_other_owners_alone():
+    index = MapClusterIndex()
+    observe(index, 1, 10, 30.2672, -97.7431)
+    observe(index, 2, 20, 30.2672, -97.7431)
+
+    index.replace_owner(10, [(3, geohash_encode(40.0, -75.0), 40.0, -75.0, 250000.0, None)])
+    assert [cluster.cell for cluster in index.clusters(10, WORLD, 3)] == [geohash_encode(40.0, -75.0, 3)]
+    assert [cluster.count for cluster in index.clusters(20, WORLD, 3)] == [1]
+    assert len(index) == 2
+
+
+def test_fingerprint_checks_are_throttled_per_owner():
+    index = MapClusterIndex()
+    assert index.claim_check(10, 60.0)
+    assert not index.claim_check(10, 60.0)
+    assert index.claim_check(20, 60.0)
+    assert index.claim_check(10, 0.0)
@@ -0,0 +1,118 @@
+"""Tests for cached slippy-map tiles."""
+from fastapi.testclient import TestClient
+
+from app.core.geo import geohash_encode
+from app.core.map_index import MapClusterIndex
+from app.core.map_tiles import TileCache, get_tile, tile_bounds, tile_for
+from app.main import app
+
+client = TestClient(app)
+
+AUSTIN = (30.2672, -97.7431)
+DALLAS = (32.7767, -96.7970)
+
+
+def get_auth_token(email: str, password: str = "tilepass123") -> str:
+    """Helper to register and get auth token."""
+    client.post(
+        "/api/v1/auth/register",
+        json={"email": email, "password": password, "full_name": "Tile User"},
+    )
+    response = client.post("/api/v1/auth/login", json={"email": email, "password": password})
+    return response.json()["access_token"]
+
+
+def create_property(headers: dict, label: str, latitude: float, longitude: float) -> int:
+    response = client.post(
+        "/api/v1/properties",
+        headers=headers,
+        json={
+            "address_line1": f"{label} Tile Rd",
+            "city": "Austin",
+            "state": "TX",
+            "zip_code": "78701",
+            "property_type": "single_family",
+            "bedrooms": 3,
+            "bathrooms": 2,
+            "square_feet": 1500,
+            "list_price": 300000,
+            "latitude": latitude,
+            "longitude": longitude,
+        },
+    )
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+def tile_path(latitude: float, longitude: float, z: int) -> str:
+    x, y = tile_for(latitude, longitude, z)
+    return f"/api/v1/properties/map/tiles/{z}/{x}/{y}"
+
+
+def test_tile_bounds_contain_their_points():
+    for z in (0, 5, 12, 18):
+        box = tile_bounds(z, *tile_for(*AUSTIN, z))
+        assert box.min_lat <= AUSTIN[0] <= box.max_lat
+        assert box.min_lon <= AUSTIN[1] <= box.max_lon
+    assert tile_bounds(0, 0, 0).max_lat == 90.0
+
+
+def test_writes_invalidate_only_the_tiles_they_touch():
+    index = MapClusterIndex()
+    cache = TileCache(max_tiles=100, max_bytes=1 << 20, max_zoom=22)
+    index.add_listener(cache.invalidate)
+    index.observe(1, 10, geohash_encode(*AUSTIN), *AUSTIN, 300000.0)
+
+    austin_tile = (10, 8, *tile_for(*AUSTIN, 8))
+    dallas_tile = (10, 8, *tile_for(*DALLAS, 8))
+    etag, body = get_tile(*austin_tile, index=index, cache=cache)
+    get_tile(*dallas_tile, index=index, cache=cache)
+    assert b'"count":[1]' in body
+
+    index.observe(2, 10, geohash_encode(*DALLAS), *DALLAS, 500000.0)
+    assert cache.get(austin_tile) == (etag, body)
+    assert cache.get(dallas_tile) is None
+
+    # A tile built before a write landed is not cached.
+    version = cache.version(10)
+    index.discard(1)
+    cache.set(austin_tile, etag, body, version)
+    assert cache.get(austin_tile) is None
+
+
+def test_cache_is_bounded():
+    cache = TileCache(max_tiles=2, max_bytes=1 << 20, max_zoom=22)
+    for x in range(3):
+        cache.set((10, 5, x, 0), f'"{x}"', b"{}", cache.version(10))
+    assert cache.get((10, 5, 0, 0)) is None
+    assert cache.evictions == 1
+
+
+def test_tile_endpoint_serves_etags_and_304s():
+    headers = {"Authorization": f"Bearer {get_auth_token('tiles@example.com')}"}
+    first = create_property(headers, "one", *AUSTIN)
+
+    response = client.get(tile_path(*AUSTIN, 16), headers=headers)
+    assert response.status_code == 200
+    assert response.json()["points"]["id"] == [first]
+    etag = response.headers["etag"]
+
+    revalidate = {**headers, "If-None-Match": etag}
+    assert client.get(tile_path(*AUSTIN, 16), headers=revalidate).status_code == 304
+
+    # A write elsewhere leaves the tile alone; one inside it changes the ETag.
+    create_property(headers, "dallas", *DALLAS)
+    assert client.get(tile_path(*AUSTIN, 16), headers=revalidate).status_code == 304
+    create_property(headers, "two", AUSTIN[0] + 0.0001, AUSTIN[1])
+    changed = client.get(tile_path(*AUSTIN, 16), headers=revalidate)
+    assert changed.status_code == 200
+    assert len(changed.json()["points"]["id"]) == 2
+
+    clusters = client.get(tile_path(*AUSTIN, 6), headers=headers).json()["clusters"]
+    assert sum(clusters["count"]) == 2
+
+
+def test_tile_coordinates_are_validated():
+    headers = {"Authorization": f"Bearer {get_auth_token('tiles-invalid@example.com')}"}
+    assert client.get("/api/v1/properties/map/tiles/2/4/0", headers=headers).status_code == 404
+    assert client.get("/api/v1/properties/map/tiles/23/0/0", headers=headers).status_code == 422
@@ -0,0 +1,115 @@
+"""Tests for keyset cursor pagination on list endpoints."""
+from fastapi.testclient import TestClient
+
+from app.api.pagination import NEXT_CURSOR_HEADER
+from app.main import app
+
+client = TestClient(app)
+
+DEAL = {
+    "purchase_price": 200000,
+    "down_payment": 40000,
+    "interest_rate": 5.0,
+    "loan_term_years": 30,
+    "monthly_rent": 1800,
+    "maintenance_percent": 5,
+    "vacancy_percent": 5,
+    "management_percent": 8,
+}
+
+
+def get_auth_token(email: str, password: str = "pagepass123") -> str:
+    """Helper to register and get auth token."""
+    client.post(
+        "/api/v1/auth/register",
+        json={"email": email, "password": password, "full_name": "Page User"},
+    )
+    response = client.post("/api/v1/auth/login", json={"email": email, "password": password})
+    return response.json()["access_token"]
+
+
+def walk(path: str, headers: dict, **params) -> list:
+    """Follow next cursors until the last page; return every item seen."""
+    items = []
+    cursor = None
+    while True:
+        query = dict(params, **({"cursor": cursor} if cursor else {}))
+        response = client.get(path, headers=headers, params=query)
+        assert response.status_code == 200
+        items.extend(response.json())
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if cursor is None:
+            return items
+
+
+def test_deal_cursor_walk_visits_every_deal_once():
+    headers = {"Authorization": f"Bearer {get_auth_token('cursor-deals@example.com')}"}
+    prices = [310000, 150000, 220000, 150000, 480000, 275000, 150000]
+    created = [
+        client.post("/api/v1/deals", headers=headers, json={**DEAL, "purchase_price": price}).json()["id"]
+        for price in prices
+    ]
+
+    by_id = walk("/api/v1/deals", headers, limit=3)
+    assert [deal["id"] for deal in by_id] == sorted(created)
+
+    # Ties on purchase_price are broken by id, so no deal is repeated or skipped.
+    by_price = walk("/api/v1/deals", headers, limit=2, sort="-purchase_price")
+    assert sorted(deal["id"] for deal in by_price) == sorted(created)
+    assert [(deal["purchase_price"], deal["id"]) for deal in by_price] == sorted(
+        ((deal["purchase_price"], deal["id"]) for deal in by_price), key=lambda pair: (-pair[0], -pair[1])
+    )
+
+
+def test_last_page_has_no_cursor_and_skip_still_works():
+    headers = {"Authorization": f"Bearer {get_auth_token('cursor-skip@example.com')}"}
+    for _ in range(3):
+        client.post("/api/v1/leads", headers=headers, json={"first_name": "Page", "last_name": "Lead"})
+
+    first = client.get("/api/v1/leads", headers=headers, params={"limit": 2})
+    assert NEXT_CURSOR_HEADER in first.headers
+    full = client.get("/api/v1/leads", headers=headers, params={"limit": 100})
+    assert NEXT_CURSOR_HEADER not in full.headers
+
+    skipped = client.get("/api/v1/leads", headers=headers, params={"skip": 1, "limit": 100})
+    assert [lead["id"] for lead in skipped.json()] == [lead["id"] for lead in full.json()][1:]
+
+
+def test_filtered_property_pages_continue_after_cursor():
+    headers = {"Authorization": f"Bearer {get_auth_token('cursor-props@example.com')}"}
+    tagged = []
+    for index in range(6):
+        response = client.post(
+            "/api/v1/properties",
+            headers=headers,
+            json={
+                "address_line1": f"{index} Cursor St",
+                "city": "Austin",
+                "state": "TX",
+                "zip_code": "78701",
+                "property_type": "single_family",
+                "bedrooms": 3,
+                "bathrooms": 2,
+                "square_feet": 1500,
+                "tags": ["pool"] if index % 2 else ["garage"],
+            },
+        )
+        assert response.status_code == 201
+        if index % 2:
+            tagged.append(response.json()["id"])
+
+    pages = walk("/api/v1/properties", headers, limit=1, tags="pool")
+    assert [prop["id"] for prop in pages] == tagged
+
+
+def test_invalid_cursor_and_sort_are_rejected():
+    headers = {"Authorization": f"Bearer {get_auth_token('cursor-bad@example.com')}"}
+    assert client.get("/api/v1/deals", headers=headers, params={"cursor": "not-a-cursor"}).status_code == 400
+    assert client.get("/api/v1/deals", headers=headers, params={"sort": "monthly_rent"}).status_code == 400
+
+    client.post("/api/v1/deals", headers=headers, json=DEAL)
+    client.post("/api/v1/deals", headers=headers, json=DEAL)
+    cursor = client.get("/api/v1/deals", headers=headers, params={"limit": 1}).headers[NEXT_CURSOR_HEADER]
+    # A cursor only resumes the sort order it was issued for.
+    response = client.get("/api/v1/deals", headers=headers, params={"cursor": cursor, "sort": "created_at"})
+    assert response.status_code == 400
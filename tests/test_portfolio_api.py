@@ -0,0 +1,107 @@
+"""Tests for the portfolio summary endpoint."""
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+client = TestClient(app)
+
+
+def get_auth_token(email: str, password: str = "portfolio123") -> str:
+    """Helper to register and get auth token."""
+    client.post(
+        "/api/v1/auth/register",
+        json={"email": email, "password": password, "full_name": "Portfolio User"},
+    )
+    response = client.post("/api/v1/auth/login", json={"email": email, "password": password})
+    return response.json()["access_token"]
+
+
+def create_deal(headers, purchase_price, monthly_rent, property_id=None):
+    response = client.post(
+        "/api/v1/deals",
+        headers=headers,
+        json={
+            "property_id": property_id,
+            "purchase_price": purchase_price,
+            "down_payment": purchase_price * 0.2,
+            "interest_rate": 6.0,
+            "loan_term_years": 30,
+            "monthly_rent": monthly_rent,
+            "maintenance_percent": 5,
+            "vacancy_percent": 5,
+            "management_percent": 8,
+        },
+    )
+    assert response.status_code == 201
+    return response.json()
+
+
+def test_portfolio_summary_aggregates_all_deals():
+    headers = {"Authorization": f"Bearer {get_auth_token('portfolio@example.com')}"}
+    property_id = client.post(
+        "/api/v1/properties",
+        headers=headers,
+        json={
+            "address_line1": "9 Elm St",
+            "city": "Denver",
+            "state": "CO",
+            "zip_code": "80202",
+            "property_type": "condo",
+            "bedrooms": 2,
+            "bathrooms": 1,
+            "square_feet": 900,
+        },
+    ).json()["id"]
+
+    deals = [
+        create_deal(headers, 200000, 1800, property_id),
+        create_deal(headers, 300000, 2600),
+        create_deal(headers, 150000, 1500),
+    ]
+    client.put(f"/api/v1/deals/{deals[2]['id']}", headers=headers, json={"monthly_rent": 1600})
+    deals[2] = client.get(f"/api/v1/deals/{deals[2]['id']}", headers=headers).json()
+
+    # Another user's deals never leak into the summary.
+    other = {"Authorization": f"Bearer {get_auth_token('portfolio-other@example.com')}"}
+    create_deal(other, 999999, 9999)
+
+    response = client.get("/api/v1/portfolio/summary", headers=headers)
+    assert response.status_code == 200
+    summary = response.json()
+
+    cash_flows = [deal["snapshot_of_analytics_result"]["cash_flow"]["monthly_cash_flow"] for deal in deals]
+    nois = [deal["snapshot_of_analytics_result"]["cash_flow"]["noi_annual"] for deal in deals]
+    prices = [deal["purchase_price"] for deal in deals]
+
+    assert summary["deal_count"] == 3
+    assert summary["deals_with_metrics"] == 3
+    assert summary["total_purchase_price"] == pytest.approx(sum(prices))
+    assert summary["total_monthly_cash_flow"] == pytest.approx(sum(cash_flows))
+    assert summary["weighted_cap_rate"] == pytest.approx(sum(nois) * 100 / sum(prices))
+    assert summary["average_cap_rate"] == pytest.approx(
+        sum(noi * 100 / price for noi, price in zip(nois, prices)) / 3
+    )
+
+    assert summary["by_stage"] == [
+        {
+            "key": "initial_analysis",
+            "deal_count": 3,
+            "total_purchase_price": pytest.approx(sum(prices)),
+            "total_monthly_cash_flow": pytest.approx(sum(cash_flows)),
+            "total_noi_annual": pytest.approx(sum(nois)),
+        }
+    ]
+    splits = {group["key"]: group for group in summary["by_property_type"]}
+    assert splits["condo"]["deal_count"] == 1
+    assert splits["condo"]["total_purchase_price"] == 200000
+    assert splits["unassigned"]["deal_count"] == 2
+
+
+def test_portfolio_summary_empty():
+    headers = {"Authorization": f"Bearer {get_auth_token('portfolio-empty@example.com')}"}
+    summary = client.get("/api/v1/portfolio/summary", headers=headers).json()
+    assert summary["deal_count"] == 0
+    assert summary["total_purchase_price"] == 0
+    assert summary["weighted_cap_rate"] is None
+    assert summary["by_stage"] == []
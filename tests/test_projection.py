@@ -0,0 +1,58 @@
+"""Tests for the multi-year projection engine."""
+import math
+
+import numpy as np
+import pytest
+
+from app.core.analytics import analyze_deal
+from app.core.assumptions import Assumptions
+from app.core.projection import project_deals
+
+DEAL = {
+    "purchase_price": 250000,
+    "down_payment": 50000,
+    "interest_rate": 5.0,
+    "loan_term_years": 30,
+    "monthly_rent": 2200,
+    "property_tax_annual": 3000,
+    "insurance_annual": 1200,
+    "hoa_monthly": 150,
+    "maintenance_percent": 8,
+    "vacancy_percent": 5,
+    "management_percent": 8,
+}
+
+
+def test_first_year_matches_cash_flow_engine():
+    projection = project_deals({name: [value] for name, value in DEAL.items()}, years=5)
+    scalar = analyze_deal({**DEAL, "assumptions": Assumptions()})["cash_flow"]
+
+    assert math.isclose(projection["noi"][0, 0], scalar["noi_annual"], rel_tol=1e-9)
+    assert math.isclose(projection["cash_flow"][0, 0], scalar["annual_cash_flow"], rel_tol=1e-9)
+    assert math.isclose(projection["debt_service"][0, 0], scalar["monthly_debt_service"] * 12, rel_tol=1e-12)
+
+
+def test_growth_and_amortization():
+    assumptions = Assumptions(rent_growth_percent_annual=3, appreciation_percent_annual=4)
+    projection = project_deals({name: [value] for name, value in DEAL.items()}, years=30, assumptions=assumptions)
+
+    assert projection["gross_rent"].shape == (1, 30)
+    assert math.isclose(projection["gross_rent"][0, 1], 2200 * 12 * 1.03)
+    assert math.isclose(projection["property_value"][0, 0], 250000 * 1.04)
+    assert np.all(np.diff(projection["loan_balance"][0]) < 0)
+    assert projection["loan_balance"][0, -1] == 0
+    assert math.isclose(projection["equity"][0, -1], projection["property_value"][0, -1])
+
+
+def test_zero_rate_loan_paid_off_linearly():
+    deal = {**DEAL, "interest_rate": 0.0, "loan_term_years": 10}
+    projection = project_deals({name: [value] for name, value in deal.items()}, years=12)
+
+    assert math.isclose(projection["loan_balance"][0, 0], 200000 - 20000)
+    assert projection["loan_balance"][0, 10] == 0
+    assert projection["debt_service"][0, 10] == 0
+
+
+def test_rejects_out_of_range_years():
+    with pytest.raises(ValueError):
+        project_deals({name: [value] for name, value in DEAL.items()}, years=0)
@@ -0,0 +1,86 @@
+"""Tests for streamed property exports."""
+import csv
+import gzip
+import io
+import json
+
+from fastapi.testclient import TestClient
+from openpyxl import load_workbook
+
+from app.api.streaming import csv_chunks, gzip_chunks, ndjson_chunks
+from app.main import app
+
+client = TestClient(app)
+
+
+def get_auth_token(email: str, password: str = "exportpass123") -> str:
+    """Helper to register and get auth token."""
+    client.post(
+        "/api/v1/auth/register",
+        json={"email": email, "password": password, "full_name": "Export User"},
+    )
+    response = client.post("/api/v1/auth/login", json={"email": email, "password": password})
+    return response.json()["access_token"]
+
+
+def create_properties(headers: dict, count: int) -> list:
+    ids = []
+    for index in range(count):
+        response = client.post(
+            "/api/v1/properties",
+            headers=headers,
+            json={
+                "address_line1": f"{index} Export Ave",
+                "city": "Austin",
+                "state": "TX",
+                "zip_code": "78701",
+                "property_type": "single_family",
+                "bedrooms": 3,
+                "bathrooms": 2,
+                "square_feet": 1500 + index,
+                "list_price": 250000,
+                "tags": ["pool", "corner"],
+            },
+        )
+        assert response.status_code == 201
+        ids.append(response.json()["id"])
+    return ids
+
+
+def test_encoders_emit_bounded_chunks():
+    rows = [[index, f"name {index}"] for index in range(5)]
+    chunks = list(csv_chunks(["id", "name"], rows, rows_per_chunk=2))
+    assert len(chunks) == 3
+    assert b"".join(chunks).decode().splitlines()[1:3] == ["0,name 0", "1,name 1"]
+
+    lines = b"".join(ndjson_chunks(["id", "name"], rows, rows_per_chunk=2)).decode().splitlines()
+    assert json.loads(lines[-1]) == {"id": 4, "name": "name 4"}
+    assert gzip.decompress(b"".join(gzip_chunks(iter(chunks)))) == b"".join(chunks)
+
+
+def test_export_formats_round_trip():
+    headers = {"Authorization": f"Bearer {get_auth_token('export@example.com')}"}
+    ids = create_properties(headers, 3)
+
+    response = client.get("/api/v1/properties/export", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [int(row["id"]) for row in rows] == ids
+    assert rows[0]["property_type"] == "single_family"
+    assert rows[0]["tags"] == "pool|corner"
+
+    response = client.get("/api/v1/properties/export", headers=headers, params={"format": "ndjson", "compress": True})
+    assert response.headers["content-disposition"].endswith("properties.ndjson.gz")
+    records = [json.loads(line) for line in gzip.decompress(response.content).decode().splitlines()]
+    assert [record["id"] for record in records] == ids
+    assert records[0]["tags"] == ["pool", "corner"]
+
+    response = client.get("/api/v1/properties/export", headers=headers, params={"format": "excel"})
+    sheet = load_workbook(io.BytesIO(response.content)).active
+    values = list(sheet.values)
+    assert values[0][0] == "id"
+    assert [row[0] for row in values[1:]] == ids
+
+    response = client.get("/api/v1/properties/export", headers=headers, params={"format": "excel", "compress": True})
+    assert response.status_code == 400
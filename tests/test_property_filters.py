@@ -0,0 +1,105 @@
+"""Tests for SQL-side property filtering (tags, radius, totals)."""
+from fastapi.testclient import TestClient
+
+from app.api.pagination import NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER
+from app.main import app
+
+client = TestClient(app)
+
+AUSTIN = (30.2672, -97.7431)
+
+
+def get_auth_token(email: str, password: str = "filterpass123") -> str:
+    """Helper to register and get auth token."""
+    client.post(
+        "/api/v1/auth/register",
+        json={"email": email, "password": password, "full_name": "Filter User"},
+    )
+    response = client.post("/api/v1/auth/login", json={"email": email, "password": password})
+    return response.json()["access_token"]
+
+
+def create_property(headers: dict, label: str, tags=None, latitude=None, longitude=None) -> int:
+    response = client.post(
+        "/api/v1/properties",
+        headers=headers,
+        json={
+            "address_line1": f"{label} Filter Ave",
+            "city": "Austin",
+            "state": "TX",
+            "zip_code": "78701",
+            "property_type": "single_family",
+            "bedrooms": 3,
+            "bathrooms": 2,
+            "square_feet": 1600,
+            "tags": tags,
+            "latitude": latitude,
+            "longitude": longitude,
+        },
+    )
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+def listed_ids(headers: dict, params) -> list:
+    response = client.get("/api/v1/properties", headers=headers, params=params)
+    assert response.status_code == 200
+    return [prop["id"] for prop in response.json()]
+
+
+def test_tag_filter_requires_every_tag_case_insensitively():
+    headers = {"Authorization": f"Bearer {get_auth_token('tags-sql@example.com')}"}
+    both = create_property(headers, "1", tags=["Pool", "Garage"])
+    pool_only = create_property(headers, "2", tags=["pool"])
+    create_property(headers, "3")
+
+    assert listed_ids(headers, [("tags", "pool")]) == [both, pool_only]
+    assert listed_ids(headers, [("tags", "POOL"), ("tags", "garage")]) == [both]
+
+    # Updating tags replaces the searchable copy.
+    response = client.put(f"/api/v1/properties/{both}", headers=headers, json={"tags": ["garage"]})
+    assert response.status_code == 200
+    assert listed_ids(headers, [("tags", "pool")]) == [pool_only]
+    assert listed_ids(headers, [("tags", "garage")]) == [both]
+
+
+def test_radius_filter_and_total_count():
+    headers = {"Authorization": f"Bearer {get_auth_token('radius-sql@example.com')}"}
+    downtown = create_property(headers, "10", latitude=AUSTIN[0], longitude=AUSTIN[1])
+    round_rock = create_property(headers, "11", latitude=30.5083, longitude=-97.6789)  # ~17 miles north
+    create_property(headers, "12", latitude=29.4241, longitude=-98.4936)  # San Antonio, ~74 miles
+    create_property(headers, "13")  # No coordinates
+
+    params = {"latitude": AUSTIN[0], "longitude": AUSTIN[1]}
+    assert listed_ids(headers, {**params, "radius_miles": 5}) == [downtown]
+    assert listed_ids(headers, {**params, "radius_miles": 20}) == [downtown, round_rock]
+
+    response = client.get(
+        "/api/v1/properties", headers=headers, params={**params, "radius_miles": 20, "limit": 1, "include_total": True}
+    )
+    assert len(response.json()) == 1
+    assert response.headers[TOTAL_COUNT_HEADER] == "2"
+    assert TOTAL_COUNT_HEADER not in client.get("/api/v1/properties", headers=headers).headers
+
+
+def test_distance_sort_and_nearest():
+    headers = {"Authorization": f"Bearer {get_auth_token('nearest-sql@example.com')}"}
+    far = create_property(headers, "20", latitude=30.6, longitude=-97.7)  # ~23 miles
+    near = create_property(headers, "21", latitude=30.28, longitude=-97.75)  # ~1 mile
+    middle = create_property(headers, "22", latitude=30.4, longitude=-97.75)  # ~9 miles
+    create_property(headers, "23")  # No coordinates
+
+    params = {"latitude": AUSTIN[0], "longitude": AUSTIN[1]}
+    assert listed_ids(headers, {**params, "sort": "distance"}) == [near, middle, far]
+    assert listed_ids(headers, {**params, "sort": "-distance", "radius_miles": 15}) == [middle, near]
+    assert listed_ids(headers, {**params, "nearest": 2}) == [near, middle]
+    assert listed_ids(headers, {**params, "nearest": 2, "sort": "id"}) == sorted([near, middle])
+
+    # Distance pages chain through cursors like any other sort.
+    first = client.get("/api/v1/properties", headers=headers, params={**params, "sort": "distance", "limit": 2})
+    cursor = first.headers[NEXT_CURSOR_HEADER]
+    second = client.get("/api/v1/properties", headers=headers, params={**params, "sort": "distance", "cursor": cursor})
+    assert [prop["id"] for prop in second.json()] == [far]
+    assert NEXT_CURSOR_HEADER not in second.headers
+
+    assert client.get("/api/v1/properties", headers=headers, params={"nearest": 3}).status_code == 400
@@ -0,0 +1,145 @@
+"""Tests for streaming bulk property import."""
+import io
+
+from fastapi.testclient import TestClient
+from openpyxl import Workbook
+
+from app.main import app
+
+client = TestClient(app)
+
+HEADER = "address_line1,city,state,zip_code,property_type,bedrooms,bathrooms,square_feet,list_price,tags,latitude,longitude\n"
+
+
+def get_auth_token(email: str, password: str = "importpass123") -> str:
+    """Helper to register and get auth token."""
+    client.post(
+        "/api/v1/auth/register",
+        json={"email": email, "password": password, "full_name": "Import User"},
+    )
+    response = client.post("/api/v1/auth/login", json={"email": email, "password": password})
+    return response.json()["access_token"]
+
+
+def upload(headers: dict, filename: str, content: bytes):
+    return client.post("/api/v1/properties/import", headers=headers, files={"file": (filename, content)})
+
+
+def test_csv_import_reports_row_errors_and_fills_derived_columns():
+    headers = {"Authorization": f"Bearer {get_auth_token('import-csv@example.com')}"}
+    content = (
+        HEADER
+        + "1 Import St,Austin,TX,78701,single_family,3,2,1500,250000,Pool|Corner,30.2672,-97.7431\n"
+        + "2 Import St,Austin,TX,78701,castle,3,2,1500,,,,\n"
+        + ",Austin,TX,78701,single_family,3,2,1500,,,,\n"
+        + "4 Import St,Austin,TX,78701,condo,2,1,900,,,,\n"
+    )
+    response = upload(headers, "properties.csv", content.encode("utf-8"))
+    assert response.status_code == 200
+    result = response.json()
+    assert (result["imported"], result["skipped"]) == (2, 2)
+    assert result["errors"][0].startswith("Row 2:")
+    assert result["errors"][1] == "Row 3: missing fields ['address_line1']"
+
+    tagged = client.get("/api/v1/properties", headers=headers, params={"tags": "pool"}).json()
+    assert [prop["id"] for prop in tagged] == result["created_ids"][:1]
+    nearby = client.get(
+        "/api/v1/properties", headers=headers, params={"latitude": 30.27, "longitude": -97.74, "radius_miles": 5}
+    ).json()
+    assert [prop["id"] for prop in nearby] == result["created_ids"][:1]
+
+
+def test_xlsx_import_and_unsupported_format():
+    headers = {"Authorization": f"Bearer {get_auth_token('import-xlsx@example.com')}"}
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(HEADER.strip().split(","))
+    sheet.append(["5 Import St", "Austin", "TX", "78701", "townhouse", 3, 2.5, 1600, 300000, None, None, None])
+    output = io.BytesIO()
+    workbook.save(output)
+
+    result = upload(headers, "properties.xlsx", output.getvalue()).json()
+    assert result["imported"] == 1
+    prop = client.get(f"/api/v1/properties/{result['created_ids'][0]}", headers=headers).json()
+    assert (prop["property_type"], prop["status"], prop["bathrooms"]) == ("townhouse", "evaluating", 2.5)
+
+    assert upload(headers, "properties.txt", b"x").status_code == 400
+
+
+def test_csv_that_is_not_utf8_is_rejected_before_any_chunk_is_written():
+    headers = {"Authorization": f"Bearer {get_auth_token('import-latin1@example.com')}"}
+    rows = "".join(f"{row} Latin St,Austin,TX,78701,condo,2,1,900,,,,\n" for row in range(1, 2501))
+    content = (HEADER + rows).encode("utf-8") + "2501 Caf\xe9 St,Austin,TX,78701,condo,2,1,900,,,,\n".encode("latin-1")
+
+    response = upload(headers, "properties.csv", content)
+    assert response.status_code == 400
+    assert "not valid UTF-8" in response.json()["detail"]
+    assert client.get("/api/v1/properties", headers=headers).json() == []
+
+    jobs = client.post("/api/v1/properties/import/jobs", headers=headers, files={"file": ("properties.csv", content)})
+    assert jobs.status_code == 400
+
+
+def test_duplicate_policies_use_normalized_addresses():
+    headers = {"Authorization": f"Bearer {get_auth_token('import-dupes@example.com')}"}
+    first = HEADER + "10 North Oak Street,Austin,TX,78701,condo,2,1,900,100000,,,\n"
+    original_id = upload(headers, "properties.csv", first.encode("utf-8")).json()["created_ids"][0]
+    again = (
+        HEADER
+        + "10 N Oak St,Austin,TX,78701-0001,condo,3,2,1000,120000,Reno,,\n"
+        + "11 Oak St,Austin,TX,78701,condo,2,1,900,,,,\n"
+        + "11 oak street,Austin,TX,78701,condo,2,1,950,,,,\n"
+    )
+
+    skipped = upload(headers, "properties.csv", again.encode("utf-8")).json()
+    assert (skipped["imported"], skipped["skipped"], skipped["duplicates"]) == (1, 2, 2)
+    assert skipped["errors"] == [f"Row 1: duplicate of property {original_id}", "Row 3: duplicate of row 2"]
+
+    flagged = client.post(
+        "/api/v1/properties/import", headers=headers, params={"duplicate_policy": "flag"},
+        files={"file": ("properties.csv", again.encode("utf-8"))},
+    ).json()
+    assert (flagged["imported"], flagged["duplicates"]) == (3, 3)
+    review = client.get("/api/v1/properties", headers=headers, params={"tags": "duplicate"}).json()
+    assert sorted(prop["id"] for prop in review) == flagged["created_ids"]
+
+    updated = client.post(
+        "/api/v1/properties/import", headers=headers, params={"duplicate_policy": "update"},
+        files={"file": ("properties.csv", again.encode("utf-8"))},
+    ).json()
+    # Rows 2 and 3 are the same address: the later one wins and row 2 is not written.
+    assert (updated["imported"], updated["updated"], updated["skipped"]) == (0, 2, 1)
+    assert original_id in updated["updated_ids"]
+    prop = client.get(f"/api/v1/properties/{original_id}", headers=headers).json()
+    assert (prop["bedrooms"], prop["list_price"], prop["tags"]) == (3, 120000, ["Reno"])
+    reno = client.get("/api/v1/properties", headers=headers, params={"tags": "reno"}).json()
+    assert original_id in [prop["id"] for prop in reno]
+
+
+def test_create_duplicate_policies():
+    headers = {"Authorization": f"Bearer {get_auth_token('create-dupes@example.com')}"}
+    payload = {
+        "address_line1": "20 Elm Avenue",
+        "address_line2": "Apt 3",
+        "city": "Austin",
+        "state": "TX",
+        "zip_code": "78701",
+        "property_type": "condo",
+        "bedrooms": 2,
+        "bathrooms": 1,
+        "square_feet": 900,
+    }
+    original = client.post("/api/v1/properties", headers=headers, json=payload).json()
+    duplicate = {**payload, "address_line1": "20 elm ave", "address_line2": "#3", "bedrooms": 3}
+
+    conflict = client.post("/api/v1/properties", headers=headers, params={"duplicate_policy": "skip"}, json=duplicate)
+    assert conflict.status_code == 409
+    assert conflict.json()["detail"] == f"Duplicate of property {original['id']}"
+
+    updated = client.post("/api/v1/properties", headers=headers, params={"duplicate_policy": "update"}, json=duplicate)
+    assert updated.status_code == 200
+    assert (updated.json()["id"], updated.json()["bedrooms"]) == (original["id"], 3)
+
+    flagged = client.post("/api/v1/properties", headers=headers, json=duplicate)
+    assert flagged.status_code == 201
+    assert flagged.json()["tags"] == ["duplicate"]
@@ -0,0 +1,94 @@
+"""Tests for zoom-aware map clustering."""
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.geo import geohash_precision_for_zoom
+from app.main import app
+
+client = TestClient(app)
+
+AUSTIN_BBOX = "-98.0,30.0,-97.5,30.5"
+
+
+def get_auth_token(email: str, password: str = "mappass123") -> str:
+    """Helper to register and get auth token."""
+    client.post(
+        "/api/v1/auth/register",
+        json={"email": email, "password": password, "full_name": "Map User"},
+    )
+    response = client.post("/api/v1/auth/login", json={"email": email, "password": password})
+    return response.json()["access_token"]
+
+
+def create_property(headers: dict, label: str, latitude: float, longitude: float, list_price=None) -> int:
+    response = client.post(
+        "/api/v1/properties",
+        headers=headers,
+        json={
+            "address_line1": f"{label} Map Rd",
+            "city": "Austin",
+            "state": "TX",
+            "zip_code": "78701",
+            "property_type": "single_family",
+            "bedrooms": 3,
+            "bathrooms": 2,
+            "square_feet": 1500,
+            "list_price": list_price,
+            "latitude": latitude,
+            "longitude": longitude,
+        },
+    )
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+def test_precision_grows_with_zoom():
+    precisions = [geohash_precision_for_zoom(zoom) for zoom in range(0, 23)]
+    assert precisions == sorted(precisions)
+    assert precisions[0] == 1
+
+
+def test_low_zoom_returns_clusters_and_high_zoom_returns_points():
+    headers = {"Authorization": f"Bearer {get_auth_token('map-clusters@example.com')}"}
+    downtown = [
+        create_property(headers, str(index), 30.2672 + index * 0.0001, -97.7431, list_price=200000 + index * 100000)
+        for index in range(3)
+    ]
+    create_property(headers, "far", 30.45, -97.55, list_price=500000)
+    create_property(headers, "dallas", 32.7767, -96.7970)  # Outside the viewport
+
+    response = client.get("/api/v1/properties/map", headers=headers, params={"zoom": 9, "bbox": AUSTIN_BBOX})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["points"] == []
+    clusters = sorted(data["clusters"], key=lambda cluster: -cluster["count"])
+    assert [cluster["count"] for cluster in clusters] == [3, 1]
+    assert clusters[0]["latitude"] == pytest.approx(30.2673)
+    assert clusters[0]["heat_value"] == 300000
+    assert (clusters[0]["heat_min"], clusters[0]["heat_max"]) == (200000, 400000)
+
+    # Attribute filters group in SQL and agree with the in-memory index.
+    filtered = client.get(
+        "/api/v1/properties/map", headers=headers, params={"zoom": 9, "bbox": AUSTIN_BBOX, "city": "Austin"}
+    ).json()
+    for sql_cluster, cluster in zip(sorted(filtered["clusters"], key=lambda cluster: -cluster["count"]), clusters):
+        assert sql_cluster["cell"] == cluster["cell"]
+        assert sql_cluster["count"] == cluster["count"]
+        assert sql_cluster["latitude"] == pytest.approx(cluster["latitude"])
+        assert sql_cluster["heat_value"] == pytest.approx(cluster["heat_value"])
+
+    zoomed = client.get(
+        "/api/v1/properties/map", headers=headers, params={"zoom": 16, "bbox": "-97.75,30.26,-97.74,30.27"}
+    ).json()
+    assert zoomed["clusters"] == []
+    assert sorted(point["id"] for point in zoomed["points"]) == downtown
+
+    # Without zoom the legacy response lists every property.
+    assert len(client.get("/api/v1/properties/map", headers=headers).json()["points"]) == 5
+
+
+def test_invalid_bbox_is_rejected():
+    headers = {"Authorization": f"Bearer {get_auth_token('map-bbox@example.com')}"}
+    for bbox in ("1,2,3", "-97,31,-98,30", "-97,30,-96,95"):
+        response = client.get("/api/v1/properties/map", headers=headers, params={"zoom": 5, "bbox": bbox})
+        assert response.status_code == 400
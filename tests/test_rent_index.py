@@ -0,0 +1,82 @@
+"""Tests for the zip-code rent index and its use in rent estimates."""
+import pytest
+
+from app.core.analytics import RENT_CONFIG, estimate_rent
+from app.core.rent_index import ZipRentIndex
+
+
+RENT_REQUEST = {
+    "bedrooms": 3,
+    "bathrooms": 2,
+    "square_feet": 1500,
+    "zip_code": "94102",
+    "property_type": "single_family",
+}
+
+
+def test_index_updates_incrementally():
+    index = ZipRentIndex(capacity=1)
+    index.observe(1, "94102", "single_family", 3000, 1500)
+    index.observe(2, "94102-1234", "single_family", 4000, 1000)
+    index.observe(3, "10001", "condo", 2000, 800)
+
+    entry = index.lookup("94102", "single_family")
+    assert entry.samples == 2
+    assert entry.rent_per_sqft == pytest.approx((2.0 + 4.0) / 2)
+
+    # Updating a deal replaces its sample; moving it changes buckets.
+    index.observe(2, "94102", "single_family", 3000, 1000)
+    assert index.lookup("94102", "single_family").rent_per_sqft == pytest.approx(2.5)
+    index.observe(2, "10001", "condo", 2400, 800)
+    assert index.lookup("94102", "single_family").samples == 1
+    assert index.lookup("10001", "condo").samples == 2
+
+    index.discard(1)
+    index.discard(1)
+    assert index.lookup("94102", "single_family") is None
+    assert len(index) == 2
+
+
+def test_index_ignores_unusable_samples():
+    index = ZipRentIndex()
+    index.observe(1, None, "condo", 2000, 800)
+    index.observe(2, "10001", "condo", 2000, 0)
+    index.observe(3, "10001", "condo", 0, 800)
+    assert len(index) == 0
+    assert index.lookup("10001", "condo") is None
+
+
+def test_index_snapshot_round_trip(tmp_path):
+    index = ZipRentIndex()
+    for deal_id in range(10):
+        index.observe(deal_id, "94102", "single_family", 2000 + deal_id * 100, 1000)
+    index.fingerprint = ("10", "9")
+    path = str(tmp_path / "rent_index.npz")
+    index.save(path)
+
+    restored = ZipRentIndex()
+    assert restored.load(path)
+    assert restored.fingerprint == ("10", "9")
+    assert restored.lookup("94102", "single_family") == index.lookup("94102", "single_family")
+
+    # Restored contributions still support incremental deletes.
+    restored.discard(0)
+    assert restored.lookup("94102", "single_family").samples == 9
+    assert not ZipRentIndex().load(str(tmp_path / "missing.npz"))
+
+
+def test_estimate_rent_blends_zip_index():
+    rule_based, _ = estimate_rent(RENT_REQUEST)
+
+    few, assumptions = estimate_rent(RENT_REQUEST, (3.0, RENT_CONFIG["zip_min_samples"] - 1))
+    assert few == rule_based
+    assert assumptions["zip_code_used"] is False
+    assert assumptions["zip_sample_count"] == RENT_CONFIG["zip_min_samples"] - 1
+
+    full, assumptions = estimate_rent(RENT_REQUEST, (3.0, RENT_CONFIG["zip_full_weight_samples"]))
+    assert full == pytest.approx(3.0 * RENT_REQUEST["square_feet"])
+    assert assumptions["zip_code_used"] is True
+    assert assumptions["zip_weight"] == 1.0
+
+    partial, _ = estimate_rent(RENT_REQUEST, (3.0, RENT_CONFIG["zip_full_weight_samples"] // 2))
+    assert min(rule_based, full) < partial < max(rule_based, full)
@@ -0,0 +1,106 @@
+"""Tests for full-text search."""
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+client = TestClient(app)
+
+
+def get_auth_token(email: str, password: str = "searchpass123") -> str:
+    """Helper to register and get auth token."""
+    client.post(
+        "/api/v1/auth/register",
+        json={"email": email, "password": password, "full_name": "Search User"},
+    )
+    response = client.post("/api/v1/auth/login", json={"email": email, "password": password})
+    return response.json()["access_token"]
+
+
+def create_property(headers: dict, address: str, city: str) -> int:
+    response = client.post(
+        "/api/v1/properties",
+        headers=headers,
+        json={
+            "address_line1": address,
+            "city": city,
+            "state": "TX",
+            "zip_code": "78701",
+            "property_type": "single_family",
+            "bedrooms": 3,
+            "bathrooms": 2,
+            "square_feet": 1500,
+        },
+    )
+    return response.json()["id"]
+
+
+def search(headers: dict, q: str, **params):
+    response = client.get("/api/v1/search", headers=headers, params={"q": q, **params})
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_search_fans_out_across_entity_types():
+    headers = {"Authorization": f"Bearer {get_auth_token('search-fanout@example.com')}"}
+    pecan = create_property(headers, "400 Pecan Grove Road", "Austin")
+    create_property(headers, "401 Pecan Street", "Houston")
+    lead = client.post(
+        "/api/v1/leads",
+        headers=headers,
+        json={"first_name": "Priya", "last_name": "Pecanson", "notes": "Wants a duplex near downtown"},
+    ).json()
+    deal = client.post(
+        "/api/v1/deals",
+        headers=headers,
+        json={
+            "purchase_price": 200000,
+            "down_payment": 40000,
+            "interest_rate": 6.0,
+            "loan_term_years": 30,
+            "monthly_rent": 1800,
+            "maintenance_percent": 8,
+            "vacancy_percent": 5,
+            "management_percent": 8,
+            "notes": "Seller motivated, pecan trees need trimming",
+        },
+    ).json()
+
+    results = search(headers, "pecan")
+    assert len(results["properties"]) == 2
+    assert [hit["id"] for hit in results["leads"]] == [lead["id"]]
+    assert [hit["id"] for hit in results["deals"]] == [deal["id"]]
+    assert "[pecan]" in results["deals"][0]["snippet"].lower()
+
+    # Every word must match a word prefix; punctuation is ignored.
+    results = search(headers, "pec AUS!")
+    assert [hit["id"] for hit in results["properties"]] == [pecan]
+    assert results["properties"][0]["title"] == "400 Pecan Grove Road, Austin"
+    assert (results["leads"], results["deals"]) == ([], [])
+
+    only_leads = search(headers, "duplex", types=["leads"])
+    assert [hit["id"] for hit in only_leads["leads"]] == [lead["id"]]
+    assert client.get("/api/v1/search", headers=headers, params={"q": "x", "types": "users"}).status_code == 400
+
+
+def test_search_index_follows_writes_and_owners():
+    headers = {"Authorization": f"Bearer {get_auth_token('search-writes@example.com')}"}
+    other = {"Authorization": f"Bearer {get_auth_token('search-other@example.com')}"}
+    property_id = create_property(headers, "12 Quillfeather Lane", "Austin")
+    assert search(other, "quillfeather")["properties"] == []
+
+    client.put(f"/api/v1/properties/{property_id}", headers=headers, json={"address_line1": "12 Marbleton Lane"})
+    assert search(headers, "quillfeather")["properties"] == []
+    assert [hit["id"] for hit in search(headers, "marbleton")["properties"]] == [property_id]
+
+    client.delete(f"/api/v1/properties/{property_id}", headers=headers)
+    assert search(headers, "marbleton")["properties"] == []
+
+    # Bulk imports bypass the ORM and are indexed all the same.
+    content = (
+        "address_line1,city,state,zip_code,property_type,bedrooms,bathrooms,square_feet\n"
+        "7 Zinnwaldite Way,Austin,TX,78701,condo,2,1,900\n"
+    )
+    imported = client.post(
+        "/api/v1/properties/import", headers=headers, files={"file": ("properties.csv", content.encode("utf-8"))}
+    ).json()
+    assert [hit["id"] for hit in search(headers, "zinnwald")["properties"]] == imported["created_ids"]
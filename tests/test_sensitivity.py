@@ -0,0 +1,55 @@
+"""Tests for sensitivity grids and tornado analysis."""
+import math
+
+import numpy as np
+import pytest
+
+from app.core.analytics import analyze_deal
+from app.core.assumptions import Assumptions
+from app.core.sensitivity import sensitivity_grid, tornado_analysis
+
+BASE = {
+    "purchase_price": 300000,
+    "down_payment": 60000,
+    "monthly_rent": 2500,
+    "interest_rate": 4.5,
+    "loan_term_years": 30,
+    "hoa_monthly": 0,
+}
+
+
+def test_grid_cells_match_scalar_analysis():
+    rates = [3.0, 5.0, 7.0]
+    rents = [2000, 2500]
+    downs = [30000, 60000, 90000, 120000]
+    grid = sensitivity_grid(BASE, [("interest_rate", rates), ("monthly_rent", rents), ("down_payment", downs)])
+
+    assert grid["monthly_cash_flow"].shape == (3, 2, 4)
+    scalar = analyze_deal(
+        {**BASE, "interest_rate": rates[2], "monthly_rent": rents[0], "down_payment": downs[1], "assumptions": Assumptions()}
+    )
+    assert math.isclose(grid["monthly_cash_flow"][2, 0, 1], scalar["cash_flow"]["monthly_cash_flow"], rel_tol=1e-12)
+    assert math.isclose(grid["dscr"][2, 0, 1], scalar["dscr"]["dscr"], rel_tol=1e-12)
+    assert grid["overall_score"][2, 0, 1] == scalar["overall_score"]
+    # Cash flow falls with rate and rises with rent everywhere on the grid
+    assert np.all(np.diff(grid["monthly_cash_flow"], axis=0) < 0)
+    assert np.all(np.diff(grid["monthly_cash_flow"], axis=1) > 0)
+
+
+def test_grid_rejects_duplicate_axes():
+    with pytest.raises(ValueError):
+        sensitivity_grid(BASE, [("interest_rate", [3.0]), ("interest_rate", [4.0])])
+
+
+def test_tornado_orders_inputs_by_cash_flow_swing():
+    result = tornado_analysis(BASE, percent=10)
+    inputs = result["inputs"]
+    swings = [abs(row["monthly_cash_flow"]["high"] - row["monthly_cash_flow"]["low"]) for row in inputs]
+
+    assert swings == sorted(swings, reverse=True)
+    assert inputs[0]["field"] == "monthly_rent"
+    rent = inputs[0]
+    assert rent["low_value"] == pytest.approx(2250)
+    assert rent["monthly_cash_flow"]["delta_high"] > 0 > rent["monthly_cash_flow"]["delta_low"]
+    hoa = next(row for row in inputs if row["field"] == "hoa_monthly")
+    assert hoa["monthly_cash_flow"]["delta_high"] == 0
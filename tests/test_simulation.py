@@ -0,0 +1,57 @@
+"""Tests for the Monte Carlo deal simulation."""
+import numpy as np
+import pytest
+
+from app.core.simulation import StreamingHistogram, simulate_deal
+
+DEAL = {
+    "purchase_price": 250000,
+    "down_payment": 50000,
+    "interest_rate": 5.0,
+    "loan_term_years": 30,
+    "monthly_rent": 2200,
+}
+
+
+def test_streaming_histogram_percentiles_track_exact_values():
+    rng = np.random.default_rng(0)
+    values = rng.normal(100, 20, 50_000)
+    histogram = StreamingHistogram(0, 200, bins=2048)
+    for chunk in np.array_split(values, 10):
+        partial = StreamingHistogram(0, 200, bins=2048)
+        partial.add(chunk)
+        histogram.merge(partial)
+
+    percentiles = histogram.percentiles((5, 50, 95))
+    for q in (5, 50, 95):
+        assert percentiles[f"p{q}"] == pytest.approx(np.percentile(values, q), abs=0.2)
+    assert histogram.total == 50_000
+    assert histogram.minimum == values.min()
+
+
+def test_seeded_simulation_is_reproducible_across_workers():
+    inline = simulate_deal(DEAL, paths=3000, seed=7, chunk_size=1000, max_workers=0)
+    pooled = simulate_deal(DEAL, paths=3000, seed=7, chunk_size=1000, max_workers=2)
+    assert inline["paths"] == 3000
+    assert inline["monthly_cash_flow"] == pooled["monthly_cash_flow"]
+    assert inline["irr_percent"] == pooled["irr_percent"]
+    assert inline["probability_dscr_below_1"] == pooled["probability_dscr_below_1"]
+
+
+def test_fixed_distributions_collapse_to_deterministic_result():
+    fixed = {name: {"kind": "fixed"} for name in ("vacancy_percent", "maintenance_percent", "rent_growth_percent",
+                                                  "appreciation_percent", "interest_rate_shock")}
+    result = simulate_deal(DEAL, distributions=fixed, paths=500, seed=1)
+    assert result["monthly_cash_flow"]["p5"] == pytest.approx(result["monthly_cash_flow"]["p95"])
+
+
+def test_rate_shocks_raise_dscr_risk():
+    calm = simulate_deal(DEAL, paths=2000, seed=3, distributions={"interest_rate_shock": {"kind": "fixed", "value": 0}})
+    shocked = simulate_deal(DEAL, paths=2000, seed=3, distributions={"interest_rate_shock": {"kind": "fixed", "value": 4}})
+    assert shocked["probability_dscr_below_1"] > calm["probability_dscr_below_1"]
+    assert shocked["monthly_cash_flow"]["p50"] < calm["monthly_cash_flow"]["p50"]
+
+
+def test_unknown_variable_rejected():
+    with pytest.raises(ValueError):
+        simulate_deal(DEAL, distributions={"tax_shock": {"kind": "normal"}}, paths=100)
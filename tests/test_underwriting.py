@@ -0,0 +1,173 @@
+"""Tests for the bulk re-underwriting job."""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.api.routes_deals import _calculate_deal_analytics
+from app.core.assumptions import Assumptions
+from app.core.batch import deal_columns
+from app.core.underwriting import (
+    RECOMPUTE_CONFIG,
+    claim_recompute_job,
+    create_recompute_job,
+    deal_snapshots_batch,
+    run_recompute_job,
+)
+from app.db.base import Base
+from app.models.deal import Deal
+from app.models.job import Job, JobStatus
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(bind=engine)
+    Base.metadata.drop_all(bind=engine)
+
+
+def make_deals(db, count):
+    deals = []
+    for index in range(count):
+        deals.append(
+            Deal(
+                user_id=1,
+                purchase_price=150000 + 5000 * index,
+                down_payment=30000 if index % 7 else 150000 + 5000 * index,  # Every 7th deal is a cash purchase
+                interest_rate=4.0 + (index % 5) * 0.5,
+                loan_term_years=30 if index % 2 else 15,
+                monthly_rent=1200 + 40 * index,
+                property_tax_annual=None if index % 3 else 2400.0,
+                insurance_annual=1100.0 if index % 4 else None,
+                hoa_monthly=None if index % 2 else 75.0,
+                maintenance_percent=5.0,
+                vacancy_percent=4.0 + index % 4,
+                management_percent=8.0,
+            )
+        )
+    db.add_all(deals)
+    db.commit()
+    return deals
+
+
+def assert_close(actual, expected):
+    """Recursive equality that tolerates float rounding between the batch and scalar paths."""
+    if isinstance(expected, dict):
+        assert actual.keys() == expected.keys()
+        for key in expected:
+            assert_close(actual[key], expected[key])
+    elif isinstance(expected, float):
+        assert actual == pytest.approx(expected, rel=1e-9, abs=1e-9)
+    else:
+        assert actual == expected
+
+
+def test_batch_snapshots_match_single_deal_analytics(session_factory):
+    db = session_factory()
+    deals = make_deals(db, 30)
+    assumptions = Assumptions(property_tax_percent=1.5, insurance_percent=0.6)
+
+    snapshots = deal_snapshots_batch(deal_columns(deals), assumptions)
+
+    for deal, snapshot in zip(deals, snapshots):
+        expected = _calculate_deal_analytics(deal, assumptions)
+        assert_close(snapshot, expected)
+
+
+def test_recompute_job_updates_every_deal(session_factory):
+    db = session_factory()
+    make_deals(db, 25)
+    assumptions = Assumptions(vacancy_percent=9)
+    job = create_recompute_job(db, assumptions)
+
+    run_recompute_job(job.id, session_factory, chunk_size=10)
+
+    db.expire_all()
+    job = db.query(Job).filter(Job.id == job.id).one()
+    assert job.status == JobStatus.COMPLETED
+    assert job.processed == job.total == 25
+    assert job.last_id == db.query(Deal.id).order_by(Deal.id.desc()).first()[0]
+    for deal in db.query(Deal).all():
+        assert deal.snapshot_of_assumptions == assumptions.model_dump()
+        assert deal.monthly_cash_flow == deal.snapshot_of_analytics_result["cash_flow"]["monthly_cash_flow"]
+        assert deal.overall_score == deal.snapshot_of_analytics_result["deal_analysis"]["overall_score"]
+
+
+def test_recompute_job_resumes_after_last_id(session_factory):
+    db = session_factory()
+    deals = make_deals(db, 12)
+    job = create_recompute_job(db, Assumptions())
+    # Pretend an earlier run committed the first five deals and then stopped.
+    job.status = JobStatus.FAILED
+    job.processed = 5
+    job.last_id = deals[4].id
+    db.commit()
+
+    run_recompute_job(job.id, session_factory, chunk_size=4)
+
+    db.expire_all()
+    job = db.query(Job).filter(Job.id == job.id).one()
+    assert job.status == JobStatus.COMPLETED
+    assert job.error is None
+    assert job.processed == job.total == 12
+    recomputed = {deal.id for deal in db.query(Deal).all() if deal.snapshot_of_analytics_result}
+    assert recomputed == {deal.id for deal in deals[5:]}
+
+
+def test_only_failed_or_stalled_recompute_jobs_are_claimed(session_factory):
+    db = session_factory()
+    make_deals(db, 3)
+    job = create_recompute_job(db, Assumptions())
+    job.status = JobStatus.RUNNING
+    db.commit()
+
+    # A live worker keeps its job: neither a resume nor a second runner takes it.
+    assert not claim_recompute_job(db, job)
+    run_recompute_job(job.id, session_factory)
+    db.expire_all()
+    assert (job.status, job.processed) == (JobStatus.RUNNING, 0)
+
+    # Once its heartbeat is stale it can be claimed, but only once.
+    job.updated_at = datetime.utcnow() - timedelta(seconds=RECOMPUTE_CONFIG["stale_seconds"] + 1)
+    db.commit()
+    other = session_factory()
+    racing = other.query(Job).filter(Job.id == job.id).one()
+    assert claim_recompute_job(db, job)
+    assert not claim_recompute_job(other, racing)
+    other.close()
+
+    run_recompute_job(job.id, session_factory, claimed=True)
+    db.expire_all()
+    assert (job.status, job.processed) == (JobStatus.COMPLETED, 3)
+    assert not claim_recompute_job(db, job)
+
+
+def test_stale_snapshots_are_refreshed_in_one_batch(session_factory, monkeypatch):
+    from app.core import underwriting
+
+    db = session_factory()
+    deals = make_deals(db, 6)
+    assumptions = Assumptions()
+    assert underwriting.refresh_stale_snapshots(deals, assumptions) == 6
+    assert underwriting.refresh_stale_snapshots(deals, assumptions) == 0
+    assert all(deal.analytics_engine_version == underwriting.ANALYTICS_ENGINE_VERSION for deal in deals)
+
+    # Editing a deal's pinned assumptions invalidates only that deal.
+    deals[0].snapshot_of_assumptions = {**deals[0].snapshot_of_assumptions, "vacancy_percent": 20.0}
+    assert underwriting.refresh_stale_snapshots(deals, assumptions) == 1
+
+    # An engine upgrade invalidates everything.
+    monkeypatch.setattr(underwriting, "ANALYTICS_ENGINE_VERSION", underwriting.ANALYTICS_ENGINE_VERSION + 1)
+    calls = []
+    original = underwriting.deal_snapshots_batch
+
+    def counting_batch(columns, batch_assumptions):
+        calls.append(len(columns["purchase_price"]))
+        return original(columns, batch_assumptions)
+
+    monkeypatch.setattr(underwriting, "deal_snapshots_batch", counting_batch)
+    assert underwriting.refresh_stale_snapshots(deals, assumptions) == 6
+    assert sorted(calls) == [1, 5]